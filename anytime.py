@@ -0,0 +1,232 @@
+"""
+Abbrechbare Berechnungen mit Zwischenergebnissen (Anytime Computations).
+
+Zieht eine Studentin einen Slider über seinen Bereich, stößt Streamlit für jeden
+Zwischenwert einen Rerun an. Teure Auswertungen (Monte-Carlo, Sweeps, Netzwerk) laufen deshalb
+nicht im Skript-Thread, sondern als Job in einem Thread-Pool:
+
+- Eine Berechnung ist ein Generator, der nach jedem Block ``(anteil, zwischenergebnis)``
+  liefert; der letzte Wert (``anteil == 1``) ist das vollständige Ergebnis. Ein
+  Zwischenergebnis ``None`` meldet nur Fortschritt (z.B. wenn ein Zwischenstand zu teuer wäre).
+- Der Skript-Thread wartet nur auf neue Zwischenstände, zeichnet sie und bleibt dabei für
+  Streamlit unterbrechbar.
+- Je Sitzung und Platz (z.B. ``"monte_carlo"``) läuft höchstens ein Job. Kommt ein neuer
+  Parametersatz an, wird der alte Job zwischen zwei Blöcken abgebrochen; dieselben Parameter
+  übernehmen dagegen den laufenden Job, statt neu zu rechnen.
+- Wird ein Panel abgeschaltet, bricht :meth:`JobRegistry.cancel` seinen Job ab. Jobs, deren
+  Sitzung nicht zurückkommt, werden nach ``EXPO_ANYTIME_TTL`` Sekunden ohne Zugriff abgebrochen
+  und vergessen.
+
+Wie der Ergebnis-Cache kommt das Modul ohne Streamlit aus. Steuerbar per Umgebungsvariable:
+
+- ``EXPO_ANYTIME_WORKERS``: Anzahl der Worker-Threads, Standard: Anzahl der Kerne, mindestens 2.
+- ``EXPO_ANYTIME_INTERVAL``: Sekunden zwischen zwei Fortschrittsupdates im Skript-Thread, Standard 0,25.
+- ``EXPO_ANYTIME_TTL``: Sekunden ohne Zugriff, nach denen ein Job verworfen wird, Standard 300.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ANYTIME_WORKERS = int(os.environ.get("EXPO_ANYTIME_WORKERS", max(2, os.cpu_count() or 1)))
+UPDATE_INTERVAL = float(os.environ.get("EXPO_ANYTIME_INTERVAL", 0.25))
+JOB_TTL = float(os.environ.get("EXPO_ANYTIME_TTL", 300))
+
+class Cancelled(Exception):
+    """Der Job wurde abgebrochen (neuerer Parametersatz, Panel abgeschaltet oder Sitzung verlassen)."""
+
+# ------------------------------------------------------
+# Einzelner Job (Job)
+# ------------------------------------------------------
+
+class Job:
+    """
+    Führt einen Anytime-Generator aus und hält den jeweils neuesten Zwischenstand bereit.
+
+    Args:
+        schritte (Iterator): Generator mit ``(anteil, zwischenergebnis)``-Paaren.
+    """
+
+    def __init__(self, schritte):
+        self._schritte = schritte
+        self._bedingung = threading.Condition()
+        self._abgebrochen = threading.Event()
+        self.version = 0  # zählt die Zwischenstände (ohne reine Fortschrittsmeldungen)
+        self.anteil = 0.0
+        self.zwischenergebnis = None
+        self.fertig = False
+        self.fehler = None
+
+    def run(self):
+        """Arbeitet den Generator ab; wird im Thread-Pool ausgeführt."""
+        try:
+            for anteil, zwischenergebnis in self._schritte:
+                if self._abgebrochen.is_set():
+                    break
+                with self._bedingung:
+                    self.anteil = anteil
+                    if zwischenergebnis is not None:
+                        self.zwischenergebnis = zwischenergebnis
+                        self.version += 1
+                        self._bedingung.notify_all()
+        except Exception as fehler:
+            self.fehler = fehler
+        finally:
+            # Schließt den Generator auch beim Abbruch, damit er z.B. ausstehende Blöcke verwerfen kann
+            self._schritte.close()
+            with self._bedingung:
+                self.fertig = True
+                self._bedingung.notify_all()
+
+    def cancel(self):
+        """Bricht den Job vor dem nächsten Block ab."""
+        self._abgebrochen.set()
+        with self._bedingung:
+            self._bedingung.notify_all()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._abgebrochen.is_set()
+
+    def wait(self, version: int, timeout: float) -> tuple:
+        """
+        Wartet höchstens ``timeout`` Sekunden auf einen Zwischenstand nach ``version``.
+
+        Args:
+            version (int): Zuletzt gesehene Version (0 = noch keine).
+            timeout (float): Maximale Wartezeit in Sekunden.
+
+        Returns:
+            tuple: ``(version, anteil, zwischenergebnis, fertig)`` des neuesten Stands.
+        """
+        with self._bedingung:
+            self._bedingung.wait_for(lambda: self.version > version or self.fertig or self.cancelled, timeout)
+            return self.version, self.anteil, self.zwischenergebnis, self.fertig or self.cancelled
+
+    def result(self):
+        """
+        Das vollständige Ergebnis eines abgeschlossenen Jobs.
+
+        Raises:
+            Cancelled: Wenn der Job abgebrochen wurde.
+            Exception: Der Fehler der Berechnung.
+        """
+        if self.cancelled:
+            raise Cancelled()
+        if self.fehler is not None:
+            raise self.fehler
+        return self.zwischenergebnis
+
+# ------------------------------------------------------
+# Jobs je Sitzung (Job Registry)
+# ------------------------------------------------------
+
+class JobRegistry:
+    """
+    Thread-Pool mit höchstens einem Job je Platz; neue Parameter brechen den alten Job ab.
+
+    Args:
+        max_workers (int): Anzahl der Worker-Threads.
+        ttl (float): Sekunden ohne Zugriff, nach denen ein Job abgebrochen und vergessen wird.
+    """
+
+    def __init__(self, max_workers: int = ANYTIME_WORKERS, ttl: float = JOB_TTL):
+        self.max_workers = max_workers
+        self.ttl = ttl
+        self._executor = None
+        self._lock = threading.Lock()
+        self._jobs = {}  # Platz -> (Parameter, Job, letzter Zugriff)
+        self.submitted = 0
+        self.reused = 0
+        self.cancelled = 0
+        self.expired = 0
+
+    def _expire(self, jetzt: float):
+        """Verwirft Jobs ohne Zugriff seit :attr:`ttl` Sekunden (Aufruf unter ``_lock``)."""
+        for platz in [p for p, (_, _, zugriff) in self._jobs.items() if jetzt - zugriff > self.ttl]:
+            _, job, _ = self._jobs.pop(platz)
+            if not job.fertig:
+                job.cancel()
+            self.expired += 1
+
+    def submit(self, platz, parameter, berechnung) -> Job:
+        """
+        Startet die Berechnung für ``platz`` bzw. übernimmt einen laufenden Job mit denselben Parametern.
+
+        Args:
+            platz: Hashbarer Schlüssel, typischerweise ``(sitzung, name)``.
+            parameter: Hashbarer, normalisierter Parametersatz.
+            berechnung (callable): Funktion ohne Argumente, die den Anytime-Generator erzeugt.
+
+        Returns:
+            Job: Der laufende Job.
+        """
+        with self._lock:
+            jetzt = time.monotonic()
+            self._expire(jetzt)
+            bisher = self._jobs.get(platz)
+            if bisher is not None:
+                alte_parameter, alter_job, _ = bisher
+                if alte_parameter == parameter and not alter_job.cancelled and alter_job.fehler is None:
+                    self._jobs[platz] = (parameter, alter_job, jetzt)
+                    self.reused += 1
+                    return alter_job
+                if not alter_job.fertig:
+                    alter_job.cancel()
+                    self.cancelled += 1
+            job = Job(berechnung())
+            self._jobs[platz] = (parameter, job, jetzt)
+            self.submitted += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="anytime")
+        self._executor.submit(job.run)
+        return job
+
+    def release(self, platz, job: Job):
+        """
+        Vergisst einen abgeschlossenen Job, sofern er noch der aktuelle seines Platzes ist. Ein
+        unterbrochener, noch laufender Job bleibt bis zum nächsten Zugriff bzw. bis zur TTL registriert.
+        """
+        with self._lock:
+            jetzt = time.monotonic()
+            eintrag = self._jobs.get(platz)
+            if eintrag is not None and eintrag[1] is job:
+                if job.fertig:
+                    del self._jobs[platz]
+                else:
+                    self._jobs[platz] = (eintrag[0], job, jetzt)
+            self._expire(jetzt)
+
+    def cancel(self, platz) -> bool:
+        """
+        Bricht den Job eines Platzes ab und vergisst ihn (z.B. wenn das Panel abgeschaltet wird).
+
+        Args:
+            platz: Schlüssel wie bei :meth:`submit`.
+
+        Returns:
+            bool: Ob ein Job registriert war.
+        """
+        with self._lock:
+            eintrag = self._jobs.pop(platz, None)
+            if eintrag is not None and not eintrag[1].fertig:
+                eintrag[1].cancel()
+                self.cancelled += 1
+        return eintrag is not None
+
+    def stats(self) -> dict:
+        """
+        Liefert Zähler der Registry.
+
+        Returns:
+            dict: "running", "registered", "submitted", "reused", "cancelled" und "expired".
+        """
+        with self._lock:
+            laufend = sum(not job.fertig for _, job, _ in self._jobs.values())
+            registriert = len(self._jobs)
+        return {"running": laufend, "registered": registriert, "submitted": self.submitted, "reused": self.reused,
+                "cancelled": self.cancelled, "expired": self.expired}
+
+# Gemeinsame Instanz für alle Sitzungen des Prozesses
+JOBS = JobRegistry()
@@ -0,0 +1,280 @@
+"""
+Lokale JSON-API für die vier Modelle (für LMS-Plug-ins, Foliengeneratoren usw.)::
+
+    python -m api [--host 127.0.0.1] [--port 8600] [--prozesse 4]
+
+Endpunkte:
+
+- ``GET /health``: Lebenszeichen.
+- ``GET /v1/modelle``: Parameter (mit Standardwerten) und Kennzahlen je Geschichte.
+- ``GET /v1/<geschichte>?startkapital=10000&...``: ein Szenario.
+- ``POST /v1/<geschichte>`` mit ``{"szenarien": [{...}, ...], "format": "roh"}``: beliebig
+  viele Szenarien in einem Aufruf. ``format`` wie beim Batch-Runner ("roh", "deutsch", "lesbar").
+- ``GET /v1/stats``: Anfragen, Cache-Treffer und ausgelagerte Batches.
+
+Die Parameter heißen wie in der Engine, gerechnet wird mit denselben Funktionen wie in der
+App und im Batch-Runner (:func:`batch.evaluate`). Antwort: ``{"geschichte": ..., "ergebnisse":
+[{Kennzahl: Wert}, ...]}`` in der Reihenfolge der Szenarien; nicht darstellbare Werte
+(z.B. Körnerzahlen jenseits von float64) sind ``null``, ihre log10-Werte bleiben gesetzt.
+
+Der Server läuft auf einer asyncio-Ereignisschleife (HTTP/1.1 mit Keep-Alive, nur
+Standardbibliothek). Kleine Anfragen rechnet die Schleife selbst – ein vektorisierter
+Engine-Aufruf dauert Mikrosekunden, der Weg in einen anderen Prozess länger. Ab
+``EXPO_API_INLINE_MAX`` Szenarien (Standard 256) wird die Anfrage samt JSON-Kodierung in
+einen Prozesspool ausgelagert, damit große Batches die übrigen Anfragen nicht aufhalten.
+Fertige Antworten liegen als Bytes in einem LRU-Cache (``EXPO_API_CACHE_MAX_ENTRIES``,
+Standard 10000, und ``EXPO_API_CACHE_MAX_BYTES``, Standard 256 MB; Lebensdauer wie
+``EXPO_CACHE_TTL_SECONDS``), Schlüssel sind Pfad und Rumpf.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import inspect
+import json
+import math
+import os
+import urllib.parse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import batch
+from cache import ResultCache
+
+# Ab dieser Anzahl Szenarien rechnet der Prozesspool statt der Ereignisschleife
+API_INLINE_MAX = int(os.environ.get("EXPO_API_INLINE_MAX", 256))
+
+# Obergrenzen je Anfrage
+API_MAX_BODY_BYTES = 16 * 1024 * 1024
+API_MAX_HEADER_BYTES = 64 * 1024
+
+API_CACHE = ResultCache(
+    max_entries=int(os.environ.get("EXPO_API_CACHE_MAX_ENTRIES", 10_000)),
+    ttl_seconds=float(os.environ.get("EXPO_CACHE_TTL_SECONDS", 3600)),
+    max_bytes=int(os.environ.get("EXPO_API_CACHE_MAX_BYTES", 256 * 1024 * 1024)),
+)
+
+_STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                413: "Payload Too Large", 500: "Internal Server Error"}
+
+# ------------------------------------------------------
+# Auswertung (Evaluation)
+# ------------------------------------------------------
+
+def _json(daten) -> bytes:
+    return json.dumps(daten, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode("utf-8")
+
+def _column(werte, dezimalstellen: int, lesbar: bool, format: str) -> list:
+    if format != "roh":
+        return batch.format_column(werte, dezimalstellen, lesbar and format == "lesbar")
+    liste = werte.tolist()
+    # JSON kennt kein inf/nan; nur bei Bedarf elementweise ersetzen
+    if not all(map(math.isfinite, liste)):
+        liste = [wert if math.isfinite(wert) else None for wert in liste]
+    return liste
+
+def respond(geschichte: str, szenarien: list, format: str = "roh") -> bytes:
+    """
+    Berechnet alle Szenarien einer Anfrage mit einem Engine-Aufruf und kodiert die Antwort.
+    Läuft in der Ereignisschleife oder (große Batches) in einem Worker-Prozess.
+
+    Args:
+        geschichte (str): Schlüssel in ``batch.BATCH_STORIES``.
+        szenarien (list): Ein Dict je Szenario (Parametername -> Wert).
+        format (str): "roh", "deutsch" oder "lesbar".
+
+    Returns:
+        bytes: JSON-Antwort.
+
+    Raises:
+        ValueError: Bei unbekannten, fehlenden oder nicht numerischen Parametern.
+    """
+    if format not in batch.FORMATE:
+        raise ValueError(f"Unbekanntes Format '{format}', erlaubt: {', '.join(batch.FORMATE)}")
+    if not isinstance(szenarien, list) or not all(isinstance(s, dict) for s in szenarien):
+        raise ValueError("'szenarien' muss eine Liste von Objekten sein")
+    parameter = batch.story_parameters(geschichte)
+    unbekannt = {name for szenario in szenarien for name in szenario} - parameter.keys()
+    if unbekannt:
+        raise ValueError(f"Unbekannte Parameter für '{geschichte}': {', '.join(sorted(unbekannt))}")
+
+    argumente = {}
+    for name, standard in parameter.items():
+        if standard is inspect.Parameter.empty:
+            if any(name not in szenario for szenario in szenarien):
+                continue  # meldet batch.evaluate als fehlenden Parameter
+            argumente[name] = [szenario[name] for szenario in szenarien]
+        elif any(name in szenario for szenario in szenarien):
+            argumente[name] = [szenario.get(name, standard) for szenario in szenarien]
+    werte = batch.evaluate(geschichte, argumente) if szenarien else {}
+
+    kennzahlen = batch.BATCH_STORIES[geschichte]["kennzahlen"]
+    spalten = [_column(np.broadcast_to(werte[name], (len(szenarien),)), dezimalstellen, lesbar, format)
+               for name, (dezimalstellen, lesbar) in kennzahlen.items()] if szenarien else []
+    return _json({"geschichte": geschichte, "ergebnisse": [dict(zip(kennzahlen, zeile)) for zeile in zip(*spalten)]})
+
+def models() -> dict:
+    """Beschreibung aller Modelle für ``GET /v1/modelle``."""
+    return {
+        geschichte: {
+            "parameter": {name: (None if standard is inspect.Parameter.empty else standard)
+                          for name, standard in batch.story_parameters(geschichte).items()},
+            "pflicht": [name for name, standard in batch.story_parameters(geschichte).items()
+                        if standard is inspect.Parameter.empty],
+            "kennzahlen": list(story["kennzahlen"]),
+        }
+        for geschichte, story in batch.BATCH_STORIES.items()
+    }
+
+def _query_value(wert: str):
+    """Zahlen aus dem Query-String als Zahl, alles andere (z.B. "monatlich") als Text."""
+    try:
+        return float(wert)
+    except ValueError:
+        return wert
+
+# ------------------------------------------------------
+# HTTP-Server (asyncio)
+# ------------------------------------------------------
+
+class ApiServer:
+    """
+    Minimaler HTTP/1.1-Server für die JSON-API.
+
+    Args:
+        prozesse (int): Worker-Prozesse für große Batches (0 = alles in der Ereignisschleife).
+        cache (ResultCache): Antwort-Cache, standardmäßig :data:`API_CACHE`.
+    """
+
+    def __init__(self, prozesse: int = os.cpu_count() or 1, cache: ResultCache = None):
+        self.pool = ProcessPoolExecutor(prozesse) if prozesse > 0 else None
+        self.cache = cache if cache is not None else API_CACHE
+        self.zaehler = {"anfragen": 0, "ausgelagert": 0, "fehler": 0}
+
+    async def handle(self, methode: str, ziel: str, rumpf: bytes) -> tuple[int, bytes, bool]:
+        """
+        Beantwortet eine Anfrage.
+
+        Args:
+            methode (str): HTTP-Methode.
+            ziel (str): Pfad samt Query-String.
+            rumpf (bytes): Request-Body.
+
+        Returns:
+            tuple[int, bytes, bool]: Statuscode, JSON-Antwort und ob sie aus dem Cache stammt.
+        """
+        self.zaehler["anfragen"] += 1
+        url = urllib.parse.urlsplit(ziel)
+        if url.path == "/health":
+            return 200, b'{"status":"ok"}', False
+        if url.path == "/v1/stats":
+            return 200, _json({**self.zaehler, "cache": self.cache.stats()}), False
+        if url.path == "/v1/modelle":
+            return 200, _json(models()), False
+
+        geschichte = url.path.removeprefix("/v1/")
+        if not url.path.startswith("/v1/") or geschichte not in batch.BATCH_STORIES:
+            return 404, _json({"fehler": f"Unbekannter Pfad {url.path}"}), False
+        if methode not in ("GET", "POST"):
+            return 405, _json({"fehler": "Nur GET und POST"}), False
+
+        schluessel = (methode, ziel, hashlib.blake2b(rumpf, digest_size=16).digest())
+        antwort = self.cache.get("api", schluessel)
+        if antwort is not None:
+            return 200, antwort, True
+        try:
+            if methode == "GET":
+                abfrage = {name: _query_value(wert) for name, wert in urllib.parse.parse_qsl(url.query)}
+                format = str(abfrage.pop("format", "roh"))
+                szenarien = [abfrage]
+            else:
+                try:
+                    anfrage = json.loads(rumpf or b"{}")
+                except json.JSONDecodeError as fehler:
+                    raise ValueError(f"Ungültiges JSON: {fehler}") from None
+                if not isinstance(anfrage, dict):
+                    raise ValueError("Erwartet wird ein JSON-Objekt mit 'szenarien'")
+                format = anfrage.get("format", "roh")
+                szenarien = anfrage.get("szenarien", [])
+            if self.pool is not None and isinstance(szenarien, list) and len(szenarien) > API_INLINE_MAX:
+                self.zaehler["ausgelagert"] += 1
+                antwort = await asyncio.get_running_loop().run_in_executor(
+                    self.pool, respond, geschichte, szenarien, format)
+            else:
+                antwort = respond(geschichte, szenarien, format)
+        except ValueError as fehler:
+            self.zaehler["fehler"] += 1
+            return 400, _json({"fehler": str(fehler)}), False
+        self.cache.put("api", schluessel, antwort)
+        return 200, antwort, False
+
+    async def serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Bearbeitet die Anfragen einer (Keep-Alive-)Verbindung nacheinander."""
+        try:
+            while True:
+                try:
+                    kopf = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    return
+                zeilen = kopf.decode("latin-1").split("\r\n")
+                try:
+                    methode, ziel, version = zeilen[0].split(" ", 2)
+                except ValueError:
+                    return
+                header = {}
+                for zeile in zeilen[1:]:
+                    name, _, wert = zeile.partition(":")
+                    header[name.strip().lower()] = wert.strip()
+                laenge = int(header.get("content-length") or 0)
+                if laenge > API_MAX_BODY_BYTES:
+                    status, antwort, treffer = 413, _json({"fehler": "Anfrage zu groß"}), False
+                    offen = False
+                else:
+                    rumpf = await reader.readexactly(laenge) if laenge else b""
+                    try:
+                        status, antwort, treffer = await self.handle(methode, ziel, rumpf)
+                    except Exception as fehler:  # Verbindung nicht wegen eines Einzelfehlers schließen
+                        status, antwort, treffer = 500, _json({"fehler": repr(fehler)}), False
+                    verbindung = header.get("connection", "").lower()
+                    offen = verbindung != "close" and (version == "HTTP/1.1" or verbindung == "keep-alive")
+                writer.write(
+                    f"HTTP/1.1 {status} {_STATUS_TEXT[status]}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(antwort)}\r\n"
+                    f"X-Cache: {'HIT' if treffer else 'MISS'}\r\n"
+                    f"Connection: {'keep-alive' if offen else 'close'}\r\n\r\n".encode("latin-1") + antwort
+                )
+                await writer.drain()
+                if not offen:
+                    return
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8600):
+        """Startet den Server und bedient Anfragen, bis die Schleife beendet wird."""
+        server = await asyncio.start_server(self.serve_connection, host, port, limit=API_MAX_HEADER_BYTES)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if self.pool is not None:
+                self.pool.shutdown(cancel_futures=True)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1", help="Adresse (Standard: nur lokal)")
+    parser.add_argument("--port", type=int, default=8600, help="Port")
+    parser.add_argument("--prozesse", type=int, default=os.cpu_count() or 1,
+                        help="Worker-Prozesse für große Batches (0 = ohne Pool)")
+    args = parser.parse_args()
+    print(f"JSON-API auf http://{args.host}:{args.port}/v1/modelle", flush=True)
+    try:
+        asyncio.run(ApiServer(args.prozesse).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""
+Statische Assets der App: Stylesheet, lokal abgelegte Originalbilder und deren responsive Varianten.
+
+Die Titelbilder werden nicht von Drittanbietern geladen, sondern als Varianten in mehreren
+Breiten und Formaten (AVIF, WebP, JPEG als Rückfall) aus ``static/img`` ausgeliefert.
+Originale (``assets/originals``), Varianten und Manifest liegen im Repository; ein frischer
+Checkout zeigt die Bilder ohne Internetzugang und ohne Build-Schritt.
+
+Die eingecheckten Originale sind schlichte, lokal gezeichnete Titelgrafiken. Die Fotos der
+Quell-URLs (:data:`IMAGE_SOURCES`) ersetzen sie bei Bedarf einmalig mit Internetzugang::
+
+    python -m assets fetch --ersetzen   # Originale von den Quell-URLs nach assets/originals laden
+    python -m assets build              # Varianten + Manifest nach static/img schreiben (Pillow)
+
+Streamlit liefert ``static/`` unter ``app/static/`` aus (``server.enableStaticServing``
+in ``.streamlit/config.toml``). Die Dateinamen enthalten einen Hash des Inhalts; ein
+geändertes Bild bekommt also eine neue URL.
+
+Fehlt ein Bild im Manifest, wirft :func:`picture_html` einen :class:`FileNotFoundError`;
+Bilder werden nie von den Quell-URLs nachgeladen.
+"""
+
+import argparse
+import functools
+import hashlib
+import html
+import io
+import json
+import mimetypes
+import os
+import urllib.request
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+ORIGINALS_DIR = os.path.join(APP_DIR, "assets", "originals")
+STATIC_DIR = os.path.join(APP_DIR, "static")
+STATIC_IMG_DIR = os.path.join(STATIC_DIR, "img")
+
+# URL-Pfad, unter dem Streamlit das Verzeichnis ``static/`` ausliefert (relativ zur App)
+STATIC_URL = "app/static"
+
+# Stylesheet der App, relativ zu ``static/``
+STYLESHEET = "app.css"
+
+# Quell-URLs der Originale (Unsplash-Lizenz); nur für ``fetch``, nie im Browser
+IMAGE_SOURCES = {
+    "schachbrett": "https://i.postimg.cc/gjrmYdF2/pierre-bamin-Ldilh-Dx3sk-unsplash.jpg",
+    "zinseszins": "https://i.postimg.cc/ZRR1Ncf3/andre-taissin-5OUMf1Mr5p-U-unsplash.jpg",
+    "viral": "https://i.postimg.cc/76jwYdxh/fusion-medical-animation-rnr8D3FNUNY-unsplash.jpg",
+    "saas": "https://i.postimg.cc/BbWfGFgr/austin-distel-rxp-Th-Owu-Vg-E-unsplash.jpg",
+    "hero": "https://images.unsplash.com/photo-1545239351-1141bd82e8a6?auto=format&fit=crop&w=1600&q=80"
+}
+
+# Zielbreiten in Pixeln (größer als das Original wird nicht hochskaliert)
+WIDTHS = (480, 960, 1600)
+
+# Formate in Reihenfolge der Browser-Präferenz: (Format, Pillow-Format, Speicheroptionen)
+FORMATS = (
+    ("avif", "AVIF", {"quality": 50}),
+    ("webp", "WEBP", {"quality": 75, "method": 6}),
+    ("jpg", "JPEG", {"quality": 80, "optimize": True, "progressive": True}),
+)
+
+_MANIFEST = "manifest.json"
+
+# Ältere Python-Versionen kennen den MIME-Typ für AVIF nicht; Streamlit ermittelt ihn über mimetypes
+mimetypes.add_type("image/avif", ".avif")
+mimetypes.add_type("image/webp", ".webp")
+
+_manifest = None
+
+# ------------------------------------------------------
+# Build-Schritte (Build Steps)
+# ------------------------------------------------------
+
+def fetch(ziel: str = ORIGINALS_DIR, ersetzen: bool = False) -> list[str]:
+    """
+    Lädt Originale von :data:`IMAGE_SOURCES` nach ``ziel`` (einmalig, benötigt Internet).
+
+    Args:
+        ziel (str): Verzeichnis für die Originale.
+        ersetzen (bool): Vorhandene Originale (z.B. die eingecheckten Titelgrafiken) überschreiben;
+                         sonst werden nur fehlende geladen.
+
+    Returns:
+        list[str]: Schlüssel der neu heruntergeladenen Bilder.
+    """
+    os.makedirs(ziel, exist_ok=True)
+    neu = []
+    for name, url in IMAGE_SOURCES.items():
+        pfad = os.path.join(ziel, f"{name}.jpg")
+        if os.path.exists(pfad) and not ersetzen:
+            continue
+        with urllib.request.urlopen(url, timeout=60) as antwort:
+            daten = antwort.read()
+        with open(pfad + ".tmp", "wb") as datei:
+            datei.write(daten)
+        os.replace(pfad + ".tmp", pfad)
+        neu.append(name)
+    return neu
+
+def build(quelle: str = ORIGINALS_DIR, ziel: str = STATIC_IMG_DIR) -> dict:
+    """
+    Erzeugt für jedes Original alle Breiten und Formate mit Inhalts-Hash im Dateinamen,
+    schreibt das Manifest und entfernt nicht mehr referenzierte Varianten.
+
+    Args:
+        quelle (str): Verzeichnis der Originale (Dateiname ohne Endung = Bildschlüssel).
+        ziel (str): Ausgabeverzeichnis unterhalb von ``static/``.
+
+    Returns:
+        dict: Das geschriebene Manifest.
+    """
+    from PIL import Image, ImageOps
+
+    os.makedirs(ziel, exist_ok=True)
+    manifest = {}
+    for datei in sorted(os.listdir(quelle)):
+        name, _ = os.path.splitext(datei)
+        with Image.open(os.path.join(quelle, datei)) as original:
+            bild = ImageOps.exif_transpose(original).convert("RGB")
+        breiten = sorted({min(breite, bild.width) for breite in WIDTHS})
+        eintrag = {"breite": bild.width, "hoehe": bild.height, "varianten": {}}
+        for endung, pil_format, optionen in FORMATS:
+            varianten = []
+            for breite in breiten:
+                skaliert = bild.resize((breite, round(bild.height * breite / bild.width)), Image.Resampling.LANCZOS)
+                puffer = io.BytesIO()
+                skaliert.save(puffer, pil_format, **optionen)
+                daten = puffer.getvalue()
+                dateiname = f"{name}-{breite}w.{hashlib.sha256(daten).hexdigest()[:12]}.{endung}"
+                with open(os.path.join(ziel, dateiname), "wb") as ausgabe:
+                    ausgabe.write(daten)
+                varianten.append([breite, dateiname, len(daten)])
+            eintrag["varianten"][endung] = varianten
+        manifest[name] = eintrag
+
+    referenziert = {v[1] for e in manifest.values() for varianten in e["varianten"].values() for v in varianten}
+    for datei in os.listdir(ziel):
+        if datei != _MANIFEST and datei not in referenziert:
+            os.remove(os.path.join(ziel, datei))
+    with open(os.path.join(ziel, _MANIFEST), "w", encoding="utf-8") as ausgabe:
+        json.dump(manifest, ausgabe, indent=2)
+    return manifest
+
+# ------------------------------------------------------
+# Einbindung in die App (Rendering)
+# ------------------------------------------------------
+
+def load_manifest(verzeichnis: str = STATIC_IMG_DIR) -> dict:
+    """Liest das Varianten-Manifest (einmal pro Prozess); leeres Dict, wenn noch kein Build existiert."""
+    global _manifest
+    if _manifest is None:
+        try:
+            with open(os.path.join(verzeichnis, _MANIFEST), encoding="utf-8") as datei:
+                _manifest = json.load(datei)
+        except (OSError, ValueError):
+            _manifest = {}
+    return _manifest
+
+def picture_html(name: str, alt: str = "", sizes: str = "100vw", eager: bool = False) -> str:
+    """
+    Erzeugt ein ``<picture>``-Element, aus dem der Browser Format (AVIF vor WebP vor JPEG)
+    und Breite passend zu Bildschirm und Pixeldichte selbst auswählt.
+
+    Args:
+        name (str): Bildschlüssel, z.B. "hero".
+        alt (str): Alternativtext.
+        sizes (str): Angezeigte Breite als ``sizes``-Attribut, z.B. "(min-width: 768px) 45vw, 100vw".
+        eager (bool): Sofort laden (Bild im ersten Viewport), sonst erst bei Sichtbarkeit.
+
+    Returns:
+        str: HTML-Schnipsel.
+
+    Raises:
+        FileNotFoundError: Wenn für das Bild noch keine Varianten gebaut wurden.
+    """
+    laden = 'loading="eager" fetchpriority="high"' if eager else 'loading="lazy"'
+    alt = html.escape(alt, quote=True)
+    eintrag = load_manifest().get(name)
+    if eintrag is None:
+        raise FileNotFoundError(
+            f"Keine Bildvarianten für {name!r} in {STATIC_IMG_DIR}; "
+            "'python -m assets build' ausführen."
+        )
+
+    def srcset(endung: str) -> str:
+        return ", ".join(f"{STATIC_URL}/img/{datei} {breite}w" for breite, datei, _ in eintrag["varianten"][endung])
+
+    quellen = "".join(
+        f'<source type="image/{endung}" srcset="{srcset(endung)}" sizes="{sizes}">'
+        for endung, _, _ in FORMATS if endung != "jpg"
+    )
+    # Für Browser ohne srcset-Unterstützung die mittlere Breite
+    jpg = eintrag["varianten"]["jpg"]
+    rueckfall = jpg[len(jpg) // 2][1]
+    return (
+        f'<picture>{quellen}'
+        f'<img src="{STATIC_URL}/img/{rueckfall}" srcset="{srcset("jpg")}" sizes="{sizes}" '
+        f'width="{eintrag["breite"]}" height="{eintrag["hoehe"]}" alt="{alt}" {laden} decoding="async">'
+        f'</picture>'
+    )
+
+@functools.lru_cache(maxsize=None)
+def stylesheet_html(static_serving: bool = True) -> str:
+    """
+    Bindet das Stylesheet der App ein. Mit statischer Auslieferung als ``<link>`` mit
+    Inhalts-Hash im Query-String (der Browser cached die Datei und lädt sie nur nach einer
+    Änderung neu), sonst als ``<style>``-Block. Die Datei wird einmal pro Prozess gelesen.
+
+    Args:
+        static_serving (bool): Ob Streamlit ``static/`` ausliefert (``server.enableStaticServing``).
+
+    Returns:
+        str: HTML-Schnipsel für ``st.markdown(..., unsafe_allow_html=True)``.
+    """
+    with open(os.path.join(STATIC_DIR, STYLESHEET), encoding="utf-8") as datei:
+        css = datei.read()
+    if not static_serving:
+        return f"<style>{css}</style>"
+    version = hashlib.sha256(css.encode("utf-8")).hexdigest()[:12]
+    return f'<link rel="stylesheet" href="{STATIC_URL}/{STYLESHEET}?v={version}">'
+
+def main():
+    parser = argparse.ArgumentParser(description="Bild-Assets der App herunterladen und optimieren.")
+    parser.add_argument("schritt", choices=["fetch", "build"], help="fetch: Originale laden, build: Varianten erzeugen")
+    parser.add_argument("--ersetzen", action="store_true", help="fetch: vorhandene Originale überschreiben")
+    args = parser.parse_args()
+    if args.schritt == "fetch":
+        neu = fetch(ersetzen=args.ersetzen)
+        print(f"{len(neu)} Originale heruntergeladen nach {ORIGINALS_DIR}")
+        return
+    manifest = build()
+    for name, eintrag in manifest.items():
+        groessen = ", ".join(f"{endung}: {sum(v[2] for v in varianten) / 1e3:.0f} KB"
+                             for endung, varianten in eintrag["varianten"].items())
+        print(f"{name:<12} {eintrag['breite']}×{eintrag['hoehe']}  {groessen}")
+
+if __name__ == "__main__":
+    main()
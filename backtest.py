@@ -0,0 +1,223 @@
+"""
+Backtest des Sparplans (Tab 2) gegen historische Marktrenditen.
+
+Statt eines konstanten Zinssatzes läuft Laras Sparplan über jedes mögliche historische
+Startdatum einer Renditereihe (rollierende Fenster). Tim bekommt wie in der Engine die
+Erträge seines Startkapitals ausgezahlt und spart linear.
+
+Die Renditereihen liegen als CSV im Verzeichnis ``EXPO_RETURNS_DIR`` (Standard: ``data``
+neben der App), eine Zeile je Periode::
+
+    # Beschreibung der Reihe (erste Kommentarzeile)
+    datum,rendite
+    1928,43.81        (jährlich: JJJJ, Rendite in Prozent)
+    1928-01,1.25      (monatlich: JJJJ-MM)
+
+Geparste Reihen werden als ``.npz`` im Cache-Verzeichnis ``EXPO_RETURNS_CACHE_DIR``
+(Standard: ``.returns_cache``) abgelegt und nur neu eingelesen, wenn sich die CSV ändert.
+
+Die Auswertung ist vollständig vektorisiert: Die Fenster sind Sichten auf die Reihe
+(``sliding_window_view``, ohne Kopie), die Vermögensverläufe ergeben sich aus kumulierten
+Produkten und Summen entlang der Fensterachse.
+"""
+
+import csv
+import os
+
+import numpy as np
+
+DATA_DIR = os.environ.get("EXPO_RETURNS_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data"))
+RETURNS_CACHE_DIR = os.environ.get(
+    "EXPO_RETURNS_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".returns_cache")
+)
+
+# Dateinamen der Renditereihen: renditen_<name>.csv
+DATEI_PRAEFIX = "renditen_"
+
+# ------------------------------------------------------
+# Renditereihen laden (Loading Return Series)
+# ------------------------------------------------------
+
+def _csv_path(name: str, verzeichnis: str) -> str:
+    return os.path.join(verzeichnis, f"{DATEI_PRAEFIX}{name}.csv")
+
+def available_series(verzeichnis: str = DATA_DIR) -> dict:
+    """
+    Listet die verfügbaren Renditereihen.
+
+    Args:
+        verzeichnis (str): Verzeichnis der CSV-Dateien.
+
+    Returns:
+        dict: Name -> Beschreibung (erste Kommentarzeile der CSV).
+    """
+    reihen = {}
+    if not os.path.isdir(verzeichnis):
+        return reihen
+    for datei in sorted(os.listdir(verzeichnis)):
+        if datei.startswith(DATEI_PRAEFIX) and datei.endswith(".csv"):
+            name = datei[len(DATEI_PRAEFIX):-len(".csv")]
+            with open(os.path.join(verzeichnis, datei), encoding="utf-8") as f:
+                erste_zeile = f.readline().strip()
+            reihen[name] = erste_zeile.lstrip("#").strip() if erste_zeile.startswith("#") else name
+    return reihen
+
+def parse_csv(pfad: str) -> dict:
+    """
+    Liest eine Renditereihe aus einer CSV-Datei (Format siehe Modulbeschreibung).
+
+    Args:
+        pfad (str): Pfad der CSV-Datei.
+
+    Returns:
+        dict: "renditen" (Dezimalzahlen, float64), "perioden_pro_jahr" (1 oder 12), "startjahr"
+        (Beginn der ersten Periode als Kommazahl) und "beschreibung".
+
+    Raises:
+        ValueError: Bei gemischten Datumsformaten, Lücken oder fehlenden Werten.
+    """
+    with open(pfad, encoding="utf-8") as f:
+        zeilen = f.read().splitlines()
+    kommentare = [z.lstrip("#").strip() for z in zeilen if z.startswith("#")]
+    daten = list(csv.DictReader(z for z in zeilen if z.strip() and not z.startswith("#")))
+    if not daten:
+        raise ValueError(f"{pfad}: keine Renditen gefunden.")
+
+    monatlich = "-" in daten[0]["datum"]
+    perioden = []
+    for zeile in daten:
+        datum = zeile["datum"].strip()
+        if ("-" in datum) != monatlich:
+            raise ValueError(f"{pfad}: jährliche und monatliche Daten gemischt ({datum}).")
+        jahr, _, monat = datum.partition("-")
+        perioden.append(int(jahr) * 12 + int(monat) - 1 if monatlich else int(jahr))
+    if np.any(np.diff(perioden) != 1):
+        raise ValueError(f"{pfad}: Die Perioden müssen lückenlos aufeinander folgen.")
+
+    perioden_pro_jahr = 12 if monatlich else 1
+    return {
+        "renditen": np.array([float(zeile["rendite"]) for zeile in daten]) / 100,
+        "perioden_pro_jahr": perioden_pro_jahr,
+        "startjahr": perioden[0] / perioden_pro_jahr,
+        "beschreibung": kommentare[0] if kommentare else os.path.basename(pfad),
+    }
+
+def load_series(name: str, verzeichnis: str = DATA_DIR, cache_verzeichnis: str = RETURNS_CACHE_DIR) -> dict:
+    """
+    Lädt eine Renditereihe aus dem Binär-Cache bzw. parst die CSV und legt sie dort ab.
+    Der Cache-Schlüssel enthält Änderungszeit und Größe der CSV.
+
+    Args:
+        name (str): Name der Reihe (siehe :func:`available_series`).
+        verzeichnis (str): Verzeichnis der CSV-Dateien.
+        cache_verzeichnis (str): Verzeichnis des Binär-Caches.
+
+    Returns:
+        dict: Wie :func:`parse_csv`.
+    """
+    pfad = _csv_path(name, verzeichnis)
+    status = os.stat(pfad)
+    cache_pfad = os.path.join(cache_verzeichnis, f"{name}_{status.st_mtime_ns}_{status.st_size}.npz")
+    if os.path.exists(cache_pfad):
+        with np.load(cache_pfad) as gespeichert:
+            return {
+                "renditen": gespeichert["renditen"],
+                "perioden_pro_jahr": int(gespeichert["perioden_pro_jahr"]),
+                "startjahr": float(gespeichert["startjahr"]),
+                "beschreibung": str(gespeichert["beschreibung"]),
+            }
+
+    reihe = parse_csv(pfad)
+    os.makedirs(cache_verzeichnis, exist_ok=True)
+    # Temporäre Datei, damit parallele Sitzungen nie eine halb geschriebene Datei lesen
+    temporaer = f"{cache_pfad}.{os.getpid()}.tmp.npz"
+    np.savez(temporaer, **reihe)
+    os.replace(temporaer, cache_pfad)
+    return reihe
+
+# ------------------------------------------------------
+# Rollierende Fenster (Rolling Windows)
+# ------------------------------------------------------
+
+def rolling_windows(renditen: np.ndarray, perioden_pro_jahr: int, startkapital: float, sparrate: float,
+                    laufzeit: int, vorschuessig: bool = True, kosten: float = 0.0, steuer: float = 0.0) -> dict:
+    """
+    Sparplan über alle Fenster von ``laufzeit`` Jahren einer Renditereihe.
+
+    Lara zahlt je Periode ``sparrate * 12 / perioden_pro_jahr`` ein und lässt alles im Markt;
+    ihr Vermögen nach ``t`` Perioden ist ``G_t · (S + c · Σ 1 / G_j)`` mit dem kumulierten
+    Wachstum ``G`` des Fensters. Tim lässt nur sein Startkapital investiert und bekommt dessen
+    Periodenerträge ausgezahlt (Verluste schießt er nach), seine Sparraten bleiben unverzinst.
+    Steuer und Kosten wie in :func:`engine.compound_interest_final`.
+
+    Args:
+        renditen (np.ndarray): Periodenrenditen als Dezimalzahlen.
+        perioden_pro_jahr (int): 1 (jährlich) oder 12 (monatlich).
+        startkapital (float): Startkapital in €.
+        sparrate (float): Monatliche Sparrate in €.
+        laufzeit (int): Laufzeit in Jahren.
+        vorschuessig (bool): Einzahlung zu Beginn (True) oder am Ende (False) jeder Periode.
+        kosten (float): Jährliche Kosten in Prozent des Kapitals.
+        steuer (float): Steuersatz auf Kapitalerträge in Prozent.
+
+    Returns:
+        dict: "fenster" (Index der ersten Periode je Fenster), "endkapital_lara", "endkapital_tim",
+        "rendite_pa" (annualisierte Marktrendite je Fenster), "pfade_lara" (Vermögen zu jedem
+        vollen Jahr, Form ``(fenster, laufzeit + 1)``) und "eigenleistung".
+    """
+    laenge = laufzeit * perioden_pro_jahr
+    renditen = np.asarray(renditen, dtype=float) - kosten / 100 / perioden_pro_jahr
+    if laenge > len(renditen):
+        raise ValueError(f"Die Reihe umfasst nur {len(renditen) / perioden_pro_jahr:g} Jahre.")
+
+    # Alle Fenster als Sicht (fenster, laenge) auf die Reihe, ohne Kopie
+    fenster = np.lib.stride_tricks.sliding_window_view(renditen, laenge)
+    wachstum = np.cumprod(1 + fenster, axis=1)
+    einzahlung = sparrate * 12 / perioden_pro_jahr
+    # Vorschüssig wird die Einzahlung der Periode t schon mit deren Rendite verzinst
+    bezug = np.concatenate([np.ones((len(fenster), 1)), wachstum[:, :-1]], axis=1) if vorschuessig else wachstum
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vermoegen = wachstum * (startkapital + einzahlung * np.cumsum(1 / bezug, axis=1))
+
+    eigenleistung = startkapital + sparrate * 12 * laufzeit
+    steuersatz = steuer / 100
+    endkapital_lara = vermoegen[:, -1]
+    endkapital_lara = endkapital_lara - steuersatz * np.maximum(endkapital_lara - eigenleistung, 0)
+
+    # Tim: Erträge des Startkapitals je Periode, versteuert nur die positiven Auszahlungen
+    ertraege = startkapital * fenster
+    endkapital_tim = eigenleistung + ertraege.sum(axis=1) - steuersatz * np.maximum(ertraege, 0).sum(axis=1)
+
+    jahresende = np.arange(perioden_pro_jahr - 1, laenge, perioden_pro_jahr)
+    return {
+        "fenster": np.arange(len(fenster)),
+        "endkapital_lara": endkapital_lara,
+        "endkapital_tim": endkapital_tim,
+        "rendite_pa": wachstum[:, -1] ** (1 / laufzeit) - 1,
+        "pfade_lara": np.concatenate([np.full((len(fenster), 1), float(startkapital)), vermoegen[:, jahresende]],
+                                     axis=1),
+        "eigenleistung": eigenleistung,
+    }
+
+def run(name: str, startkapital: float, sparrate: float, laufzeit: int, vorschuessig: bool = True,
+        kosten: float = 0.0, steuer: float = 0.0) -> dict:
+    """
+    Backtest des Sparplans gegen die Renditereihe ``name`` (siehe :func:`rolling_windows`).
+
+    Args:
+        name (str): Name der Reihe (siehe :func:`available_series`).
+        Sonst siehe :func:`rolling_windows`.
+
+    Returns:
+        dict: Ergebnis von :func:`rolling_windows` plus "startjahre" (Beginn jedes Fensters als
+        Kommazahl), "perioden_pro_jahr" und "beschreibung" der Reihe.
+    """
+    reihe = load_series(name)
+    ergebnis = rolling_windows(reihe["renditen"], reihe["perioden_pro_jahr"], startkapital, sparrate, laufzeit,
+                               vorschuessig, kosten, steuer)
+    return {
+        **ergebnis,
+        "startjahre": reihe["startjahr"] + ergebnis["fenster"] / reihe["perioden_pro_jahr"],
+        "perioden_pro_jahr": reihe["perioden_pro_jahr"],
+        "beschreibung": reihe["beschreibung"],
+    }
@@ -0,0 +1,310 @@
+"""
+Batch-Runner: wertet beliebig viele Szenarien einer Geschichte außerhalb der App aus
+(z.B. zum Korrigieren von Übungsaufgaben oder für Vorlesungsmaterial)::
+
+    python -m batch zinseszins szenarien.csv --ausgabe ergebnisse.parquet
+    python -m batch viral szenarien.jsonl --ausgabe - --format deutsch > ergebnisse.csv
+
+Die Spalten der Eingabe heißen wie die Parameter der Engine-Funktion der Geschichte
+(siehe :data:`BATCH_STORIES`, z.B. ``startkapital, sparrate, laufzeit, zinssatz`` für
+``engine.compound_interest_final``). Fehlende optionale Parameter erhalten deren
+Standardwert, alle weiteren Spalten (z.B. eine Matrikelnummer) werden unverändert
+durchgereicht. ``perioden_pro_jahr`` darf auch als Name ("monatlich", siehe
+``engine.ZINSPERIODEN``) angegeben werden.
+
+Die Eingabe wird blockweise gelesen (CSV oder JSON Lines, auch komprimiert oder ``-``
+für stdin) und jeder Block mit einem einzigen vektorisierten Engine-Aufruf berechnet.
+Die Blöcke laufen in einem Prozesspool; es sind höchstens zwei Blöcke je Prozess
+unterwegs, und die Ergebnisse werden in Eingabereihenfolge sofort als CSV oder Parquet
+geschrieben. Der Speicherbedarf hängt so nur von der Blockgröße ab, nicht von der
+Anzahl der Zeilen. Am Ende wird der Durchsatz (Szenarien pro Sekunde) auf stderr ausgegeben.
+"""
+
+import argparse
+import functools
+import inspect
+import os
+import sys
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import engine
+from formatting import format_number, format_numbers, human_numbers
+
+# Zeilen pro Block (ein Engine-Aufruf je Block)
+BLOCKGROESSE = 100_000
+
+# ------------------------------------------------------
+# Geschichten (Stories)
+# Kennzahlen: Name -> (Dezimalstellen, mit Suffix "Mio." usw. lesbar formatierbar)
+# ------------------------------------------------------
+
+def _chessboard(feld_nummer, faktor=2.0) -> dict:
+    """Körnerzahlen je Feld (float64, ``inf`` jenseits von 10^308) samt ihrer log10-Werte."""
+    return {**engine.chessboard_grains(feld_nummer, faktor), **engine.chessboard_log10(feld_nummer, faktor)}
+
+BATCH_STORIES = {
+    "schachbrett": {
+        "model": _chessboard,
+        "kennzahlen": {
+            "koerner_auf_feld": (0, True),
+            "koerner_gesamt": (0, True),
+            "gewicht_tonnen": (2, True),
+            "flaeche_m2": (2, True),
+            "log10_koerner_auf_feld": (4, False),
+            "log10_koerner_gesamt": (4, False),
+            "log10_gewicht_tonnen": (4, False),
+            "log10_flaeche_m2": (4, False),
+        },
+    },
+    "zinseszins": {
+        "model": engine.compound_interest_final,
+        "kennzahlen": {
+            "endkapital_lara": (2, True),
+            "endkapital_tim": (2, True),
+            "eigenleistung_kumuliert": (2, True),
+        },
+    },
+    "viral": {
+        "model": engine.viral_final,
+        "kennzahlen": {
+            "gesamt_personen_erreicht": (0, True),
+            "personen_letzte_welle": (0, True),
+            "anteil_letzte_welle_gesamt": (4, False),
+        },
+    },
+    "saas": {
+        "model": engine.saas_final,
+        "kennzahlen": {
+            "gesamt_mrr_exponentiell": (2, True),
+            "gesamt_mrr_linear": (2, True),
+            "kumulatives_wachstum_gesamt": (2, True),
+            "anteil_zuwachs_letzter_monat": (4, False),
+            "erforderliche_fte_am_ende": (1, True),
+            "zus_fte_benoetigt": (1, True),
+        },
+    },
+}
+
+# Ausgabeformate der Kennzahlen: Zahlen, deutsch formatiert (format_number) oder lesbar (human_number)
+FORMATE = ("roh", "deutsch", "lesbar")
+
+@functools.lru_cache(maxsize=None)
+def story_parameters(geschichte: str) -> dict:
+    """
+    Parameter der Engine-Funktion einer Geschichte (einmal pro Prozess ermittelt, nicht verändern).
+
+    Args:
+        geschichte (str): Schlüssel in :data:`BATCH_STORIES`.
+
+    Returns:
+        dict: Parametername -> Standardwert (``inspect.Parameter.empty`` für Pflichtparameter).
+    """
+    signatur = inspect.signature(BATCH_STORIES[geschichte]["model"])
+    return {name: parameter.default for name, parameter in signatur.parameters.items()}
+
+# ------------------------------------------------------
+# Auswertung je Block (Chunk Evaluation)
+# ------------------------------------------------------
+
+def _parameter(name: str, werte) -> np.ndarray:
+    """Wandelt Eingabewerte (Spalte oder Liste) in das Array um, das die Engine erwartet."""
+    werte = np.asarray(werte)
+    text = werte.dtype.kind in "OUS"
+    if name == "perioden_pro_jahr" and text:
+        werte = np.array([engine.ZINSPERIODEN.get(wert, wert) for wert in werte.tolist()], dtype=object)
+    elif name == "vorschuessig":
+        if text:
+            return np.isin(np.char.lower(np.char.strip(werte.astype(str))), ("true", "1", "ja", "periodenbeginn"))
+        return werte != 0
+    try:
+        return werte.astype(float)
+    except (TypeError, ValueError):
+        raise ValueError(f"Parameter '{name}' muss numerisch sein") from None
+
+def evaluate(geschichte: str, argumente: dict) -> dict:
+    """
+    Berechnet die Kennzahlen einer Geschichte für Parameter-Arrays (ein Eintrag je Szenario).
+
+    Args:
+        geschichte (str): Schlüssel in :data:`BATCH_STORIES`.
+        argumente (dict): Parametername -> Werte; weitere Schlüssel werden ignoriert, fehlende
+                          optionale Parameter erhalten den Standardwert der Engine.
+
+    Returns:
+        dict: Kennzahl -> Array (Reihenfolge wie in ``BATCH_STORIES[geschichte]["kennzahlen"]``).
+
+    Raises:
+        ValueError: Wenn Pflichtparameter fehlen oder Werte nicht numerisch sind.
+    """
+    story = BATCH_STORIES[geschichte]
+    parameter = story_parameters(geschichte)
+    fehlend = [name for name, standard in parameter.items()
+               if standard is inspect.Parameter.empty and name not in argumente]
+    if fehlend:
+        raise ValueError(f"Fehlende Parameter für '{geschichte}': {', '.join(fehlend)}")
+    werte = story["model"](**{name: _parameter(name, argumente[name]) for name in parameter if name in argumente})
+    return {name: werte[name] for name in story["kennzahlen"]}
+
+def format_column(werte: np.ndarray, dezimalstellen: int, lesbar: bool) -> list[str]:
+    """Formatiert eine Kennzahl spaltenweise; nicht darstellbare Werte (``inf``/``nan``) bleiben leer."""
+    texte = human_numbers(werte) if lesbar else format_numbers(werte, dezimalstellen)
+    return np.where(np.isfinite(werte), texte, "").tolist()
+
+def evaluate_chunk(geschichte: str, block: pd.DataFrame, format: str = "roh") -> pd.DataFrame:
+    """
+    Berechnet alle Kennzahlen für einen Block von Szenarien mit einem Engine-Aufruf.
+
+    Args:
+        geschichte (str): Schlüssel in :data:`BATCH_STORIES`.
+        block (pd.DataFrame): Eine Zeile je Szenario, Spalten wie die Engine-Parameter.
+        format (str): "roh" (Zahlen), "deutsch" (:func:`format_number`) oder "lesbar"
+                      (:func:`human_number`, Anteile und log10-Werte weiterhin per format_number).
+
+    Returns:
+        pd.DataFrame: Der Block mit angehängten Kennzahl-Spalten.
+
+    Raises:
+        ValueError: Wenn Pflichtparameter fehlen oder Werte nicht numerisch sind.
+    """
+    werte = evaluate(geschichte, {name: block[name].to_numpy() for name in block.columns})
+    ergebnis = {}
+    for name, (dezimalstellen, lesbar) in BATCH_STORIES[geschichte]["kennzahlen"].items():
+        spalte = np.broadcast_to(werte[name], (len(block),))
+        ergebnis[name] = spalte if format == "roh" else format_column(spalte, dezimalstellen, lesbar and format == "lesbar")
+    return pd.concat([block.reset_index(drop=True), pd.DataFrame(ergebnis)], axis=1)
+
+def run_batch(geschichte: str, bloecke: Iterable[pd.DataFrame], prozesse: int = 1,
+              format: str = "roh") -> Iterator[pd.DataFrame]:
+    """
+    Wertet die Blöcke der Reihe nach aus, bei ``prozesse > 1`` parallel in einem Prozesspool.
+    Es sind höchstens ``2 * prozesse`` Blöcke gleichzeitig unterwegs (begrenzter Speicher),
+    die Ergebnisse kommen in Eingabereihenfolge zurück.
+
+    Args:
+        geschichte (str): Schlüssel in :data:`BATCH_STORIES`.
+        bloecke (Iterable[pd.DataFrame]): Eingabeblöcke, z.B. aus :func:`read_scenarios`.
+        prozesse (int): Anzahl der Worker-Prozesse; 1 rechnet im aktuellen Prozess.
+        format (str): Ausgabeformat der Kennzahlen, siehe :func:`evaluate_chunk`.
+
+    Returns:
+        Iterator[pd.DataFrame]: Ergebnisblöcke.
+    """
+    if prozesse <= 1:
+        for block in bloecke:
+            yield evaluate_chunk(geschichte, block, format)
+        return
+    with ProcessPoolExecutor(prozesse) as pool:
+        offen = deque()
+        for block in bloecke:
+            offen.append(pool.submit(evaluate_chunk, geschichte, block, format))
+            if len(offen) >= 2 * prozesse:
+                yield offen.popleft().result()
+        while offen:
+            yield offen.popleft().result()
+
+# ------------------------------------------------------
+# Ein- und Ausgabe (Streaming I/O)
+# ------------------------------------------------------
+
+def _file_format(pfad: str, format: str = None) -> str:
+    """Dateiformat aus der Endung (Komprimierungsendungen wie ``.gz`` werden übersprungen)."""
+    if format:
+        return format
+    endungen = [endung.lower() for endung in os.path.basename(pfad).split(".")[1:]]
+    endungen = [endung for endung in endungen if endung not in ("gz", "bz2", "xz", "zst", "zip")]
+    return {"jsonl": "jsonl", "ndjson": "jsonl", "parquet": "parquet"}.get(endungen[-1] if endungen else "", "csv")
+
+def read_scenarios(pfad: str, blockgroesse: int = BLOCKGROESSE, format: str = None) -> Iterator[pd.DataFrame]:
+    """
+    Liest Szenarien blockweise, ohne die ganze Datei in den Speicher zu laden.
+
+    Args:
+        pfad (str): CSV- oder JSON-Lines-Datei (auch ``.gz`` usw.), ``-`` für stdin.
+        blockgroesse (int): Zeilen pro Block.
+        format (str): "csv" oder "jsonl"; ``None`` ermittelt das Format aus der Endung.
+
+    Returns:
+        Iterator[pd.DataFrame]: Blöcke mit höchstens ``blockgroesse`` Zeilen.
+    """
+    quelle = sys.stdin if pfad == "-" else pfad
+    if _file_format(pfad, format) == "jsonl":
+        leser = pd.read_json(quelle, lines=True, chunksize=blockgroesse, dtype=False, convert_dates=False)
+    else:
+        leser = pd.read_csv(quelle, chunksize=blockgroesse)
+    with leser:
+        yield from leser
+
+def write_results(bloecke: Iterable[pd.DataFrame], ziel: str, format: str = None) -> int:
+    """
+    Schreibt Ergebnisblöcke fortlaufend als CSV oder Parquet (eine Row Group je Block).
+
+    Args:
+        bloecke (Iterable[pd.DataFrame]): Ergebnisblöcke, z.B. aus :func:`run_batch`.
+        ziel (str): Ausgabedatei, ``-`` für CSV auf stdout.
+        format (str): "csv" oder "parquet"; ``None`` ermittelt das Format aus der Endung.
+
+    Returns:
+        int: Anzahl der geschriebenen Zeilen.
+    """
+    zeilen = 0
+    if ziel != "-" and _file_format(ziel, format) == "parquet":
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Für die Parquet-Ausgabe wird pyarrow benötigt (pip install pyarrow).")
+        schreiber = None
+        try:
+            for block in bloecke:
+                tabelle = pa.Table.from_pandas(block, preserve_index=False)
+                if schreiber is None:
+                    schreiber = pq.ParquetWriter(ziel, tabelle.schema)
+                schreiber.write_table(tabelle.cast(schreiber.schema))
+                zeilen += len(block)
+        finally:
+            if schreiber is not None:
+                schreiber.close()
+        return zeilen
+
+    ausgabe = sys.stdout if ziel == "-" else open(ziel, "w", newline="", encoding="utf-8")
+    try:
+        for block in bloecke:
+            block.to_csv(ausgabe, header=zeilen == 0, index=False)
+            zeilen += len(block)
+    finally:
+        if ausgabe is not sys.stdout:
+            ausgabe.close()
+    return zeilen
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("geschichte", choices=list(BATCH_STORIES), help="Modell, mit dem gerechnet wird")
+    parser.add_argument("eingabe", help="CSV- oder JSON-Lines-Datei mit einem Szenario je Zeile, - für stdin")
+    parser.add_argument("--ausgabe", default="-", help="CSV- oder Parquet-Datei, - für CSV auf stdout (Standard)")
+    parser.add_argument("--eingabeformat", choices=["csv", "jsonl"], help="Format der Eingabe (Standard: aus der Endung)")
+    parser.add_argument("--ausgabeformat", choices=["csv", "parquet"], help="Format der Ausgabe (Standard: aus der Endung)")
+    parser.add_argument("--format", choices=FORMATE, default="roh",
+                        help="Kennzahlen als Zahlen (roh), deutsch formatiert oder lesbar mit Mio./Mrd.")
+    parser.add_argument("--blockgroesse", type=int, default=BLOCKGROESSE, help="Zeilen pro Block")
+    parser.add_argument("--prozesse", type=int, default=os.cpu_count() or 1, help="Worker-Prozesse (1 = ohne Pool)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    bloecke = read_scenarios(args.eingabe, args.blockgroesse, args.eingabeformat)
+    try:
+        zeilen = write_results(run_batch(args.geschichte, bloecke, args.prozesse, args.format),
+                               args.ausgabe, args.ausgabeformat)
+    except ValueError as fehler:
+        parser.error(str(fehler))
+    dauer = time.perf_counter() - start
+    print(f"{format_number(zeilen)} Szenarien in {format_number(dauer, 2)} s "
+          f"({format_number(zeilen / dauer if dauer else 0)} Szenarien/s)", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+"""
+Mess- und Lastwerkzeuge für die App (Benchmarks & Measurement Tools).
+
+Die Skripte werden aus dem Projektverzeichnis als Module gestartet, z.B.
+``python -m benchmarks.tab_reruns``.
+"""
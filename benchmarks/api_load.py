@@ -0,0 +1,262 @@
+"""
+Lasttest für die JSON-API (``python -m api``): Durchsatz und Latenzverteilung für
+typische Anfragemuster sowie ein Abgleich der Werte mit den Funktionen der App.
+
+Aufruf::
+
+    python -m benchmarks.api_load [--url http://127.0.0.1:8600] [--dauer 10]
+                                  [--verbindungen 32] [--min-rps 3000] [--json report.json]
+
+Ohne ``--url`` wird ein lokaler API-Server gestartet. Gemessen werden nacheinander:
+
+- ``cache_treffer``: Standardeinstellungen der App als GET (fast nur Cache-Treffer),
+- ``einzeln``: jedes Mal neue Parameter als GET (Berechnung in der Ereignisschleife),
+- ``batch_1000``: POST mit je 1000 Szenarien (Berechnung im Prozesspool).
+
+Das Skript endet mit Exit-Code 1, wenn ein Wert von der App abweicht oder
+``cache_treffer`` weniger als ``--min-rps`` Anfragen pro Sekunde schafft.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import math
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+import urllib.parse
+import urllib.request
+
+import engine
+import lookup
+from benchmarks.st_client import free_port, run
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Standardeinstellungen der App je Geschichte (wie die Slider beim ersten Aufruf)
+APP_DEFAULTS = {
+    "schachbrett": {"feld_nummer": 32, "faktor": 2.0},
+    "zinseszins": {"startkapital": 5_000, "sparrate": 400, "laufzeit": 25, "zinssatz": 7.0},
+    "viral": {"starter_personen": 50, "multiplikator": 1.7, "anzahl_wellen": 15},
+    "saas": {"start_mrr": 25_000, "monatliche_wachstumsrate": 12.0, "monate_planungszeitraum": 36,
+             "lineares_ziel_delta_mrr": 10_000, "team_aktuelle_fte": 12, "mrr_pro_fte_produktivitaet": 12_000},
+}
+
+# Funktionen, mit denen die App die Kennzahlen berechnet (siehe exponential.py)
+APP_FUNCTIONS = {
+    "zinseszins": lookup.tabulated(engine.compound_interest_final),
+    "viral": lookup.tabulated(engine.viral_final),
+    "saas": lookup.tabulated(engine.saas_final),
+}
+
+@contextlib.contextmanager
+def api_server(prozesse: int = None, timeout: float = 30):
+    """
+    Startet ``python -m api`` in einem Unterprozess und liefert die Basis-URL.
+
+    Args:
+        prozesse (int): Worker-Prozesse des Servers; standardmäßig dessen Vorgabe.
+        timeout (float): Maximale Wartezeit auf den Health-Check in Sekunden.
+
+    Yields:
+        str: Basis-URL.
+    """
+    port = free_port()
+    befehl = [sys.executable, "-m", "api", "--port", str(port)]
+    if prozesse is not None:
+        befehl += ["--prozesse", str(prozesse)]
+    prozess = subprocess.Popen(befehl, cwd=PROJECT_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    try:
+        ende = time.monotonic() + timeout
+        while True:
+            try:
+                with urllib.request.urlopen(url + "/health", timeout=1):
+                    break
+            except OSError:
+                if time.monotonic() > ende or prozess.poll() is not None:
+                    raise RuntimeError("API-Server ist nicht gestartet")
+                time.sleep(0.1)
+        yield url
+    finally:
+        prozess.terminate()
+        prozess.wait(timeout=10)
+
+# ------------------------------------------------------
+# Anfragemuster (Request Mixes)
+# ------------------------------------------------------
+
+def _get(geschichte: str, parameter: dict) -> tuple:
+    return "GET", f"/v1/{geschichte}?{urllib.parse.urlencode(parameter)}", b""
+
+def _post(geschichte: str, szenarien: list) -> tuple:
+    return "POST", f"/v1/{geschichte}", json.dumps({"szenarien": szenarien}).encode()
+
+def mix_cache_hits(rng: random.Random):
+    """Immer dieselben Standardeinstellungen (nach der ersten Anfrage je URL Cache-Treffer)."""
+    while True:
+        geschichte = rng.choice(list(APP_DEFAULTS))
+        yield _get(geschichte, APP_DEFAULTS[geschichte])
+
+def mix_single(rng: random.Random):
+    """Jede Anfrage mit neuem Startkapital bzw. neuen Startpersonen (Cache-Fehlzugriffe)."""
+    while True:
+        geschichte = rng.choice(list(APP_DEFAULTS))
+        parameter = dict(APP_DEFAULTS[geschichte])
+        schluessel = next(iter(parameter))
+        parameter[schluessel] = rng.randint(1, 10**9) if geschichte != "schachbrett" else rng.randint(1, 10**6)
+        yield _get(geschichte, parameter)
+
+def mix_batch(rng: random.Random, groesse: int = 1000):
+    """POST mit ``groesse`` zufälligen Zinseszins-Szenarien (je Anfrage ein geändertes Szenario)."""
+    szenarien = [
+        {"startkapital": rng.randint(0, 500_000), "sparrate": rng.randint(0, 5_000),
+         "laufzeit": rng.randint(5, 50), "zinssatz": rng.randint(0, 36) / 2}
+        for _ in range(groesse)
+    ]
+    while True:
+        szenarien[0]["startkapital"] = rng.randint(0, 10**9)
+        yield _post("zinseszins", szenarien)
+
+MIXES = {"cache_treffer": mix_cache_hits, "einzeln": mix_single, "batch_1000": mix_batch}
+
+# ------------------------------------------------------
+# Lastgenerator (Load Generator)
+# ------------------------------------------------------
+
+async def _request(reader, writer, host: str, methode: str, ziel: str, rumpf: bytes) -> tuple[int, bytes]:
+    writer.write(f"{methode} {ziel} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(rumpf)}\r\n\r\n".encode("latin-1") + rumpf)
+    kopf = await reader.readuntil(b"\r\n\r\n")
+    zeilen = kopf.decode("latin-1").split("\r\n")
+    laenge = next(int(z.split(":", 1)[1]) for z in zeilen if z.lower().startswith("content-length:"))
+    return int(zeilen[0].split(" ", 2)[1]), await reader.readexactly(laenge)
+
+async def _connection(url: str, anfragen, dauer: float, latenzen: list, fehler: list):
+    teile = urllib.parse.urlsplit(url)
+    reader, writer = await asyncio.open_connection(teile.hostname, teile.port, limit=2**24)
+    try:
+        ende = time.perf_counter() + dauer
+        while (start := time.perf_counter()) < ende:
+            methode, ziel, rumpf = next(anfragen)
+            status, _ = await _request(reader, writer, teile.netloc, methode, ziel, rumpf)
+            latenzen.append(time.perf_counter() - start)
+            if status != 200:
+                fehler.append(status)
+    finally:
+        writer.close()
+
+async def load(url: str, mix: str, dauer: float = 10, verbindungen: int = 32, seed: int = 0) -> dict:
+    """
+    Erzeugt ``dauer`` Sekunden lang Last über ``verbindungen`` Keep-Alive-Verbindungen.
+
+    Args:
+        url (str): Basis-URL der API.
+        mix (str): Schlüssel in :data:`MIXES`.
+        dauer (float): Messdauer in Sekunden.
+        verbindungen (int): Gleichzeitige Verbindungen (je eine offene Anfrage).
+        seed (int): Startwert der Zufallsparameter.
+
+    Returns:
+        dict: Anfragen, Fehler, Anfragen/s und Latenz-Perzentile in ms.
+    """
+    anfragen = MIXES[mix](random.Random(seed))
+    latenzen, fehler = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(_connection(url, anfragen, dauer, latenzen, fehler) for _ in range(verbindungen)))
+    gesamt = time.perf_counter() - start
+    perzentile = statistics.quantiles(latenzen, n=100) if len(latenzen) > 1 else [latenzen[0]] * 99
+    return {
+        "requests": len(latenzen),
+        "errors": len(fehler),
+        "rps": len(latenzen) / gesamt,
+        "p50_ms": perzentile[49] * 1000,
+        "p95_ms": perzentile[94] * 1000,
+        "p99_ms": perzentile[98] * 1000,
+    }
+
+# ------------------------------------------------------
+# Abgleich mit der App (Consistency Check)
+# ------------------------------------------------------
+
+def _app_values(geschichte: str, parameter: dict) -> dict:
+    if geschichte == "schachbrett":
+        szene = engine.chessboard_scene(parameter["feld_nummer"], parameter.get("faktor", 2))
+        return {name: wert for name, wert in szene.items() if wert is not None}
+    return {name: float(wert) for name, wert in APP_FUNCTIONS[geschichte](**parameter).items()}
+
+def check_consistency(url: str, seed: int = 0, anzahl: int = 50) -> list[str]:
+    """
+    Vergleicht API-Antworten (einzeln und als Batch) mit den Funktionen, über die die App rechnet.
+
+    Returns:
+        list[str]: Abweichungen als lesbare Meldungen (leer, wenn alles übereinstimmt).
+    """
+    rng = random.Random(seed)
+    faelle = {geschichte: [dict(parameter)] for geschichte, parameter in APP_DEFAULTS.items()}
+    for _ in range(anzahl):
+        faelle["schachbrett"].append({"feld_nummer": rng.randint(1, 64)})
+        faelle["zinseszins"].append({"startkapital": rng.randrange(0, 500_001, 1_000),
+                                     "sparrate": rng.randrange(0, 5_001, 50), "laufzeit": rng.randint(5, 50),
+                                     "zinssatz": rng.randint(0, 36) / 2, "kosten": rng.randint(0, 60) / 20})
+        faelle["viral"].append({"starter_personen": rng.randint(1, 1_000), "multiplikator": rng.randint(5, 50) / 10,
+                                "anzahl_wellen": rng.randint(1, 40)})
+        faelle["saas"].append({**APP_DEFAULTS["saas"], "start_mrr": rng.randrange(1_000, 1_000_001, 1_000),
+                               "monatliche_wachstumsrate": rng.randint(0, 70) / 2,
+                               "monate_planungszeitraum": rng.randint(6, 60)})
+
+    abweichungen = []
+    for geschichte, szenarien in faelle.items():
+        with urllib.request.urlopen(url + f"/v1/{geschichte}", json.dumps({"szenarien": szenarien}).encode()) as a:
+            batch_ergebnisse = json.load(a)["ergebnisse"]
+        with urllib.request.urlopen(url + _get(geschichte, szenarien[0])[1]) as antwort:
+            einzeln = json.load(antwort)["ergebnisse"][0]
+        for i, (parameter, ergebnis) in enumerate(zip(szenarien, batch_ergebnisse)):
+            vergleich = [(ergebnis, "batch")] + ([(einzeln, "einzeln")] if i == 0 else [])
+            for name, erwartet in _app_values(geschichte, parameter).items():
+                for antwort, art in vergleich:
+                    if not math.isclose(antwort[name], erwartet, rel_tol=1e-12, abs_tol=1e-9):
+                        abweichungen.append(f"{geschichte} {parameter} ({art}): {name} = {antwort[name]} statt {erwartet}")
+    return abweichungen
+
+def print_report(bericht: dict):
+    """Gibt den Bericht als Tabelle auf der Konsole aus."""
+    print(f"{'Muster':<16} {'Anfragen':>10} {'Fehler':>7} {'Anfr./s':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for mix, werte in bericht["load"].items():
+        print(f"{mix:<16} {werte['requests']:>10,} {werte['errors']:>7} {werte['rps']:>10,.0f} "
+              f"{werte['p50_ms']:>8.2f} {werte['p95_ms']:>8.2f} {werte['p99_ms']:>8.2f}")
+    print(f"Abweichungen zur App: {len(bericht['mismatches'])}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Laufende API; ohne Angabe wird ein lokaler Server gestartet")
+    parser.add_argument("--dauer", type=float, default=10, help="Messdauer je Muster in Sekunden")
+    parser.add_argument("--verbindungen", type=int, default=32, help="Gleichzeitige Keep-Alive-Verbindungen")
+    parser.add_argument("--prozesse", type=int, help="Worker-Prozesse des gestarteten Servers")
+    parser.add_argument("--min-rps", type=float, default=3_000, help="Mindestdurchsatz für cache_treffer")
+    parser.add_argument("--json", help="Bericht zusätzlich als JSON-Datei speichern")
+    args = parser.parse_args()
+
+    async def messen(url: str) -> dict:
+        return {mix: await load(url, mix, args.dauer, args.verbindungen) for mix in MIXES}
+
+    with contextlib.nullcontext(args.url) if args.url else api_server(args.prozesse) as url:
+        bericht = {"mismatches": check_consistency(url), "load": run(messen(url))}
+    print_report(bericht)
+    for meldung in bericht["mismatches"][:20]:
+        print(f"ABWEICHUNG: {meldung}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(bericht, f, indent=2)
+
+    zu_langsam = bericht["load"]["cache_treffer"]["rps"] < args.min_rps
+    if zu_langsam:
+        print(f"DURCHSATZ UNTER {args.min_rps:,.0f} Anfragen/s")
+    sys.exit(1 if bericht["mismatches"] or zu_langsam else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Misst die Chart-Payload je Skriptlauf (JSON-Spezifikation aller ``st.plotly_chart``-Elemente)
+für typische und für extreme Einstellungen und prüft sie gegen feste Obergrenzen.
+
+Aufruf::
+
+    python -m benchmarks.chart_payloads [--json report.json]
+
+Die App läuft dabei über ``streamlit.testing`` (ohne Browser). Überschreitet ein Chart
+``MAX_CHART_BYTES`` (animierte Charts im Abspielmodus: ``MAX_ANIMATION_BYTES``) oder
+die Summe der statischen Charts eines Szenarios ``MAX_SCENARIO_BYTES``, endet das Skript
+mit Exit-Code 1 und eignet sich so als Regressionsprüfung.
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.st_client import APP_SCRIPT
+
+# Obergrenzen für die JSON-Spezifikation eines einzelnen Charts bzw. aller Charts eines Laufs
+MAX_CHART_BYTES = 120_000
+MAX_SCENARIO_BYTES = 300_000
+
+# Ein animierter Chart enthält alle Frames eines Durchlaufs und ersetzt damit bis zu 64 Reruns
+MAX_ANIMATION_BYTES = 250_000
+
+# Szenario -> Liste von (Widget-Art, Label oder Key, Wert); leere Liste = Standardeinstellungen
+SCENARIOS = {
+    "standard": [],
+    "lange_horizonte": [
+        ("select_slider", "Brettgröße", 1_000),
+        ("slider", "Laufzeit (Jahre)", 50),
+        ("selectbox", "Verzinsung & Sparrate", "täglich"),
+        ("slider", "Anzahl Wellen", 40),
+        ("slider", "Planungszeitraum (Monate)", 60),
+    ],
+    "monte_carlo": [
+        ("slider", "Laufzeit (Jahre)", 50),
+        ("toggle", "mc_zinseszins", True),
+    ],
+    "sweep": [
+        ("toggle", "sweep_zinseszins", True),
+        ("toggle", "sweep_saas", True),
+    ],
+    # Abspielmodus: ein Rerun liefert alle Frames (ersetzt 64 bzw. 50 Slider-Reruns)
+    "abspielen": [
+        ("slider", "Wähle ein Feld (1–64)", 64),
+        ("select_slider", "Brettgröße", 8),
+        ("slider", "Laufzeit (Jahre)", 50),
+        ("toggle", "abspielen_schachbrett", True),
+        ("toggle", "abspielen_zinseszins", True),
+        ("toggle", "abspielen_viral", True),
+        ("toggle", "abspielen_saas", True),
+    ],
+    "abspielen_lange_horizonte": [
+        ("select_slider", "Brettgröße", 1_000),
+        ("slider", "Laufzeit (Jahre)", 50),
+        ("selectbox", "Verzinsung & Sparrate", "täglich"),
+        ("toggle", "abspielen_schachbrett", True),
+        ("toggle", "abspielen_zinseszins", True),
+    ],
+}
+
+def _widget(at: AppTest, art: str, name: str):
+    for widget in getattr(at, art):
+        if name in (widget.label, widget.key):
+            return widget
+    raise KeyError(f"{art} {name!r} nicht gefunden")
+
+def measure_scenario(aenderungen: list, script: str = APP_SCRIPT) -> dict:
+    """
+    Führt die App mit den gegebenen Widget-Änderungen aus und misst alle Charts des letzten Laufs.
+
+    Args:
+        aenderungen (list): Liste von (Widget-Art, Label oder Key, Wert).
+        script (str): Pfad zum App-Skript.
+
+    Returns:
+        dict: Bytes je Chart (Titel -> Bytes), Titel der animierten Charts, Summe und
+              Dauer des letzten Laufs in ms.
+    """
+    at = AppTest.from_file(script, default_timeout=300)
+    start = time.perf_counter()
+    at.run()
+    for art, name, wert in aenderungen:
+        # Jede Änderung einzeln ausführen, damit abhängige Widgets (z.B. Feld-Slider) neu entstehen
+        _widget(at, art, name).set_value(wert)
+        start = time.perf_counter()
+        at.run()
+    dauer = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+
+    charts = {}
+    animiert = []
+    for element in at.get("plotly_chart"):
+        spec = json.loads(element.proto.spec)
+        titel = spec.get("layout", {}).get("title", {}).get("text") or f"chart_{len(charts)}"
+        charts[titel] = len(element.proto.spec.encode("utf-8"))
+        if spec.get("frames"):
+            animiert.append(titel)
+    return {"charts": charts, "animated": animiert, "total_bytes": sum(charts.values()), "run_ms": dauer * 1000}
+
+def check_bounds(bericht: dict) -> list[str]:
+    """Liefert alle Verletzungen der Obergrenzen als lesbare Meldungen."""
+    fehler = []
+    for szenario, werte in bericht.items():
+        statisch = 0
+        for titel, groesse in werte["charts"].items():
+            grenze = MAX_ANIMATION_BYTES if titel in werte["animated"] else MAX_CHART_BYTES
+            if groesse > grenze:
+                fehler.append(f"{szenario}: '{titel}' hat {groesse:,} Bytes (Grenze {grenze:,})")
+            if titel not in werte["animated"]:
+                statisch += groesse
+        if statisch > MAX_SCENARIO_BYTES:
+            fehler.append(f"{szenario}: {statisch:,} Bytes in statischen Charts (Grenze {MAX_SCENARIO_BYTES:,})")
+    return fehler
+
+def print_report(bericht: dict):
+    """Gibt den Bericht als Tabelle auf der Konsole aus."""
+    for szenario, werte in bericht.items():
+        print(f"{szenario} ({werte['total_bytes']:,} Bytes, letzter Lauf {werte['run_ms']:.0f} ms)")
+        for titel, groesse in werte["charts"].items():
+            markierung = " (animiert)" if titel in werte["animated"] else ""
+            print(f"  {(titel[:60] + markierung):<71} {groesse:>10,}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--json", help="Bericht zusätzlich als JSON-Datei speichern")
+    args = parser.parse_args()
+
+    bericht = {szenario: measure_scenario(aenderungen) for szenario, aenderungen in SCENARIOS.items()}
+    print_report(bericht)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(bericht, f, indent=2)
+
+    fehler = check_bounds(bericht)
+    for meldung in fehler:
+        print(f"GRENZE ÜBERSCHRITTEN: {meldung}")
+    sys.exit(1 if fehler else 0)
+
+if __name__ == "__main__":
+    main()
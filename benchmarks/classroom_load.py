@@ -0,0 +1,262 @@
+"""
+Lasttest in Hörsaalgröße: ``N`` gleichzeitige Browser-Sitzungen (Websocket-Clients aus
+``st_client``) öffnen die App und bewegen Slider in allen vier Tabs.
+
+Aufruf::
+
+    python -m benchmarks.classroom_load [--sitzungen 150] [--interaktionen 20] [--rampe 10]
+                                        [--denkzeit 1.0] [--url http://localhost:8501] [--json report.json]
+
+Jede Sitzung lädt die Seite, wartet eine zufällige Denkzeit und stellt dann nacheinander
+Slider aus :data:`benchmarks.tab_reruns.TAB_INTERACTIONS` auf benachbarte Werte (wie beim
+Ziehen und Loslassen im Browser, jeweils als Fragment-Rerun). Die Sitzungen starten
+gleichmäßig verteilt über ``--rampe`` Sekunden.
+
+Berichtet werden p50/p95/p99 der Latenz für den ersten Seitenaufbau und für Reruns
+(gesamt und je Tab), Fehler und Zeitüberschreitungen sowie CPU-Auslastung und
+Speicher des Serverprozesses (RSS vor dem Test, Spitze und Zuwachs je Sitzung). Ohne
+``--url`` wird ein eigener Server gestartet; nur dann lassen sich CPU und Speicher messen.
+Der JSON-Bericht enthält zusätzlich Commit und Versionen, um Releases zu vergleichen.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+import streamlit
+
+from benchmarks.st_client import StreamlitSession, run, streamlit_server
+from benchmarks.tab_reruns import TAB_INTERACTIONS
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Maximale Wartezeit auf einen Rerun, danach zählt er als Zeitüberschreitung
+RERUN_TIMEOUT_S = 120
+
+# Abtastintervall für CPU und Speicher des Servers
+SAMPLE_INTERVAL_S = 0.5
+
+# ------------------------------------------------------
+# Servermessung (Server Resource Sampling)
+# ------------------------------------------------------
+
+def process_sample(pid: int) -> tuple[float, int]:
+    """
+    Verbrauchte CPU-Zeit (Sekunden) und RSS (Bytes) eines Prozesses.
+    Nutzt psutil, falls installiert, sonst ``/proc`` (Linux).
+    """
+    try:
+        import psutil
+    except ImportError:
+        with open(f"/proc/{pid}/stat", encoding="ascii") as datei:
+            felder = datei.read().rsplit(")", 1)[1].split()
+        takt = os.sysconf("SC_CLK_TCK")
+        # utime und stime sind Feld 14 und 15 der stat-Datei (hier ab Feld 3 gezählt), RSS Feld 24 in Seiten
+        return (int(felder[11]) + int(felder[12])) / takt, int(felder[21]) * os.sysconf("SC_PAGE_SIZE")
+    prozess = psutil.Process(pid)
+    zeiten = prozess.cpu_times()
+    return zeiten.user + zeiten.system, prozess.memory_info().rss
+
+async def sample_server(pid: int, proben: list, stopp: asyncio.Event):
+    """Schreibt bis ``stopp`` regelmäßig (Zeit, CPU-Sekunden, RSS) des Servers nach ``proben``."""
+    while not stopp.is_set():
+        proben.append((time.perf_counter(), *process_sample(pid)))
+        try:
+            await asyncio.wait_for(stopp.wait(), SAMPLE_INTERVAL_S)
+        except asyncio.TimeoutError:
+            pass
+    proben.append((time.perf_counter(), *process_sample(pid)))
+
+def summarize_samples(proben: list, rss_basis: int, sitzungen: int) -> dict:
+    """CPU-Auslastung (100 % = ein Kern) und Speicher aus den Serverproben."""
+    auslastung = [(c2 - c1) / (t2 - t1) * 100 for (t1, c1, _), (t2, c2, _) in zip(proben, proben[1:]) if t2 > t1]
+    rss_spitze = max(rss for _, _, rss in proben)
+    dauer = proben[-1][0] - proben[0][0]
+    return {
+        "cpu_percent_mean": (proben[-1][1] - proben[0][1]) / dauer * 100 if dauer else 0.0,
+        "cpu_percent_p95": _percentiles(auslastung)["p95"] if auslastung else 0.0,
+        "cpu_percent_max": max(auslastung, default=0.0),
+        "cpu_cores": os.cpu_count(),
+        "rss_baseline_mb": rss_basis / 2**20,
+        "rss_peak_mb": rss_spitze / 2**20,
+        "rss_per_session_mb": (rss_spitze - rss_basis) / 2**20 / sitzungen,
+    }
+
+# ------------------------------------------------------
+# Simulierte Sitzungen (Simulated Sessions)
+# ------------------------------------------------------
+
+def _percentiles(werte: list) -> dict:
+    if len(werte) == 1:
+        return {"p50": werte[0], "p95": werte[0], "p99": werte[0]}
+    quantile = statistics.quantiles(werte, n=100, method="inclusive")
+    return {"p50": quantile[49], "p95": quantile[94], "p99": quantile[98]}
+
+async def simulate_session(url: str, nummer: int, start_s: float, interaktionen: int, denkzeit: float,
+                           messungen: dict):
+    """
+    Eine Studierenden-Sitzung: Seite laden, dann ``interaktionen`` Slider-Änderungen in zufälligen Tabs.
+
+    Args:
+        url (str): Basis-URL des Servers.
+        nummer (int): Startwert für die Zufallsfolge dieser Sitzung.
+        start_s (float): Verzögerung bis zum Öffnen der Seite (Rampe).
+        interaktionen (int): Anzahl der Slider-Änderungen.
+        denkzeit (float): Mittlere Pause zwischen zwei Interaktionen in Sekunden.
+        messungen (dict): Sammelt Latenzen ("initial", je Tab) und Fehler.
+    """
+    rng = random.Random(nummer)
+    await asyncio.sleep(start_s)
+    try:
+        async with StreamlitSession(url) as sitzung:
+            ergebnis = await asyncio.wait_for(sitzung.rerun(), RERUN_TIMEOUT_S)
+            messungen["initial"].append(ergebnis.latency_s * 1000)
+            tab, position = None, 0
+            for _ in range(interaktionen):
+                await asyncio.sleep(rng.expovariate(1 / denkzeit) if denkzeit > 0 else 0)
+                # Meist im selben Tab weiterziehen, gelegentlich den Tab wechseln
+                if tab is None or rng.random() < 0.25:
+                    tab = rng.choice(list(TAB_INTERACTIONS))
+                    position = rng.randrange(len(TAB_INTERACTIONS[tab][1]))
+                label, werte = TAB_INTERACTIONS[tab]
+                position = min(max(position + rng.choice((-2, -1, 1, 2)), 0), len(werte) - 1)
+                ergebnis = await asyncio.wait_for(sitzung.rerun({label: werte[position]}), RERUN_TIMEOUT_S)
+                messungen["reruns"][tab].append(ergebnis.latency_s * 1000)
+    except asyncio.TimeoutError:
+        messungen["timeouts"] += 1
+    except Exception as fehler:  # Verbindungsabbrüche usw. zählen, den Test aber nicht abbrechen
+        messungen["errors"].append(repr(fehler))
+
+async def measure(url: str, sitzungen: int, interaktionen: int = 20, rampe: float = 10, denkzeit: float = 1.0,
+                  server_pid: int = None) -> dict:
+    """
+    Führt den Lasttest aus und fasst die Messwerte zusammen.
+
+    Args:
+        url (str): Basis-URL des Servers.
+        sitzungen (int): Anzahl gleichzeitiger Sitzungen.
+        interaktionen (int): Slider-Änderungen je Sitzung.
+        rampe (float): Zeitraum in Sekunden, über den die Sitzungen starten.
+        denkzeit (float): Mittlere Pause zwischen zwei Interaktionen einer Sitzung in Sekunden.
+        server_pid (int): Prozess-ID des Servers für CPU- und Speichermessung (optional).
+
+    Returns:
+        dict: Latenz-Perzentile in ms, Fehler, Durchsatz und ggf. Serverressourcen.
+    """
+    # Eine Sitzung vorab, damit Modul-Importe und Ergebniscache nicht in die Messung fallen
+    async with StreamlitSession(url) as aufwaermen:
+        await aufwaermen.rerun()
+
+    messungen = {"initial": [], "reruns": {tab: [] for tab in TAB_INTERACTIONS}, "errors": [], "timeouts": 0}
+    proben, stopp = [], asyncio.Event()
+    abtastung = None
+    if server_pid is not None:
+        rss_basis = process_sample(server_pid)[1]
+        abtastung = asyncio.create_task(sample_server(server_pid, proben, stopp))
+
+    cpu_client = time.process_time()
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        simulate_session(url, nummer, rampe * nummer / sitzungen, interaktionen, denkzeit, messungen)
+        for nummer in range(sitzungen)
+    ))
+    dauer = time.perf_counter() - start
+    cpu_client = time.process_time() - cpu_client
+    if abtastung is not None:
+        stopp.set()
+        await abtastung
+
+    alle_reruns = [wert for werte in messungen["reruns"].values() for wert in werte]
+    bericht = {
+        "initial_load_ms": _percentiles(messungen["initial"]) if messungen["initial"] else None,
+        "rerun_ms": _percentiles(alle_reruns) if alle_reruns else None,
+        "rerun_ms_per_tab": {tab: _percentiles(werte) for tab, werte in messungen["reruns"].items() if werte},
+        "reruns": len(alle_reruns),
+        "reruns_per_s": len(alle_reruns) / dauer,
+        "sessions_completed": len(messungen["initial"]),
+        "timeouts": messungen["timeouts"],
+        "errors": len(messungen["errors"]),
+        "error_samples": messungen["errors"][:5],
+        "duration_s": dauer,
+        # Liegt die Client-CPU nahe an der Dauer, begrenzt der Lastgenerator selbst die Messung
+        "client_cpu_s": cpu_client,
+    }
+    if proben:
+        bericht["server"] = summarize_samples(proben, rss_basis, sitzungen)
+    return bericht
+
+def environment() -> dict:
+    """Commit, Versionen und Rechner, damit Berichte verschiedener Releases vergleichbar bleiben."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "streamlit": streamlit.__version__,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+def print_report(bericht: dict):
+    """Gibt den Bericht als Tabelle auf der Konsole aus."""
+    ergebnis = bericht["results"]
+    konfiguration = bericht["config"]
+    print(f"{konfiguration['sessions']} Sitzungen × {konfiguration['interactions']} Interaktionen, "
+          f"Rampe {konfiguration['ramp_s']:.0f} s, Denkzeit {konfiguration['think_time_s']:.1f} s "
+          f"-> {ergebnis['reruns']:,} Reruns in {ergebnis['duration_s']:.1f} s ({ergebnis['reruns_per_s']:.1f}/s)")
+    print(f"{'':<20} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    zeilen = {"Erster Seitenaufbau": ergebnis["initial_load_ms"], "Rerun (alle Tabs)": ergebnis["rerun_ms"],
+              **{f"  {tab}": werte for tab, werte in ergebnis["rerun_ms_per_tab"].items()}}
+    for name, werte in zeilen.items():
+        if werte:
+            print(f"{name:<20} {werte['p50']:>9.1f} {werte['p95']:>9.1f} {werte['p99']:>9.1f}")
+    print(f"Abgeschlossene Sitzungen: {ergebnis['sessions_completed']}, Zeitüberschreitungen: "
+          f"{ergebnis['timeouts']}, Fehler: {ergebnis['errors']}, Client-CPU: {ergebnis['client_cpu_s']:.1f} s")
+    if "server" in ergebnis:
+        server = ergebnis["server"]
+        print(f"Server-CPU: Mittel {server['cpu_percent_mean']:.0f} %, p95 {server['cpu_percent_p95']:.0f} %, "
+              f"Max {server['cpu_percent_max']:.0f} % ({server['cpu_cores']} Kerne); "
+              f"RSS {server['rss_baseline_mb']:.0f} -> {server['rss_peak_mb']:.0f} MB "
+              f"({server['rss_per_session_mb']:.2f} MB je Sitzung)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sitzungen", type=int, default=150, help="Gleichzeitige Sitzungen")
+    parser.add_argument("--interaktionen", type=int, default=20, help="Slider-Änderungen je Sitzung")
+    parser.add_argument("--rampe", type=float, default=10, help="Sekunden, über die die Sitzungen starten")
+    parser.add_argument("--denkzeit", type=float, default=1.0, help="Mittlere Pause zwischen Interaktionen (s)")
+    parser.add_argument("--url", help="Bereits laufender Streamlit-Server (ohne CPU-/Speichermessung)")
+    parser.add_argument("--json", help="Bericht zusätzlich als JSON-Datei speichern")
+    args = parser.parse_args()
+
+    argumente = (args.sitzungen, args.interaktionen, args.rampe, args.denkzeit)
+    if args.url:
+        ergebnis = run(measure(args.url, *argumente))
+    else:
+        with streamlit_server() as (url, prozess):
+            ergebnis = run(measure(url, *argumente, server_pid=prozess.pid))
+
+    bericht = {
+        "config": {"sessions": args.sitzungen, "interactions": args.interaktionen, "ramp_s": args.rampe,
+                   "think_time_s": args.denkzeit, "url": args.url},
+        "environment": environment(),
+        "results": ergebnis,
+    }
+    print_report(bericht)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(bericht, f, indent=2)
+    sys.exit(1 if ergebnis["errors"] or ergebnis["timeouts"] else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Prüft die Array-Formatierung (``format_numbers``, ``human_numbers``) Wert für Wert gegen
+die Einzelwert-Funktionen ``format_number`` und ``human_number``.
+
+Aufruf::
+
+    python -m benchmarks.formatting_equivalence [--seeds 4] [--anzahl 20000]
+
+Neben zufälligen Werten über alle Größenordnungen enthalten die Fälle exakte und knapp
+verfehlte Rundungsgrenzen (x,5 auf jeder Dezimalstelle), ``-0.0`` und Werte, die auf
+``-0`` runden, ganze Zahlen ab 2^53, ``nan``/``±inf``, subnormale Zahlen sowie Eingaben
+als int-Array, pandas-Serie und zweidimensionales Array. Die Array-Varianten lesen alle
+Werte als float64; verglichen wird daher mit den Einzelwert-Funktionen auf ``float(wert)``.
+Weicht ein Text ab, endet das Skript mit Exit-Code 1 und eignet sich so als
+Regressionsprüfung.
+"""
+
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+from formatting import format_number, format_numbers, human_number, human_numbers
+
+# Geprüfte Dezimalstellen von format_numbers
+DEZIMALSTELLEN = range(7)
+
+# Feste Randfälle, unabhängig vom Seed
+RANDFAELLE = [
+    0.0, -0.0, 0.5, -0.5, 1.5, 2.5, -2.5, 0.05, 0.15, 0.25, 0.35, 1.005, 2.675, 999.5, 999.95, 999_999.5,
+    -0.4, -0.04, -0.004, -1e-12, 1e-12, 5e-324, -5e-324, 2.0 ** 53 - 1, 2.0 ** 53, -2.0 ** 53, 2.0 ** 53 + 2,
+    2.0 ** 63, 1e16, 1e17, 1e21, 1e22, 1.7976931348623157e308, -1.7976931348623157e308,
+    999.0, 999_499.9, 999_500.0, 999_950_000.0, 999_999_999_999.0, 1e12 - 1, 1e15, 123_456_789.012_345_6,
+    float("nan"), float("inf"), float("-inf"),
+]
+
+def random_values(rng: np.random.Generator, anzahl: int) -> np.ndarray:
+    """Zufallswerte über alle Größenordnungen samt exakter und knapp verfehlter Rundungsgrenzen."""
+    groessen = 10.0 ** rng.uniform(-8, 20, anzahl) * rng.choice([-1.0, 1.0], anzahl)
+    stellen = rng.integers(0, 7, anzahl)
+    ganz = rng.integers(-10 ** 9, 10 ** 9, anzahl)
+    # (k + 0,5) / 10^d liegt genau bzw. (binär) knapp neben der Rundungsgrenze der d-ten Stelle
+    grenzen = (ganz + 0.5) / 10.0 ** stellen
+    verschoben = np.nextafter(grenzen, rng.choice([-np.inf, np.inf], anzahl))
+    ganze = rng.integers(-2 ** 62, 2 ** 62, anzahl).astype(float)
+    return np.concatenate([groessen, grenzen, verschoben, ganze, ganz.astype(float), RANDFAELLE])
+
+def _mismatches(name: str, erwartet: list, gefunden: np.ndarray, werte) -> list[str]:
+    gefunden = list(np.asarray(gefunden, dtype=object).ravel())
+    return [f"{name}({wert!r}): {text!r} statt {referenz!r}"
+            for wert, referenz, text in zip(werte, erwartet, gefunden) if text != referenz]
+
+def check_values(werte: np.ndarray) -> tuple[int, list[str]]:
+    """Vergleicht alle Dezimalstellen von format_numbers und human_numbers für ``werte``."""
+    werte_liste = werte.tolist()
+    fehler = []
+    for dezimalstellen in DEZIMALSTELLEN:
+        erwartet = [format_number(wert, dezimalstellen) for wert in werte_liste]
+        fehler += _mismatches(f"format_numbers[{dezimalstellen}]", erwartet,
+                              format_numbers(werte, dezimalstellen), werte_liste)
+    fehler += _mismatches("human_numbers", [human_number(wert) for wert in werte_liste], human_numbers(werte),
+                          werte_liste)
+    return len(werte) * (len(DEZIMALSTELLEN) + 1), fehler
+
+def check_inputs(rng: np.random.Generator) -> tuple[int, list[str]]:
+    """Eingabetypen: int-Arrays, pandas-Serien (auch mit nan) und mehrdimensionale Arrays."""
+    ganze = rng.integers(-2 ** 53, 2 ** 53, 1_000)
+    serie = pd.Series(np.append(rng.normal(0, 1e6, 999), np.nan), index=np.arange(1_000) * 3)
+    matrix = rng.normal(0, 1e4, (20, 50))
+    fehler = []
+    anzahl = 0
+    for name, eingabe in (("int64", ganze), ("Series", serie), ("2D", matrix)):
+        werte = [float(wert) for wert in np.asarray(eingabe, dtype=float).ravel()]
+        for dezimalstellen in (0, 2):
+            ergebnis = format_numbers(eingabe, dezimalstellen)
+            if ergebnis.shape != np.shape(eingabe):
+                fehler.append(f"format_numbers({name}): Form {ergebnis.shape} statt {np.shape(eingabe)}")
+            fehler += _mismatches(f"format_numbers[{dezimalstellen}]({name})",
+                                  [format_number(wert, dezimalstellen) for wert in werte], ergebnis, werte)
+        ergebnis = human_numbers(eingabe)
+        if ergebnis.shape != np.shape(eingabe):
+            fehler.append(f"human_numbers({name}): Form {ergebnis.shape} statt {np.shape(eingabe)}")
+        fehler += _mismatches(f"human_numbers({name})", [human_number(wert) for wert in werte], ergebnis, werte)
+        anzahl += 3 * len(werte)
+    # Leere Eingaben behalten ihre Form
+    for leer in (np.array([]), np.empty((0, 3))):
+        if format_numbers(leer).shape != leer.shape or human_numbers(leer).shape != leer.shape:
+            fehler.append(f"Leere Eingabe der Form {leer.shape} ändert die Form")
+    return anzahl, fehler
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seeds", type=int, default=4, help="Anzahl der Zufalls-Seeds")
+    parser.add_argument("--anzahl", type=int, default=20_000, help="Zufallswerte je Art und Seed")
+    parser.add_argument("--max-meldungen", type=int, default=20, help="Höchstzahl ausgegebener Abweichungen")
+    args = parser.parse_args()
+
+    anzahl = 0
+    fehler = []
+    for seed in range(args.seeds):
+        rng = np.random.default_rng(seed)
+        for geprueft, abweichungen in (check_values(random_values(rng, args.anzahl)), check_inputs(rng)):
+            anzahl += geprueft
+            fehler += abweichungen
+    print(f"{anzahl:,} Vergleiche, {len(fehler):,} Abweichungen")
+    for meldung in fehler[:args.max_meldungen]:
+        print(f"  ABWEICHUNG: {meldung}")
+    sys.exit(1 if fehler else 0)
+
+if __name__ == "__main__":
+    main()
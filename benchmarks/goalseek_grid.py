@@ -0,0 +1,125 @@
+"""
+Prüft die ganzzahligen Zielwertsuchen (siehe goalseek) gegen die Engine auf dem Raster.
+
+Aufruf::
+
+    python -m benchmarks.goalseek_grid
+
+Für ein Parameterraster (auch mit negativem Nettozins, Steuer und Inflation) wird die
+Zielwertsuche mit der ersten Überschreitung verglichen, die sich aus der Engine Jahr für
+Jahr (bzw. Welle für Welle, Monat für Monat) ergibt. Die Ziele liegen genau auf, knapp
+unter und knapp über den Werten der Engine sowie jenseits jedes erreichbaren Werts.
+Weicht ein Ergebnis ab, endet das Skript mit Exit-Code 1 und eignet sich so als
+Regressionsprüfung.
+"""
+
+import argparse
+import itertools
+import sys
+
+import numpy as np
+
+import engine
+import goalseek
+
+# Parameterraster der Zinseszins-Geschichte; Kosten über dem Zinssatz ergeben negativen Nettozins
+ZINSESZINS_RASTER = {
+    "startkapital": (0.0, 1_000.0, 100_000.0),
+    "sparrate": (0.0, 50.0, 500.0),
+    "zinssatz": (0.0, 0.5, 3.0, 8.0),
+    "perioden_pro_jahr": (1, 12),
+    "vorschuessig": (True, False),
+    "inflation": (0.0, 2.0),
+    "kosten": (0.0, 2.0),
+    "steuer": (0.0, 25.0),
+}
+
+# Jahre bzw. Stützstellen, an denen Ziele aus den Werten der Engine gebildet werden
+ZIEL_STELLEN = (1, 2, 5, 10, 30, 100)
+
+# Relative Abstände der Ziele zu den Werten der Engine
+ZIEL_ABSTAENDE = (1 - 1e-9, 1.0, 1 + 1e-9)
+
+def _targets(werte: np.ndarray) -> np.ndarray:
+    """Ziele je Zeile: knapp um die Werte an :data:`ZIEL_STELLEN` sowie weit über dem Maximum."""
+    stellen = werte[:, list(ZIEL_STELLEN)]
+    ziele = [stellen * abstand for abstand in ZIEL_ABSTAENDE]
+    ziele.append(np.nanmax(werte, axis=1, keepdims=True) * 2 + 1)
+    return np.concatenate(ziele, axis=1)
+
+def _first_crossing(werte: np.ndarray, ziele: np.ndarray) -> np.ndarray:
+    """Erster Index je Zeile, an dem ``werte`` das Ziel erreicht; ``NaN``, wenn nie."""
+    erreicht = werte[:, None, :] >= ziele[:, :, None]
+    return np.where(erreicht.any(axis=-1), np.argmax(erreicht, axis=-1), np.nan)
+
+def _compare(name: str, erwartet: np.ndarray, gefunden: np.ndarray, parameter: list, ziele: np.ndarray,
+             max_index: int) -> list[str]:
+    """
+    Meldungen für alle Abweichungen. Jenseits des Rasters (``max_index``) darf die Zielwertsuche
+    eine Lösung liefern, wo das Raster keine kennt.
+    """
+    jenseits = np.isnan(erwartet) & (gefunden > max_index)
+    abweichend = ~((erwartet == gefunden) | (np.isnan(erwartet) & np.isnan(gefunden)) | jenseits)
+    return [f"{name}{parameter[zeile]}: Ziel {ziele[zeile, spalte]!r} -> {gefunden[zeile, spalte]}, "
+            f"Engine {erwartet[zeile, spalte]}" for zeile, spalte in zip(*np.nonzero(abweichend))]
+
+def check_compound_interest_years() -> tuple[int, list[str]]:
+    """Prüft :func:`goalseek.compound_interest_years` auf dem Jahresraster bis LAUFZEIT_MAX_JAHRE."""
+    kombinationen = list(itertools.product(*ZINSESZINS_RASTER.values()))
+    jahre = np.arange(goalseek.LAUFZEIT_MAX_JAHRE + 1)
+    fehler = []
+    anzahl = 0
+    # Geschlossene Form und Rastersuche getrennt aufrufen (die Rastersuche gilt sonst für alle)
+    for geschlossen in (True, False):
+        auswahl = [k for k in kombinationen if (k[5] == 0 and k[7] == 0) == geschlossen]
+        s, r, z, p, v, i, k, st = (np.array(werte)[:, None] for werte in zip(*auswahl))
+        werte = engine.compound_interest_final(s, r, jahre, z, p, v, i, k, st)["endkapital_lara"]
+        ziele = _targets(werte)
+        gefunden = goalseek.compound_interest_years(ziele, s, r, z, p, v, i, k, st)
+        fehler += _compare("compound_interest_years", _first_crossing(werte, ziele), gefunden, auswahl, ziele,
+                           goalseek.LAUFZEIT_MAX_JAHRE)
+        anzahl += ziele.size
+    return anzahl, fehler
+
+def check_viral_waves() -> tuple[int, list[str]]:
+    """Prüft :func:`goalseek.viral_waves` auf dem Raster der Wellen."""
+    auswahl = list(itertools.product((1.0, 50.0), (0.9, 1.0, 1.7, 3.0)))
+    starter, multiplikator = (np.array(werte)[:, None] for werte in zip(*auswahl))
+    wellen = np.arange(ZIEL_STELLEN[-1] + 1)
+    werte = engine.viral_final(starter, multiplikator, wellen)["gesamt_personen_erreicht"]
+    ziele = _targets(werte)
+    gefunden = goalseek.viral_waves(ziele, starter, multiplikator)
+    return ziele.size, _compare("viral_waves", _first_crossing(werte, ziele), gefunden, auswahl, ziele, wellen[-1])
+
+def check_saas_month() -> tuple[int, list[str]]:
+    """Prüft :func:`goalseek.saas_month` auf dem Raster der Monate."""
+    auswahl = list(itertools.product((1_000.0, 25_000.0), (0.0, 0.5, 5.0, 20.0)))
+    start_mrr, rate = (np.array(werte)[:, None] for werte in zip(*auswahl))
+    monate = np.arange(ZIEL_STELLEN[-1] + 1)
+    werte = engine.saas_final(start_mrr, rate, monate, 0)["gesamt_mrr_exponentiell"]
+    ziele = _targets(werte)
+    gefunden = goalseek.saas_month(ziele, start_mrr, rate)
+    return ziele.size, _compare("saas_month", _first_crossing(werte, ziele), gefunden, auswahl, ziele, monate[-1])
+
+CHECKS = {
+    "compound_interest_years": check_compound_interest_years,
+    "viral_waves": check_viral_waves,
+    "saas_month": check_saas_month,
+}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-meldungen", type=int, default=20, help="Höchstzahl ausgegebener Abweichungen je Prüfung")
+    args = parser.parse_args()
+
+    alle_fehler = 0
+    for name, pruefung in CHECKS.items():
+        anzahl, fehler = pruefung()
+        print(f"{name:<26} {anzahl:>8,} Ziele  {len(fehler):>6,} Abweichungen")
+        for meldung in fehler[:args.max_meldungen]:
+            print(f"  ABWEICHUNG: {meldung}")
+        alle_fehler += len(fehler)
+    sys.exit(1 if alle_fehler else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Minimaler Headless-Client für das Streamlit-Websocket-Protokoll.
+
+Spricht dasselbe Protokoll wie der Browser (``/_stcore/stream``, Protobuf-
+``BackMsg``/``ForwardMsg``), merkt sich die Widgets aus den empfangenen Deltas
+und kann Widget-Änderungen als vollständigen Rerun oder als Fragment-Rerun
+senden. Gemessen werden Latenz, Anzahl Nachrichten und übertragene Bytes bis
+zur ``script_finished``-Nachricht.
+"""
+
+import asyncio
+import contextlib
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from dataclasses import dataclass
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+APP_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "exponential.py")
+
+# Widget-Typ -> Feld im WidgetState-Protobuf
+_WIDGET_VALUE_FIELDS = {
+    "slider": "double_array_value",
+    "select_slider": "string_array_value",
+    "number_input": "double_value",
+    "checkbox": "bool_value",
+    "toggle": "bool_value",
+    "radio": "string_value",
+    "selectbox": "string_value",
+}
+
+@dataclass
+class Widget:
+    """Ein vom Server gemeldetes Widget samt aktuellem Wert und Fragment-Zugehörigkeit."""
+    id: str
+    kind: str
+    label: str
+    value: object
+    fragment_id: str
+
+@dataclass
+class RerunResult:
+    """Messwerte eines einzelnen Reruns."""
+    latency_s: float
+    bytes_received: int
+    messages: int
+    fragment: bool
+
+def _initial_value(kind: str, element):
+    if kind == "slider":
+        return list(element.value or element.default)
+    if kind == "select_slider":
+        return [element.options[int(i)] for i in (element.value or element.default)]
+    if kind == "number_input":
+        return element.value if element.HasField("value") else element.default
+    if kind in ("checkbox", "toggle"):
+        return element.value if element.set_value else element.default
+    if kind in ("radio", "selectbox"):
+        return element.raw_value if element.HasField("raw_value") else element.options[element.default]
+    return getattr(element, "value", None)
+
+class StreamlitSession:
+    """
+    Eine simulierte Browser-Sitzung.
+
+    Args:
+        url (str): Basis-URL des Servers, z.B. ``http://localhost:8501``.
+    """
+
+    def __init__(self, url: str):
+        self.ws_url = url.replace("http", "ws", 1).rstrip("/") + "/_stcore/stream"
+        self.widgets: dict[str, Widget] = {}
+        self._ws = None
+
+    async def __aenter__(self):
+        self._ws = await websockets.connect(self.ws_url, subprotocols=["streamlit"], max_size=None)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._ws.close()
+
+    def _remember_widget(self, delta):
+        if delta.WhichOneof("type") != "new_element":
+            return
+        kind = delta.new_element.WhichOneof("type")
+        if kind not in _WIDGET_VALUE_FIELDS:
+            return
+        element = getattr(delta.new_element, kind)
+        if kind == "slider" and element.options:
+            # st.select_slider überträgt die formatierten Optionen statt Zahlen
+            kind = "select_slider"
+        # Widgets mit ``key`` (Suffix der ID) über den Key ansprechen, da sich Labels wiederholen dürfen
+        user_key = element.id.rsplit("-", 1)[-1]
+        name = element.label if user_key == "None" else user_key
+        bekannt = self.widgets.get(name)
+        wert = bekannt.value if bekannt and bekannt.id == element.id else _initial_value(kind, element)
+        self.widgets[name] = Widget(element.id, kind, element.label, wert, delta.fragment_id)
+
+    def _widget_states(self, client_state):
+        for widget in self.widgets.values():
+            state = client_state.widget_states.widgets.add()
+            state.id = widget.id
+            feld = _WIDGET_VALUE_FIELDS[widget.kind]
+            if feld == "double_array_value":
+                state.double_array_value.data.extend(float(v) for v in widget.value)
+            elif feld == "string_array_value":
+                state.string_array_value.data.extend(widget.value)
+            else:
+                setattr(state, feld, widget.value)
+
+    async def rerun(self, changes: dict = None, fragment: bool = True, query_string: str = "") -> RerunResult:
+        """
+        Sendet einen Rerun (optional mit geänderten Widget-Werten) und wartet auf dessen Ende.
+
+        Args:
+            changes (dict): Widget-Label (bzw. ``key``, falls gesetzt) -> neuer Wert
+                            (Slider-Werte als Zahl oder Liste, Select-Slider-Werte
+                            als formatierte Option, z.B. ``"64 × 64"``).
+            fragment (bool): Bei ``True`` wird nur das Fragment des geänderten Widgets
+                             neu ausgeführt (wie im Browser), sonst das gesamte Skript.
+            query_string (str): Query-String der Seite, z.B. ``"debug=1"``.
+
+        Returns:
+            RerunResult: Latenz, empfangene Bytes und Nachrichtenanzahl.
+        """
+        changes = changes or {}
+        fragment_id = ""
+        for label, wert in changes.items():
+            widget = self.widgets[label]
+            ist_liste = widget.kind in ("slider", "select_slider")
+            widget.value = list(wert) if isinstance(wert, (list, tuple)) else ([wert] if ist_liste else wert)
+            fragment_id = widget.fragment_id if fragment else ""
+
+        msg = BackMsg()
+        msg.rerun_script.query_string = query_string
+        msg.rerun_script.page_script_hash = ""
+        msg.rerun_script.fragment_id = fragment_id
+        if self.widgets:
+            self._widget_states(msg.rerun_script)
+
+        start = time.perf_counter()
+        await self._ws.send(msg.SerializeToString())
+        anzahl = 0
+        groesse = 0
+        while True:
+            raw = await self._ws.recv()
+            anzahl += 1
+            groesse += len(raw)
+            forward = ForwardMsg()
+            forward.ParseFromString(raw)
+            art = forward.WhichOneof("type")
+            if art == "delta":
+                self._remember_widget(forward.delta)
+            elif art == "script_finished":
+                break
+        return RerunResult(time.perf_counter() - start, groesse, anzahl, bool(fragment_id))
+
+# ------------------------------------------------------
+# Lokaler Testserver (Local Test Server)
+# ------------------------------------------------------
+
+def free_port() -> int:
+    """Liefert einen freien lokalen TCP-Port."""
+    with contextlib.closing(socket.socket()) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+@contextlib.contextmanager
+def streamlit_server(script: str = APP_SCRIPT, port: int = None, env: dict = None, timeout: float = 30):
+    """
+    Startet ``streamlit run`` headless in einem Unterprozess und liefert die Basis-URL.
+
+    Args:
+        script (str): Pfad zum App-Skript.
+        port (int): Port; standardmäßig ein freier Port.
+        env (dict): Zusätzliche Umgebungsvariablen für den Server.
+        timeout (float): Maximale Wartezeit auf den Health-Check in Sekunden.
+
+    Yields:
+        tuple[str, subprocess.Popen]: Basis-URL und Serverprozess.
+    """
+    port = port or free_port()
+    prozess = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", script,
+         "--server.headless", "true", "--server.port", str(port),
+         "--browser.gatherUsageStats", "false"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        env={**os.environ, **(env or {})},
+        cwd=os.path.dirname(os.path.abspath(script)), # damit .streamlit/config.toml der App gilt
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        ende = time.monotonic() + timeout
+        while True:
+            try:
+                with urllib.request.urlopen(url + "/_stcore/health", timeout=1):
+                    break
+            except OSError:
+                if time.monotonic() > ende or prozess.poll() is not None:
+                    raise RuntimeError("Streamlit-Server ist nicht gestartet")
+                time.sleep(0.2)
+        yield url, prozess
+    finally:
+        prozess.terminate()
+        prozess.wait(timeout=10)
+
+def run(coro):
+    """Kleiner Wrapper um ``asyncio.run`` für die Skripte in diesem Paket."""
+    return asyncio.run(coro)
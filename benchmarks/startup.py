@@ -0,0 +1,113 @@
+"""
+Misst den Kaltstart der App: Importzeit der App-Module in einem frischen Prozess
+sowie die Zeit bis zum ersten vollständig gerenderten Seitenaufbau.
+
+Aufruf::
+
+    python -m benchmarks.startup [--runs 3] [--json report.json]
+
+Je Lauf wird ein neuer Streamlit-Server gestartet. Gemessen werden die Zeit bis zum
+Health-Check, der erste Skriptlauf einer Sitzung auf dem frischen Server (kalt: der
+Skript-Thread importiert dabei die App-Module) und der erste Lauf einer zweiten
+Sitzung (warm: Module und Ergebniscache sind bereits geladen).
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.st_client import APP_SCRIPT, StreamlitSession, run, streamlit_server
+
+# Führt die Importanweisungen am Anfang des App-Skripts aus (Streamlit separat gemessen)
+_IMPORT_PROBE = """
+import ast, json, sys, time
+start = time.perf_counter()
+import streamlit
+streamlit_s = time.perf_counter() - start
+baum = ast.parse(open(sys.argv[1], encoding="utf-8").read())
+importe = []
+for knoten in baum.body:
+    if not isinstance(knoten, (ast.Import, ast.ImportFrom)):
+        break
+    importe.append(knoten)
+start = time.perf_counter()
+exec(compile(ast.Module(importe, []), sys.argv[1], "exec"), {})
+app_s = time.perf_counter() - start
+print(json.dumps({
+    "streamlit_ms": streamlit_s * 1000,
+    "app_modules_ms": app_s * 1000,
+    "loaded": {name: name in sys.modules for name in ("pandas", "plotly.express")},
+}))
+"""
+
+def measure_imports(script: str = APP_SCRIPT) -> dict:
+    """Importzeiten des App-Skripts in einem frischen Python-Prozess."""
+    ausgabe = subprocess.run([sys.executable, "-c", _IMPORT_PROBE, script], cwd=os.path.dirname(script),
+                             check=True, capture_output=True, text=True).stdout
+    return json.loads(ausgabe.strip().splitlines()[-1])
+
+async def _first_renders(url: str) -> tuple:
+    async with StreamlitSession(url) as session:
+        kalt = await session.rerun()
+    async with StreamlitSession(url) as session:
+        warm = await session.rerun()
+    return kalt, warm
+
+def measure(runs: int = 3) -> dict:
+    """
+    Startet ``runs`` frische Server und misst jeweils Importe, Serverstart und ersten Seitenaufbau.
+
+    Args:
+        runs (int): Anzahl unabhängiger Kaltstarts.
+
+    Returns:
+        dict: Mediane je Messgröße in Millisekunden bzw. Bytes sowie die Einzelwerte.
+    """
+    laeufe = []
+    for _ in range(runs):
+        importe = measure_imports()
+        start = time.perf_counter()
+        with streamlit_server() as (url, _):
+            server_s = time.perf_counter() - start
+            kalt, warm = run(_first_renders(url))
+        laeufe.append({
+            **{k: v for k, v in importe.items() if k != "loaded"},
+            "server_ready_ms": server_s * 1000,
+            "first_render_cold_ms": kalt.latency_s * 1000,
+            "first_render_warm_ms": warm.latency_s * 1000,
+            "time_to_first_render_ms": (server_s + kalt.latency_s) * 1000,
+            "first_render_bytes": kalt.bytes_received,
+            "first_render_messages": kalt.messages,
+        })
+    return {
+        "median": {k: statistics.median(l[k] for l in laeufe) for k in laeufe[0]},
+        "heavy_modules_at_import": importe["loaded"],
+        "runs": laeufe,
+    }
+
+def print_report(bericht: dict):
+    """Gibt den Bericht als Tabelle auf der Konsole aus."""
+    for name, wert in bericht["median"].items():
+        einheit = "" if name.endswith(("bytes", "messages")) else " ms"
+        print(f"{name:<24} {wert:>12,.1f}{einheit}")
+    geladen = [name for name, ja in bericht["heavy_modules_at_import"].items() if ja]
+    print(f"Beim Import geladen: {', '.join(geladen) or '—'}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="Anzahl der Kaltstarts")
+    parser.add_argument("--json", help="Bericht zusätzlich als JSON-Datei speichern")
+    args = parser.parse_args()
+
+    bericht = measure(args.runs)
+    print_report(bericht)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(bericht, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,371 @@
+"""
+Benchmark-Suite für die heißen Pfade der App mit gespeicherter Baseline und Regressionsprüfung.
+
+Aufruf::
+
+    python -m benchmarks.suite [--filter engine.] [--groessen 10,100,1000,10000,100000]
+                               [--ohne-e2e] [--speichern] [--schwelle 0.25] [--json report.json]
+
+Gemessen werden einzeln:
+
+- ``formatting.*``: format_number, human_number, magnitude_number, best_comparison(_log10)
+  für je 1000 Werte, dazu die Array-Varianten format_numbers und human_numbers für dieselben Werte,
+- ``catalog.*[1000]``: Größenvergleiche gegen den Referenzkatalog, einzeln und als Batch,
+- ``engine.*_series[n]``: Zeitreihen der vier Geschichten über ``n`` Schritte,
+- ``engine.*_final[n]``: Kennzahlen für ``n`` Szenarien in einem vektorisierten Aufruf,
+- ``engine.*_frame[n]``: DataFrame-Aufbau für ``n`` Schritte,
+- ``goalseek.*[n]``: Zielwertsuche für ``n`` Ziele in einem Aufruf (Logarithmus bzw. Newton),
+- ``cohorts.*``: Kohortenmodell über ``n`` Monate sowie 1000 Varianten über zehn Jahre in
+  Tagesauflösung,
+- ``backtest.*``: rollierende 30-Jahres-Fenster über 1000 Jahre Monatsrenditen,
+- ``charts.*[n]``: Plotly-Figur aus ``n`` Punkten (inkl. LTTB) samt JSON-Serialisierung
+  und Abspielmodus,
+- ``e2e.<Tab>``: vollständiger Skriptlauf über ``streamlit.testing`` nach einer
+  Slider-Änderung im jeweiligen Tab (Median über die Werte aus ``tab_reruns``, schnellster
+  von :data:`E2E_WIEDERHOLUNGEN` Durchläufen, jeder mit eigener Kalibrierung).
+
+Mikro-Benchmarks laufen per ``timeit`` (automatische Anzahl, bestes von fünf Wiederholungen);
+verglichen wird die Zeit pro Aufruf, bereinigt um die Geschwindigkeit des Rechners
+(Referenzlast vor und nach der Messung, siehe :func:`calibrate`). ``--speichern`` ergänzt die
+Baseline (:data:`BASELINE_FILE`) um Benchmarks, die dort noch fehlen, umgerechnet auf deren
+Kalibrierung; bestehende Einträge bleiben unverändert. Nur ``--speichern --ueberschreiben``
+ersetzt auch sie – gedacht für Commits, die eine Verlangsamung bewusst in Kauf nehmen und das
+begründen. Sonst endet das Skript mit Exit-Code 1, sobald ein Benchmark um
+mehr als die Schwelle langsamer ist als die Baseline (für Aufrufe unter einer Millisekunde
+großzügiger, siehe :data:`SCHWELLEN_KURZ`). Die Baseline gilt nur für den Rechner,
+auf dem sie erzeugt wurde – auf einem neuen CI-Rechner zuerst ``--speichern`` ausführen.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import timeit
+
+import numpy as np
+import pandas as pd
+
+import backtest
+import cache
+import catalog
+import charts
+import cohorts
+import engine
+import goalseek
+from benchmarks.classroom_load import environment
+from benchmarks.st_client import APP_SCRIPT
+from benchmarks.tab_reruns import TAB_INTERACTIONS
+from formatting import (best_comparison, best_comparison_log10, format_number, format_numbers, human_number,
+                        human_numbers, magnitude_number)
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# Schrittzahlen bzw. Szenarien für die parametrisierten Benchmarks
+GROESSEN = (10, 100, 1_000, 10_000, 100_000)
+
+# Erlaubte Verlangsamung gegenüber der Baseline (0.25 = 25 %); Präfix -> abweichende Schwelle
+SCHWELLE = 0.25
+SCHWELLEN = {"e2e.": 0.5}
+
+# Kurze Aufrufe schwanken stärker (Allokator, Caches, Timer): Baseline unter x Sekunden -> Mindestschwelle
+SCHWELLEN_KURZ = ((1e-4, 1.0), (1e-3, 0.5))
+
+# Wie oft ein Mikro-Benchmark über der Schwelle nachgemessen wird, bevor er als Regression gilt
+NACHMESSUNGEN = 2
+
+# Gemessene Durchläufe je Tab im End-to-End-Benchmark (nach einem verworfenen Aufwärmdurchlauf);
+# es zählt der schnellste Durchlauf, wie bei den Mikro-Benchmarks
+E2E_WIEDERHOLUNGEN = 5
+
+# Referenzen wie in den Tabs der App (Gewicht in t, Einwohner)
+_GEWICHT = [("40-Tonnen-Lkw", 40), ("Eiffelturm", 10_100), ("Cheops-Pyramide", 5_750_000),
+            ("Weltreisproduktion (Jahr)", 520_000_000)]
+_BEVOELKERUNG = [("Frankfurt am Main", 773_068), ("Hessen", 6_391_360), ("Deutschland", 84_607_016),
+                 ("Europa", 744_000_000), ("Welt", 8_100_000_000)]
+
+# ------------------------------------------------------
+# Mikro-Benchmarks (Micro Benchmarks)
+# ------------------------------------------------------
+
+def micro_benchmarks(groessen: tuple = GROESSEN) -> dict:
+    """
+    Alle Mikro-Benchmarks als Name -> Funktion ohne Argumente.
+
+    Args:
+        groessen (tuple): Schrittzahlen bzw. Szenarien der parametrisierten Benchmarks.
+
+    Returns:
+        dict: Benchmark-Name -> aufzurufende Funktion.
+    """
+    rng = np.random.default_rng(0)
+    werte = (10 ** rng.uniform(-1, 14, 1_000) * rng.choice([-1, 1], 1_000)).tolist()
+    log10_werte = rng.uniform(0, 80, 1_000).tolist()
+    werte_array = np.array(werte)
+    churn = rng.uniform(0, 5, 1_000)
+    monatsrenditen = rng.normal(0.007, 0.045, 12_000)
+    benchmarks = {
+        "formatting.format_number[1000]": lambda: [format_number(w, 2) for w in werte],
+        "formatting.human_number[1000]": lambda: [human_number(w) for w in werte],
+        "formatting.format_numbers[1000]": lambda: format_numbers(werte_array, 2),
+        "formatting.human_numbers[1000]": lambda: human_numbers(werte_array),
+        "formatting.magnitude_number[1000]": lambda: [magnitude_number(w) for w in log10_werte],
+        "formatting.best_comparison[1000]": lambda: [best_comparison(w, _BEVOELKERUNG) for w in werte],
+        "formatting.best_comparison_log10[1000]": lambda: [best_comparison_log10(w, _GEWICHT) for w in log10_werte],
+        "catalog.best[1000]": lambda: [catalog.index("bevoelkerung").best(w) for w in werte],
+        "catalog.best_many[1000]": lambda: catalog.index("bevoelkerung").best_many(werte),
+        "catalog.best_many_log10[1000]": lambda: catalog.index("masse").best_many_log10(log10_werte),
+        # Zehn Jahre in Tagesauflösung für 1000 Churn-Varianten in einem Aufruf
+        "cohorts.mrr_final[1000x3650]": lambda: cohorts.mrr_final(
+            25_000, 12, 120, churn, 5, 1, 12, 12_000, cohorts.AUFLOESUNGEN["täglich"]),
+        # Sparplan über alle 11.641 Startmonate einer 1000-jährigen Monatsreihe
+        "backtest.rolling_windows[12000x30]": lambda: backtest.rolling_windows(
+            monatsrenditen, 12, 5_000, 400, 30, kosten=0.2, steuer=25),
+    }
+
+    for n in groessen:
+        # Zeitreihen über n Schritte (Raten so gewählt, dass auch 100.000 Schritte in float64 bleiben)
+        benchmarks[f"engine.chessboard_series[{n}]"] = lambda n=n: engine.chessboard_series(n, 2.0)
+        benchmarks[f"engine.compound_interest_series[{n}]"] = (
+            lambda n=n: engine.compound_interest_series(5_000, 400, n, 0.5, 1, inflation=2.0, kosten=0.2, steuer=25))
+        benchmarks[f"engine.viral_series[{n}]"] = lambda n=n: engine.viral_series(50, 1.001, n)
+        benchmarks[f"engine.saas_series[{n}]"] = lambda n=n: engine.saas_series(25_000, 0.5, n, 10_000)
+
+        # Kennzahlen für n Szenarien in einem Aufruf
+        zins = rng.uniform(0, 18, n)
+        benchmarks[f"engine.chessboard_log10[{n}]"] = lambda n=n: engine.chessboard_log10(np.arange(1, n + 1), 2.0)
+        benchmarks[f"engine.compound_interest_final[{n}]"] = (
+            lambda zins=zins: engine.compound_interest_final(5_000, 400, 25, zins, 12))
+        benchmarks[f"engine.viral_final[{n}]"] = lambda zins=zins: engine.viral_final(50, 1 + zins / 10, 15)
+        benchmarks[f"engine.saas_final[{n}]"] = lambda zins=zins: engine.saas_final(25_000, zins, 36, 10_000, 12, 12_000)
+
+        # Zielwertsuche für n Ziele: geschlossene Form bzw. Newton mit Klammer
+        ziele = np.geomspace(1e5, 1e8, n)
+        benchmarks[f"goalseek.compound_interest_rate[{n}]"] = (
+            lambda ziele=ziele: goalseek.compound_interest_rate(ziele, 5_000, 400, 25))
+        benchmarks[f"goalseek.viral_waves[{n}]"] = lambda ziele=ziele: goalseek.viral_waves(ziele, 50, 1.7)
+
+        # DataFrame-Aufbau
+        benchmarks[f"engine.chessboard_frame[{n}]"] = lambda n=n: engine.chessboard_frame(n, 2.0)
+        benchmarks[f"engine.compound_interest_frame[{n}]"] = lambda n=n: engine.compound_interest_frame(5_000, 400, n, 0.5)
+        benchmarks[f"engine.viral_frame[{n}]"] = lambda n=n: engine.viral_frame(50, 1.001, n)
+        benchmarks[f"engine.saas_frame[{n}]"] = lambda n=n: engine.saas_frame(25_000, 0.5, n, 10_000)
+
+        # Kohortenmodell über n Monate (Faltung direkt bzw. per FFT)
+        benchmarks[f"cohorts.mrr_series[{n}]"] = lambda n=n: cohorts.mrr_series(25_000, 0.5, n, 2, 5, 1)
+
+        # Plotly-Figuren wie in der App: Aufbau inkl. Ausdünnung und die JSON-Spezifikation für den Browser
+        reihen = engine.compound_interest_series(5_000, 400, n, 0.5)
+        linien = {"Zinseszins (Lara)": reihen["kapital_zinseszins"], "Nur eingezahlt": reihen["eingezahlt_total"],
+                  "Lineares Sparen (Tim)": reihen["kapital_lineares_sparen"]}
+        benchmarks[f"charts.line_figure[{n}]"] = lambda x=reihen["jahre"], linien=linien: charts.line_figure(
+            x, linien, "Zinseszins vs. Lineares Sparen", "Jahr", "Kapital in €", "Szenario")
+        figur = charts.line_figure(reihen["jahre"], linien, "Zinseszins", "Jahr", "Kapital in €", "Szenario")
+        benchmarks[f"charts.to_json[{n}]"] = figur.to_json
+        benchmarks[f"charts.animate[{n}]"] = lambda x=reihen["jahre"], linien=linien: charts.animate(
+            charts.line_figure(x, linien, "Zinseszins", "Jahr", "Kapital in €", "Szenario",
+                               ziel_punkte=charts.ANIMATION_ZIEL_PUNKTE), "Jahr")
+    return benchmarks
+
+def time_call(funktion, wiederholungen: int = 5) -> float:
+    """Sekunden pro Aufruf: automatische Anzahl (mind. 0,2 s je Messung), bestes von ``wiederholungen``."""
+    timer = timeit.Timer(funktion)
+    anzahl, _ = timer.autorange()
+    return min(timer.repeat(wiederholungen, anzahl)) / anzahl
+
+def _kalibrierung_last(_x=np.random.default_rng(1).random(100_000)):
+    np.cumprod(1 + _x * 1e-6)
+    pd.DataFrame({"x": _x[:10_000]})
+    "".join(str(i) for i in range(2_000))
+
+def calibrate() -> float:
+    """
+    Sekunden pro Aufruf einer festen Referenzlast (NumPy, pandas, reines Python). Das Verhältnis
+    zur Kalibrierung der Baseline gleicht unterschiedlich schnelle bzw. ausgelastete Rechner aus.
+    """
+    return time_call(_kalibrierung_last)
+
+# ------------------------------------------------------
+# End-to-End: vollständiger Skriptlauf je Tab (Full Script Rerun)
+# ------------------------------------------------------
+
+def e2e_benchmarks(script: str = APP_SCRIPT, wiederholungen: int = E2E_WIEDERHOLUNGEN,
+                   kalibrierung: float = None) -> dict:
+    """
+    Dauer eines vollständigen Skriptlaufs nach einer Slider-Änderung je Tab. Jeder Tab
+    durchläuft alle Werte einmal zum Aufwärmen und dann ``wiederholungen``-mal, jeweils mit
+    geleertem Ergebniscache. Je Durchlauf wird der Median gebildet; es zählt der schnellste
+    Durchlauf, damit kurzzeitige Last auf dem Rechner das Ergebnis nicht verschiebt.
+
+    Args:
+        script (str): Pfad zum App-Skript.
+        wiederholungen (int): Gemessene Durchläufe je Tab.
+        kalibrierung (float): Optional. Jeder Durchlauf wird zusammen mit einer frischen
+                              Kalibrierung (vorher und nachher) gemessen und auf diese
+                              Kalibrierung umgerechnet, wie das Nachmessen der Mikro-Benchmarks.
+
+    Returns:
+        dict: "e2e.<Tab>" -> Sekunden pro Skriptlauf.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(script, default_timeout=300)
+    at.run()
+    ergebnisse = {}
+    for tab, (label, werte) in TAB_INTERACTIONS.items():
+        mediane = []
+        for durchlauf in range(wiederholungen + 1):
+            cache.RESULT_CACHE.clear()
+            lokal = calibrate() if kalibrierung and durchlauf else None
+            dauern = []
+            for wert in werte:
+                slider = next(s for s in at.slider if s.label == label)
+                slider.set_value(wert)
+                start = time.perf_counter()
+                at.run()
+                dauern.append(time.perf_counter() - start)
+            if at.exception:
+                raise RuntimeError(at.exception[0].message)
+            if durchlauf:
+                umrechnung = kalibrierung / statistics.mean([lokal, calibrate()]) if kalibrierung else 1.0
+                mediane.append(statistics.median(dauern) * umrechnung)
+        ergebnisse[f"e2e.{tab}"] = min(mediane)
+    return ergebnisse
+
+# ------------------------------------------------------
+# Baseline & Regressionsprüfung (Baseline & Gates)
+# ------------------------------------------------------
+
+def threshold(name: str, schwelle: float = SCHWELLE, baseline: float = None) -> float:
+    """
+    Erlaubte Verlangsamung für einen Benchmark: längstes passendes Präfix aus :data:`SCHWELLEN`,
+    für kurze Aufrufe mindestens die Schwelle aus :data:`SCHWELLEN_KURZ`.
+
+    Args:
+        name (str): Name des Benchmarks.
+        schwelle (float): Standardschwelle ohne passendes Präfix.
+        baseline (float): Sekunden pro Aufruf der Baseline.
+
+    Returns:
+        float: Erlaubte Verlangsamung (0.25 = 25 %).
+    """
+    passend = [praefix for praefix in SCHWELLEN if name.startswith(praefix)]
+    erlaubt = SCHWELLEN[max(passend, key=len)] if passend else schwelle
+    if baseline is not None:
+        erlaubt = max([erlaubt] + [kurz for grenze, kurz in SCHWELLEN_KURZ if baseline < grenze])
+    return erlaubt
+
+def compare(ergebnisse: dict, baseline: dict, schwelle: float = SCHWELLE, skalierung: float = 1.0) -> dict:
+    """
+    Vergleicht die Messung mit der Baseline.
+
+    Args:
+        ergebnisse (dict): Name -> Sekunden pro Aufruf.
+        baseline (dict): Name -> Sekunden pro Aufruf der Baseline.
+        schwelle (float): Standardschwelle, siehe :func:`threshold`.
+        skalierung (float): Kalibrierung jetzt / Kalibrierung der Baseline (siehe :func:`calibrate`).
+
+    Returns:
+        dict: Name -> {"seconds", "baseline", "ratio", "regression"}; ``ratio`` ist um die
+        Rechnergeschwindigkeit bereinigt.
+    """
+    vergleich = {}
+    for name, sekunden in ergebnisse.items():
+        referenz = baseline.get(name)
+        verhaeltnis = sekunden / (referenz * skalierung) if referenz else None
+        vergleich[name] = {
+            "seconds": sekunden,
+            "baseline": referenz,
+            "ratio": verhaeltnis,
+            "regression": verhaeltnis is not None and verhaeltnis > 1 + threshold(name, schwelle, referenz),
+        }
+    return vergleich
+
+def _dauer(sekunden: float) -> str:
+    for faktor, einheit in ((1, "s"), (1e-3, "ms"), (1e-6, "µs")):
+        if sekunden >= faktor:
+            return f"{sekunden / faktor:.3g} {einheit}"
+    return f"{sekunden / 1e-9:.3g} ns"
+
+def print_report(vergleich: dict):
+    """Gibt Messung, Baseline und Verhältnis als Tabelle aus."""
+    print(f"{'Benchmark':<44} {'Zeit':>10} {'Baseline':>10} {'Faktor':>7}")
+    for name, werte in vergleich.items():
+        baseline = _dauer(werte["baseline"]) if werte["baseline"] else "—"
+        faktor = f"{werte['ratio']:.2f}" if werte["ratio"] else "—"
+        markierung = "  REGRESSION" if werte["regression"] else ""
+        print(f"{name:<44} {_dauer(werte['seconds']):>10} {baseline:>10} {faktor:>7}{markierung}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", default="", help="Nur Benchmarks, deren Name diesen Text enthält")
+    parser.add_argument("--groessen", default=",".join(map(str, GROESSEN)),
+                        help="Schrittzahlen/Szenarien, kommagetrennt")
+    parser.add_argument("--ohne-e2e", action="store_true", help="Vollständige Skriptläufe überspringen")
+    parser.add_argument("--schwelle", type=float, default=SCHWELLE, help="Erlaubte Verlangsamung (0.25 = 25 %%)")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="Pfad der Baseline-Datei")
+    parser.add_argument("--speichern", action="store_true", help="Fehlende Benchmarks in die Baseline aufnehmen")
+    parser.add_argument("--ueberschreiben", action="store_true",
+                        help="Mit --speichern auch bestehende Einträge durch die Messung ersetzen")
+    parser.add_argument("--json", help="Bericht zusätzlich als JSON-Datei speichern")
+    args = parser.parse_args()
+
+    groessen = tuple(int(g) for g in args.groessen.split(","))
+    benchmarks = micro_benchmarks(groessen)
+    ergebnisse = {}
+    kalibrierungen = [calibrate()]
+    for name, funktion in benchmarks.items():
+        if args.filter in name:
+            ergebnisse[name] = time_call(funktion)
+    kalibrierungen.append(calibrate())
+    kalibrierung = statistics.mean(kalibrierungen)
+    if not args.ohne_e2e and any(args.filter in f"e2e.{tab}" for tab in TAB_INTERACTIONS):
+        # Skriptläufe schwanken mit der Last stärker als Mikro-Benchmarks: je Durchlauf frisch kalibrieren
+        e2e = e2e_benchmarks(kalibrierung=kalibrierung)
+        ergebnisse.update({n: s for n, s in e2e.items() if args.filter in n})
+
+    try:
+        with open(args.baseline, encoding="utf-8") as datei:
+            baseline = json.load(datei)
+    except OSError:
+        baseline = {"environment": environment(), "calibration": kalibrierung, "results": {}}
+    skalierung = kalibrierung / baseline["calibration"]
+    vergleich = compare(ergebnisse, baseline["results"], args.schwelle, skalierung)
+    if not args.speichern:
+        # Auffällige Mikro-Benchmarks erneut messen, damit kurzzeitige Last auf dem Rechner nicht als Regression zählt
+        for _ in range(NACHMESSUNGEN):
+            auffaellig = [name for name, werte in vergleich.items() if werte["regression"] and name in benchmarks]
+            for name in auffaellig:
+                # Zusammen mit einer frischen Kalibrierung messen und auf die Gesamtkalibrierung umrechnen
+                lokal = calibrate()
+                ergebnisse[name] = min(ergebnisse[name], time_call(benchmarks[name]) * kalibrierung / lokal)
+            vergleich = compare(ergebnisse, baseline["results"], args.schwelle, skalierung)
+    print(f"Rechner-Skalierung gegenüber Baseline: {skalierung:.2f}")
+    print_report(vergleich)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment(), "calibration": kalibrierung, "scale": skalierung,
+                       "results": vergleich}, f, indent=2)
+    if args.speichern:
+        # Neue Messungen auf die Kalibrierung der Baseline umrechnen, damit bestehende Einträge (und ihr
+        # Diff) unverändert bleiben; ohne --ueberschreiben werden nur fehlende Benchmarks ergänzt
+        neu = {name: sekunden / skalierung for name, sekunden in ergebnisse.items()
+               if args.ueberschreiben or name not in baseline["results"]}
+        baseline["results"].update(neu)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"{len(neu)} Einträge in {args.baseline} gespeichert")
+        return
+
+    regressionen = [name for name, werte in vergleich.items() if werte["regression"]]
+    ohne_baseline = [name for name, werte in vergleich.items() if werte["baseline"] is None]
+    if ohne_baseline:
+        print(f"{len(ohne_baseline)} Benchmarks ohne Baseline (mit --speichern anlegen)")
+    if regressionen:
+        print(f"{len(regressionen)} Regressionen: {', '.join(regressionen)}")
+    sys.exit(1 if regressionen else 0)
+
+if __name__ == "__main__":
+    main()
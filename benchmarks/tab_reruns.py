@@ -0,0 +1,89 @@
+"""
+Misst Latenz und Payload einer Slider-Interaktion je Tab – einmal als vollständiger
+Skript-Rerun (Verhalten ohne Fragmente) und einmal als Fragment-Rerun.
+
+Aufruf::
+
+    python -m benchmarks.tab_reruns [--url http://localhost:8501] [--json report.json]
+
+Ohne ``--url`` wird ein lokaler Streamlit-Server gestartet.
+"""
+
+import argparse
+import json
+import statistics
+
+from benchmarks.st_client import StreamlitSession, run, streamlit_server
+
+# Repräsentativer Slider je Tab und die Werte, die beim "Ziehen" durchlaufen werden
+TAB_INTERACTIONS = {
+    "Schachbrett": ("Wähle ein Feld (1–64)", list(range(1, 65, 3))),
+    "Zinseszins": ("Jährlicher Zinssatz (%)", [v / 2 for v in range(0, 37, 2)]),
+    "Viral": ("Anzahl Wellen", list(range(1, 41, 2))),
+    "SaaS": ("Monatliches Wachstum (%)", [v / 2 for v in range(0, 71, 4)]),
+}
+
+async def measure(url: str, repeats: int = 1) -> dict:
+    """
+    Führt alle Slider-Sweeps als Voll- und als Fragment-Rerun aus.
+
+    Args:
+        url (str): Basis-URL des Streamlit-Servers.
+        repeats (int): Wie oft jeder Sweep pro Modus wiederholt wird.
+
+    Returns:
+        dict: Je Tab und Modus Median/Mittel der Latenz (ms) und der Bytes pro Interaktion.
+    """
+    bericht = {}
+    async with StreamlitSession(url) as session:
+        erster = await session.rerun()
+        bericht["initial_load"] = {"latency_ms": erster.latency_s * 1000, "bytes": erster.bytes_received}
+        for tab, (label, werte) in TAB_INTERACTIONS.items():
+            # Aufwärmen, damit beide Modi mit gefülltem Ergebniscache verglichen werden
+            for wert in werte:
+                await session.rerun({label: wert}, fragment=True)
+            bericht[tab] = {}
+            for modus, fragment in (("full_rerun", False), ("fragment_rerun", True)):
+                ergebnisse = [
+                    await session.rerun({label: wert}, fragment=fragment)
+                    for _ in range(repeats) for wert in werte
+                ]
+                latenzen = [e.latency_s * 1000 for e in ergebnisse]
+                bericht[tab][modus] = {
+                    "latency_ms_median": statistics.median(latenzen),
+                    "latency_ms_mean": statistics.fmean(latenzen),
+                    "bytes_per_interaction": statistics.fmean(e.bytes_received for e in ergebnisse),
+                    "messages_per_interaction": statistics.fmean(e.messages for e in ergebnisse),
+                }
+    return bericht
+
+def print_report(bericht: dict):
+    """Gibt den Bericht als Tabelle auf der Konsole aus."""
+    print(f"Initialer Seitenaufbau: {bericht['initial_load']['latency_ms']:.1f} ms, "
+          f"{bericht['initial_load']['bytes']:,} Bytes")
+    print(f"{'Tab':<12} {'Modus':<15} {'Median ms':>10} {'Bytes':>10} {'Msgs':>6}")
+    for tab in TAB_INTERACTIONS:
+        for modus, werte in bericht[tab].items():
+            print(f"{tab:<12} {modus:<15} {werte['latency_ms_median']:>10.1f} "
+                  f"{werte['bytes_per_interaction']:>10.0f} {werte['messages_per_interaction']:>6.0f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Bereits laufender Streamlit-Server")
+    parser.add_argument("--repeats", type=int, default=1, help="Wiederholungen je Sweep")
+    parser.add_argument("--json", help="Bericht zusätzlich als JSON-Datei speichern")
+    args = parser.parse_args()
+
+    if args.url:
+        bericht = run(measure(args.url, args.repeats))
+    else:
+        with streamlit_server() as (url, _):
+            bericht = run(measure(url, args.repeats))
+
+    print_report(bericht)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(bericht, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Stochastisches Ausbreitungsmodell für den viralen Dominoeffekt (Tab 3).
+
+Galton–Watson-Verzweigungsprozess mit Poisson- oder negativ-binomial verteilter
+Nachkommenzahl (Mittelwert = Multiplikator) und optionaler endlicher Population.
+Mit Population wird daraus ein Reed–Frost-Kettenbinomialmodell: Die Kontakte
+einer Welle treffen zufällige Personen, nur noch nicht Erreichte zählen als neu.
+
+Es werden keine einzelnen Personen simuliert, sondern aggregierte Zählwerte pro
+Welle: Die Summe von ``n`` unabhängigen Poisson(m)-Variablen ist Poisson(n·m),
+bei der negativen Binomialverteilung gilt das analog über die Gamma-Poisson-Mischung.
+Der Aufwand hängt damit nur von Replikaten × Wellen ab, nicht von der Populationsgröße.
+"""
+
+import numpy as np
+
+# Ab diesem Erwartungswert wird die Poisson-Verteilung durch die Normalverteilung angenähert
+_POISSON_NORMAL_GRENZE = 1e7
+
+# ------------------------------------------------------
+# Interne Hilfsfunktionen (Internal Helpers)
+# ------------------------------------------------------
+
+def _poisson(rng: np.random.Generator, lam: np.ndarray) -> np.ndarray:
+    """Poisson-Ziehung als float64, für sehr große Erwartungswerte per Normalapproximation."""
+    gross = lam > _POISSON_NORMAL_GRENZE
+    ergebnis = rng.poisson(np.where(gross, 0.0, lam)).astype(float)
+    if gross.any():
+        lam_gross = lam[gross]
+        ergebnis[gross] = np.maximum(np.round(lam_gross + np.sqrt(lam_gross) * rng.standard_normal(lam_gross.shape)), 0)
+    return ergebnis
+
+def _offspring_intensity(rng: np.random.Generator, eltern: np.ndarray, multiplikator: float,
+                         verteilung: str, dispersion: float) -> np.ndarray:
+    """
+    Poisson-Intensität der Nachkommen aller ``eltern`` je Replikat. Bei der negativen
+    Binomialverteilung ist sie selbst zufällig: NB(k, Mittel m) = Poisson(Gamma(k, m / k)),
+    summiert über n Eltern also Poisson(Gamma(n·k, m / k)).
+    """
+    if verteilung == "negbin":
+        return np.where(eltern > 0, rng.gamma(np.maximum(eltern * dispersion, 1e-300), multiplikator / dispersion), 0.0)
+    return eltern * multiplikator
+
+# ------------------------------------------------------
+# Analytische Größen (Analytical Quantities)
+# ------------------------------------------------------
+
+def extinction_probability(multiplikator, verteilung: str = "poisson", dispersion: float = 1.0,
+                           starter_personen=1, iterationen: int = 500):
+    """
+    Aussterbewahrscheinlichkeit des unbegrenzten Verzweigungsprozesses: kleinste Lösung
+    von ``q = G(q)`` (Fixpunktiteration ab 0), für ``n`` Startpersonen ``q ** n``.
+
+    Args:
+        multiplikator (array_like): Mittlere Nachkommenzahl.
+        verteilung (str): "poisson" oder "negbin".
+        dispersion (float): Dispersionsparameter k der negativen Binomialverteilung.
+        starter_personen (array_like): Anzahl der unabhängigen Startpersonen.
+        iterationen (int): Anzahl der Fixpunktiterationen.
+
+    Returns:
+        np.ndarray: Wahrscheinlichkeit, dass die Ausbreitung irgendwann erlischt.
+    """
+    m = np.asarray(multiplikator, dtype=float)
+    q = np.zeros_like(m)
+    for _ in range(iterationen):
+        if verteilung == "negbin":
+            q = (1 + m * (1 - q) / dispersion) ** (-dispersion)
+        else:
+            q = np.exp(m * (q - 1))
+    return q ** np.asarray(starter_personen, dtype=float)
+
+def mean_field_series(starter_personen, multiplikator, anzahl_wellen: int, population=None) -> np.ndarray:
+    """
+    Deterministische Erwartungskurve (Mean-Field-Reed–Frost) der neu Erreichten je Welle.
+    Ohne Population entspricht sie der geometrischen Reihe der Engine.
+
+    Args:
+        starter_personen (array_like): Initiale Personen.
+        multiplikator (array_like): Multiplikator pro Welle.
+        anzahl_wellen (int): Anzahl der Wellen.
+        population (array_like): Größe der Population oder ``None`` für unbegrenzt.
+
+    Returns:
+        np.ndarray: Neu Erreichte je Welle, Zeitachse als letzte Achse.
+    """
+    aktiv = np.asarray(starter_personen, dtype=float)
+    m = np.asarray(multiplikator, dtype=float)
+    if population is not None:
+        aktiv = np.minimum(aktiv, population)
+    erreicht = aktiv
+    wellen = [aktiv]
+    for _ in range(1, anzahl_wellen):
+        if population is None:
+            aktiv = aktiv * m
+        else:
+            aktiv = (population - erreicht) * -np.expm1(-m * aktiv / population)
+        erreicht = erreicht + aktiv
+        wellen.append(aktiv)
+    return np.stack(np.broadcast_arrays(*wellen), axis=-1)
+
+# ------------------------------------------------------
+# Simulation (Simulation)
+# ------------------------------------------------------
+
+def simulate_spread(starter_personen: int, multiplikator: float, anzahl_wellen: int, replikate: int = 1_000,
+                    population: int = None, verteilung: str = "poisson", dispersion: float = 1.0,
+                    seed: int = 42, saettigung: float = 0.95) -> dict:
+    """
+    Simuliert die Ausbreitung über ``anzahl_wellen`` Wellen in ``replikate`` unabhängigen Läufen.
+
+    Args:
+        starter_personen (int): Initiale Personen (Welle 1).
+        multiplikator (float): Mittlere Anzahl überzeugter Personen je Person und Welle.
+        anzahl_wellen (int): Anzahl der Wellen.
+        replikate (int): Anzahl unabhängiger Simulationsläufe.
+        population (int): Größe der Population; ``None`` für einen unbegrenzten Verzweigungsprozess.
+        verteilung (str): Nachkommenverteilung, "poisson" oder "negbin".
+        dispersion (float): Dispersionsparameter k der negativen Binomialverteilung (klein = Superspreader).
+        seed (int): Seed für reproduzierbare Ergebnisse.
+        saettigung (float): Anteil der endgültigen Reichweite, der den Sättigungszeitpunkt markiert.
+
+    Returns:
+        dict: Wellenweise Zählwerte, Verteilung der Endreichweite, empirische und analytische
+              Aussterbewahrscheinlichkeit sowie die Zeit bis zur Sättigung je Replikat.
+    """
+    rng = np.random.default_rng(seed)
+    neu = np.zeros((replikate, anzahl_wellen))
+    start = float(min(starter_personen, population) if population else starter_personen)
+    aktiv = np.full(replikate, start)
+    erreicht = aktiv.copy()
+    neu[:, 0] = aktiv
+
+    for welle in range(1, anzahl_wellen):
+        intensitaet = _offspring_intensity(rng, aktiv, multiplikator, verteilung, dispersion)
+        if population:
+            # Reed–Frost: Jede noch nicht erreichte Person wird mit 1 - exp(-Intensität / N) erreicht;
+            # für eine kleine Welle in großer Population entspricht das wieder Poisson(Intensität)
+            anfaellig = (population - erreicht).astype(np.int64)
+            aktiv = rng.binomial(anfaellig, -np.expm1(-intensitaet / population)).astype(float)
+        else:
+            aktiv = _poisson(rng, intensitaet)
+        erreicht += aktiv
+        neu[:, welle] = aktiv
+
+    kumuliert = np.cumsum(neu, axis=1)
+    endreichweite = kumuliert[:, -1]
+    if population:
+        # Gesättigt = großer Ausbruch (>= 1 % der Population), dessen Wachstum zum Erliegen gekommen ist;
+        # Sättigungszeitpunkt ist die Welle, in der ``saettigung`` der endgültigen Reichweite erreicht ist
+        gesaettigt = (endreichweite >= 0.01 * population) & (neu[:, -1] < 0.01 * endreichweite)
+        welle_erreicht = (kumuliert >= saettigung * endreichweite[:, np.newaxis]).argmax(axis=1) + 1.0
+        zeit_bis_saettigung = np.where(gesaettigt, welle_erreicht, np.nan)
+    else:
+        zeit_bis_saettigung = np.full(replikate, np.nan)
+
+    return {
+        "runden": np.arange(1, anzahl_wellen + 1),
+        "neu_erreicht_pro_runde": neu,
+        "kumulativ_erreicht": kumuliert,
+        "endreichweite": endreichweite,
+        # Erloschen = keine neuen Personen mehr, ohne dass die Population gesättigt wurde
+        "aussterben_empirisch": float(np.mean((neu[:, -1] == 0) & np.isnan(zeit_bis_saettigung))),
+        "aussterben_analytisch": float(extinction_probability(multiplikator, verteilung, dispersion, start)),
+        "zeit_bis_saettigung": zeit_bis_saettigung,
+    }
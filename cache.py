@@ -0,0 +1,310 @@
+"""
+Sitzungsübergreifender Ergebnis-Cache (Cross-Session Result Cache).
+
+Streamlit führt das Skript bei jeder Widget-Interaktion komplett neu aus. Importierte
+Module bleiben dabei im Prozess erhalten – ein Cache auf Modulebene wird also von
+allen Sitzungen geteilt. Identische (normalisierte) Parameter werden so nur einmal
+berechnet, egal wie viele Studierende gleichzeitig dieselben Standardwerte sehen.
+
+Im Unterschied zu ``st.cache_data`` funktioniert der Cache auch ohne Streamlit
+(z.B. für die Engine außerhalb der App), gibt gecachte Objekte ohne Kopie zurück
+(Plotly-Figuren werden von ``st.plotly_chart`` nur gelesen) und führt Treffer-/
+Fehlzähler. Fragen mehrere Sitzungen gleichzeitig denselben noch nicht berechneten
+Schlüssel an, rechnet nur die erste; die anderen warten auf deren Ergebnis (Single-Flight).
+Größe und Lebensdauer lassen sich per Umgebungsvariable steuern:
+
+- ``EXPO_CACHE_MAX_ENTRIES``: maximale Anzahl Einträge (LRU-Verdrängung), Standard 1024.
+- ``EXPO_CACHE_MAX_BYTES``: geschätzter Speicher aller Einträge (LRU-Verdrängung, siehe
+  :func:`estimate_size`), Standard 512 MB.
+- ``EXPO_CACHE_TTL_SECONDS``: Lebensdauer eines Eintrags in Sekunden, Standard 3600.
+  ``0`` deaktiviert den Ablauf.
+"""
+
+import functools
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+# ------------------------------------------------------
+# Schlüssel-Normalisierung (Key Normalization)
+# ------------------------------------------------------
+
+def normalize_key(value):
+    """
+    Überführt Parameter in eine hashbare, kanonische Form, damit gleichwertige
+    Eingaben (z.B. ``7``, ``7.0`` und ``np.float64(7.0)``) denselben Schlüssel ergeben.
+
+    Args:
+        value: Ein beliebiger Parameterwert (Zahl, String, Sequenz, Dict, NumPy-Array).
+
+    Returns:
+        Ein hashbarer, normalisierter Schlüssel.
+    """
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        zahl = float(value)
+        if zahl.is_integer() and abs(zahl) < 2 ** 53:
+            return int(zahl)
+        return round(zahl, 12)
+    if isinstance(value, np.ndarray):
+        return ("ndarray", value.shape, value.dtype.str, value.tobytes())
+    if isinstance(value, (list, tuple)):
+        return tuple(normalize_key(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, normalize_key(v)) for k, v in value.items()))
+    return value
+
+# ------------------------------------------------------
+# Größenschätzung (Size Estimation)
+# ------------------------------------------------------
+
+# Ab dieser Länge wird die Größe einer Liste aus einer Stichprobe hochgerechnet
+_STICHPROBE = 32
+
+def estimate_size(value, _tiefe: int = 0) -> int:
+    """
+    Schätzt den Arbeitsspeicher eines gecachten Werts in Bytes: NumPy-Arrays über ``nbytes``
+    (Memory-Maps zählen nicht, ihre Daten liegen auf der Platte), pandas-Objekte über
+    ``memory_usage``, Container und Plotly-Figuren rekursiv, lange Listen per Stichprobe.
+
+    Args:
+        value: Der zu schätzende Wert.
+
+    Returns:
+        int: Geschätzte Größe in Bytes.
+    """
+    if isinstance(value, np.memmap):
+        return sys.getsizeof(value)
+    if isinstance(value, np.ndarray):
+        if value.dtype == object:
+            # Zeiger im Array plus die referenzierten Objekte (z.B. formatierte Texte)
+            return value.nbytes + estimate_size(value.ravel().tolist(), _tiefe + 1)
+        return value.nbytes + sys.getsizeof(value)
+    # pandas nur prüfen, wenn es schon geladen ist – der Import allein kostet den App-Start ~0,5 s
+    pd = sys.modules.get("pandas")
+    if pd is not None and isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        nutzung = value.memory_usage(deep=False)
+        return int(nutzung.sum() if hasattr(nutzung, "sum") else nutzung)
+    if _tiefe > 8:
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(v, _tiefe + 1) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        stichprobe = value[:_STICHPROBE]
+        teil = sum(estimate_size(v, _tiefe + 1) for v in stichprobe)
+        return sys.getsizeof(value) + (teil * len(value) // len(stichprobe) if stichprobe else 0)
+    if hasattr(value, "to_plotly_json"):
+        # Plotly-Figur: Spuren und Layout als Dicts bzw. Listen (ohne Validierung der Properties)
+        return estimate_size(getattr(value, "_data", None), _tiefe + 1) + estimate_size(
+            getattr(value, "_layout", None), _tiefe + 1) + sys.getsizeof(value)
+    return sys.getsizeof(value)
+
+# ------------------------------------------------------
+# Cache-Implementierung (Cache Implementation)
+# ------------------------------------------------------
+
+# Markiert einen Fehlzugriff (``None`` kann ein gültiger gecachter Wert sein)
+_MISS = object()
+
+class _Berechnung:
+    """Eine laufende Berechnung eines Schlüssels, auf deren Ergebnis weitere Aufrufer warten."""
+
+    def __init__(self):
+        self.fertig = threading.Event()
+        self.wert = _MISS
+
+class ResultCache:
+    """
+    Thread-sicherer LRU-Cache mit optionaler Lebensdauer (TTL) und Trefferstatistik.
+
+    Args:
+        max_entries (int): Maximale Anzahl an Einträgen, danach wird der am längsten
+                           nicht genutzte Eintrag verdrängt.
+        ttl_seconds (float): Lebensdauer eines Eintrags in Sekunden (``0`` = unbegrenzt).
+        max_bytes (int): Maximaler geschätzter Speicher aller Einträge (``None`` = unbegrenzt);
+                         größere Einzelwerte werden gar nicht erst abgelegt.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 3600, max_bytes: int = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # Schlüssel -> (Ablaufzeitpunkt, Wert, Bytes)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._laufend = {}  # Schlüssel -> _Berechnung (Single-Flight)
+        self._stats = {}  # Namensraum -> {"hits": ..., "misses": ...}
+        self.evictions = 0
+        self.waits = 0
+
+    def _remove(self, voller_key):
+        """Entfernt einen Eintrag samt seiner Bytes (Aufruf unter ``_lock``)."""
+        self._bytes -= self._entries.pop(voller_key)[2]
+
+    def _count(self, namespace: str, field: str):
+        zaehler = self._stats.setdefault(namespace, {"hits": 0, "misses": 0})
+        zaehler[field] += 1
+
+    def get(self, namespace: str, key, default=None):
+        """
+        Liefert den gecachten Wert für ``(namespace, key)`` und zählt Treffer bzw. Fehlzugriff.
+
+        Args:
+            namespace (str): Namensraum, typischerweise der Funktionsname.
+            key: Bereits normalisierter, hashbarer Schlüssel.
+            default: Rückgabewert, wenn kein gültiger Eintrag existiert.
+
+        Returns:
+            Der gecachte Wert oder ``default``.
+        """
+        voller_key = (namespace, key)
+        with self._lock:
+            eintrag = self._entries.get(voller_key)
+            if eintrag is not None and (eintrag[0] is None or eintrag[0] > time.monotonic()):
+                self._entries.move_to_end(voller_key)
+                self._count(namespace, "hits")
+                return eintrag[1]
+            if eintrag is not None:
+                self._remove(voller_key)  # abgelaufen
+            self._count(namespace, "misses")
+        return default
+
+    def put(self, namespace: str, key, value):
+        """
+        Legt ``value`` unter ``(namespace, key)`` ab und verdrängt bei Bedarf die ältesten Einträge.
+        Werte über ``max_bytes`` werden nicht abgelegt.
+
+        Args:
+            namespace (str): Namensraum, typischerweise der Funktionsname.
+            key: Bereits normalisierter, hashbarer Schlüssel.
+            value: Der zu cachende Wert.
+        """
+        ablauf = time.monotonic() + self.ttl_seconds if self.ttl_seconds > 0 else None
+        # Schätzung außerhalb des Locks (kann bei großen Figuren etwas dauern)
+        groesse = estimate_size(value) if self.max_bytes is not None else 0
+        voller_key = (namespace, key)
+        with self._lock:
+            if voller_key in self._entries:
+                self._remove(voller_key)
+            if self.max_bytes is not None and groesse > self.max_bytes:
+                self.evictions += 1
+                return
+            self._entries[voller_key] = (ablauf, value, groesse)
+            self._bytes += groesse
+            while len(self._entries) > self.max_entries or (self.max_bytes is not None and self._bytes > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def get_or_compute(self, namespace: str, key, compute):
+        """
+        Liefert den gecachten Wert für ``(namespace, key)`` oder berechnet ihn über ``compute()``.
+        Läuft die Berechnung desselben Schlüssels bereits in einem anderen Thread, wird auf
+        deren Ergebnis gewartet; schlägt sie fehl, rechnet einer der Wartenden selbst.
+
+        Args:
+            namespace (str): Namensraum, typischerweise der Funktionsname.
+            key: Bereits normalisierter, hashbarer Schlüssel.
+            compute (callable): Funktion ohne Argumente, die den Wert bei einem Fehlzugriff erzeugt.
+
+        Returns:
+            Der gecachte oder neu berechnete Wert.
+        """
+        voller_key = (namespace, key)
+        while True:
+            wert = self.get(namespace, key, _MISS)
+            if wert is not _MISS:
+                return wert
+            with self._lock:
+                berechnung = self._laufend.get(voller_key)
+                if berechnung is None:
+                    berechnung = self._laufend[voller_key] = _Berechnung()
+                    break
+                self.waits += 1
+            berechnung.fertig.wait()
+            if berechnung.wert is not _MISS:
+                return berechnung.wert
+
+        # Berechnung außerhalb des Locks, damit andere Schlüssel nicht blockieren
+        try:
+            wert = compute()
+            berechnung.wert = wert
+            self.put(namespace, key, wert)
+        finally:
+            with self._lock:
+                del self._laufend[voller_key]
+            berechnung.fertig.set()
+        return wert
+
+    def stats(self) -> dict:
+        """
+        Liefert Treffer-/Fehlzähler gesamt und je Namensraum.
+
+        Returns:
+            dict: "hits", "misses", "hit_rate", "entries", "bytes", "evictions", "waits" und "namespaces".
+        """
+        with self._lock:
+            namensraeume = {name: dict(werte) for name, werte in self._stats.items()}
+            eintraege = len(self._entries)
+            belegt = self._bytes
+        hits = sum(w["hits"] for w in namensraeume.values())
+        misses = sum(w["misses"] for w in namensraeume.values())
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "entries": eintraege,
+            "bytes": belegt,
+            "evictions": self.evictions,
+            "waits": self.waits,
+            "namespaces": namensraeume,
+        }
+
+    def clear(self):
+        """Leert den Cache und setzt alle Zähler zurück."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._stats.clear()
+            self.evictions = 0
+            self.waits = 0
+
+# Gemeinsame Instanz für alle Sitzungen des Prozesses
+RESULT_CACHE = ResultCache(
+    max_entries=int(os.environ.get("EXPO_CACHE_MAX_ENTRIES", 1024)),
+    ttl_seconds=float(os.environ.get("EXPO_CACHE_TTL_SECONDS", 3600)),
+    max_bytes=int(os.environ.get("EXPO_CACHE_MAX_BYTES", 512 * 1024 * 1024)),
+)
+
+def memoize(func=None, *, cache: ResultCache = None, namespace: str = None):
+    """
+    Dekorator, der die Ergebnisse einer Funktion im gemeinsamen Cache ablegt.
+    Der Schlüssel besteht aus dem Namensraum und den normalisierten Argumenten; gleichzeitige
+    Aufrufe mit demselben Schlüssel rechnen nur einmal (siehe :meth:`ResultCache.get_or_compute`).
+
+    Kann als ``@memoize`` oder ``@memoize(namespace="...")`` verwendet werden.
+
+    Args:
+        func (callable): Die zu cachende Funktion.
+        cache (ResultCache): Zu verwendender Cache, standardmäßig :data:`RESULT_CACHE`.
+        namespace (str): Namensraum für Schlüssel und Statistik, standardmäßig ``modul.funktion``.
+
+    Returns:
+        callable: Die gecachte Funktion; das Original ist als ``__wrapped__`` erreichbar.
+    """
+    if func is None:
+        return functools.partial(memoize, cache=cache, namespace=namespace)
+
+    name = namespace or f"{func.__module__}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        ziel = cache if cache is not None else RESULT_CACHE
+        key = (normalize_key(args), normalize_key(kwargs))
+        return ziel.get_or_compute(name, key, lambda: func(*args, **kwargs))
+
+    return wrapper
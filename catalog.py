@@ -0,0 +1,258 @@
+"""
+Referenzkatalog für Größenvergleiche ("5,2× Eiffelturm").
+
+Die Referenzen liegen als CSV in ``EXPO_CATALOG_FILE`` (Standard: ``data/vergleiche.csv``),
+eine Zeile je Objekt::
+
+    dimension,bezeichnung,wert,einheit,auswahl
+    masse,Eiffelturm,10100,t,schachbrett
+
+Beim ersten Zugriff wird der Katalog einmal pro Prozess geladen, jeder Wert in die
+Basiseinheit seiner Dimension umgerechnet (siehe :data:`EINHEITEN`) und je Dimension in
+einen nach Wert sortierten :class:`ReferenceIndex` gelegt. Die Suche nach der passenden
+Referenz ist dann eine Binärsuche (``bisect`` für Einzelwerte, ``np.searchsorted`` für
+ganze Arrays, z.B. alle Hover-Labels eines Charts in einem Aufruf).
+
+Die Vergleiche folgen :func:`formatting.best_comparison`: größte Referenz, die der Wert
+erreicht; kleinere Werte werden mit der kleinsten Referenz verglichen.
+"""
+
+import bisect
+import csv
+import functools
+import os
+
+import numpy as np
+
+import engine
+from formatting import format_number, format_numbers, magnitude_number
+
+CATALOG_FILE = os.environ.get(
+    "EXPO_CATALOG_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "vergleiche.csv")
+)
+
+# Dimension -> Einheit -> Faktor zur Basiseinheit (Faktor 1)
+EINHEITEN = {
+    "masse": {"mg": 1e-9, "g": 1e-6, "kg": 1e-3, "t": 1.0, "Mio. t": 1e6, "Mrd. t": 1e9, "Bio. t": 1e12},
+    "flaeche": {"cm²": 1e-4, "m²": 1.0, "ha": 1e4, "km²": 1e6, "Mio. km²": 1e12},
+    "bevoelkerung": {"Personen": 1.0, "Tsd.": 1e3, "Mio.": 1e6, "Mrd.": 1e9},
+    "geld": {"€": 1.0, "Tsd. €": 1e3, "Mio. €": 1e6, "Mrd. €": 1e9, "Bio. €": 1e12},
+    "volumen": {"ml": 1e-6, "l": 1e-3, "m³": 1.0, "Mio. m³": 1e6, "km³": 1e9, "Mio. km³": 1e15},
+}
+
+# ------------------------------------------------------
+# Einheiten (Units)
+# ------------------------------------------------------
+
+def base_unit(dimension: str) -> str:
+    """Basiseinheit einer Dimension, z.B. "t" für "masse"."""
+    return next(einheit for einheit, faktor in EINHEITEN[dimension].items() if faktor == 1.0)
+
+def convert(wert, von: str, nach: str, dimension: str):
+    """
+    Rechnet Werte zwischen zwei Einheiten derselben Dimension um.
+
+    Args:
+        wert (array_like): Wert(e) in der Einheit ``von``.
+        von (str): Ausgangseinheit.
+        nach (str): Zieleinheit.
+        dimension (str): Schlüssel in :data:`EINHEITEN`.
+
+    Returns:
+        Wert(e) in der Einheit ``nach`` (float bzw. np.ndarray).
+
+    Raises:
+        ValueError: Wenn eine Einheit nicht zur Dimension gehört.
+    """
+    einheiten = EINHEITEN[dimension]
+    for einheit in (von, nach):
+        if einheit not in einheiten:
+            raise ValueError(f"Unbekannte Einheit {einheit!r} für {dimension}, erlaubt: {', '.join(einheiten)}.")
+    faktor = einheiten[von] / einheiten[nach]
+    return np.asarray(wert, dtype=float) * faktor if np.ndim(wert) else float(wert) * faktor
+
+# ------------------------------------------------------
+# Sortierter Index je Dimension (Reference Index)
+# ------------------------------------------------------
+
+class ReferenceIndex:
+    """
+    Nach Wert sortierte Referenzen einer Dimension mit Binärsuche.
+
+    Args:
+        dimension (str): Schlüssel in :data:`EINHEITEN`.
+        referenzen (list[tuple[str, float]]): (Bezeichnung, Wert in der Basiseinheit).
+        auswahl (dict): Geschichte -> Bezeichnungen, die die Geschichte als feste Auswahl zeigt.
+    """
+
+    def __init__(self, dimension: str, referenzen: list[tuple[str, float]], auswahl: dict = None):
+        if not referenzen:
+            raise ValueError(f"Keine Referenzen für {dimension}.")
+        self.dimension = dimension
+        self.einheit = base_unit(dimension)
+        # Stabil sortiert: Bei gleichen Werten gewinnt wie in best_comparison die zuletzt genannte Referenz
+        sortiert = sorted(referenzen, key=lambda x: x[1])
+        self.bezeichnungen = [label for label, _ in sortiert]
+        self.werte = [float(wert) for _, wert in sortiert]
+        self._werte = np.array(self.werte)
+        self._log10_max = float(np.log10(self.werte[-1]))
+        self._auswahl = auswahl or {}
+
+    def __len__(self) -> int:
+        return len(self.werte)
+
+    def items(self, auswahl: str = None) -> list[tuple[str, float]]:
+        """
+        Referenzen als (Bezeichnung, Wert in der Basiseinheit), aufsteigend nach Wert.
+
+        Args:
+            auswahl (str): Nur die Referenzen, die diese Geschichte als feste Auswahl zeigt.
+
+        Returns:
+            list[tuple[str, float]]: Die Referenzen.
+        """
+        paare = zip(self.bezeichnungen, self.werte)
+        if auswahl is None:
+            return list(paare)
+        gewaehlt = self._auswahl.get(auswahl, ())
+        return [(label, wert) for label, wert in paare if label in gewaehlt]
+
+    def _to_base(self, werte, einheit: str):
+        return werte if einheit is None else convert(werte, einheit, self.einheit, self.dimension)
+
+    def best(self, wert: float, einheit: str = None) -> str:
+        """
+        Vergleichsstring für einen Einzelwert (z.B. "5,2× Eiffelturm").
+
+        Args:
+            wert (float): Der zu vergleichende Wert.
+            einheit (str): Einheit des Werts; Standard ist die Basiseinheit der Dimension.
+
+        Returns:
+            str: Ein Vergleichsstring.
+        """
+        wert = self._to_base(wert, einheit)
+        if wert <= 0:
+            return f"0× {self.bezeichnungen[0]}"
+        # Kleinere Werte (und nan) werden mit der kleinsten Referenz verglichen
+        i = bisect.bisect_right(self.werte, wert) - 1 if wert >= self.werte[0] else 0
+        return f"{format_number(wert / self.werte[i], 1)}× {self.bezeichnungen[i]}"
+
+    def lookup(self, werte, einheit: str = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Passende Referenz für ganze Arrays in einem Aufruf.
+
+        Args:
+            werte (array_like): Die zu vergleichenden Werte.
+            einheit (str): Einheit der Werte; Standard ist die Basiseinheit der Dimension.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Index der Referenz (siehe :attr:`bezeichnungen`) und
+            Faktor je Wert (0 für Werte ≤ 0).
+        """
+        werte = np.asarray(self._to_base(werte, einheit), dtype=float)
+        index = np.where(werte >= self._werte[0], np.searchsorted(self._werte, werte, side="right") - 1, 0)
+        faktoren = np.where(werte <= 0, 0.0, werte / self._werte[index])
+        return index, faktoren
+
+    def best_many(self, werte, einheit: str = None) -> list[str]:
+        """
+        Vergleichsstrings für ganze Arrays, identisch zu :meth:`best` je Wert.
+
+        Args:
+            werte (array_like): Die zu vergleichenden Werte (eindimensional).
+            einheit (str): Einheit der Werte; Standard ist die Basiseinheit der Dimension.
+
+        Returns:
+            list[str]: Ein Vergleichsstring je Wert.
+        """
+        werte = np.asarray(self._to_base(werte, einheit), dtype=float)
+        index, faktoren = self.lookup(werte)
+        faktoren = np.where(werte <= 0, "0", format_numbers(faktoren, 1))
+        return [f"{faktor}× {self.bezeichnungen[i]}" for faktor, i in zip(faktoren.tolist(), index.tolist())]
+
+    def best_many_log10(self, log10_werte, einheit: str = None, max_faktor_log10: float = None) -> list[str]:
+        """
+        Wie :meth:`best_many` für Werte, von denen nur der Zehnerlogarithmus bekannt ist
+        (siehe :func:`formatting.best_comparison_log10`): Jenseits von float64 wird mit der
+        größten Referenz verglichen und der Faktor über magnitude_number formatiert.
+
+        Args:
+            log10_werte (array_like): Zehnerlogarithmen der Werte (eindimensional).
+            einheit (str): Einheit der Werte; Standard ist die Basiseinheit der Dimension.
+            max_faktor_log10 (float): Optional. Faktoren ab 10^max_faktor_log10 (gegenüber der
+                                      größten Referenz) werden schon innerhalb von float64 über
+                                      magnitude_number formatiert, z.B. "1,34 × 10²⁴⁵" statt
+                                      245 ausgeschriebener Stellen – kurze Texte für Hover-Labels.
+
+        Returns:
+            list[str]: Ein Vergleichsstring je Wert.
+        """
+        log10_werte = np.asarray(log10_werte, dtype=float)
+        if einheit is not None:
+            log10_werte = log10_werte + np.log10(EINHEITEN[self.dimension][einheit])
+        exakt = log10_werte <= engine.EXAKT_MAX_LOG10
+        if max_faktor_log10 is not None:
+            exakt &= log10_werte < self._log10_max + max_faktor_log10
+        texte = np.empty(len(log10_werte), dtype=object)
+        # Potenz je Wert wie in best_comparison_log10, damit die letzte Stelle übereinstimmt
+        texte[exakt] = self.best_many([10 ** wert for wert in log10_werte[exakt].tolist()])
+        groesste = self.bezeichnungen[-1]
+        texte[~exakt] = [f"{magnitude_number(wert - self._log10_max)}× {groesste}" for wert in log10_werte[~exakt]]
+        return texte.tolist()
+
+    def best_log10(self, log10_wert: float, einheit: str = None) -> str:
+        """Wie :meth:`best_many_log10` für einen Einzelwert."""
+        return self.best_many_log10([log10_wert], einheit)[0]
+
+# ------------------------------------------------------
+# Katalog laden (Loading the Catalog)
+# ------------------------------------------------------
+
+def parse_catalog(pfad: str) -> dict:
+    """
+    Liest den Katalog aus einer CSV-Datei (Format siehe Modulbeschreibung).
+
+    Args:
+        pfad (str): Pfad der CSV-Datei.
+
+    Returns:
+        dict: Dimension -> :class:`ReferenceIndex`.
+
+    Raises:
+        ValueError: Bei unbekannten Dimensionen oder Einheiten und nicht positiven Werten.
+    """
+    with open(pfad, encoding="utf-8") as f:
+        zeilen = list(csv.DictReader(z for z in f if z.strip() and not z.startswith("#")))
+
+    referenzen = {dimension: [] for dimension in EINHEITEN}
+    auswahl = {dimension: {} for dimension in EINHEITEN}
+    for nummer, zeile in enumerate(zeilen, start=1):
+        dimension, label = zeile["dimension"].strip(), zeile["bezeichnung"].strip()
+        if dimension not in EINHEITEN:
+            raise ValueError(f"{pfad}, Eintrag {nummer}: unbekannte Dimension {dimension!r}.")
+        wert = convert(float(zeile["wert"]), zeile["einheit"].strip(), base_unit(dimension), dimension)
+        if not wert > 0:
+            raise ValueError(f"{pfad}, Eintrag {nummer}: Referenzwerte müssen positiv sein.")
+        referenzen[dimension].append((label, wert))
+        for geschichte in filter(None, (zeile.get("auswahl") or "").split("|")):
+            auswahl[dimension].setdefault(geschichte.strip(), set()).add(label)
+    return {dimension: ReferenceIndex(dimension, paare, auswahl[dimension])
+            for dimension, paare in referenzen.items() if paare}
+
+@functools.lru_cache(maxsize=None)
+def load_catalog(pfad: str = CATALOG_FILE) -> dict:
+    """
+    Lädt den Katalog einmal pro Prozess (nicht verändern).
+
+    Args:
+        pfad (str): Pfad der CSV-Datei.
+
+    Returns:
+        dict: Dimension -> :class:`ReferenceIndex`.
+    """
+    return parse_catalog(pfad)
+
+def index(dimension: str) -> ReferenceIndex:
+    """Sortierter Index einer Dimension des Standardkatalogs."""
+    return load_catalog()[dimension]
@@ -0,0 +1,256 @@
+"""
+Chart-Schicht der App: schlanke Plotly-Figuren für ``st.plotly_chart``.
+
+Jede Figur wird bei jedem (Fragment-)Rerun als vollständige JSON-Spezifikation an den
+Browser gesendet. Damit diese Payload auch bei langen Zeitreihen (tägliche Verzinsung
+über Jahrzehnte) klein bleibt, gilt hier:
+
+* Alle Figuren teilen ein einmal aufgebautes, schlankes Template (:func:`lean_template`):
+  das aktive Streamlit-Template, reduziert auf die verwendeten Trace-Typen, plus die
+  gemeinsamen Layout-Vorgaben (Legende, Hover). Einzelne Figuren setzen nur noch Titel
+  und Achsen.
+* Linien mit mehr als ``CHART_ZIEL_PUNKTE`` Punkten werden formerhaltend per
+  Largest-Triangle-Three-Buckets (:func:`lttb`) ausgedünnt.
+* Ab ``CHART_WEBGL_AB_PUNKTE`` Punkten je Figur werden WebGL-Traces (``Scattergl``)
+  verwendet, die der Browser deutlich schneller zeichnet als SVG.
+* Für den Abspielmodus erzeugt :func:`animate` alle Zwischenstände einmalig als
+  Plotly-Frames; das Abspielen läuft danach vollständig im Browser.
+
+Beide Schwellen lassen sich über ``EXPO_CHART_POINTS`` und ``EXPO_CHART_WEBGL_POINTS``
+anpassen.
+"""
+
+import functools
+import os
+
+import numpy as np
+# Bleibt ein Import auf Modulebene: ``import streamlit`` lädt plotly.graph_objects und plotly.io
+# ohnehin (streamlit 1.66), ein Import in den Figur-Funktionen spart in der App also nichts
+import plotly.graph_objects as go
+import plotly.io as pio
+
+# Zielanzahl an Punkten je Linie nach dem Ausdünnen (mehr ist auf einem Bildschirm nicht unterscheidbar)
+CHART_ZIEL_PUNKTE = int(os.environ.get("EXPO_CHART_POINTS", 800))
+
+# Ab dieser Gesamtzahl an Punkten je Figur werden WebGL- statt SVG-Traces erzeugt
+CHART_WEBGL_AB_PUNKTE = int(os.environ.get("EXPO_CHART_WEBGL_POINTS", 2_000))
+
+# Abspielmodus: höchstens so viele Frames, Punkte je Linie und Gesamtdauer eines Durchlaufs
+ANIMATION_MAX_FRAMES = 64
+ANIMATION_ZIEL_PUNKTE = 200
+ANIMATION_DAUER_MS = 6_000
+
+# Gemeinsame Layout-Vorgaben aller Charts
+_LAYOUT = dict(
+    legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+    hovermode="x unified" # Verbessert die Lesbarkeit beim Hovern über mehrere Linien
+)
+
+# ------------------------------------------------------
+# Template (Template)
+# ------------------------------------------------------
+
+@functools.lru_cache(maxsize=None)
+def lean_template(trace_typen: tuple = ("scatter",)) -> go.layout.Template:
+    """
+    Baut einmal pro Prozess (und Kombination von Trace-Typen) das gemeinsame Template.
+
+    Grundlage ist das beim ersten Aufruf aktive Plotly-Standard-Template (in der App das von
+    Streamlit registrierte, dessen Platzhalterfarben der Browser durch die Theme-Farben ersetzt).
+    Übernommen werden nur die Farbpalette und die Vorgaben der tatsächlich verwendeten
+    Trace-Typen; das vollständige Template würde sonst mit jeder Figur erneut übertragen.
+
+    Args:
+        trace_typen (tuple): Sortierte Trace-Typen der Figur, z.B. ``("heatmap", "scatter")``.
+
+    Returns:
+        go.layout.Template: Das schlanke Template.
+    """
+    name = pio.templates.default
+    basis = pio.templates[name] if name and name in pio.templates else go.layout.Template()
+    daten = {}
+    for typ in trace_typen:
+        # Scattergl teilt sich die Vorgaben mit Scatter, falls das Basis-Template keine eigenen hat
+        vorgaben = getattr(basis.data, typ) or (basis.data.scatter if typ == "scattergl" else ())
+        if vorgaben:
+            daten[typ] = [trace.to_plotly_json() for trace in vorgaben]
+    return go.layout.Template(data=daten, layout=dict(colorway=basis.layout.colorway, **_LAYOUT))
+
+def new_figure(data=None, **layout) -> go.Figure:
+    """
+    Erstellt eine leere bzw. mit ``data`` gefüllte Figur mit dem gemeinsamen Template. Das
+    Template enthält die Vorgaben für Linien (``scatter``) und für alle Trace-Typen in ``data``.
+
+    Args:
+        data: Trace oder Liste von Traces.
+        **layout: Weitere Layout-Eigenschaften, z.B. ``title`` oder ``xaxis_title``.
+
+    Returns:
+        go.Figure: Die Figur.
+    """
+    traces = [] if data is None else (list(data) if isinstance(data, (list, tuple)) else [data])
+    trace_typen = tuple(sorted({"scatter", *(trace.type for trace in traces)}))
+    return go.Figure(traces, layout=dict(template=lean_template(trace_typen), **layout))
+
+# ------------------------------------------------------
+# Ausdünnen (Downsampling)
+# ------------------------------------------------------
+
+def lttb(x, y, ziel_punkte: int = CHART_ZIEL_PUNKTE) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: wählt ``ziel_punkte`` Punkte so aus, dass die sichtbare
+    Form der Kurve (Knicke, Spitzen) erhalten bleibt. Erster und letzter Punkt bleiben immer.
+
+    Die Mittelwerte der Buckets werden vektorisiert vorberechnet; nur die Auswahl je Bucket,
+    die vom zuvor gewählten Punkt abhängt, läuft in einer Schleife über die Buckets.
+
+    Args:
+        x (array_like): Monoton steigende x-Werte.
+        y (array_like): y-Werte (für logarithmische Achsen bereits logarithmiert).
+        ziel_punkte (int): Gewünschte Anzahl an Punkten (mindestens 3).
+
+    Returns:
+        np.ndarray: Sortierte Indizes der ausgewählten Punkte.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if ziel_punkte >= n or ziel_punkte < 3 or not np.isfinite(y).all():
+        return np.arange(n)
+
+    # Bucket-Grenzen für die inneren Punkte 1 … n-2; Bucket i umfasst grenzen[i]:grenzen[i + 1]
+    grenzen = (np.floor(np.arange(ziel_punkte - 1) * (n - 2) / (ziel_punkte - 2)) + 1).astype(np.int64)
+    grenzen[-1] = n - 1
+    laengen = np.diff(grenzen)
+    mittel_x = np.add.reduceat(x[:-1], grenzen[:-1]) / laengen
+    mittel_y = np.add.reduceat(y[:-1], grenzen[:-1]) / laengen
+    # Für den letzten Bucket dient der letzte Punkt als "nächster Bucket"
+    mittel_x = np.append(mittel_x[1:], x[-1])
+    mittel_y = np.append(mittel_y[1:], y[-1])
+
+    auswahl = np.empty(ziel_punkte, dtype=np.int64)
+    auswahl[0], auswahl[-1] = 0, n - 1
+    a = 0
+    for i in range(ziel_punkte - 2):
+        von, bis = grenzen[i], grenzen[i + 1]
+        # Doppelte Dreiecksfläche aus gewähltem Punkt a, Kandidat und Mittel des nächsten Buckets
+        flaeche = np.abs((x[a] - mittel_x[i]) * (y[von:bis] - y[a]) - (x[a] - x[von:bis]) * (mittel_y[i] - y[a]))
+        a = von + int(np.argmax(flaeche))
+        auswahl[i + 1] = a
+    return auswahl
+
+# ------------------------------------------------------
+# Figuren (Figures)
+# ------------------------------------------------------
+
+def line_figure(x, linien: dict, titel: str, x_titel: str, y_titel: str, legenden_titel: str,
+                log_y: bool = False, ziel_punkte: int = CHART_ZIEL_PUNKTE) -> go.Figure:
+    """
+    Liniendiagramm mit einer Linie je Eintrag in ``linien``; lange Linien werden per
+    :func:`lttb` ausgedünnt, große Figuren als WebGL gezeichnet.
+
+    Args:
+        x (array_like): Gemeinsame x-Werte.
+        linien (dict): Name der Linie -> y-Werte.
+        titel (str): Titel des Charts.
+        x_titel (str): Beschriftung der x-Achse.
+        y_titel (str): Beschriftung der y-Achse.
+        legenden_titel (str): Überschrift der Legende.
+        log_y (bool): Logarithmische y-Achse.
+        ziel_punkte (int): Maximale Anzahl an Punkten je Linie.
+
+    Returns:
+        go.Figure: Die fertige Figur.
+    """
+    x = np.asarray(x)
+    punkte = []
+    for name, y in linien.items():
+        y = np.asarray(y)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            auswahl = lttb(x, np.log10(y) if log_y else y, ziel_punkte)
+        punkte.append((name, x[auswahl], y[auswahl]))
+
+    trace = go.Scattergl if sum(len(px) for _, px, _ in punkte) > CHART_WEBGL_AB_PUNKTE else go.Scatter
+    return new_figure(
+        [trace(x=px, y=py, mode="lines", name=name) for name, px, py in punkte],
+        title=titel,
+        xaxis_title=x_titel,
+        yaxis_title=y_titel,
+        yaxis_type="log" if log_y else None,
+        legend_title_text=legenden_titel,
+    )
+
+def _kompakt(werte: np.ndarray) -> np.ndarray:
+    """Gleitkommawerte als float32 (halbe Payload, ~7 gültige Stellen), sofern der Wertebereich es erlaubt."""
+    if werte.dtype.kind == "f" and len(werte) and np.nanmax(np.abs(werte)) < 1e30:
+        return werte.astype(np.float32)
+    return werte
+
+def animate(fig: go.Figure, schritt_label: str, stufen=None, beschriftung=None,
+            max_frames: int = ANIMATION_MAX_FRAMES, dauer_ms: int = ANIMATION_DAUER_MS) -> go.Figure:
+    """
+    Ergänzt eine fertige Figur um Plotly-Frames, die die Kurven Schritt für Schritt aufbauen,
+    sowie um Abspiel-/Pause-Knöpfe und einen Schieberegler. Alle Frames werden einmal
+    berechnet und mit der Figur übertragen; Abspielen und Vorspulen lösen keinen Rerun aus.
+
+    Die Achsen werden auf den Endstand fixiert, damit das Wachstum sichtbar "ausbricht",
+    statt durch mitwandernde Achsen verschluckt zu werden.
+
+    Args:
+        fig (go.Figure): Figur mit Linien- oder Balken-Traces über einer gemeinsamen x-Achse.
+        schritt_label (str): Bezeichnung eines Schritts im Regler, z.B. "Feld" oder "Jahr".
+        stufen (array_like): x-Werte, bis zu denen je ein Frame reicht; ``None`` für
+                             gleichmäßig verteilte x-Werte der Traces.
+        beschriftung (callable): Formatiert einen x-Wert für den Regler; Standard ``f"{x:g}"``.
+        max_frames (int): Höchstzahl an Frames bei automatisch gewählten Stufen.
+        dauer_ms (int): Dauer eines vollständigen Durchlaufs in Millisekunden.
+
+    Returns:
+        go.Figure: Dieselbe Figur mit Frames, Knöpfen und Regler.
+    """
+    beschriftung = beschriftung or (lambda wert: f"{wert:g}")
+    werte = [(np.asarray(trace.x), np.asarray(trace.y)) for trace in fig.data]
+    alle_x = np.unique(np.concatenate([x for x, _ in werte]))
+    if stufen is None:
+        stufen = alle_x[np.unique(np.round(np.linspace(0, len(alle_x) - 1, min(max_frames, len(alle_x)))).astype(int))]
+
+    namen = [beschriftung(stufe) for stufe in stufen]
+    fig.frames = [
+        go.Frame(name=name, data=[dict(type=trace.type, x=_kompakt(x[x <= stufe]), y=_kompakt(y[x <= stufe]))
+                                  for trace, (x, y) in zip(fig.data, werte)])
+        for name, stufe in zip(namen, stufen)
+    ]
+
+    # Achsen auf den Endstand fixieren (Balken brauchen eine halbe Breite Rand)
+    alle_y = np.concatenate([y for _, y in werte]).astype(float)
+    rand = 0.5 if any(trace.type == "bar" for trace in fig.data) else 0.0
+    fig.update_xaxes(range=[alle_x[0] - rand, alle_x[-1] + rand])
+    if fig.layout.yaxis.type == "log":
+        positiv = alle_y[alle_y > 0]
+        unten, oben = np.log10(positiv.min()), np.log10(positiv.max())
+        fig.update_yaxes(range=[unten - 0.05 * (oben - unten), oben + 0.05 * (oben - unten)])
+    else:
+        fig.update_yaxes(range=[min(0.0, np.nanmin(alle_y)), np.nanmax(alle_y) * 1.05])
+
+    schritt = dict(mode="immediate", frame=dict(duration=max(dauer_ms // len(namen), 20), redraw=True),
+                   transition=dict(duration=0))
+    fig.update_layout(
+        updatemenus=[dict(
+            type="buttons", direction="left", showactive=False, x=0, xanchor="left", y=-0.15, yanchor="top",
+            buttons=[
+                dict(label="▶ Abspielen", method="animate", args=[None, dict(schritt, fromcurrent=False)]),
+                dict(label="❚❚ Pause", method="animate",
+                     args=[[None], dict(mode="immediate", frame=dict(duration=0, redraw=False))]),
+            ],
+        )],
+        sliders=[dict(
+            active=len(namen) - 1, x=0.25, len=0.75, y=-0.1, yanchor="top",
+            currentvalue=dict(prefix=f"{schritt_label}: "),
+            steps=[dict(label=name, method="animate",
+                        args=[[name], dict(mode="immediate", frame=dict(duration=0, redraw=True),
+                                           transition=dict(duration=0))])
+                   for name in namen],
+        )],
+        margin=dict(b=120),
+    )
+    return fig
@@ -0,0 +1,190 @@
+"""
+Kohortenmodell für den SaaS-Hypergrowth (Tab 4).
+
+Die Engine rechnet den MRR als Zinseszinsreihe ``start_mrr * (1 + rate) ** t`` – ohne
+Kündigungen (Churn) und ohne Ausbau bestehender Kunden (Expansion). Hier setzt sich der
+MRR stattdessen aus Kundenkohorten zusammen:
+
+- In jedem Schritt kommt eine Kohorte mit dem Neukunden-MRR ``akquisition[s]`` hinzu.
+- Jede Kohorte folgt derselben Retentionskurve ``kernel[alter]``: Anteil ihres Start-MRR,
+  der nach ``alter`` Schritten (nach Churn, inklusive Expansion) noch erlöst wird.
+- Der Gesamt-MRR ist damit die Faltung ``Σ_s akquisition[s] · kernel[t - s]`` plus dem
+  Bestand zu Beginn, der mit der Retention reifer Kunden schrumpft bzw. wächst.
+
+Die Neukundenakquise wächst mit der Planrate und startet bei ``start_mrr · rate``: Ohne
+Churn und Expansion ergibt sich exakt die Planreihe von :func:`engine.saas_series`.
+
+Wie in der Engine ist die Zeitachse die *letzte* Achse, alle übrigen Parameter dürfen
+Arrays sein. Die Faltung läuft per FFT (auch bei wenigen Schritten schneller als direkt),
+sodass zehn Jahre in Tagesauflösung für tausende Varianten in einem Aufruf berechnet werden.
+"""
+
+import numpy as np
+
+# Schritte je Monat der wählbaren Zeitauflösungen
+AUFLOESUNGEN = {"monatlich": 1, "wöchentlich": 52 / 12, "täglich": 365 / 12}
+
+# Abklingzeit in Monaten des zusätzlichen Churns neuer Kunden (Onboarding-Phase)
+FRUEHCHURN_MONATE = 3.0
+
+# ------------------------------------------------------
+# Faltung und Retention (Convolution & Retention)
+# ------------------------------------------------------
+
+def convolve(akquisition, kernel) -> np.ndarray:
+    """
+    Abgeschnittene lineare Faltung ``Σ_s akquisition[s] · kernel[t - s]`` entlang der letzten
+    Achse per FFT; die übrigen Achsen werden nach den NumPy-Broadcasting-Regeln kombiniert.
+
+    Args:
+        akquisition (array_like): Zugänge je Schritt, Form ``(..., schritte)``.
+        kernel (array_like): Verlauf eines Zugangs über sein Alter, mindestens ``schritte`` lang.
+
+    Returns:
+        np.ndarray: Faltung der Form ``(*broadcast_shape, schritte)``.
+    """
+    akquisition = np.asarray(akquisition, dtype=float)
+    laenge = akquisition.shape[-1]
+    kernel = np.asarray(kernel, dtype=float)[..., :laenge]
+    # Nullauffüllung auf die nächste Zweierpotenz ≥ 2·laenge - 1 verhindert zyklische Überlappung
+    n = 1 << (2 * laenge - 2).bit_length()
+    return np.fft.irfft(np.fft.rfft(akquisition, n) * np.fft.rfft(kernel, n), n)[..., :laenge]
+
+def retention_kernel(schritte: int, churn, fruehchurn=0.0, expansion=0.0, schritte_pro_monat: float = 1) -> np.ndarray:
+    """
+    Retentionskurve einer Kohorte: Anteil ihres Start-MRR, der nach ``alter`` Schritten noch
+    erlöst wird. Im Monat kündigen ``churn + fruehchurn · exp(-alter / FRUEHCHURN_MONATE)``
+    Prozent der Kunden, die verbleibenden bauen ihren Umsatz um ``expansion`` Prozent aus.
+
+    Args:
+        schritte (int): Länge der Kurve (Alter 0 bis ``schritte - 1``).
+        churn (array_like): Monatlicher Churn reifer Kunden in Prozent.
+        fruehchurn (array_like): Zusätzlicher monatlicher Churn neuer Kunden in Prozent.
+        expansion (array_like): Monatliche Expansion verbleibender Kunden in Prozent.
+        schritte_pro_monat (float): Zeitauflösung, siehe :data:`AUFLOESUNGEN`.
+
+    Returns:
+        np.ndarray: Kurve der Form ``(*broadcast_shape, schritte)`` mit ``kernel[..., 0] == 1``.
+    """
+    alter_monate = np.arange(schritte) / schritte_pro_monat
+    churn = np.expand_dims(np.asarray(churn, dtype=float) / 100, -1)
+    fruehchurn = np.expand_dims(np.asarray(fruehchurn, dtype=float) / 100, -1)
+    expansion = np.expand_dims(np.asarray(expansion, dtype=float) / 100, -1)
+
+    kuendigung = np.minimum(churn + fruehchurn * np.exp(-alter_monate / FRUEHCHURN_MONATE), 1.0)
+    with np.errstate(divide="ignore"):
+        # Logarithmische Retention je Schritt; Monatsraten werden auf die Schrittweite umgerechnet
+        log_schritt = (np.log1p(-kuendigung) + np.log1p(expansion)) / schritte_pro_monat
+    kernel = np.ones(log_schritt.shape)
+    kernel[..., 1:] = np.exp(np.cumsum(log_schritt[..., :-1], axis=-1))
+    return kernel
+
+# ------------------------------------------------------
+# MRR aus Kohorten (MRR from Cohorts)
+# ------------------------------------------------------
+
+def mrr_series(start_mrr, monatliche_wachstumsrate, monate_planungszeitraum: int, churn, fruehchurn=0.0,
+               expansion=0.0, schritte_pro_monat: float = 1) -> dict:
+    """
+    MRR-Zeitreihe aus Kundenkohorten.
+
+    Args:
+        start_mrr (array_like): Startumsatz (MRR) in €, bildet die Bestandskohorte.
+        monatliche_wachstumsrate (array_like): Monatliches Wachstum der Neukundenakquise in Prozent.
+        monate_planungszeitraum (int): Planungszeitraum in Monaten (gemeinsame Zeitachse).
+        churn (array_like): Monatlicher Churn reifer Kunden in Prozent.
+        fruehchurn (array_like): Zusätzlicher monatlicher Churn neuer Kunden in Prozent.
+        expansion (array_like): Monatliche Expansion verbleibender Kunden in Prozent.
+        schritte_pro_monat (float): Zeitauflösung, siehe :data:`AUFLOESUNGEN`.
+
+    Returns:
+        dict: "monate" (Zeitachse in Monaten), "mrr", "mrr_bestand" (Anteil der Bestandskunden),
+        "mrr_plan" (ohne Churn und Expansion), "akquisition" (Neukunden-MRR je Schritt) und
+        "kernel" (Retentionskurve neuer Kohorten), jeweils mit der Zeit als letzter Achse.
+    """
+    schritte = int(round(monate_planungszeitraum * schritte_pro_monat))
+    t = np.arange(schritte + 1)
+    start_mrr = np.expand_dims(np.asarray(start_mrr, dtype=float), -1)
+    rate_monat = np.expand_dims(np.asarray(monatliche_wachstumsrate, dtype=float) / 100, -1)
+    rate = np.power(1 + rate_monat, 1 / schritte_pro_monat) - 1
+
+    # Neukunden-MRR je Schritt; Schritt 0 gehört allein dem Bestand
+    akquisition = np.where(t >= 1, start_mrr * rate * np.power(1 + rate, np.maximum(t - 1, 0)), 0.0)
+    kernel = retention_kernel(schritte + 1, churn, fruehchurn, expansion, schritte_pro_monat)
+    # Bestandskunden haben die Onboarding-Phase hinter sich: nur Churn und Expansion reifer Kunden
+    mrr_bestand = start_mrr * retention_kernel(schritte + 1, churn, 0.0, expansion, schritte_pro_monat)
+    # Die FFT kann Werte nahe null minimal ins Negative rechnen
+    mrr_neukunden = np.maximum(convolve(akquisition, kernel), 0.0)
+    return {
+        "monate": t / schritte_pro_monat,
+        "mrr": mrr_bestand + mrr_neukunden,
+        "mrr_bestand": mrr_bestand,
+        "mrr_plan": start_mrr * np.power(1 + rate, t),
+        "akquisition": akquisition,
+        "kernel": kernel,
+    }
+
+def mrr_final(start_mrr, monatliche_wachstumsrate, monate_planungszeitraum: int, churn, fruehchurn=0.0,
+              expansion=0.0, team_aktuelle_fte=0, mrr_pro_fte_produktivitaet=1, schritte_pro_monat: float = 1) -> dict:
+    """
+    Kennzahlen des Kohortenmodells am Ende des Planungszeitraums (broadcastfähig), analog zu
+    :func:`engine.saas_final`.
+
+    Args:
+        team_aktuelle_fte (array_like): Aktuelle Teamgröße in FTE.
+        mrr_pro_fte_produktivitaet (array_like): MRR, den eine FTE tragen kann.
+        Sonst siehe :func:`mrr_series`.
+
+    Returns:
+        dict: MRR am Ende mit und ohne Churn, Lücke zum Plan, Anteil des letzten Monats am
+        Wachstum, Net Revenue Retention reifer Kunden (12 Monate) sowie FTE-Bedarf.
+    """
+    reihen = mrr_series(start_mrr, monatliche_wachstumsrate, monate_planungszeitraum, churn, fruehchurn,
+                        expansion, schritte_pro_monat)
+    mrr = reihen["mrr"]
+    mrr_am_ende = mrr[..., -1]
+    mrr_plan_am_ende = reihen["mrr_plan"][..., -1]
+
+    kumulatives_wachstum = mrr_am_ende - np.asarray(start_mrr, dtype=float)
+    vormonat = mrr[..., max(mrr.shape[-1] - 1 - int(round(schritte_pro_monat)), 0)]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        anteil = np.where(kumulatives_wachstum > 0, (mrr_am_ende - vormonat) / kumulatives_wachstum, 0.0)
+
+    net_revenue_retention = ((1 - np.asarray(churn, dtype=float) / 100)
+                             * (1 + np.asarray(expansion, dtype=float) / 100)) ** 12
+    erforderliche_fte_am_ende = mrr_am_ende / np.asarray(mrr_pro_fte_produktivitaet, dtype=float)
+    return {
+        "mrr_am_ende": mrr_am_ende,
+        "mrr_plan_am_ende": mrr_plan_am_ende,
+        "luecke_zum_plan": mrr_plan_am_ende - mrr_am_ende,
+        "anteil_zuwachs_letzter_monat": anteil,
+        "net_revenue_retention": net_revenue_retention,
+        "erforderliche_fte_am_ende": erforderliche_fte_am_ende,
+        "zus_fte_benoetigt": np.maximum(erforderliche_fte_am_ende - np.asarray(team_aktuelle_fte, dtype=float), 0),
+    }
+
+def cohort_layers(start_mrr: float, monatliche_wachstumsrate: float, monate_planungszeitraum: int, churn: float,
+                  fruehchurn: float = 0.0, expansion: float = 0.0, schritte_pro_monat: float = 1,
+                  monate_je_schicht: int = 12) -> dict:
+    """
+    MRR je Akquisejahrgang für das Schichtdiagramm ("Layer Cake"): Alle Jahrgänge werden in
+    einem Aufruf von :func:`convolve` gefaltet.
+
+    Args:
+        monate_je_schicht (int): Monate, deren Neukunden eine Schicht bilden.
+        Sonst siehe :func:`mrr_series` (nur Skalare).
+
+    Returns:
+        dict: "monate", "mrr_bestand", "mrr_plan" und "schichten" (Form ``(jahrgaenge, schritte + 1)``).
+    """
+    reihen = mrr_series(start_mrr, monatliche_wachstumsrate, monate_planungszeitraum, churn, fruehchurn,
+                        expansion, schritte_pro_monat)
+    # Schritt s gehört zum Jahrgang ceil(s / Schritte je Schicht); Jahrgang 0 ist der Bestand
+    jahrgang = np.ceil(np.arange(len(reihen["monate"])) / (monate_je_schicht * schritte_pro_monat)).astype(int)
+    masken = jahrgang == np.arange(1, jahrgang[-1] + 1)[:, np.newaxis]
+    return {
+        "monate": reihen["monate"],
+        "mrr_bestand": reihen["mrr_bestand"],
+        "mrr_plan": reihen["mrr_plan"],
+        "schichten": np.maximum(convolve(reihen["akquisition"] * masken, reihen["kernel"]), 0.0),
+    }
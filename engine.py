@@ -0,0 +1,624 @@
+"""
+Rechenkern (Simulation Engine) für die vier Geschichten der App.
+
+Alle Modelle sind mit NumPy vektorisiert bzw. in geschlossener Form implementiert
+und kommen ohne Streamlit aus. Parameter dürfen Skalare oder Arrays sein; Arrays
+werden nach den üblichen NumPy-Broadcasting-Regeln kombiniert, sodass tausende
+Szenarien in einem einzigen Aufruf berechnet werden können.
+
+Konvention für Zeitreihen: Die Zeitachse ist immer die *letzte* Achse. Bei
+Array-Parametern hat das Ergebnis die Form ``(*broadcast_shape, schritte)``.
+"""
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    # pandas wird nur für die *_frame-Funktionen gebraucht und erst dort importiert (Kaltstart der App)
+    import pandas as pd
+
+# ------------------------------------------------------
+# Konstanten (Constants)
+# ------------------------------------------------------
+
+SCHACHBRETT_FELDER = 64
+GEWICHT_PRO_KORN_G = 0.025  # Gramm
+FLAECHE_PRO_KORN_CM2 = 0.3  # cm²
+
+# Bis zu dieser Zehnerpotenz werden Körnerzahlen als Zahl (int/float64) berechnet, darüber nur im Logarithmus
+EXAKT_MAX_LOG10 = 300
+
+# Maximale Anzahl an Punkten je Kurve im Schachbrett-Chart
+CHART_MAX_PUNKTE = 500
+
+# Zins- und Sparperioden pro Jahr für den Zinseszins-Vergleich
+ZINSPERIODEN = {"jährlich": 1, "quartalsweise": 4, "monatlich": 12, "täglich": 365}
+
+# ------------------------------------------------------
+# Interne Hilfsfunktionen (Internal Helpers)
+# ------------------------------------------------------
+
+def _growth_sum(rate, n):
+    """
+    Berechnet die geometrische Summe ``1 + q + ... + q^(n-1)`` mit ``q = 1 + rate``
+    numerisch stabil über ``expm1``/``log1p``. Für ``rate == 0`` ergibt sich ``n``.
+
+    Args:
+        rate (array_like): Wachstumsrate pro Periode als Dezimalzahl (0.07 = 7 %).
+        n (array_like): Anzahl der Perioden.
+
+    Returns:
+        np.ndarray: Die geometrische Summe.
+    """
+    rate = np.asarray(rate, dtype=float)
+    n = np.asarray(n, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        summe = np.expm1(n * np.log1p(rate)) / rate
+    return np.where(rate == 0, n, summe)
+
+def _log10_growth_sum(faktor, n):
+    """
+    Berechnet ``log10(1 + f + ... + f^(n-1))`` ohne Überlauf, auch wenn die Summe
+    selbst weit jenseits von float64 liegt. Für ``f == 1`` ergibt sich ``log10(n)``.
+
+    Args:
+        faktor (array_like): Faktor f pro Periode, größer als 0.
+        n (array_like): Anzahl der Perioden (mindestens 1).
+
+    Returns:
+        np.ndarray: Zehnerlogarithmus der geometrischen Summe.
+    """
+    faktor = np.asarray(faktor, dtype=float)
+    n = np.asarray(n, dtype=float)
+    ln_f = np.log(faktor)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        # f > 1: (f^n - 1) / (f - 1) = f^(n-1) * (1 - f^-n) / (1 - f^-1), es wird nie f^n gebildet
+        wachsend = (n - 1) * ln_f + np.log(-np.expm1(-n * ln_f)) - np.log(-np.expm1(-ln_f))
+        # f < 1: (1 - f^n) / (1 - f), hier kann nichts überlaufen
+        schrumpfend = np.log(-np.expm1(n * ln_f)) - np.log(-np.expm1(ln_f))
+    summe = np.where(faktor > 1, wachsend, schrumpfend) / np.log(10)
+    return np.where(faktor == 1, np.log10(n), summe)
+
+# ------------------------------------------------------
+# Tab 1: Schachbrett-Legende
+# ------------------------------------------------------
+
+def chessboard_log10(feld_nummer, faktor=2.0) -> dict:
+    """
+    Berechnet die Kennzahlen der Schachbrett-Legende im Logarithmus (Basis 10).
+    Damit bleiben auch Bretter mit Millionen Feldern oder beliebigen Vervielfachungs-
+    faktoren darstellbar, deren Körnerzahlen weit jenseits von float64 liegen.
+
+    Args:
+        feld_nummer (array_like): Feldnummer(n) ab 1.
+        faktor (array_like): Vervielfachung von Feld zu Feld (2 = Verdopplung), größer als 0.
+
+    Returns:
+        dict: log10 der Körner auf dem Feld, der kumulierten Körner, des Gewichts (t) und der Fläche (m²).
+    """
+    feld_nummer = np.asarray(feld_nummer, dtype=float)
+    log10_gesamt = _log10_growth_sum(faktor, feld_nummer)
+    return {
+        "log10_koerner_auf_feld": (feld_nummer - 1) * np.log10(faktor),
+        "log10_koerner_gesamt": log10_gesamt,
+        "log10_gewicht_tonnen": log10_gesamt + np.log10(GEWICHT_PRO_KORN_G / 1_000_000),
+        "log10_flaeche_m2": log10_gesamt + np.log10(FLAECHE_PRO_KORN_CM2 / 10_000),
+    }
+
+def chessboard_scene(feld_nummer: int, faktor: float = 2) -> dict:
+    """
+    Berechnet die Kennzahlen für ein einzelnes Feld. Solange die Werte als Zahl darstellbar
+    sind, werden sie bei ganzzahligem Faktor exakt (Python-Ganzzahlen) berechnet, damit die
+    "Exakt"-Angaben im UI nicht durch Gleitkomma-Rundung verfälscht werden. Darüber hinaus
+    sind nur die log10-Werte aus :func:`chessboard_log10` gesetzt, die übrigen Werte sind ``None``.
+
+    Args:
+        feld_nummer (int): Das betrachtete Feld (ab 1).
+        faktor (float): Vervielfachung von Feld zu Feld (2 = Verdopplung).
+
+    Returns:
+        dict: Körner auf dem Feld, kumulierte Körner, Gewicht in Tonnen und Fläche in m²
+              sowie deren log10-Werte.
+    """
+    szene = {key: float(wert) for key, wert in chessboard_log10(feld_nummer, faktor).items()}
+    if szene["log10_koerner_gesamt"] > EXAKT_MAX_LOG10:
+        return {**szene, "koerner_auf_feld": None, "koerner_gesamt": None, "gewicht_tonnen": None, "flaeche_m2": None}
+
+    if float(faktor).is_integer():
+        basis = int(faktor)
+        koerner_auf_feld = basis ** (feld_nummer - 1)
+        # Summe aller Körner bis zu diesem Feld (geometrische Reihe)
+        koerner_gesamt = (basis ** feld_nummer - 1) // (basis - 1) if basis != 1 else feld_nummer
+    else:
+        koerner_auf_feld = 10 ** szene["log10_koerner_auf_feld"]
+        koerner_gesamt = 10 ** szene["log10_koerner_gesamt"]
+    return {
+        **szene,
+        "koerner_auf_feld": koerner_auf_feld,
+        "koerner_gesamt": koerner_gesamt,
+        "gewicht_tonnen": koerner_gesamt * GEWICHT_PRO_KORN_G / 1_000_000,  # Gramm -> Tonnen
+        "flaeche_m2": koerner_gesamt * FLAECHE_PRO_KORN_CM2 / 10_000,  # cm² -> m²
+    }
+
+def chessboard_grains(feld_nummer, faktor=2.0) -> dict:
+    """
+    Vektorisierte Variante von :func:`chessboard_scene` für beliebig viele Felder (float64).
+    Jenseits von ca. 10^308 Körnern ergibt sich ``inf``; dafür :func:`chessboard_log10` verwenden.
+
+    Args:
+        feld_nummer (array_like): Feldnummer(n) ab 1.
+        faktor (array_like): Vervielfachung von Feld zu Feld (2 = Verdopplung).
+
+    Returns:
+        dict: Arrays für Körner auf dem Feld, kumulierte Körner, Gewicht (t) und Fläche (m²).
+    """
+    feld_nummer = np.asarray(feld_nummer, dtype=float)
+    with np.errstate(over="ignore"):
+        koerner_auf_feld = np.power(faktor, feld_nummer - 1)
+        koerner_gesamt = np.power(10.0, _log10_growth_sum(faktor, feld_nummer))
+    return {
+        "koerner_auf_feld": koerner_auf_feld,
+        "koerner_gesamt": koerner_gesamt,
+        "gewicht_tonnen": koerner_gesamt * GEWICHT_PRO_KORN_G / 1_000_000,
+        "flaeche_m2": koerner_gesamt * FLAECHE_PRO_KORN_CM2 / 10_000,
+    }
+
+def chessboard_series(feld_nummer: int = SCHACHBRETT_FELDER, faktor: float = 2.0, max_punkte: int = None) -> dict:
+    """
+    Zeitreihe der Schachbrett-Legende bis einschließlich ``feld_nummer`` im Logarithmus.
+    Bei mehr als ``max_punkte`` Feldern werden gleichmäßig verteilte Felder ausgewählt
+    (im Logarithmus ist die Kurve nahezu eine Gerade, es geht also nichts Sichtbares verloren);
+    der Speicherbedarf hängt dann nicht mehr von der Brettgröße ab.
+
+    Args:
+        feld_nummer (int): Letztes dargestellte Feld.
+        faktor (float): Vervielfachung von Feld zu Feld (2 = Verdopplung).
+        max_punkte (int): Maximale Anzahl an Punkten; ``None`` für alle Felder.
+
+    Returns:
+        dict: "felder", "log10_koerner_auf_feld" und "log10_koerner_gesamt".
+    """
+    if max_punkte is None or feld_nummer <= max_punkte:
+        felder = np.arange(1, feld_nummer + 1)
+    else:
+        felder = np.unique(np.round(np.linspace(1, feld_nummer, max_punkte)).astype(np.int64))
+    log10_werte = chessboard_log10(felder, faktor)
+    return {
+        "felder": felder,
+        "log10_koerner_auf_feld": log10_werte["log10_koerner_auf_feld"],
+        "log10_koerner_gesamt": log10_werte["log10_koerner_gesamt"],
+    }
+
+def chessboard_frame(feld_nummer: int = SCHACHBRETT_FELDER, faktor: float = 2.0,
+                     max_punkte: int = None) -> "pd.DataFrame":
+    """
+    Erstellt den DataFrame für den Schachbrett-Chart bis einschließlich ``feld_nummer``
+    (Auswahl der Felder wie in :func:`chessboard_series`).
+
+    Args:
+        feld_nummer (int): Letztes dargestellte Feld.
+        faktor (float): Vervielfachung von Feld zu Feld (2 = Verdopplung).
+        max_punkte (int): Maximale Anzahl an Zeilen; ``None`` für alle Felder.
+
+    Returns:
+        pd.DataFrame: Spalten "Feld", "Reiskörner" und "Kumuliert" (``inf`` jenseits von float64)
+                      sowie "log₁₀ Reiskörner" und "log₁₀ Kumuliert".
+    """
+    import pandas as pd
+
+    reihen = chessboard_series(feld_nummer, faktor, max_punkte)
+    with np.errstate(over="ignore"):
+        return pd.DataFrame({
+            "Feld": reihen["felder"],
+            "Reiskörner": np.power(10.0, reihen["log10_koerner_auf_feld"]),
+            "Kumuliert": np.power(10.0, reihen["log10_koerner_gesamt"]),
+            "log₁₀ Reiskörner": reihen["log10_koerner_auf_feld"],
+            "log₁₀ Kumuliert": reihen["log10_koerner_gesamt"],
+        })
+
+# ------------------------------------------------------
+# Tab 2: Zinseszins vs. Zeit (Compound Interest vs. Time)
+# ------------------------------------------------------
+
+def compound_interest_final(startkapital, sparrate, laufzeit, zinssatz, perioden_pro_jahr=1, vorschuessig=True,
+                            inflation=0.0, kosten=0.0, steuer=0.0) -> dict:
+    """
+    Geschlossene Form der Endwerte nach ``laufzeit`` Jahren; alle Parameter sind
+    broadcastfähig (auch die Laufzeit). Der Aufwand ist unabhängig von Laufzeit und
+    Zinsperiode (Rentenbarwertformel statt Schleife über die Perioden).
+
+    Lara zahlt pro Zinsperiode ``sparrate * 12 / perioden_pro_jahr`` ein und verzinst das
+    gesamte Kapital mit dem anteiligen Nominalzins (Standard: jährlich, Einzahlung zu
+    Periodenbeginn). Tim erhält nur einfache Zinsen auf das Startkapital.
+
+    Kosten (z.B. TER) mindern den Zins beider Anlagen. Die Kapitalertragsteuer fällt bei
+    Tim jährlich auf die ausgezahlten Zinsen an, bei Lara (thesaurierend) erst beim Verkauf
+    am Ende der Laufzeit. Mit Inflation werden alle Werte in heutiger Kaufkraft ausgewiesen.
+
+    Args:
+        startkapital (array_like): Startkapital in €.
+        sparrate (array_like): Monatliche Sparrate in €.
+        laufzeit (array_like): Laufzeit in Jahren.
+        zinssatz (array_like): Jährlicher Zinssatz in Prozent.
+        perioden_pro_jahr (array_like): Zins- und Sparperioden pro Jahr (1, 4, 12, 365, siehe ZINSPERIODEN).
+        vorschuessig (array_like): Einzahlung zu Beginn (True) oder am Ende (False) jeder Periode.
+        inflation (array_like): Jährliche Inflationsrate in Prozent.
+        kosten (array_like): Jährliche Kosten in Prozent des Kapitals.
+        steuer (array_like): Steuersatz auf Kapitalerträge in Prozent.
+
+    Returns:
+        dict: Endkapital Lara, Endkapital Tim und kumulierte Eigenleistung.
+    """
+    rate = (np.asarray(zinssatz, dtype=float) - np.asarray(kosten, dtype=float)) / 100
+    return compound_interest_from_factors(
+        startkapital, sparrate, laufzeit, rate, perioden_pro_jahr, vorschuessig, inflation, steuer,
+        **compound_interest_factors(rate, perioden_pro_jahr, laufzeit),
+    )
+
+def compound_interest_factors(rate, perioden_pro_jahr, laufzeit) -> dict:
+    """
+    Exponentielle Faktoren des Sparplans: Aufzinsung ``q^n`` und geometrische Summe
+    ``1 + q + ... + q^(n-1)`` mit ``q = 1 + rate / perioden_pro_jahr`` über ``n`` Perioden.
+
+    Args:
+        rate (array_like): Jährlicher Nettozins (nach Kosten) als Dezimalzahl.
+        perioden_pro_jahr (array_like): Zins- und Sparperioden pro Jahr.
+        laufzeit (array_like): Laufzeit in Jahren.
+
+    Returns:
+        dict: "aufzinsung" und "wachstum".
+    """
+    perioden_pro_jahr = np.asarray(perioden_pro_jahr, dtype=float)
+    periodenrate = np.asarray(rate, dtype=float) / perioden_pro_jahr
+    perioden = np.asarray(laufzeit, dtype=float) * perioden_pro_jahr
+    return {
+        "aufzinsung": np.power(1 + periodenrate, perioden),
+        "wachstum": _growth_sum(periodenrate, perioden),
+    }
+
+def compound_interest_from_factors(startkapital, sparrate, laufzeit, rate, perioden_pro_jahr, vorschuessig,
+                                   inflation, steuer, aufzinsung, wachstum) -> dict:
+    """
+    Setzt die Kennzahlen von :func:`compound_interest_final` aus den exponentiellen Faktoren
+    zusammen. Alles übrige ist linear in Startkapital und Sparrate, daher können die Faktoren
+    auch aus vorberechneten Tabellen stammen (siehe ``lookup``).
+
+    Args:
+        startkapital (array_like): Startkapital in €.
+        sparrate (array_like): Monatliche Sparrate in €.
+        laufzeit (array_like): Laufzeit in Jahren.
+        rate (array_like): Jährlicher Nettozins (nach Kosten) als Dezimalzahl.
+        perioden_pro_jahr (array_like): Zins- und Sparperioden pro Jahr.
+        vorschuessig (array_like): Einzahlung zu Beginn (True) oder am Ende (False) jeder Periode.
+        inflation (array_like): Jährliche Inflationsrate in Prozent.
+        steuer (array_like): Steuersatz auf Kapitalerträge in Prozent.
+        aufzinsung (array_like): ``q^n`` mit ``q = 1 + rate / perioden_pro_jahr`` und ``n`` Perioden.
+        wachstum (array_like): Geometrische Summe ``1 + q + ... + q^(n-1)``.
+
+    Returns:
+        dict: Endkapital Lara, Endkapital Tim und kumulierte Eigenleistung.
+    """
+    startkapital = np.asarray(startkapital, dtype=float)
+    jahressparrate = np.asarray(sparrate, dtype=float) * 12
+    laufzeit = np.asarray(laufzeit, dtype=float)
+    perioden_pro_jahr = np.asarray(perioden_pro_jahr, dtype=float)
+    steuersatz = np.asarray(steuer, dtype=float) / 100
+
+    # Nachschüssige Rente: s * (q^n - 1) / (q - 1); vorschüssig wird jede Rate eine Periode länger verzinst
+    zeitpunkt = np.where(vorschuessig, 1 + rate / perioden_pro_jahr, 1.0)
+    rente = jahressparrate / perioden_pro_jahr * zeitpunkt * wachstum
+    endkapital_lara = startkapital * aufzinsung + rente
+    eigenleistung = startkapital + jahressparrate * laufzeit
+    endkapital_lara = endkapital_lara - steuersatz * np.maximum(endkapital_lara - eigenleistung, 0)
+    zinsen_tim = startkapital * rate * laufzeit
+    endkapital_tim = eigenleistung + zinsen_tim - steuersatz * np.maximum(zinsen_tim, 0)
+
+    kaufkraft = np.power(1 + np.asarray(inflation, dtype=float) / 100, -laufzeit)
+    return {
+        "endkapital_lara": endkapital_lara * kaufkraft,
+        "endkapital_tim": endkapital_tim * kaufkraft,
+        "eigenleistung_kumuliert": eigenleistung * kaufkraft,
+    }
+
+def compound_interest_series(startkapital, sparrate, laufzeit: int, zinssatz, perioden_pro_jahr: int = 1,
+                             **optionen) -> dict:
+    """
+    Zeitreihen für Lara (Zinseszins), Tim (lineares Sparen) und die reine Eigenleistung
+    von Jahr 0 bis ``laufzeit``, ein Punkt je Zinsperiode (bei täglicher Verzinsung über
+    50 Jahre also gut 18.000 Punkte, vektorisiert ausgewertet).
+
+    Args:
+        startkapital (array_like): Startkapital in €.
+        sparrate (array_like): Monatliche Sparrate in €.
+        laufzeit (int): Laufzeit in Jahren (gemeinsame Zeitachse).
+        zinssatz (array_like): Jährlicher Zinssatz in Prozent.
+        perioden_pro_jahr (int): Zins- und Sparperioden pro Jahr (gemeinsame Zeitachse).
+        **optionen: Weitere Parameter von :func:`compound_interest_final` (Zahlungszeitpunkt,
+                    Inflation, Kosten, Steuer).
+
+    Returns:
+        dict: "jahre" sowie Arrays der Form ``(*broadcast_shape, laufzeit * perioden_pro_jahr + 1)``.
+    """
+    jahre = np.arange(laufzeit * perioden_pro_jahr + 1) / perioden_pro_jahr
+    # Parameter um eine Zeitachse erweitern, damit sie gegen ``jahre`` broadcasten
+    werte = compound_interest_final(
+        np.expand_dims(startkapital, -1),
+        np.expand_dims(sparrate, -1),
+        jahre,
+        np.expand_dims(zinssatz, -1),
+        perioden_pro_jahr,
+        **{name: np.expand_dims(wert, -1) for name, wert in optionen.items()},
+    )
+    return {
+        "jahre": jahre,
+        "kapital_zinseszins": werte["endkapital_lara"],
+        "kapital_lineares_sparen": werte["endkapital_tim"],
+        "eingezahlt_total": werte["eigenleistung_kumuliert"],
+    }
+
+def compound_interest_frame(startkapital: float, sparrate: float, laufzeit: int, zinssatz: float,
+                            perioden_pro_jahr: int = 1, reihen: dict = None, **optionen) -> "pd.DataFrame":
+    """
+    Erstellt den DataFrame für den Zinseszins-Chart eines einzelnen Szenarios.
+
+    Args:
+        startkapital (float): Startkapital in €.
+        sparrate (float): Monatliche Sparrate in €.
+        laufzeit (int): Laufzeit in Jahren.
+        zinssatz (float): Jährlicher Zinssatz in Prozent.
+        perioden_pro_jahr (int): Zins- und Sparperioden pro Jahr.
+        reihen (dict): Bereits berechnete Zeitreihen (z.B. aus ``lookup``), sonst per :func:`compound_interest_series`.
+        **optionen: Weitere Parameter von :func:`compound_interest_final`.
+
+    Returns:
+        pd.DataFrame: Spalten "Jahr", "Zinseszins (Lara)", "Nur eingezahlt", "Lineares Sparen (Tim)".
+    """
+    import pandas as pd
+
+    if reihen is None:
+        reihen = compound_interest_series(startkapital, sparrate, laufzeit, zinssatz, perioden_pro_jahr, **optionen)
+    return pd.DataFrame({
+        "Jahr": reihen["jahre"],
+        "Zinseszins (Lara)": reihen["kapital_zinseszins"],
+        "Nur eingezahlt": reihen["eingezahlt_total"],
+        "Lineares Sparen (Tim)": reihen["kapital_lineares_sparen"],
+    })
+
+# ------------------------------------------------------
+# Tab 3: Viraler Dominoeffekt (Viral Domino Effect)
+# ------------------------------------------------------
+
+def viral_final(starter_personen, multiplikator, anzahl_wellen) -> dict:
+    """
+    Geschlossene Form der Reichweite nach ``anzahl_wellen`` Wellen (broadcastfähig).
+
+    Welle ``i`` (ab 0) erreicht ``starter_personen * multiplikator ** i`` neue Personen.
+
+    Args:
+        starter_personen (array_like): Initiale Personen.
+        multiplikator (array_like): Multiplikator pro Welle.
+        anzahl_wellen (array_like): Anzahl der Wellen.
+
+    Returns:
+        dict: Gesamtreichweite, Personen der letzten Welle und deren Anteil an der Gesamtreichweite.
+    """
+    return viral_from_factors(starter_personen, anzahl_wellen, **viral_factors(multiplikator, anzahl_wellen))
+
+def viral_factors(multiplikator, anzahl_wellen) -> dict:
+    """
+    Exponentielle Faktoren der Reichweite: ``1 + m + ... + m^(n-1)`` und ``m^(n-1)``.
+
+    Args:
+        multiplikator (array_like): Multiplikator pro Welle.
+        anzahl_wellen (array_like): Anzahl der Wellen.
+
+    Returns:
+        dict: "summe" und "letzte_potenz".
+    """
+    multiplikator = np.asarray(multiplikator, dtype=float)
+    anzahl_wellen = np.asarray(anzahl_wellen, dtype=float)
+    return {
+        "summe": _growth_sum(multiplikator - 1, anzahl_wellen),
+        "letzte_potenz": np.power(multiplikator, anzahl_wellen - 1),
+    }
+
+def viral_from_factors(starter_personen, anzahl_wellen, summe, letzte_potenz) -> dict:
+    """
+    Setzt die Kennzahlen von :func:`viral_final` aus den exponentiellen Faktoren zusammen
+    (linear in den Startpersonen, die Faktoren können aus ``lookup`` stammen).
+
+    Args:
+        starter_personen (array_like): Initiale Personen.
+        anzahl_wellen (array_like): Anzahl der Wellen.
+        summe (array_like): ``1 + m + ... + m^(n-1)`` für Multiplikator ``m`` und ``n`` Wellen.
+        letzte_potenz (array_like): ``m^(n-1)``.
+
+    Returns:
+        dict: Gesamtreichweite, Personen der letzten Welle und deren Anteil an der Gesamtreichweite.
+    """
+    starter_personen = np.asarray(starter_personen, dtype=float)
+    gesamt = starter_personen * summe
+    letzte_welle = np.where(np.asarray(anzahl_wellen) > 0, starter_personen * letzte_potenz, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        anteil = np.where(gesamt != 0, letzte_welle / gesamt, 0.0)
+    return {
+        "gesamt_personen_erreicht": gesamt,
+        "personen_letzte_welle": letzte_welle,
+        "anteil_letzte_welle_gesamt": anteil,
+    }
+
+def viral_series(starter_personen, multiplikator, anzahl_wellen: int) -> dict:
+    """
+    Zeitreihen der neu und kumuliert erreichten Personen je Welle.
+
+    Args:
+        starter_personen (array_like): Initiale Personen.
+        multiplikator (array_like): Multiplikator pro Welle.
+        anzahl_wellen (int): Anzahl der Wellen (gemeinsame Zeitachse).
+
+    Returns:
+        dict: "runden" (1-basiert) sowie Arrays der Form ``(*broadcast_shape, anzahl_wellen)``.
+    """
+    runden = np.arange(1, anzahl_wellen + 1)
+    neu = np.expand_dims(np.asarray(starter_personen, dtype=float), -1) * np.power(
+        np.expand_dims(np.asarray(multiplikator, dtype=float), -1), runden - 1
+    )
+    return {
+        "runden": runden,
+        "neu_erreicht_pro_runde": neu,
+        "kumulativ_erreicht": np.cumsum(neu, axis=-1),
+    }
+
+def viral_frame(starter_personen: float, multiplikator: float, anzahl_wellen: int, reihen: dict = None) -> "pd.DataFrame":
+    """
+    Erstellt den DataFrame für den Wellen-Chart eines einzelnen Szenarios.
+
+    Args:
+        starter_personen (float): Initiale Personen.
+        multiplikator (float): Multiplikator pro Welle.
+        anzahl_wellen (int): Anzahl der Wellen.
+        reihen (dict): Bereits berechnete Zeitreihen (z.B. aus ``lookup``), sonst per :func:`viral_series`.
+
+    Returns:
+        pd.DataFrame: Spalten "Runde", "Neu erreicht" und "Gesamt erreicht".
+    """
+    import pandas as pd
+
+    if reihen is None:
+        reihen = viral_series(starter_personen, multiplikator, anzahl_wellen)
+    return pd.DataFrame({
+        "Runde": reihen["runden"],
+        "Neu erreicht": reihen["neu_erreicht_pro_runde"],
+        "Gesamt erreicht": reihen["kumulativ_erreicht"],
+    })
+
+# ------------------------------------------------------
+# Tab 4: SaaS-Hypergrowth (SaaS Hypergrowth)
+# ------------------------------------------------------
+
+def saas_final(start_mrr, monatliche_wachstumsrate, monate_planungszeitraum, lineares_ziel_delta_mrr,
+               team_aktuelle_fte=0, mrr_pro_fte_produktivitaet=1) -> dict:
+    """
+    Geschlossene Form der SaaS-Kennzahlen am Ende des Planungszeitraums (broadcastfähig).
+
+    Args:
+        start_mrr (array_like): Startumsatz (MRR) in €.
+        monatliche_wachstumsrate (array_like): Monatliches Wachstum in Prozent.
+        monate_planungszeitraum (array_like): Planungszeitraum in Monaten.
+        lineares_ziel_delta_mrr (array_like): Linearer Zuwachs des MRR pro Monat in €.
+        team_aktuelle_fte (array_like): Aktuelle Teamgröße in FTE.
+        mrr_pro_fte_produktivitaet (array_like): MRR, den eine FTE tragen kann.
+
+    Returns:
+        dict: MRR exponentiell/linear, Anteil des letzten Monats am Wachstum sowie FTE-Bedarf.
+    """
+    return saas_from_factors(start_mrr, monatliche_wachstumsrate, monate_planungszeitraum, lineares_ziel_delta_mrr,
+                             team_aktuelle_fte, mrr_pro_fte_produktivitaet,
+                             **saas_factors(monatliche_wachstumsrate, monate_planungszeitraum))
+
+def saas_factors(monatliche_wachstumsrate, monate_planungszeitraum) -> dict:
+    """
+    Exponentieller Wachstumsfaktor ``(1 + rate) ** monate`` des MRR.
+
+    Args:
+        monatliche_wachstumsrate (array_like): Monatliches Wachstum in Prozent.
+        monate_planungszeitraum (array_like): Planungszeitraum in Monaten.
+
+    Returns:
+        dict: "wachstum".
+    """
+    rate = np.asarray(monatliche_wachstumsrate, dtype=float) / 100
+    return {"wachstum": np.power(1 + rate, np.asarray(monate_planungszeitraum, dtype=float))}
+
+def saas_from_factors(start_mrr, monatliche_wachstumsrate, monate_planungszeitraum, lineares_ziel_delta_mrr,
+                      team_aktuelle_fte, mrr_pro_fte_produktivitaet, wachstum) -> dict:
+    """
+    Setzt die Kennzahlen von :func:`saas_final` aus dem Wachstumsfaktor zusammen
+    (linear im Startumsatz, der Faktor kann aus ``lookup`` stammen).
+
+    Args:
+        start_mrr (array_like): Startumsatz (MRR) in €.
+        monatliche_wachstumsrate (array_like): Monatliches Wachstum in Prozent.
+        monate_planungszeitraum (array_like): Planungszeitraum in Monaten.
+        lineares_ziel_delta_mrr (array_like): Linearer Zuwachs des MRR pro Monat in €.
+        team_aktuelle_fte (array_like): Aktuelle Teamgröße in FTE.
+        mrr_pro_fte_produktivitaet (array_like): MRR, den eine FTE tragen kann.
+        wachstum (array_like): ``(1 + rate) ** monate``.
+
+    Returns:
+        dict: MRR exponentiell/linear, Anteil des letzten Monats am Wachstum sowie FTE-Bedarf.
+    """
+    start_mrr = np.asarray(start_mrr, dtype=float)
+    rate = np.asarray(monatliche_wachstumsrate, dtype=float) / 100
+    monate = np.asarray(monate_planungszeitraum, dtype=float)
+
+    gesamt_mrr_exponentiell = start_mrr * wachstum
+    gesamt_mrr_linear = start_mrr + np.asarray(lineares_ziel_delta_mrr, dtype=float) * monate
+
+    kumulatives_wachstum_gesamt = gesamt_mrr_exponentiell - start_mrr
+    # Wachstum im letzten Monat des Planungszeitraums
+    zuwachs_letzter_monat = np.where(monate >= 1, gesamt_mrr_exponentiell * rate / (1 + rate), 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        anteil = np.where(kumulatives_wachstum_gesamt > 0, zuwachs_letzter_monat / kumulatives_wachstum_gesamt, 0.0)
+
+    erforderliche_fte_am_ende = gesamt_mrr_exponentiell / np.asarray(mrr_pro_fte_produktivitaet, dtype=float)
+    return {
+        "gesamt_mrr_exponentiell": gesamt_mrr_exponentiell,
+        "gesamt_mrr_linear": gesamt_mrr_linear,
+        "kumulatives_wachstum_gesamt": kumulatives_wachstum_gesamt,
+        "anteil_zuwachs_letzter_monat": anteil,
+        "erforderliche_fte_am_ende": erforderliche_fte_am_ende,
+        "zus_fte_benoetigt": np.maximum(erforderliche_fte_am_ende - np.asarray(team_aktuelle_fte, dtype=float), 0),
+    }
+
+def saas_series(start_mrr, monatliche_wachstumsrate, monate_planungszeitraum: int, lineares_ziel_delta_mrr) -> dict:
+    """
+    Monatliche MRR-Zeitreihen für exponentielles Wachstum und das lineare Ziel.
+
+    Args:
+        start_mrr (array_like): Startumsatz (MRR) in €.
+        monatliche_wachstumsrate (array_like): Monatliches Wachstum in Prozent.
+        monate_planungszeitraum (int): Planungszeitraum in Monaten (gemeinsame Zeitachse).
+        lineares_ziel_delta_mrr (array_like): Linearer Zuwachs des MRR pro Monat in €.
+
+    Returns:
+        dict: "monate" sowie Arrays der Form ``(*broadcast_shape, monate_planungszeitraum + 1)``.
+    """
+    monate = np.arange(monate_planungszeitraum + 1)
+    werte = saas_final(
+        np.expand_dims(start_mrr, -1),
+        np.expand_dims(monatliche_wachstumsrate, -1),
+        monate,
+        np.expand_dims(lineares_ziel_delta_mrr, -1),
+    )
+    return {
+        "monate": monate,
+        "mrr_exponentiell": werte["gesamt_mrr_exponentiell"],
+        "mrr_linear": werte["gesamt_mrr_linear"],
+    }
+
+def saas_frame(start_mrr: float, monatliche_wachstumsrate: float, monate_planungszeitraum: int,
+               lineares_ziel_delta_mrr: float, reihen: dict = None) -> "pd.DataFrame":
+    """
+    Erstellt den DataFrame für den MRR-Chart eines einzelnen Szenarios.
+
+    Args:
+        start_mrr (float): Startumsatz (MRR) in €.
+        monatliche_wachstumsrate (float): Monatliches Wachstum in Prozent.
+        monate_planungszeitraum (int): Planungszeitraum in Monaten.
+        lineares_ziel_delta_mrr (float): Linearer Zuwachs des MRR pro Monat in €.
+        reihen (dict): Bereits berechnete Zeitreihen (z.B. aus ``lookup``), sonst per :func:`saas_series`.
+
+    Returns:
+        pd.DataFrame: Spalten "Monat", "Exponentielles Wachstum" und "Lineares Ziel".
+    """
+    import pandas as pd
+
+    if reihen is None:
+        reihen = saas_series(start_mrr, monatliche_wachstumsrate, monate_planungszeitraum, lineares_ziel_delta_mrr)
+    return pd.DataFrame({
+        "Monat": reihen["monate"],
+        "Exponentielles Wachstum": reihen["mrr_exponentiell"],
+        "Lineares Ziel": reihen["mrr_linear"],
+    })
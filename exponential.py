@@ -1,6 +1,26 @@
+import uuid
+
 import streamlit as st
-import pandas as pd
-import plotly.express as px
+import numpy as np
+# Von streamlit bereits geladen (siehe charts), daher kein verzögerter Import
+import plotly.graph_objects as go
+
+import anytime
+import assets
+import backtest
+import cache
+import catalog
+import charts
+import branching
+import cohorts
+import engine
+import goalseek
+import instrumentation
+from formatting import format_number, format_numbers, human_number, magnitude_number, scientific_number
+import lookup
+import montecarlo
+import network
+import sweep
 
 # ------------------------------------------------------
 # Seiteneinstellungen & Formatierung (Page Settings & Styling)
@@ -11,270 +31,994 @@ st.set_page_config(
     page_icon="🚀"
 )
 
-# Custom CSS für ein ansprechendes dunkles Theme und verbesserte Lesbarkeit
-# Die Verwendung von unsafe_allow_html=True ist hier unkritisch,
-# da der CSS-Inhalt statisch ist und nicht von Benutzereingaben stammt,
-# wodurch kein Sicherheitsrisiko (z.B. XSS) entsteht.
-st.markdown(
+def profiling_enabled() -> bool:
     """
-    <style>
-        /* BASE STYLES FÜR DEN GESAMTEN BODY */
-        body {
-            background: #10131a; /* Sehr dunkler Hintergrund für guten Kontrast */
-            color: #f5f7fb; /* Standardtextfarbe: sehr helles Grau */
-            font-family: 'Inter', 'Segoe UI', 'Roboto', 'Helvetica Neue', Arial, sans-serif; /* Moderne, gut lesbare Sans-Serif-Schriften */
-            line-height: 1.6; /* Verbesserter Zeilenabstand für bessere Lesbarkeit von Textblöcken */
-            font-size: 1rem; /* Basis-Schriftgröße (oft 16px), gut lesbar */
-        }
-        
-        /* Allgemeine Absatzstile für konsistente Lesbarkeit */
-        p {
-            line-height: 1.6; /* Übernimmt Zeilenabstand vom Body, kann hier spezifisch angepasst werden */
-            margin-bottom: 0.8em; /* Abstand zwischen Absätzen für bessere Texttrennung */
-        }
+    Ob die Laufzeitmessung für diese Sitzung aktiv ist: für alle Sitzungen per ``EXPO_PROFILE=1``
+    oder einzeln per Query-Parameter ``?profil=1`` (siehe instrumentation).
+    """
+    return instrumentation.ENABLED or st.query_params.get("profil") == "1"
 
-        /* STREAMLIT BLOCK CONTAINER OVERRIDES (Hauptinhaltsbereich) */
-        .block-container {
-            padding-top: 2rem;
-            padding-bottom: 2rem;
-            color: #f5f7fb; /* Stellt sicher, dass Text im Hauptinhaltsbereich hell ist */
-        }
+# Ohne aktive Messung kosten die Abschnitte unten nur einen Attributzugriff
+instrumentation.start_run(profiling_enabled())
 
-        /* SPEZIFISCHE TEXTELEMENTE & KOMPONENTEN */
-        .headline-gradient {
-            font-size: 3rem;
-            font-weight: 800;
-            background: -webkit-linear-gradient(120deg, #9be15d, #00c6ff);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            text-align: center;
-            margin-bottom: 0.3rem;
-        }
-        .subheadline {
-            text-align: center;
-            font-size: 1.2rem;
-            color: #d0d4e4; /* Helleres Grau, guter Kontrast */
-            margin-bottom: 2rem;
-        }
-        .intro-card {
-            background: linear-gradient(135deg, rgba(105,130,255,0.25), rgba(0,28,70,0.55));
-            border-radius: 16px;
-            padding: 1.1rem 1.6rem;
-            margin-bottom: 1.2rem;
-            box-shadow: 0 12px 35px rgba(0,0,0,0.35);
-        }
-        .story-card {
-            background: linear-gradient(135deg, rgba(180,192,255,0.16), rgba(55,76,128,0.12));
-            border-radius: 18px;
-            padding: 1.5rem 2rem;
-            box-shadow: 0 14px 45px rgba(15, 32, 67, 0.35);
-            margin-bottom: 1.5rem;
-            color: #f5f7fb;
-        }
-        .story-quote {
-            font-style: italic;
-            color: #d8def2; /* Leicht bläuliches Hellgrau für Zitate */
-        }
-        .metric-container .stMetric {
-            background: rgba(10,15,25,0.75);
-            border-radius: 16px;
-            padding: 1.1rem;
-            box-shadow: inset 0 0 0 1px rgba(155,225,93,0.25);
-            color: #f5f7fb; /* Sicherstellen, dass Metrik-Werte hell sind */
-        }
-        .footer-message {
-            text-align: center;
-            font-size: 1.15rem;
-            color: #9be15d; /* Helles Grün, guter Kontrast und Akzentfarbe */
-            font-weight: 600;
-        }
+# Custom CSS für ein ansprechendes dunkles Theme und verbesserte Lesbarkeit (static/app.css).
+# Das Stylesheet wird als statische Datei verlinkt: Der Browser lädt es einmal und hält es im Cache,
+# pro Skriptlauf wird nur noch das kurze <link>-Tag gesendet. Der Inhalt ist statisch und stammt
+# nicht von Benutzereingaben, unsafe_allow_html=True ist daher unkritisch.
+with instrumentation.section("css"):
+    st.markdown(assets.stylesheet_html(st.get_option("server.enableStaticServing")), unsafe_allow_html=True)
 
-        /* BILDER UND BILDUNTERSCHRIFTEN */
-        .image-frame {
-            width: 100%;
-            padding-top: 56%; /* Behält ein Seitenverhältnis von ca. 16:9 bei */
-            border-radius: 18px;
-            background-size: cover;
-            background-position: center;
-            box-shadow: 0 18px 45px rgba(0,0,0,0.45);
-            margin-bottom: 0.6rem;
-        }
-        .image-caption {
-            text-align: center;
-            font-size: 1rem; /* Leicht erhöht für bessere Lesbarkeit von Captions */
-            color: #d0d4e4; /* Helleres Grau, guter Kontrast */
-            margin-bottom: 1.5rem;
-            line-height: 1.4; /* Etwas strafferer Zeilenabstand für Captions */
-        }
+# ------------------------------------------------------
+# UI-Hilfskomponenten (UI Helper Components)
+# Abstraktion für häufige UI-Muster zur Verbesserung der Lesbarkeit und Konsistenz.
+# ------------------------------------------------------
 
-        /* STREAMLIT SPEZIFISCHE KOMPONENTEN (ANPASSUNGEN FÜR LESBARKEIT) */
-        .st-expander {
-            background: rgba(15, 25, 42, 0.65);
-            border-radius: 0.5rem; /* Runde Ecken passend zu anderen Komponenten */
-            border: 1px solid rgba(155,225,93,0.15); /* Dezenter Rahmen */
-        }
-        .st-expander details {
-            padding: 0.5rem 1rem;
-            color: #f5f7fb; /* Farbe des Summary-Textes im Expander */
-        }
-        .st-expander details summary::marker {
-            color: #9be15d; /* Farbe des Auf-/Zuklappfeils */
-        }
-        /* Sicherstellen, dass der Inhalt innerhalb des Expanders auch gut lesbar ist */
-        .streamlit-expanderContent {
-            color: #f5f7fb; /* Textfarbe für den Inhalt des Expanders */
-            line-height: 1.6; /* Konsistenter Zeilenabstand */
-            padding: 0.5rem 1rem 1rem; /* Innenabstand */
-        }
+def render_cover_image(bild: str, caption: str, sizes: str = "100vw", eager: bool = False):
+    """
+    Rendert ein gestyltes Titelbild mit Bildunterschrift. Der Browser wählt Format und
+    Breite aus den lokal ausgelieferten Varianten (siehe assets).
 
-        /* Anpassung für Streamlit's Standard-Captions (z.B. von st.caption) */
-        /* Targets Streamlit's internal CSS structure for captions. May need adjustment with Streamlit updates. */
-        div[data-testid="caption"] p, /* Häufig verwendeter Selector für st.caption */
-        .st-emotion-cache-1wv0jxv.e1nzilhr0 { /* Fallback für Streamlit's generierte Klassen */
-            font-size: 0.95rem !important; /* Etwas größer als Streamlit's Standard (ca. 0.875rem) */
-            color: #d0d4e4 !important; /* Sicherstellen, dass Captions hell genug sind */
-            line-height: 1.4 !important; /* Etwas straffer für Captions */
-        }
+    Args:
+        bild (str): Schlüssel des Bildes in assets.IMAGE_SOURCES.
+        caption (str): Die Bildunterschrift.
+        sizes (str): Angezeigte Breite des Bildes (HTML-Attribut ``sizes``).
+        eager (bool): Bild sofort laden statt erst bei Sichtbarkeit (z.B. im Hero-Bereich).
+    """
+    try:
+        bild_html = assets.picture_html(bild, caption, sizes, eager)
+    except FileNotFoundError as fehler:
+        # Ohne Build sichtbar melden statt die Bilder von Drittanbietern nachzuladen
+        st.error(str(fehler))
+        return
+    # HTML ist hartcodiert und kontrolliert, daher hier sicher.
+    st.markdown(
+        f"""
+        <div class="image-frame">{bild_html}</div>
+        <p class="image-caption">{caption}</p>
+        """,
+        unsafe_allow_html=True
+    )
 
-        /* Anpassung für st.info, st.success, st.warning Texte */
-        .stAlert {
-            font-size: 1rem; /* Konsistente Schriftgröße für Alerts */
-            line-height: 1.5; /* Angepasster Zeilenabstand für Alerts */
-        }
+def render_intro_card(text: str):
+    """
+    Rendert einen Einführungstextblock in einer gestylten Karte.
 
-    </style>
-    """,
-    unsafe_allow_html=True # Notwendig zum Injizieren von benutzerdefiniertem CSS
-)
+    Args:
+        text (str): Der Textinhalt für die Einführungskarte.
+    """
+    # HTML ist hartcodiert und kontrolliert, daher hier sicher.
+    st.markdown(f"<div class='intro-card'><p>{text}</p></div>", unsafe_allow_html=True) # Text in p-Tag für Zeilenabstand
 
-# ------------------------------------------------------
-# Hilfsfunktionen (Helper Functions)
-# ------------------------------------------------------
+def render_story_card(text: str):
+    """
+    Rendert einen Story-Textblock in einer gestylten Karte.
 
-def format_number(value: float, decimals: int = 0) -> str:
+    Args:
+        text (str): Der Textinhalt für die Story-Karte. Kann HTML für Zitate usw. enthalten.
     """
-    Formatiert eine Zahl mit Tausender-Trennzeichen und Dezimalstellen,
-    unter Verwendung des deutschen Lokals (Komma für Dezimal, Punkt für Tausender).
+    # HTML ist hartcodiert und kontrolliert, daher hier sicher.
+    st.markdown(f"<div class='story-card'>{text}</div>", unsafe_allow_html=True)
+
+def render_chart(fig: go.Figure):
+    """
+    Sendet eine Plotly-Figur in voller Breite an den Browser (Serialisierung als eigener Messabschnitt).
 
     Args:
-        value (float): Die zu formatierende Zahl.
-        decimals (int): Anzahl der Dezimalstellen. Standardwert ist 0.
+        fig (go.Figure): Die darzustellende Figur.
+    """
+    with instrumentation.section("plotly_chart"):
+        st.plotly_chart(fig, use_container_width=True)
+
+def render_anytime(platz: str, namensraum: str, parameter: tuple, berechnung, figur):
+    """
+    Führt eine teure Berechnung als abbrechbaren Job außerhalb des Skript-Threads aus (siehe anytime)
+    und zeichnet jeden Zwischenstand, bis das vollständige Ergebnis vorliegt. Kommen während der
+    Berechnung neue Slider-Werte an, beendet Streamlit diesen Lauf am nächsten Fortschrittsupdate;
+    der neue Lauf bricht den alten Job ab. Nur vollständige Ergebnisse landen im Cache.
+
+    Args:
+        platz (str): Name des Platzes; je Sitzung und Platz läuft höchstens ein Job.
+        namensraum (str): Namensraum im Ergebnis-Cache.
+        parameter (tuple): Parameter, die das Ergebnis bestimmen (Cache-Schlüssel).
+        berechnung (callable): Funktion ohne Argumente, die den Anytime-Generator erzeugt.
+        figur (callable): Erstellt aus einem (Zwischen-)Ergebnis die Figur.
 
     Returns:
-        str: Die formatierte Zahl als String.
+        Das vollständige Ergebnis.
+    """
+    schluessel = cache.normalize_key(parameter)
+    ergebnis = cache.RESULT_CACHE.get(namensraum, schluessel)
+    if ergebnis is not None:
+        render_chart(figur(ergebnis))
+        return ergebnis
+
+    sitzung = st.session_state.setdefault("anytime_sitzung", uuid.uuid4().hex)
+    job = anytime.JOBS.submit((sitzung, platz), schluessel, berechnung)
+    diagramm = st.empty()
+    fortschritt = st.progress(0.0, text="Berechnung läuft …")
+    version, fertig = 0, False
+    try:
+        while not fertig:
+            neu, anteil, zwischenergebnis, fertig = job.wait(version, anytime.UPDATE_INTERVAL)
+            if neu > version and not fertig:
+                version = neu
+                with diagramm:
+                    render_chart(figur(zwischenergebnis))
+            # Jedes Update ist für Streamlit ein Unterbrechungspunkt, falls inzwischen neue Werte angekommen sind
+            fortschritt.progress(anteil, text=f"Berechnung läuft … {anteil:.0%}")
+    finally:
+        # Ein unterbrochener, noch laufender Job bleibt registriert: Der nächste Lauf übernimmt oder bricht ihn ab
+        anytime.JOBS.release((sitzung, platz), job)
+    fortschritt.empty()
+    try:
+        ergebnis = job.result()
+    except anytime.Cancelled:
+        st.stop() # Ein neuerer Lauf derselben Sitzung hat übernommen
+    cache.RESULT_CACHE.put(namensraum, schluessel, ergebnis)
+    # Das Endergebnis kann schon als letzter Zwischenstand gezeichnet sein (der Job meldet es, bevor er
+    # fertig ist); dieselbe Figur ein zweites Mal zu senden, wäre für Streamlit eine doppelte Element-ID
+    if job.version != version:
+        with diagramm:
+            render_chart(figur(ergebnis))
+    return ergebnis
+
+def cancel_anytime(platz: str):
+    """
+    Bricht den Job eines abgeschalteten Panels ab (siehe render_anytime), damit er weder
+    Worker belegt noch sein Ergebnis in der Registry liegen bleibt.
+
+    Args:
+        platz (str): Name des Platzes wie bei render_anytime.
     """
-    # Ersetzt Tausender-Trennzeichen (Komma) durch X, Dezimalpunkt durch Komma, X wieder durch Punkt
-    return f"{value:,.{decimals}f}".replace(",", "X").replace(".", ",").replace("X", ".")
+    sitzung = st.session_state.get("anytime_sitzung")
+    if sitzung is not None:
+        anytime.JOBS.cancel((sitzung, platz))
 
-def human_number(value: float) -> str:
+def render_play_toggle(geschichte: str) -> bool:
     """
-    Formatiert eine Zahl in einen menschenlesbaren String mit Suffixen (z.B. Mio., Mrd.).
-    Verwendet deutsches Zahlenformat.
+    Schalter für den Abspielmodus eines Charts: Alle Zwischenstände werden mit einem einzigen
+    Rerun berechnet und danach im Browser abgespielt, statt den Slider Schritt für Schritt zu ziehen.
 
     Args:
-        value (float): Die zu formatierende Zahl.
+        geschichte (str): Kurzname der Geschichte, bildet den Widget-Key.
 
     Returns:
-        str: Die menschenlesbare Zahl als String.
+        bool: Ob der Abspielmodus aktiv ist.
     """
-    thresholds = [
-        (1e12, " Bio."),
-        (1e9,  " Mrd."),
-        (1e6,  " Mio."),
-        (1e3,  " Tsd.")
-    ]
-    for threshold, suffix in thresholds:
-        if abs(value) >= threshold:
-            formatted = value / threshold
-            return f"{formatted:,.1f}".replace(",", "X").replace(".", ",").replace("X", ".") + suffix
-    return f"{value:,.0f}".replace(",", "X").replace(".", ",").replace("X", ".")
+    return st.toggle(
+        "▶ Abspielen: Wachstum im Browser animieren",
+        key=f"abspielen_{geschichte}",
+        help="Alle Schritte werden einmal berechnet; Abspielen und Vorspulen laufen ohne weitere Serveranfragen."
+    )
 
-def best_comparison(value: float, comparison_list: list[tuple[str, float]]) -> str:
+@instrumentation.timed("sweep")
+def render_sweep_panel(space: str, aktuelle_werte: dict, bereiche: dict = None):
     """
-    Vergleicht einen Wert mit einer Liste von Referenzwerten und gibt den am besten
-    passenden Vergleichsstring zurück (z.B. "5.2× Eiffelturm").
+    Rendert den optionalen Sweep-Modus einer Geschichte: zwei wählbare Parameter werden
+    als komplettes Raster ausgewertet und als Heatmap mit markierter aktueller Auswahl gezeigt.
 
     Args:
-        value (float): Der zu vergleichende Wert.
-        comparison_list (list[tuple[str, float]]): Eine Liste von Tupeln, wobei jedes Tupel
-                                                    (Bezeichnung: str, Referenzwert: float) enthält.
+        space (str): Schlüssel in sweep.SWEEP_SPACES.
+        aktuelle_werte (dict): Aktuelle Slider-Werte aller Parameter der Geschichte.
+        bereiche (dict): Optional abweichende (Minimum, Maximum) je Parameter.
+    """
+    if not st.toggle("Sweep-Modus: zwei Parameter gleichzeitig variieren", key=f"sweep_{space}"):
+        cancel_anytime(f"sweep_{space}")
+        return
+    raum = sweep.SWEEP_SPACES[space]
+    parameter = list(raum["parameter"])
+    label_von = lambda name: raum["parameter"][name][0]
+    standard_x, standard_y = raum["standard"]
+
+    cols = st.columns(4, gap="medium")
+    x_param = cols[0].selectbox("x-Achse", parameter, index=parameter.index(standard_x),
+                                format_func=label_von, key=f"sweep_{space}_x")
+    y_optionen = [p for p in parameter if p != x_param]
+    y_param = cols[1].selectbox("y-Achse", y_optionen,
+                                index=y_optionen.index(standard_y) if standard_y in y_optionen else 0,
+                                format_func=label_von, key=f"sweep_{space}_y")
+    metric = cols[2].selectbox("Kennzahl", list(raum["kennzahlen"]),
+                               format_func=lambda k: raum["kennzahlen"][k][0], key=f"sweep_{space}_metric")
+    resolution = cols[3].select_slider("Auflösung je Achse", options=[100, 250, 500, 1000], value=250,
+                                       key=f"sweep_{space}_resolution")
+    darstellung = st.radio("Darstellung", ["Heatmap", "Konturen"], horizontal=True, key=f"sweep_{space}_art")
+
+    # Das Raster hängt nicht von den aktuellen Werten der beiden Achsen ab: Ein Zug an einem dieser
+    # Slider verschiebt nur das Kreuz und startet keine Neuberechnung
+    fest = {name: wert for name, wert in aktuelle_werte.items() if name not in (x_param, y_param)}
+    render_anytime(
+        f"sweep_{space}", "sweep.display_grid", (space, x_param, y_param, metric, fest, resolution, bereiche),
+        lambda: sweep_display_grids(space, x_param, y_param, metric, fest, resolution, bereiche),
+        lambda raster: sweep_figure(space, x_param, y_param, metric, aktuelle_werte, darstellung, raster)
+    )
+    st.caption(f"Berechnet auf bis zu {resolution} × {resolution} Stützstellen, "
+               f"angezeigt mit höchstens {sweep.MAX_DISPLAY_CELLS} × {sweep.MAX_DISPLAY_CELLS} Zellen. "
+               "Das Kreuz markiert die aktuelle Slider-Auswahl.")
+
+@instrumentation.timed("monte_carlo")
+def render_monte_carlo_panel(startkapital: float, sparrate: float, laufzeit: int, zinssatz: float):
+    """
+    Rendert den optionalen Monte-Carlo-Modus der Zinseszins-Geschichte: Statt eines festen
+    Zinssatzes werden viele zufällige Renditepfade simuliert und als Perzentilbänder gezeigt.
+
+    Args:
+        startkapital (float): Startkapital in €.
+        sparrate (float): Monatliche Sparrate in €.
+        laufzeit (int): Laufzeit in Jahren.
+        zinssatz (float): Erwartete jährliche Rendite in Prozent.
+    """
+    if not st.toggle("Monte-Carlo-Modus: schwankende Renditen simulieren", key="mc_zinseszins"):
+        cancel_anytime("monte_carlo")
+        return
+    cols = st.columns(4, gap="medium")
+    volatilitaet = cols[0].slider("Volatilität (% p.a.)", min_value=0.0, max_value=40.0, value=15.0, step=0.5)
+    n_paths = cols[1].select_slider("Anzahl Pfade", options=[1_000, 10_000, 50_000, 100_000], value=10_000)
+    seed = cols[2].number_input("Seed", min_value=0, max_value=2**32 - 1, value=42, step=1)
+    parallel = cols[3].checkbox("Auf alle Kerne verteilen", value=False,
+                                help="Verteilt die Pfade auf einen Prozesspool – gleicher Seed, gleiches Ergebnis.")
+
+    # Das Backend beeinflusst das Ergebnis nicht und gehört daher nicht zum Cache-Schlüssel
+    ergebnis = render_anytime(
+        "monte_carlo", "montecarlo.simulate", (startkapital, sparrate, laufzeit, zinssatz, volatilitaet, n_paths, seed),
+        lambda: montecarlo.simulate_progressive(startkapital, sparrate, laufzeit, zinssatz, volatilitaet, n_paths, seed,
+                                                "process" if parallel else "serial", anytime.UPDATE_INTERVAL),
+        lambda teil: monte_carlo_figure(teil, startkapital, sparrate)
+    )
+
+    median_index = ergebnis["perzentile"].index(50)
+    cols = st.columns(4, gap="large")
+    cols[0].metric("Median Lara", human_number(ergebnis["lara_baender"][median_index, -1]))
+    cols[1].metric("Schlechteste 5 % (Lara)", human_number(ergebnis["lara_baender"][0, -1]))
+    cols[2].metric("P(Lara > Tim)", f"{format_number(ergebnis['p_lara_schlaegt_tim'] * 100, 1)}%")
+    cols[3].metric("P(Lara > Eigenleistung)", f"{format_number(ergebnis['p_lara_schlaegt_eigenleistung'] * 100, 1)}%")
+    st.caption(f"{format_number(n_paths)} Pfade, lognormalverteilte Jahresrenditen mit Erwartungswert "
+               f"{format_number(zinssatz, 1)} % und Volatilität {format_number(volatilitaet, 1)} %. "
+               "Tim und Lara erleben jeweils dieselbe Renditefolge.")
+
+@instrumentation.timed("backtest")
+def render_backtest_panel(startkapital: float, sparrate: float, laufzeit: int, zinssatz: float, annahmen: dict):
+    """
+    Rendert den optionalen Backtest der Zinseszins-Geschichte: Laras Sparplan läuft über jedes
+    mögliche Startjahr einer historischen Renditereihe (siehe backtest.py) statt mit festem Zinssatz.
+
+    Args:
+        startkapital (float): Startkapital in €.
+        sparrate (float): Monatliche Sparrate in €.
+        laufzeit (int): Laufzeit in Jahren.
+        zinssatz (float): Fester jährlicher Zinssatz in Prozent (Vergleichslinie).
+        annahmen (dict): Weitere Annahmen der Geschichte; Einzahlungszeitpunkt, Kosten und Steuer werden übernommen.
+    """
+    reihen = backtest.available_series()
+    if not reihen or not st.toggle("Backtest: Sparplan gegen historische Marktrenditen", key="backtest_zinseszins"):
+        return
+    name = st.selectbox("Renditereihe", list(reihen), format_func=reihen.get, key="backtest_zinseszins_reihe")
+    annahmen = {k: annahmen[k] for k in ("vorschuessig", "kosten", "steuer")}
+    try:
+        ergebnis = backtest_run(name, startkapital, sparrate, laufzeit, **annahmen)
+    except ValueError as fehler:
+        st.warning(f"Backtest nicht möglich: {fehler}")
+        return
+    render_chart(backtest_figure(name, startkapital, sparrate, laufzeit, zinssatz, **annahmen))
+
+    lara, tim, startjahre = ergebnis["endkapital_lara"], ergebnis["endkapital_tim"], ergebnis["startjahre"]
+    schlechtestes, bestes = np.argmin(lara), np.argmax(lara)
+    cols = st.columns(4, gap="large")
+    cols[0].metric("Median Lara", human_number(np.median(lara)))
+    cols[1].metric(f"Schlechtester Start ({startjahre[schlechtestes]:.0f})", human_number(lara[schlechtestes]))
+    cols[2].metric(f"Bester Start ({startjahre[bestes]:.0f})", human_number(lara[bestes]))
+    cols[3].metric("Anteil Lara > Tim", f"{format_number(np.mean(lara > tim) * 100, 1)}%")
+    st.caption(f"{format_number(len(lara))} rollierende Fenster à {laufzeit} Jahre, Marktrendite zwischen "
+               f"{format_number(ergebnis['rendite_pa'].min() * 100, 1)} % und "
+               f"{format_number(ergebnis['rendite_pa'].max() * 100, 1)} % p.a. Nominale Werte: Die Inflation "
+               "aus den weiteren Annahmen wird nicht abgezogen, die Reihe enthält ihre eigene Geldentwertung.")
+
+@instrumentation.timed("verzweigung")
+def render_branching_panel(starter_personen: int, multiplikator: float, anzahl_wellen: int,
+                           vergleich_pop: list[tuple[str, float]]):
+    """
+    Rendert den optionalen stochastischen Modus der viralen Geschichte: Verzweigungsprozess
+    mit zufälliger Nachkommenzahl und optionaler Sättigung an einer realen Bevölkerungsgröße.
+
+    Args:
+        starter_personen (int): Initiale Personen.
+        multiplikator (float): Mittlere Anzahl überzeugter Personen je Person und Welle.
+        anzahl_wellen (int): Anzahl der Wellen.
+        vergleich_pop (list[tuple[str, float]]): Bevölkerungsreferenzen (Bezeichnung, Einwohner).
+    """
+    if not st.toggle("Stochastischer Modus: Zufall, Aussterben und Sättigung", key="stochastik_viral"):
+        return
+    populationen = {"Unbegrenzt": None, **{label: int(wert) for label, wert in vergleich_pop}}
+    cols = st.columns(4, gap="medium")
+    population_label = cols[0].selectbox("Population", list(populationen), index=len(populationen) - 1)
+    verteilung = cols[1].radio("Nachkommen je Person", ["poisson", "negbin"], horizontal=True,
+                               format_func={"poisson": "Poisson", "negbin": "Negativ-binomial"}.get)
+    dispersion = cols[2].slider("Dispersion k", min_value=0.1, max_value=10.0, value=0.5, step=0.1,
+                                disabled=verteilung != "negbin",
+                                help="Kleines k: wenige Superspreader tragen die Ausbreitung, viele überzeugen niemanden.")
+    replikate = cols[3].select_slider("Replikate", options=[100, 1_000, 10_000, 100_000], value=1_000)
+    population = populationen[population_label]
+
+    ergebnis = spread_simulation(starter_personen, multiplikator, anzahl_wellen, replikate, population,
+                                 verteilung, dispersion)
+    render_chart(
+        branching_figure(starter_personen, multiplikator, anzahl_wellen, replikate, population, verteilung, dispersion)
+    )
+
+    saettigungszeiten = ergebnis["zeit_bis_saettigung"]
+    anteil_gesaettigt = float(np.mean(~np.isnan(saettigungszeiten)))
+    cols = st.columns(4, gap="large")
+    cols[0].metric("Median Reichweite", human_number(float(np.median(ergebnis["endreichweite"]))))
+    cols[1].metric("P(Aussterben)", f"{format_number(ergebnis['aussterben_empirisch'] * 100, 1)}%")
+    cols[2].metric("Sättigung erreicht", f"{format_number(anteil_gesaettigt * 100, 1)}%")
+    cols[3].metric("Median Wellen bis Sättigung",
+                   format_number(float(np.nanmedian(saettigungszeiten)), 0) if anteil_gesaettigt else "–")
+    st.caption(f"Theoretische Aussterbewahrscheinlichkeit ohne Populationsgrenze: "
+               f"{format_number(ergebnis['aussterben_analytisch'] * 100, 1)}%. "
+               "Sättigung: großer Ausbruch, dessen Wachstum zum Erliegen gekommen ist "
+               "(Welle, in der 95 % der endgültigen Reichweite erreicht sind).")
+
+@instrumentation.timed("netzwerk")
+def render_network_panel(starter_personen: int, multiplikator: float, anzahl_wellen: int):
+    """
+    Rendert den optionalen Netzwerk-Modus der viralen Geschichte: Die Ausbreitung läuft
+    Welle für Welle über einen synthetischen sozialen Graphen mit Millionen Personen.
+
+    Args:
+        starter_personen (int): Anzahl der Startpersonen.
+        multiplikator (float): Mittlere Anzahl überzeugter Kontakte je Person und Welle.
+        anzahl_wellen (int): Anzahl der Wellen.
+    """
+    if not st.toggle("Netzwerk-Modus: Ausbreitung über ein soziales Netzwerk", key="netzwerk_viral"):
+        cancel_anytime("netzwerk")
+        return
+    cols = st.columns(3, gap="medium")
+    modell = cols[0].radio("Netzwerktyp", ["small_world", "scale_free"], horizontal=True,
+                           format_func={"small_world": "Small-World", "scale_free": "Skalenfrei"}.get)
+    knoten = cols[1].select_slider("Personen im Netzwerk", options=[100_000, 1_000_000, 5_000_000, 10_000_000],
+                                   value=1_000_000, format_func=human_number)
+    mittlerer_grad = cols[2].slider("Kontakte pro Person (Mittel)", min_value=4, max_value=20, value=10, step=2)
+
+    # Der erste Bau eines großen Graphen dauert Sekunden: als abbrechbarer Job mit Fortschrittsbalken
+    render_anytime(
+        "netzwerk", "network.spread", (starter_personen, multiplikator, anzahl_wellen, modell, knoten, mittlerer_grad),
+        lambda: network_spread(starter_personen, multiplikator, anzahl_wellen, modell, knoten, mittlerer_grad),
+        lambda ergebnis: network_figure(ergebnis, starter_personen, multiplikator, anzahl_wellen, knoten)
+    )
+    st.caption("Jede neu erreichte Person überzeugt jeden ihrer Kontakte mit Wahrscheinlichkeit "
+               "Multiplikator / Kontakte – bereits Erreichte zählen nicht doppelt. "
+               "Das Netzwerk wird einmalig erzeugt und danach von der Platte gemappt.")
+
+def render_goal_seek_toggle(geschichte: str) -> bool:
+    """
+    Schalter für die Zielwertsuche eines Tabs: Umkehrfragen ("Wann bzw. womit wird das Ziel
+    erreicht?") werden für eine ganze Tabelle von Zielen in einem Aufruf gelöst (siehe goalseek).
+
+    Args:
+        geschichte (str): Kurzname der Geschichte, bildet den Widget-Key.
 
     Returns:
-        str: Ein Vergleichsstring.
+        bool: Ob die Zielwertsuche aktiv ist.
     """
-    if value <= 0:
-        label, _= comparison_list[0]
-        return f"0× {label}" # Bei Null oder negativen Werten, 0 mal die kleinste Einheit zurückgeben
-    
-    # Vergleichsliste nach Referenzwert sortieren, um die beste Übereinstimmung zu finden
-    comparison_list = sorted(comparison_list, key=lambda x: x[1])
-
-    # Von der größten zur kleinsten Referenz iterieren
-    for label, ref in reversed(comparison_list):
-        if value >= ref:
-            factor = value / ref
-            return f"{format_number(factor, 1)}× {label}"
-    
-    # Wenn der Wert kleiner als alle Referenzen ist, mit der kleinsten vergleichen
-    label, ref = comparison_list[0]
-    factor = value / ref
-    return f"{format_number(factor, 1)}× {label}"
+    return st.toggle("🎯 Zielwertsuche: Wann bzw. womit wird ein Ziel erreicht?", key=f"zielsuche_{geschichte}")
 
-# ------------------------------------------------------
-# UI-Hilfskomponenten (UI Helper Components)
-# Abstraktion für häufige UI-Muster zur Verbesserung der Lesbarkeit und Konsistenz.
-# ------------------------------------------------------
+def goal_seek_cell(wert: float, einheit: str = "", nachkommastellen: int = 0) -> str:
+    """Formatiert eine Lösung der Zielwertsuche; ``NaN`` steht für ein unerreichbares Ziel."""
+    if not np.isfinite(wert):
+        return "nicht erreichbar"
+    return f"{format_number(wert, nachkommastellen)}{einheit}"
 
-def render_cover_image(url: str, caption: str):
+@instrumentation.timed("zielsuche")
+def render_chessboard_goal_seek(faktor: float, gewicht_vergleiche: list[tuple[str, float]],
+                                flaechen_vergleiche: list[tuple[str, float]]):
     """
-    Rendert ein gestyltes Titelbild mit Bildunterschrift.
+    Zielwertsuche der Schachbrett-Legende: erstes Feld, ab dem der Reis schwerer bzw. größer
+    ist als jede Referenz.
 
     Args:
-        url (str): Die URL des Bildes.
-        caption (str): Die Bildunterschrift.
+        faktor (float): Vervielfachung von Feld zu Feld.
+        gewicht_vergleiche (list[tuple[str, float]]): Gewichtsreferenzen (Bezeichnung, Tonnen).
+        flaechen_vergleiche (list[tuple[str, float]]): Flächenreferenzen (Bezeichnung, m²).
     """
-    # HTML ist hartcodiert und kontrolliert, daher hier sicher.
-    st.markdown(
-        f"""
-        <div class="image-frame" style="background-image: url('{url}');"></div>
-        <p class="image-caption">{caption}</p>
-        """,
-        unsafe_allow_html=True
+    if not render_goal_seek_toggle("schachbrett"):
+        return
+    felder_gewicht = goal_seek_field(tuple(w for _, w in gewicht_vergleiche), faktor, "gewicht_tonnen")
+    felder_flaeche = goal_seek_field(tuple(w for _, w in flaechen_vergleiche), faktor, "flaeche_m2")
+    st.dataframe(
+        {
+            "Ziel": [f"Schwerer als {label}" for label, _ in gewicht_vergleiche]
+                    + [f"Größer als {label}" for label, _ in flaechen_vergleiche],
+            "Ab Feld": [goal_seek_cell(feld) for feld in np.concatenate([felder_gewicht, felder_flaeche])],
+        },
+        hide_index=True,
     )
+    st.caption(f"Kumulierte Körner bis zum Feld bei Faktor {format_number(faktor, 1)}; "
+               "bei einem Faktor von 1 wächst der Berg nur linear.")
 
-def render_intro_card(text: str):
+@instrumentation.timed("zielsuche")
+def render_compound_interest_goal_seek(startkapital: float, sparrate: float, laufzeit: int, zinssatz: float,
+                                       annahmen: dict):
     """
-    Rendert einen Einführungstextblock in einer gestylten Karte.
+    Zielwertsuche des Zinseszins-Vergleichs: nötiger Zinssatz bei der gewählten Laufzeit und
+    nötige Laufzeit beim gewählten Zinssatz für eine Reihe von Zielvermögen.
 
     Args:
-        text (str): Der Textinhalt für die Einführungskarte.
+        startkapital (float): Startkapital in €.
+        sparrate (float): Monatliche Sparrate in €.
+        laufzeit (int): Laufzeit in Jahren.
+        zinssatz (float): Jährlicher Zinssatz in Prozent.
+        annahmen (dict): Zinsperioden, Zahlungszeitpunkt, Inflation, Kosten und Steuer.
     """
-    # HTML ist hartcodiert und kontrolliert, daher hier sicher.
-    st.markdown(f"<div class='intro-card'><p>{text}</p></div>", unsafe_allow_html=True) # Text in p-Tag für Zeilenabstand
+    if not render_goal_seek_toggle("zinseszins"):
+        return
+    eigenes_ziel = st.number_input("Eigenes Zielvermögen (€)", min_value=1_000, max_value=100_000_000,
+                                   value=1_000_000, step=50_000)
+    ziele = tuple(sorted({100_000, 250_000, 500_000, 1_000_000, 2_000_000, 5_000_000, eigenes_ziel}))
+    zinssaetze = goal_seek_rate(ziele, startkapital, sparrate, laufzeit, **annahmen)
+    jahre = goal_seek_years(ziele, startkapital, sparrate, zinssatz, **annahmen)
+    # Ziele unterhalb des Endkapitals ohne Zinsen brauchen keinen Zinssatz
+    ohne_zinsen = float(compound_interest_final(startkapital, sparrate, laufzeit, goalseek.ZINSSATZ_BEREICH[0],
+                                                **annahmen)["endkapital_lara"])
+    st.dataframe(
+        {
+            "Zielvermögen": [f"{format_number(ziel)} €" for ziel in ziele],
+            f"Nötiger Zinssatz in {laufzeit} Jahren": [
+                "schon ohne Zinsen" if ziel <= ohne_zinsen else goal_seek_cell(z, " %", 2)
+                for ziel, z in zip(ziele, zinssaetze)
+            ],
+            f"Jahre bei {format_number(zinssatz, 1)} %": [goal_seek_cell(j) for j in jahre],
+        },
+        hide_index=True,
+    )
+    st.caption(f"Zinssätze zwischen {format_number(goalseek.ZINSSATZ_BEREICH[0])} und "
+               f"{format_number(goalseek.ZINSSATZ_BEREICH[1])} % werden durchsucht; "
+               "Kosten, Steuer und Inflation wie oben eingestellt.")
 
-def render_story_card(text: str):
+@instrumentation.timed("zielsuche")
+def render_viral_goal_seek(starter_personen: int, multiplikator: float, anzahl_wellen: int,
+                           vergleich_pop: list[tuple[str, float]]):
     """
-    Rendert einen Story-Textblock in einer gestylten Karte.
+    Zielwertsuche des viralen Dominoeffekts: Wellen bis zu jeder Bevölkerungsreferenz und der
+    dafür nötige Multiplikator bei der gewählten Anzahl an Wellen.
 
     Args:
-        text (str): Der Textinhalt für die Story-Karte. Kann HTML für Zitate usw. enthalten.
+        starter_personen (int): Initiale Personen.
+        multiplikator (float): Multiplikator pro Welle.
+        anzahl_wellen (int): Anzahl der Wellen.
+        vergleich_pop (list[tuple[str, float]]): Bevölkerungsreferenzen (Bezeichnung, Einwohner).
     """
-    # HTML ist hartcodiert und kontrolliert, daher hier sicher.
-    st.markdown(f"<div class='story-card'>{text}</div>", unsafe_allow_html=True)
+    if not render_goal_seek_toggle("viral"):
+        return
+    ziele = tuple(wert for _, wert in vergleich_pop)
+    wellen = goal_seek_waves(ziele, starter_personen, multiplikator)
+    multiplikatoren = goal_seek_multiplier(ziele, starter_personen, anzahl_wellen)
+    st.dataframe(
+        {
+            "Ziel": [label for label, _ in vergleich_pop],
+            "Personen": [format_number(wert) for wert in ziele],
+            f"Wellen bei Multiplikator {format_number(multiplikator, 1)}": [goal_seek_cell(w) for w in wellen],
+            f"Nötiger Multiplikator in {anzahl_wellen} Wellen": [goal_seek_cell(m, "", 2) for m in multiplikatoren],
+        },
+        hide_index=True,
+    )
+    if multiplikator < 1:
+        st.caption(f"Bei einem Multiplikator unter 1 endet die Ausbreitung bei höchstens "
+                   f"{format_number(starter_personen / (1 - multiplikator))} Personen.")
+
+@instrumentation.timed("zielsuche")
+def render_saas_goal_seek(start_mrr: float, monatliche_wachstumsrate: float, monate_planungszeitraum: int,
+                          kohorten_parameter: tuple = None):
+    """
+    Zielwertsuche des SaaS-Hypergrowth: Monat, in dem der MRR ein Ziel überschreitet, und das
+    dafür nötige monatliche Wachstum im Planungszeitraum; im Kohorten-Modus zusätzlich der
+    Monat der Kohortenreihe.
+
+    Args:
+        start_mrr (float): Startumsatz (MRR) in €.
+        monatliche_wachstumsrate (float): Monatliches Wachstum in Prozent.
+        monate_planungszeitraum (int): Planungszeitraum in Monaten.
+        kohorten_parameter (tuple): Churn, Frühchurn, Expansion und Schritte je Monat oder None.
+    """
+    if not render_goal_seek_toggle("saas"):
+        return
+    eigenes_ziel = st.number_input("Eigenes MRR-Ziel (€)", min_value=1_000, max_value=1_000_000_000,
+                                   value=1_000_000, step=100_000)
+    ziele = tuple(sorted({100_000, 1_000_000, 10_000_000, 100_000_000, eigenes_ziel}))
+    spalten = {
+        "MRR-Ziel": [f"{format_number(ziel)} €" for ziel in ziele],
+        "Monat nach Plan": [goal_seek_cell(m) for m in goal_seek_month(ziele, start_mrr, monatliche_wachstumsrate)],
+    }
+    if kohorten_parameter is not None:
+        reihen = saas_cohort_series(start_mrr, monatliche_wachstumsrate, monate_planungszeitraum, *kohorten_parameter)
+        monate = goalseek.first_crossing(reihen["monate"], reihen["mrr"], ziele)
+        spalten["Monat mit Churn"] = [goal_seek_cell(m, "", 0 if kohorten_parameter[-1] == 1 else 1) for m in monate]
+    spalten[f"Nötiges Wachstum für Monat {monate_planungszeitraum}"] = [
+        goal_seek_cell(r, " %", 2) for r in goal_seek_growth(ziele, start_mrr, monate_planungszeitraum)
+    ]
+    st.dataframe(spalten, hide_index=True)
+    if kohorten_parameter is not None:
+        st.caption("Die Kohortenreihe reicht nur bis zum Ende des Planungszeitraums.")
+
+def render_profile_panel():
+    """
+    Rendert die Laufzeitmessung in der Seitenleiste: Dauer je Abschnitt und gesendete Bytes je
+    Element über alle gemessenen Läufe des Prozesses, dazu der Export als Prometheus-Text bzw. JSON.
+    Fragment-Reruns aktualisieren die Seitenleiste nicht – dafür gibt es den Aktualisieren-Knopf.
+    """
+    daten = instrumentation.RECORDER.snapshot()
+    with st.sidebar.expander("⏱ Laufzeitmessung", expanded=True):
+        st.caption(f"{format_number(daten['runs'])} gemessene Läufe")
+        st.dataframe(
+            {
+                "Abschnitt": list(daten["sections"]),
+                "Aufrufe": [w["calls"] for w in daten["sections"].values()],
+                "Letzter Lauf (ms)": [w["seconds_last"] * 1000 for w in daten["sections"].values()],
+                "Ø je Aufruf (ms)": [w["seconds_total"] / w["calls"] * 1000 for w in daten["sections"].values()],
+                "Max (ms)": [w["seconds_max"] * 1000 for w in daten["sections"].values()],
+            },
+            hide_index=True,
+        )
+        st.dataframe(
+            {
+                "Abschnitt": [e["section"] for e in daten["elements"]],
+                "Element": [e["element"] for e in daten["elements"]],
+                "Nachrichten": [e["messages"] for e in daten["elements"]],
+                "Letzter Lauf (Bytes)": [e["bytes_last"] for e in daten["elements"]],
+                "Gesamt (Bytes)": [e["bytes_total"] for e in daten["elements"]],
+            },
+            hide_index=True,
+        )
+        cols = st.columns(3)
+        cols[0].button("Aktualisieren", key="profil_aktualisieren")
+        cols[1].download_button("Prometheus", instrumentation.prometheus_text(), "metrics.txt", "text/plain")
+        cols[2].download_button("JSON", instrumentation.json_text(), "profil.json", "application/json")
 
 # ------------------------------------------------------
-# Konstanten (Constants)
-# Häufig verwendete oder konfigurationsähnliche Werte zentralisieren.
+# Gecachte Berechnungen & Charts (Cached Computations & Charts)
+# Ergebnisse werden über cache.RESULT_CACHE sitzungsübergreifend geteilt,
+# identische Slider-Werte werden also nur einmal berechnet. Kennzahlen und
+# Zeitreihen auf den Slider-Rastern kommen aus den Lookup-Tabellen (siehe lookup).
 # ------------------------------------------------------
 
-# Bild-URLs für bessere Organisation
-IMAGE_URLS = {
-    "schachbrett": "https://i.postimg.cc/gjrmYdF2/pierre-bamin-Ldilh-Dx3sk-unsplash.jpg",
-    "zinseszins": "https://i.postimg.cc/ZRR1Ncf3/andre-taissin-5OUMf1Mr5p-U-unsplash.jpg",
-    "viral": "https://i.postimg.cc/76jwYdxh/fusion-medical-animation-rnr8D3FNUNY-unsplash.jpg",
-    "saas": "https://i.postimg.cc/BbWfGFgr/austin-distel-rxp-Th-Owu-Vg-E-unsplash.jpg",
-    "hero": "https://images.unsplash.com/photo-1545239351-1141bd82e8a6?auto=format&fit=crop&w=1600&q=80"
-}
+# Modellaufrufe werden bei aktiver Laufzeitmessung als Abschnitt "modell" erfasst
+modellaufruf = instrumentation.timed("modell")
+chessboard_scene = modellaufruf(cache.memoize(engine.chessboard_scene))
+compound_interest_final = modellaufruf(cache.memoize(lookup.tabulated(engine.compound_interest_final)))
+viral_final = modellaufruf(cache.memoize(lookup.tabulated(engine.viral_final)))
+saas_final = modellaufruf(cache.memoize(lookup.tabulated(engine.saas_final)))
+compound_interest_series = modellaufruf(lookup.tabulated(engine.compound_interest_series))
+viral_series = modellaufruf(lookup.tabulated(engine.viral_series))
+saas_series = modellaufruf(lookup.tabulated(engine.saas_series))
+saas_cohort_final = modellaufruf(cache.memoize(cohorts.mrr_final))
+saas_cohort_layers = modellaufruf(cache.memoize(cohorts.cohort_layers))
+saas_cohort_series = modellaufruf(cache.memoize(cohorts.mrr_series))
+goal_seek_field = modellaufruf(cache.memoize(goalseek.chessboard_field))
+goal_seek_rate = modellaufruf(cache.memoize(goalseek.compound_interest_rate))
+goal_seek_years = modellaufruf(cache.memoize(goalseek.compound_interest_years))
+goal_seek_waves = modellaufruf(cache.memoize(goalseek.viral_waves))
+goal_seek_multiplier = modellaufruf(cache.memoize(goalseek.viral_multiplier))
+goal_seek_month = modellaufruf(cache.memoize(goalseek.saas_month))
+goal_seek_growth = modellaufruf(cache.memoize(goalseek.saas_rate))
+backtest_run = modellaufruf(cache.memoize(backtest.run))
+spread_simulation = modellaufruf(cache.memoize(branching.simulate_spread))
+
+@instrumentation.timed("figur")
+@cache.memoize
+def chessboard_figure(feld_nummer: int, faktor: float = 2.0, animiert: bool = False):
+    """
+    Erstellt den Schachbrett-Chart bis zum gewählten Feld. Große Bretter werden auf
+    engine.CHART_MAX_PUNKTE Punkte je Kurve ausgedünnt; liegen die Körnerzahlen jenseits
+    von float64, zeigt die y-Achse direkt die Zehnerpotenz.
+
+    Args:
+        feld_nummer (int): Letztes dargestellte Feld.
+        faktor (float): Vervielfachung von Feld zu Feld.
+        animiert (bool): Abspielmodus – alle Zwischenstände als Frames für die Animation im Browser.
+
+    Returns:
+        plotly.graph_objects.Figure: Die fertige Figur.
+    """
+    reihen = engine.chessboard_series(feld_nummer, faktor, max_punkte=engine.CHART_MAX_PUNKTE)
+    log10_feld, log10_gesamt = reihen["log10_koerner_auf_feld"], reihen["log10_koerner_gesamt"]
+    punkte = charts.ANIMATION_ZIEL_PUNKTE if animiert else charts.CHART_ZIEL_PUNKTE
+    if log10_gesamt[-1] <= engine.EXAKT_MAX_LOG10:
+        # Logarithmische Skala ist essentiell für die Darstellung exponentiellen Wachstums
+        fig = charts.line_figure(
+            reihen["felder"], {"Reiskörner": 10 ** log10_feld, "Kumuliert": 10 ** log10_gesamt},
+            "Exponentielles Wachstum auf dem Schachbrett", "Feld", "Anzahl der Reiskörner", "Sicht", log_y=True,
+            ziel_punkte=punkte
+        )
+    else:
+        fig = charts.line_figure(
+            reihen["felder"], {"Reiskörner": log10_feld, "Kumuliert": log10_gesamt},
+            "Exponentielles Wachstum auf dem Schachbrett", "Feld", "Zehnerpotenz der Reiskörner (log₁₀)", "Sicht",
+            ziel_punkte=punkte
+        )
+
+    # Körner je dargestelltem Punkt als Hover-Label; den Gewichtsvergleich (ein Katalogaufruf) nur für
+    # die kumulierte Kurve wie in der Metrik "Gewichtsvergleich". Faktoren ab einer Billion werden
+    # kompakt formatiert – ausgeschrieben hätte das Label bei großen Brettern Hunderte Stellen.
+    for trace, log10_koerner in zip(fig.data, (log10_feld, log10_gesamt)):
+        log10_koerner = log10_koerner[np.searchsorted(reihen["felder"], trace.x)]
+        koerner = list(map(magnitude_number, log10_koerner.tolist()))
+        if trace.name != "Kumuliert":
+            trace.customdata = koerner
+            trace.hovertemplate = "Feld %{x}: %{customdata} Körner<extra>%{fullData.name}</extra>"
+            continue
+        vergleiche = catalog.index("masse").best_many_log10(log10_koerner + np.log10(engine.GEWICHT_PRO_KORN_G), "g",
+                                                            max_faktor_log10=12)
+        trace.customdata = list(zip(koerner, vergleiche))
+        trace.hovertemplate = "Feld %{x}: %{customdata[0]} Körner<br>≈ %{customdata[1]}<extra>%{fullData.name}</extra>"
+    return charts.animate(fig, "Feld", beschriftung=format_number) if animiert else fig
+
+@instrumentation.timed("figur")
+@cache.memoize
+def compound_interest_figure(startkapital: float, sparrate: float, laufzeit: int, zinssatz: float,
+                             perioden_pro_jahr: int = 1, vorschuessig: bool = True, inflation: float = 0.0,
+                             kosten: float = 0.0, steuer: float = 0.0, animiert: bool = False):
+    """
+    Erstellt den Chart "Zinseszins vs. Lineares Sparen" mit einem Punkt je Zinsperiode.
+
+    Args:
+        startkapital (float): Startkapital in €.
+        sparrate (float): Monatliche Sparrate in €.
+        laufzeit (int): Laufzeit in Jahren.
+        zinssatz (float): Jährlicher Zinssatz in Prozent.
+        perioden_pro_jahr (int): Zins- und Sparperioden pro Jahr.
+        vorschuessig (bool): Einzahlung zu Beginn (True) oder am Ende (False) jeder Periode.
+        inflation (float): Jährliche Inflationsrate in Prozent.
+        kosten (float): Jährliche Kosten in Prozent.
+        steuer (float): Steuersatz auf Kapitalerträge in Prozent.
+        animiert (bool): Abspielmodus – alle Zwischenstände als Frames für die Animation im Browser.
+
+    Returns:
+        plotly.graph_objects.Figure: Die fertige Figur.
+    """
+    annahmen = dict(vorschuessig=vorschuessig, inflation=inflation, kosten=kosten, steuer=steuer)
+    reihen = compound_interest_series(startkapital, sparrate, laufzeit, zinssatz, perioden_pro_jahr, **annahmen)
+    fig = charts.line_figure(
+        reihen["jahre"],
+        {"Zinseszins (Lara)": reihen["kapital_zinseszins"], "Nur eingezahlt": reihen["eingezahlt_total"],
+         "Lineares Sparen (Tim)": reihen["kapital_lineares_sparen"]},
+        "Zinseszins vs. Lineares Sparen", "Jahr",
+        "Kapital in € (heutige Kaufkraft)" if inflation else "Kapital in €", "Szenario",
+        ziel_punkte=charts.ANIMATION_ZIEL_PUNKTE if animiert else charts.CHART_ZIEL_PUNKTE
+    )
+    # Ein Frame je Jahr, auch bei unterjähriger Verzinsung
+    return charts.animate(fig, "Jahr", stufen=np.arange(laufzeit + 1)) if animiert else fig
+
+@instrumentation.timed("figur")
+@cache.memoize
+def viral_figure(starter_personen: int, multiplikator: float, anzahl_wellen: int, animiert: bool = False):
+    """
+    Erstellt den Balken-Chart der neu erreichten Personen pro Welle.
+
+    Args:
+        starter_personen (int): Initiale Personen.
+        multiplikator (float): Multiplikator pro Welle.
+        anzahl_wellen (int): Anzahl der Wellen.
+        animiert (bool): Abspielmodus – alle Zwischenstände als Frames für die Animation im Browser.
+
+    Returns:
+        plotly.graph_objects.Figure: Die fertige Figur.
+    """
+    reihen = viral_series(starter_personen, multiplikator, anzahl_wellen)
+    fig = charts.new_figure(
+        go.Bar(x=reihen["runden"], y=reihen["neu_erreicht_pro_runde"], name="Neu erreicht", marker_color="#00c6ff",
+               customdata=list(zip(format_numbers(reihen["neu_erreicht_pro_runde"]).tolist(),
+                                   catalog.index("bevoelkerung").best_many(reihen["neu_erreicht_pro_runde"]))),
+               hovertemplate="Runde %{x}: %{customdata[0]} Personen<br>≈ %{customdata[1]}<extra></extra>"),
+        title="Neu erreichte Personen pro Welle",
+        xaxis_title="Runde",
+        yaxis_title="Anzahl Personen"
+    )
+    return charts.animate(fig, "Welle") if animiert else fig
+
+@instrumentation.timed("figur")
+@cache.memoize
+def saas_figure(start_mrr: float, monatliche_wachstumsrate: float, monate_planungszeitraum: int,
+                lineares_ziel_delta_mrr: float, animiert: bool = False):
+    """
+    Erstellt den MRR-Chart "exponentiell vs. linear".
+
+    Args:
+        start_mrr (float): Startumsatz (MRR) in €.
+        monatliche_wachstumsrate (float): Monatliches Wachstum in Prozent.
+        monate_planungszeitraum (int): Planungszeitraum in Monaten.
+        lineares_ziel_delta_mrr (float): Linearer Zuwachs des MRR pro Monat in €.
+        animiert (bool): Abspielmodus – alle Zwischenstände als Frames für die Animation im Browser.
+
+    Returns:
+        plotly.graph_objects.Figure: Die fertige Figur.
+    """
+    reihen = saas_series(start_mrr, monatliche_wachstumsrate, monate_planungszeitraum, lineares_ziel_delta_mrr)
+    fig = charts.line_figure(
+        reihen["monate"],
+        {"Exponentielles Wachstum": reihen["mrr_exponentiell"], "Lineares Ziel": reihen["mrr_linear"]},
+        "Monatlich wiederkehrender Umsatz (MRR) Entwicklung", "Monat", "MRR in €", "Szenario"
+    )
+    return charts.animate(fig, "Monat") if animiert else fig
+
+@instrumentation.timed("figur")
+@cache.memoize
+def saas_cohort_figure(start_mrr: float, monatliche_wachstumsrate: float, monate_planungszeitraum: int,
+                       lineares_ziel_delta_mrr: float, churn: float, fruehchurn: float, expansion: float,
+                       schritte_pro_monat: float):
+    """
+    Erstellt das Schichtdiagramm des Kohortenmodells: MRR der Bestandskunden und je
+    Akquisejahrgang, dazu der Plan ohne Churn und das lineare Ziel.
+
+    Args:
+        start_mrr (float): Startumsatz (MRR) in €.
+        monatliche_wachstumsrate (float): Monatliches Wachstum der Neukundenakquise in Prozent.
+        monate_planungszeitraum (int): Planungszeitraum in Monaten.
+        lineares_ziel_delta_mrr (float): Linearer Zuwachs des MRR pro Monat in €.
+        churn (float): Monatlicher Churn reifer Kunden in Prozent.
+        fruehchurn (float): Zusätzlicher monatlicher Churn neuer Kunden in Prozent.
+        expansion (float): Monatliche Expansion verbleibender Kunden in Prozent.
+        schritte_pro_monat (float): Zeitauflösung, siehe cohorts.AUFLOESUNGEN.
+
+    Returns:
+        plotly.graph_objects.Figure: Die fertige Figur.
+    """
+    ergebnis = saas_cohort_layers(start_mrr, monatliche_wachstumsrate, monate_planungszeitraum, churn, fruehchurn,
+                                  expansion, schritte_pro_monat)
+    # Auch bei Tagesauflösung genügt dem Chart eine Stützstelle je Monat
+    auswahl = np.round(np.arange(monate_planungszeitraum + 1) * schritte_pro_monat).astype(int)
+    monate = ergebnis["monate"][auswahl]
+
+    fig = charts.new_figure()
+    fig.add_trace(go.Scatter(x=monate, y=ergebnis["mrr_bestand"][auswahl], mode="lines", stackgroup="kohorten",
+                             name="Bestandskunden", line=dict(width=0.5)))
+    for jahrgang, schicht in enumerate(ergebnis["schichten"], start=1):
+        fig.add_trace(go.Scatter(x=monate, y=schicht[auswahl], mode="lines", stackgroup="kohorten",
+                                 name=f"Neukunden Jahr {jahrgang}", line=dict(width=0.5)))
+    fig.add_trace(go.Scatter(x=monate, y=ergebnis["mrr_plan"][auswahl], mode="lines", name="Plan ohne Churn",
+                             line=dict(color="#d0d4e4", dash="dot")))
+    fig.add_trace(go.Scatter(x=monate, y=start_mrr + lineares_ziel_delta_mrr * monate, mode="lines",
+                             name="Lineares Ziel", line=dict(color="#f5f7fb", dash="dash")))
+    fig.update_layout(
+        title="MRR nach Kundenkohorten: Churn und Expansion",
+        xaxis_title="Monat",
+        yaxis_title="MRR in €"
+    )
+    return fig
+
+@instrumentation.timed("figur")
+def monte_carlo_figure(ergebnis: dict, startkapital: float, sparrate: float):
+    """
+    Erstellt den Fächer-Chart (Perzentilbänder) der Monte-Carlo-Simulation, auch für
+    Zwischenstände mit einem Teil der Pfade.
+
+    Args:
+        ergebnis (dict): (Zwischen-)Ergebnis von montecarlo.simulate bzw. simulate_progressive.
+        startkapital (float): Startkapital in €.
+        sparrate (float): Monatliche Sparrate in €.
+
+    Returns:
+        plotly.graph_objects.Figure: Die fertige Figur.
+    """
+    jahre = ergebnis["jahre"]
+    p05, p25, p50, p75, p95 = ergebnis["lara_baender"]
+    eingezahlt = startkapital + sparrate * 12 * jahre
+
+    fig = charts.new_figure()
+    for oben, unten, name, deckkraft in ((p95, p05, "Lara 5–95 %", 0.18), (p75, p25, "Lara 25–75 %", 0.35)):
+        fig.add_trace(go.Scatter(x=jahre, y=oben, mode="lines", line=dict(width=0), showlegend=False, hoverinfo="skip"))
+        fig.add_trace(go.Scatter(x=jahre, y=unten, mode="lines", line=dict(width=0), fill="tonexty",
+                                 fillcolor=f"rgba(155,225,93,{deckkraft})", name=name))
+    fig.add_trace(go.Scatter(x=jahre, y=p50, mode="lines", name="Lara Median", line=dict(color="#9be15d", width=3)))
+    fig.add_trace(go.Scatter(x=jahre, y=ergebnis["tim_baender"][2], mode="lines", name="Tim Median",
+                             line=dict(color="#00c6ff")))
+    fig.add_trace(go.Scatter(x=jahre, y=eingezahlt, mode="lines", name="Nur eingezahlt",
+                             line=dict(color="#d0d4e4", dash="dot")))
+    fig.update_layout(
+        title=f"Zinseszins unter schwankenden Renditen ({format_number(ergebnis['pfade'])} Pfade)",
+        xaxis_title="Jahr",
+        yaxis_title="Kapital in €"
+    )
+    return fig
+
+@instrumentation.timed("figur")
+@cache.memoize
+def backtest_figure(name: str, startkapital: float, sparrate: float, laufzeit: int, zinssatz: float,
+                    vorschuessig: bool = True, kosten: float = 0.0, steuer: float = 0.0):
+    """
+    Erstellt den Chart des Backtests: Endkapital von Lara und Tim je historischem Startjahr,
+    dazu Laras Endkapital beim festen Zinssatz als Vergleichslinie.
+
+    Args:
+        name (str): Name der Renditereihe (siehe backtest.available_series).
+        zinssatz (float): Fester jährlicher Zinssatz in Prozent.
+        Sonst siehe render_backtest_panel.
+
+    Returns:
+        plotly.graph_objects.Figure: Die fertige Figur.
+    """
+    annahmen = dict(vorschuessig=vorschuessig, kosten=kosten, steuer=steuer)
+    ergebnis = backtest_run(name, startkapital, sparrate, laufzeit, **annahmen)
+    startjahre = ergebnis["startjahre"]
+    fig = charts.line_figure(
+        startjahre,
+        {"Zinseszins (Lara)": ergebnis["endkapital_lara"], "Lineares Sparen (Tim)": ergebnis["endkapital_tim"],
+         "Nur eingezahlt": np.full(len(startjahre), ergebnis["eigenleistung"])},
+        f"Endkapital nach {laufzeit} Jahren je Startjahr", "Startjahr", "Kapital in €", "Szenario"
+    )
+    # Gleiche Zinsperioden wie die Reihe, damit nur die Renditefolge den Unterschied macht
+    fest = compound_interest_final(startkapital, sparrate, laufzeit, zinssatz, ergebnis["perioden_pro_jahr"], **annahmen)
+    fig.add_hline(y=float(fest["endkapital_lara"]), line_dash="dash", line_color="#f5f7fb",
+                  annotation_text=f"Lara bei festen {format_number(zinssatz, 1)} %")
+    return fig
+
+@instrumentation.timed("figur")
+@cache.memoize
+def branching_figure(starter_personen: int, multiplikator: float, anzahl_wellen: int, replikate: int,
+                     population: int, verteilung: str, dispersion: float):
+    """
+    Erstellt den Chart der kumulierten Reichweite im stochastischen Modus: Perzentilband
+    der Simulation, geometrische Kurve der Engine und Mean-Field-Erwartung mit Sättigung.
+
+    Args:
+        starter_personen (int): Initiale Personen.
+        multiplikator (float): Mittlere Anzahl überzeugter Personen je Person und Welle.
+        anzahl_wellen (int): Anzahl der Wellen.
+        replikate (int): Anzahl der Simulationsläufe.
+        population (int): Populationsgröße oder None.
+        verteilung (str): "poisson" oder "negbin".
+        dispersion (float): Dispersionsparameter k.
+
+    Returns:
+        plotly.graph_objects.Figure: Die fertige Figur.
+    """
+    ergebnis = spread_simulation(starter_personen, multiplikator, anzahl_wellen, replikate, population,
+                                 verteilung, dispersion)
+    runden = ergebnis["runden"]
+    p05, p50, p95 = np.percentile(ergebnis["kumulativ_erreicht"], [5, 50, 95], axis=0)
+    geometrisch = engine.viral_series(starter_personen, multiplikator, anzahl_wellen)["kumulativ_erreicht"]
+    erwartung = np.cumsum(branching.mean_field_series(starter_personen, multiplikator, anzahl_wellen, population))
+
+    fig = charts.new_figure()
+    fig.add_trace(go.Scatter(x=runden, y=p95, mode="lines", line=dict(width=0), showlegend=False, hoverinfo="skip"))
+    fig.add_trace(go.Scatter(x=runden, y=p05, mode="lines", line=dict(width=0), fill="tonexty",
+                             fillcolor="rgba(0,198,255,0.25)", name="Simulation 5–95 %"))
+    fig.add_trace(go.Scatter(x=runden, y=p50, mode="lines", name="Simulation Median", line=dict(color="#00c6ff", width=3)))
+    fig.add_trace(go.Scatter(x=runden, y=geometrisch, mode="lines", name="Geometrisch (ohne Grenze)",
+                             line=dict(color="#d0d4e4", dash="dot")))
+    if population:
+        fig.add_trace(go.Scatter(x=runden, y=erwartung, mode="lines", name="Erwartung mit Sättigung",
+                                 line=dict(color="#9be15d")))
+        fig.add_hline(y=population, line_dash="dash", line_color="#f5f7fb", annotation_text="Population")
+    fig.update_layout(
+        title="Kumulierte Reichweite: Zufall und Sättigung",
+        xaxis_title="Runde",
+        yaxis_title="Gesamt erreicht",
+        yaxis_type="log"
+    )
+    return fig
+
+def network_spread(starter_personen: int, multiplikator: float, anzahl_wellen: int, modell: str, knoten: int,
+                   mittlerer_grad: int):
+    """
+    Anytime-Auswertung des Netzwerk-Modus: Baut den Graphen (bzw. mappt ihn aus dem Graph-Cache)
+    mit Fortschrittsmeldungen je Block und lässt die Ausbreitung darauf laufen.
+
+    Args:
+        starter_personen (int): Anzahl der Startpersonen.
+        multiplikator (float): Mittlere Anzahl überzeugter Kontakte je Person und Welle.
+        anzahl_wellen (int): Anzahl der Wellen.
+        modell (str): "small_world" oder "scale_free".
+        knoten (int): Anzahl der Personen im Netzwerk.
+        mittlerer_grad (int): Mittlere Anzahl Kontakte je Person.
+
+    Yields:
+        tuple[float, dict]: Fortschritt mit ``None``, zuletzt das Ergebnis von network.spread.
+    """
+    for anteil, graph in network.build_graph_progressive(modell, knoten, mittlerer_grad):
+        if graph is None:
+            yield 0.9 * anteil, None # Der Bau dominiert; die Ausbreitung bekommt den Rest des Balkens
+    yield 1.0, network.spread(*graph, starter_personen, multiplikator, anzahl_wellen)
+
+@instrumentation.timed("figur")
+def network_figure(ergebnis: dict, starter_personen: int, multiplikator: float, anzahl_wellen: int, knoten: int):
+    """
+    Erstellt den Chart der neu erreichten Personen pro Welle im Netzwerk neben der geometrischen Kurve.
+
+    Args:
+        ergebnis (dict): Ausbreitung aus :func:`network_spread`.
+        starter_personen (int): Anzahl der Startpersonen.
+        multiplikator (float): Mittlere Anzahl überzeugter Kontakte je Person und Welle.
+        anzahl_wellen (int): Anzahl der Wellen.
+        knoten (int): Anzahl der Personen im Netzwerk.
+
+    Returns:
+        plotly.graph_objects.Figure: Die fertige Figur.
+    """
+    geometrisch = engine.viral_series(starter_personen, multiplikator, anzahl_wellen)
+
+    fig = charts.new_figure()
+    fig.add_trace(go.Bar(x=ergebnis["runden"], y=ergebnis["neu_erreicht_pro_runde"], name="Netzwerk",
+                         marker_color="#00c6ff"))
+    fig.add_trace(go.Scatter(x=geometrisch["runden"], y=geometrisch["neu_erreicht_pro_runde"], mode="lines+markers",
+                             name="Geometrisch (ohne Netzwerk)", line=dict(color="#9be15d")))
+    fig.update_layout(
+        title=f"Neu erreichte Personen pro Welle im Netzwerk ({human_number(knoten)} Personen)",
+        xaxis_title="Runde",
+        yaxis_title="Anzahl Personen",
+        yaxis_type="log"
+    )
+    return fig
+
+def sweep_display_grids(space: str, x_param: str, y_param: str, metric: str, aktuelle_werte: dict,
+                        resolution: int, bereiche: dict = None):
+    """
+    Anytime-Auswertung eines 2-D-Parameter-Sweeps: Das Raster wird blockweise in voller
+    Auflösung berechnet und jeder Zwischenstand für den Browser auf höchstens
+    sweep.MAX_DISPLAY_CELLS Zellen je Achse verkleinert. Gecacht wird so nur das kleine Raster.
+
+    Args:
+        space (str): Schlüssel in sweep.SWEEP_SPACES.
+        x_param (str): Parameter auf der x-Achse.
+        y_param (str): Parameter auf der y-Achse.
+        metric (str): Dargestellte Kennzahl.
+        aktuelle_werte (dict): Aktuelle Slider-Werte der übrigen Parameter der Geschichte.
+        resolution (int): Stützstellen je Achse für die Berechnung.
+        bereiche (dict): Optional abweichende (Minimum, Maximum) je Parameter.
+
+    Yields:
+        tuple[float, tuple]: Anteil der berechneten Zeilen und das verkleinerte Raster (x, y, z).
+    """
+    log_skala = sweep.SWEEP_SPACES[space]["kennzahlen"][metric][1]
+    for anteil, (x, y, z) in sweep.evaluate_grid_progressive(space, x_param, y_param, metric, aktuelle_werte,
+                                                             resolution, bereiche=bereiche):
+        if log_skala:
+            # Exponentielle Kennzahlen logarithmisch einfärben, sonst wäre nur die letzte Ecke sichtbar
+            z = np.log10(np.maximum(z, 1.0))
+        x_anzeige, y_anzeige, z_anzeige = sweep.downsample_grid(x, y, z)
+        yield anteil, (x_anzeige, y_anzeige, z_anzeige.astype(np.float32)) # float32 halbiert die Payload
+
+@instrumentation.timed("figur")
+def sweep_figure(space: str, x_param: str, y_param: str, metric: str, aktuelle_werte: dict, darstellung: str,
+                 raster: tuple):
+    """
+    Erstellt die Heatmap (bzw. Konturdarstellung) eines 2-D-Parameter-Sweeps, auch für
+    Zwischenstände mit einem Teil der Zeilen.
+
+    Args:
+        space (str): Schlüssel in sweep.SWEEP_SPACES.
+        x_param (str): Parameter auf der x-Achse.
+        y_param (str): Parameter auf der y-Achse.
+        metric (str): Dargestellte Kennzahl.
+        aktuelle_werte (dict): Aktuelle Slider-Werte aller Parameter der Geschichte.
+        darstellung (str): "Heatmap" oder "Konturen".
+        raster (tuple): Verkleinertes Raster (x, y, z) aus :func:`sweep_display_grids`.
+
+    Returns:
+        plotly.graph_objects.Figure: Die fertige Figur mit markierter aktueller Auswahl.
+    """
+    raum = sweep.SWEEP_SPACES[space]
+    label, log_skala = raum["kennzahlen"][metric]
+    if log_skala:
+        label = f"log₁₀ {label}"
+    x, y, z = raster
+
+    trace = go.Contour if darstellung == "Konturen" else go.Heatmap
+    fig = charts.new_figure(trace(
+        x=x, y=y, z=z,
+        colorscale="Viridis",
+        colorbar=dict(title=label),
+        hovertemplate=f"%{{x}} / %{{y}}<br>{label}: %{{z:.3f}}<extra></extra>",
+    ))
+    fig.add_trace(go.Scatter(
+        x=[aktuelle_werte[x_param]], y=[aktuelle_werte[y_param]],
+        mode="markers", name="Aktuelle Auswahl",
+        marker=dict(symbol="x", size=14, color="#ffffff", line=dict(width=2, color="#10131a")),
+    ))
+    fig.update_layout(
+        title=f"Sweep: {label}",
+        xaxis_title=raum["parameter"][x_param][0],
+        yaxis_title=raum["parameter"][y_param][0],
+        hovermode="closest"
+    )
+    return fig
 
 # ------------------------------------------------------
 # Hero-Bereich (Hero Section)
@@ -302,12 +1046,17 @@ with hero_col1:
     )
 with hero_col2:
     render_cover_image(
-        IMAGE_URLS["hero"],
-        "Wenn Wachstum explodiert, verändern sich Welten."
+        "hero",
+        "Wenn Wachstum explodiert, verändern sich Welten.",
+        sizes="(min-width: 768px) 45vw, 100vw", # Rechte Spalte (4/9) des Hero-Bereichs
+        eager=True
     )
 st.markdown("---")
 
-# Tabs zur Navigation zwischen den Geschichten
+# Tabs zur Navigation zwischen den Geschichten.
+# Der interaktive Teil jedes Tabs ist ein eigenes st.fragment: Eine Widget-Änderung führt nur
+# das Fragment ihres Tabs erneut aus – die anderen Tabs, der CSS-Block und die statischen
+# Story-Karten werden weder neu berechnet noch erneut an den Browser gesendet.
 tab1, tab2, tab3, tab4 = st.tabs([
     "🌾 Schachbrett-Legende",
     "💰 Zinseszins vs. Zeit",
@@ -318,119 +1067,102 @@ tab1, tab2, tab3, tab4 = st.tabs([
 # ------------------------------------------------------
 # Tab 1: Schachbrett-Legende
 # ------------------------------------------------------
-with tab1:
-    render_intro_card(
-        "Am Morgen der Audienz tritt ein Gelehrter vor den König und präsentiert das Schachspiel. "
-        "Als Belohnung verlangt er nur Reis auf den Feldern des Brettes – jedes Mal doppelt so viel wie zuvor. "
-        "Der Hof schmunzelt, ahnt aber nicht, dass diese Verdopplung das Reich an den Rand der Kapitulation bringt."
-    )
-    render_cover_image(
-        IMAGE_URLS["schachbrett"],
-        "Reis, soweit das Auge reicht – und doch nur ein Vorgeschmack auf Exponentialität."
-    )
-    render_story_card(
-        """
-        In alten Chroniken heißt es, der König lachte über den „bescheidenen“ Wunsch nach verdoppelten Reiskörnern pro Feld.
-        Doch nach wenigen Reihen füllten sich Scheunen, Speicher und schließlich ganze Städte. Erst dann begriff der Hof,
-        welche Macht in einer einfachen Verdopplung steckt.
-        """
-    )
-
+@st.fragment
+@instrumentation.traced("Schachbrett", profiling_enabled)
+def render_chessboard_scene():
+    """
+    Interaktive Szene der Schachbrett-Legende (Slider, Kennzahlen und Chart).
+    """
     col1, col2 = st.columns([1, 2], gap="large")
     with col1:
         st.subheader("Einstellbare Szene")
-        feld_nummer = st.slider("Wähle ein Feld (1–64)", min_value=1, max_value=64, value=32, step=1)
-        
-        # Berechnungen für die Schachbrett-Legende
-        koerner_auf_feld = 2 ** (feld_nummer - 1)
-        koerner_gesamt = 2 ** feld_nummer - 1 # Summe aller Körner bis zu diesem Feld
-        
-        gewicht_pro_korn_g = 0.025 # Gramm
-        gewicht_tonnen = koerner_gesamt * gewicht_pro_korn_g / 1_000_000 # Umrechnung von Gramm in Tonnen
+        seitenlaenge = st.select_slider("Brettgröße", options=[8, 16, 32, 64, 100, 250, 500, 1_000], value=8,
+                                        format_func=lambda n: f"{n} × {n}")
+        faktor = st.slider("Vervielfachung pro Feld", min_value=1.0, max_value=10.0, value=2.0, step=0.1,
+                           help="2,0 entspricht der klassischen Verdopplung der Legende.")
+        anzahl_felder = seitenlaenge ** 2
+        feld_nummer = st.slider(f"Wähle ein Feld (1–{format_number(anzahl_felder)})", min_value=1,
+                                max_value=anzahl_felder, value=anzahl_felder // 2, step=1)
         
-        flaeche_pro_korn_cm2 = 0.3 # cm²
-        flaeche_m2 = koerner_gesamt * flaeche_pro_korn_cm2 / 10_000 # Umrechnung von cm² in m²
+        # Berechnungen für die Schachbrett-Legende (exakt bzw. im Logarithmus, siehe engine.chessboard_scene)
+        szene = chessboard_scene(feld_nummer, faktor)
         
-        # Vergleichslisten für Metriken
-        gewicht_vergleiche = [
-            ("40-Tonnen-Lkw", 40), # 40 Tonnen
-            ("Eiffelturm", 10_100), # 10.100 Tonnen
-            ("Cheops-Pyramide", 5_750_000), # 5,75 Millionen Tonnen
-            ("Weltreisproduktion (Jahr)", 520_000_000), # ca. 520 Millionen Tonnen (2023)
-        ]
-        flaechen_vergleiche = [
-            ("Basketballfeld", 420), # ~420 m²
-            ("Frankfurter Römerberg", 7_000), # ~7.000 m²
-            ("Frankfurter Flughafen", 2_300_000), # ~2,3 Millionen m²
-        ]
+        # Referenzen für Metriken und Zielwertsuche (einmal pro Prozess geladen, siehe catalog.py)
+        gewichte, flaechen = catalog.index("masse"), catalog.index("flaeche")
+        gewicht_vergleiche = gewichte.items("schachbrett")
+        flaechen_vergleiche = flaechen.items("schachbrett")
 
     with col2:
-        st.subheader(f"Feld {feld_nummer} im Fokus")
+        st.subheader(f"Feld {format_number(feld_nummer)} im Fokus")
         
         # Anzeige der Metriken in einer strukturierten Weise
         metric_row = st.columns(3, gap="large")
-        metric_row[0].metric("Reiskörner auf dem Feld", human_number(koerner_auf_feld))
-        metric_row[1].metric("Kumuliert bis Feld", human_number(koerner_gesamt))
-        metric_row[2].metric("Gewicht (t)", human_number(gewicht_tonnen))
+        metric_row[0].metric("Reiskörner auf dem Feld", magnitude_number(szene["log10_koerner_auf_feld"]))
+        metric_row[1].metric("Kumuliert bis Feld", magnitude_number(szene["log10_koerner_gesamt"]))
+        metric_row[2].metric("Gewicht (t)", magnitude_number(szene["log10_gewicht_tonnen"]))
         
         caption_row = st.columns(3, gap="large")
-        caption_row[0].caption(f"Exakt: {format_number(koerner_auf_feld)} Körner")
-        caption_row[1].caption(f"Exakt: {format_number(koerner_gesamt)} Körner")
-        caption_row[2].caption(f"Exakt: {format_number(gewicht_tonnen, 2)} t")
+        if szene["koerner_gesamt"] is None:
+            caption_row[0].caption(f"≈ {scientific_number(szene['log10_koerner_auf_feld'])} Körner")
+            caption_row[1].caption(f"≈ {scientific_number(szene['log10_koerner_gesamt'])} Körner")
+            caption_row[2].caption(f"≈ {scientific_number(szene['log10_gewicht_tonnen'])} t")
+        else:
+            # Bei gebrochenem Faktor sind die Körnerzahlen nur rechnerische Näherungen
+            praefix = "Exakt:" if float(faktor).is_integer() else "≈"
+            caption_row[0].caption(f"{praefix} {format_number(szene['koerner_auf_feld'])} Körner")
+            caption_row[1].caption(f"{praefix} {format_number(szene['koerner_gesamt'])} Körner")
+            caption_row[2].caption(f"{praefix} {format_number(szene['gewicht_tonnen'], 2)} t")
         
         metric_row2 = st.columns(2, gap="large")
-        metric_row2[0].metric("Gewichtsvergleich", best_comparison(gewicht_tonnen, gewicht_vergleiche))
-        metric_row2[1].metric("Flächenbedarf", best_comparison(flaeche_m2, flaechen_vergleiche))
+        metric_row2[0].metric("Gewichtsvergleich", gewichte.best_log10(szene["log10_gewicht_tonnen"]))
+        metric_row2[1].metric("Flächenbedarf", flaechen.best_log10(szene["log10_flaeche_m2"]))
         
         caption_row2 = st.columns(2, gap="large")
-        caption_row2[0].caption("Referenzen: 40 t – 520 Mio. t (Weltreisproduktion)")
-        caption_row2[1].caption("Referenzen: 420 m² (Basketballfeld) – 2.3 Mio. m² (Flughafen)")
+        caption_row2[0].caption(f"{len(gewichte)} Referenzen: {gewichte.bezeichnungen[0]} bis {gewichte.bezeichnungen[-1]}")
+        caption_row2[1].caption(f"{len(flaechen)} Referenzen: {flaechen.bezeichnungen[0]} bis {flaechen.bezeichnungen[-1]}")
         
         st.caption("Der Großteil des Reisbergs entsteht auf den letzten Feldern – ein klassisches Merkmal exponentieller Prozesse.")
     
     with st.expander("Visualisierung & Details"):
-        # DataFrame für die Plot-Erstellung
-        df_chessboard = pd.DataFrame({
-            "Feld": range(1, 65),
-            "Reiskörner": [2 ** (i - 1) for i in range(1, 65)],
-            "Kumuliert": [2 ** i - 1 for i in range(1, 65)]
-        })
-        
-        fig = px.line(
-            df_chessboard[df_chessboard["Feld"] <= feld_nummer],
-            x="Feld",
-            y=["Reiskörner", "Kumuliert"],
-            labels={"value": "Anzahl der Reiskörner", "variable": "Sicht"},
-            title="Exponentielles Wachstum auf dem Schachbrett",
-            log_y=True # Logarithmische Skala ist essentiell für die Darstellung exponentiellen Wachstums
-        )
-        fig.update_layout(
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-            hovermode="x unified" # Verbessert die Lesbarkeit beim Hovern über mehrere Linien
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        fig = chessboard_figure(feld_nummer, faktor, animiert=render_play_toggle("schachbrett"))
+        render_chart(fig)
         st.info("Hinweis: Eine logarithmische Skala ist nötig, um das enorme Wachstum auf den späteren Feldern sichtbar zu machen. Auf einer linearen Skala wären die früheren Felder kaum zu erkennen.")
+        if anzahl_felder > engine.CHART_MAX_PUNKTE:
+            st.caption(f"Für die Darstellung werden höchstens {engine.CHART_MAX_PUNKTE} gleichmäßig verteilte Felder berechnet.")
 
-# ------------------------------------------------------
-# Tab 2: Zinseszins vs. Zeit (Compound Interest vs. Time)
-# ------------------------------------------------------
-with tab2:
+    render_chessboard_goal_seek(faktor, gewicht_vergleiche, flaechen_vergleiche)
+    render_sweep_panel("schachbrett", {"feld_nummer": feld_nummer, "faktor": faktor},
+                       bereiche={"feld_nummer": (1, anzahl_felder)})
+
+with tab1:
     render_intro_card(
-        "Frankfurt, Rooftop-Bar: Zwei Absolventen stoßen auf ihren Karrierestart an. "
-        "Beide haben gleich viel gespart – doch nur eine Person hat ihre Zinsen stets reinvestiert. "
-        "Im Abendlicht offenbart der Depotvergleich, wie stark Exponentialität Vermögen treibt."
+        "Am Morgen der Audienz tritt ein Gelehrter vor den König und präsentiert das Schachspiel. "
+        "Als Belohnung verlangt er nur Reis auf den Feldern des Brettes – jedes Mal doppelt so viel wie zuvor. "
+        "Der Hof schmunzelt, ahnt aber nicht, dass diese Verdopplung das Reich an den Rand der Kapitulation bringt."
     )
     render_cover_image(
-        IMAGE_URLS["zinseszins"],
-        "Der Zinseszins ist der leise Architekt beim Vermögensaufbau."
+        "schachbrett",
+        "Reis, soweit das Auge reicht – und doch nur ein Vorgeschmack auf Exponentialität."
     )
     render_story_card(
         """
-        Lara lässt jeden Ertrag im Depot, Tim investiert gleich viel, gönnt sich aber jährlich die Zinsen.
-        25 Jahre später zeigt die Skyline, wie weit Exponentialität Lara getragen hat – Tims Depot blieb linear.
+        In alten Chroniken heißt es, der König lachte über den „bescheidenen“ Wunsch nach verdoppelten Reiskörnern pro Feld.
+        Doch nach wenigen Reihen füllten sich Scheunen, Speicher und schließlich ganze Städte. Erst dann begriff der Hof,
+        welche Macht in einer einfachen Verdopplung steckt.
         """
     )
-    
+
+    render_chessboard_scene()
+
+# ------------------------------------------------------
+# Tab 2: Zinseszins vs. Zeit (Compound Interest vs. Time)
+# ------------------------------------------------------
+@st.fragment
+@instrumentation.traced("Zinseszins", profiling_enabled)
+def render_compound_interest_scene():
+    """
+    Interaktive Szene des Zinseszins-Vergleichs (Eingaben, Chart und Bilanz).
+    """
     col1, col2 = st.columns([1, 2], gap="large")
     with col1:
         st.subheader("Finanzielle Ausgangslage")
@@ -438,54 +1170,40 @@ with tab2:
         sparrate = st.slider("Monatliche Sparrate (€)", min_value=0, max_value=5_000, value=400, step=50)
         laufzeit = st.slider("Laufzeit (Jahre)", min_value=5, max_value=50, value=25)
         zinssatz = st.slider("Jährlicher Zinssatz (%)", min_value=0.0, max_value=18.0, value=7.0, step=0.5)
+
+        with st.expander("Weitere Annahmen"):
+            verzinsung = st.selectbox("Verzinsung & Sparrate", list(engine.ZINSPERIODEN), index=0,
+                                      help="Wie oft Zinsen gutgeschrieben und Sparraten eingezahlt werden.")
+            zeitpunkt = st.radio("Einzahlung", ["Periodenbeginn", "Periodenende"], horizontal=True)
+            inflation = st.slider("Inflation (% p.a.)", min_value=0.0, max_value=10.0, value=0.0, step=0.1,
+                                  help="Alle Beträge werden in heutiger Kaufkraft ausgewiesen.")
+            kosten = st.slider("Kosten (% p.a.)", min_value=0.0, max_value=3.0, value=0.0, step=0.05,
+                               help="Laufende Kosten, z.B. die TER eines ETFs; mindern den Zins.")
+            steuer = st.slider("Kapitalertragsteuer (%)", min_value=0.0, max_value=50.0, value=0.0, step=0.125,
+                               help="Abgeltungsteuer inkl. Soli: 26,375 %. Tims Zinsen werden jährlich versteuert, "
+                                    "Laras Gewinne erst am Ende der Laufzeit.")
+        annahmen = {
+            "perioden_pro_jahr": engine.ZINSPERIODEN[verzinsung],
+            "vorschuessig": zeitpunkt == "Periodenbeginn",
+            "inflation": inflation,
+            "kosten": kosten,
+            "steuer": steuer,
+        }
         
-        # Korrigierte Berechnungen für Zinseszins- und lineares Szenario
-        jahre = list(range(laufzeit + 1))
-        kapital_zinseszins = [float(startkapital)] # Laras Kapital (Zinseszins)
-        kapital_lineares_sparen = [float(startkapital)] # Tims Kapital (lineares Sparen)
-        eingezahlt_total = [float(startkapital)] # Summe der eigenen Einzahlungen (Start + Sparraten)
-        
-        for jahr in range(1, laufzeit + 1):
-            # Laras Kapital: Vorheriges Kapital + jährliche Sparrate * 12, dann Zins angewendet
-            kapital_zinseszins.append((kapital_zinseszins[-1] + sparrate * 12) * (1 + zinssatz / 100))
-            
-            # Gesamte Eigenleistung bis zum aktuellen Jahr
-            eingezahlt_total.append(float(startkapital + sparrate * 12 * jahr))
-            
-            # Tims Kapital: Startkapital + jährliche Sparrate * 12 + einfache Zinsen auf Startkapital
-            # Die Zinsen auf das Startkapital werden hier als "einfache Zinsen" (simple interest) betrachtet,
-            # da Tim sich die jährlichen Zinsen gönnt und sie nicht reinvestiert.
-            zinsen_einfach_tim = startkapital * (zinssatz / 100) * jahr
-            kapital_lineares_sparen.append(float(startkapital + (sparrate * 12 * jahr) + zinsen_einfach_tim))
-
-        endkapital_lara = kapital_zinseszins[-1]
-        eigenleistung_kumuliert = eingezahlt_total[-1] # Gesamtes vom Nutzer eingezahltes Geld
+        # Zinseszins- und lineares Szenario in geschlossener Form (siehe engine.compound_interest_final)
+        bilanz = compound_interest_final(startkapital, sparrate, laufzeit, zinssatz, **annahmen)
+        endkapital_lara = float(bilanz["endkapital_lara"])
+        eigenleistung_kumuliert = float(bilanz["eigenleistung_kumuliert"]) # Gesamtes vom Nutzer eingezahltes Geld
         zinsgewinne_lara = endkapital_lara - eigenleistung_kumuliert
         
-        endkapital_tim = kapital_lineares_sparen[-1]
+        endkapital_tim = float(bilanz["endkapital_tim"])
         vorsprung_lara_vs_tim = endkapital_lara - endkapital_tim
 
     with col2:
         st.subheader("Vermögensreise über die Jahre")
-        plot_df_finanzen = pd.DataFrame({
-            "Jahr": jahre,
-            "Zinseszins (Lara)": kapital_zinseszins,
-            "Nur eingezahlt": eingezahlt_total,
-            "Lineares Sparen (Tim)": kapital_lineares_sparen
-        })
-        
-        fig = px.line(
-            plot_df_finanzen,
-            x="Jahr",
-            y=["Zinseszins (Lara)", "Nur eingezahlt", "Lineares Sparen (Tim)"],
-            labels={"value": "Kapital in €", "variable": "Szenario"},
-            title="Zinseszins vs. Lineares Sparen"
-        )
-        fig.update_layout(
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-            hovermode="x unified"
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        fig = compound_interest_figure(startkapital, sparrate, laufzeit, zinssatz, **annahmen,
+                                       animiert=render_play_toggle("zinseszins"))
+        render_chart(fig)
         
         st.write("---")
         st.subheader(f"Bilanz nach {laufzeit} Jahren")
@@ -500,32 +1218,50 @@ with tab2:
         cap_cols[1].caption(f"Exakt: {format_number(eigenleistung_kumuliert, 2)} €")
         cap_cols[2].caption(f"Exakt: {format_number(zinsgewinne_lara, 2)} €")
         cap_cols[3].caption(f"Exakt: {format_number(vorsprung_lara_vs_tim, 2)} €")
+        if inflation or kosten or steuer:
+            st.caption(f"Nach {format_number(kosten, 2)} % Kosten p.a. und {format_number(steuer, 3)} % Steuer auf Erträge, "
+                       f"in heutiger Kaufkraft bei {format_number(inflation, 1)} % Inflation.")
         
         if zinsgewinne_lara > eigenleistung_kumuliert:
             st.success("Herzlichen Glückwunsch! Ihr Kapital arbeitet härter als Ihre Einzahlungen – die exponentielle Phase ist erreicht.")
         else:
             st.info("Noch überwiegen die Eigenleistungen die Zinsgewinne. Bleiben Sie geduldig, mit der Zeit kehrt sich das Verhältnis um!")
 
-# ------------------------------------------------------
-# Tab 3: Viraler Dominoeffekt (Viral Domino Effect)
-# ------------------------------------------------------
-with tab3:
+    render_compound_interest_goal_seek(startkapital, sparrate, laufzeit, zinssatz, annahmen)
+    render_monte_carlo_panel(startkapital, sparrate, laufzeit, zinssatz)
+    render_backtest_panel(startkapital, sparrate, laufzeit, zinssatz, annahmen)
+    render_sweep_panel("zinseszins", {
+        "startkapital": startkapital, "sparrate": sparrate, "laufzeit": laufzeit, "zinssatz": zinssatz, **annahmen,
+    })
+
+with tab2:
     render_intro_card(
-        "Ein Startup veröffentlicht seine nachhaltige Kreditkarte in Social Media. "
-        "Ein einziger Post entfacht eine Kette: Jede Kundin überzeugt weitere Freundinnen – "
-        "die Monitoring-Screens im Headquarter leuchten und das Support-Team kommt ins Schwitzen."
+        "Frankfurt, Rooftop-Bar: Zwei Absolventen stoßen auf ihren Karrierestart an. "
+        "Beide haben gleich viel gespart – doch nur eine Person hat ihre Zinsen stets reinvestiert. "
+        "Im Abendlicht offenbart der Depotvergleich, wie stark Exponentialität Vermögen treibt."
     )
     render_cover_image(
-        IMAGE_URLS["viral"],
-        "Wenn eine Idee den Nerv trifft, vervielfacht sie sich in Wellen."
+        "zinseszins",
+        "Der Zinseszins ist der leise Architekt beim Vermögensaufbau."
     )
     render_story_card(
         """
-        <p>Die Kampagne trifft einen Nerv: Jeder neue Kunde bringt durchschnittlich 1,7 weitere mit.</p>
-        <p>In wenigen Wellen schießt die Nutzung durch die Decke – Netzwerkeffekte in Reinform.</p>
+        Lara lässt jeden Ertrag im Depot, Tim investiert gleich viel, gönnt sich aber jährlich die Zinsen.
+        25 Jahre später zeigt die Skyline, wie weit Exponentialität Lara getragen hat – Tims Depot blieb linear.
         """
     )
-    
+
+    render_compound_interest_scene()
+
+# ------------------------------------------------------
+# Tab 3: Viraler Dominoeffekt (Viral Domino Effect)
+# ------------------------------------------------------
+@st.fragment
+@instrumentation.traced("Viral", profiling_enabled)
+def render_viral_scene():
+    """
+    Interaktive Szene des viralen Dominoeffekts (Eingaben, Chart und Reichweite).
+    """
     col1, col2 = st.columns([1, 2], gap="large")
     with col1:
         st.subheader("Netzwerk-Dynamik")
@@ -533,58 +1269,24 @@ with tab3:
         multiplikator = st.slider("Multiplikator pro Welle", min_value=0.5, max_value=5.0, value=1.7, step=0.1)
         anzahl_wellen = st.slider("Anzahl Wellen", min_value=1, max_value=40, value=15)
         
-        runden_liste = list(range(1, anzahl_wellen + 1))
-        neu_erreicht_pro_runde = []
-        kumulativ_erreicht = []
-        
-        total_erreicht_kumuliert = 0
-
-        for i in range(anzahl_wellen):
-            # Die exponentielle Formel für die Anzahl der Personen in Welle 'i' (beginnend bei 0)
-            # Welle 0 (oder 1 im UI): starter_personen * (multiplikator^0) = starter_personen
-            # Welle 1 (oder 2 im UI): starter_personen * (multiplikator^1)
-            # usw.
-            personen_in_aktueller_welle = starter_personen * (multiplikator ** i) 
-            
-            neu_erreicht_pro_runde.append(personen_in_aktueller_welle)
-            total_erreicht_kumuliert += personen_in_aktueller_welle
-            kumulativ_erreicht.append(total_erreicht_kumuliert)
-        
-        gesamt_personen_erreicht = kumulativ_erreicht[-1] if kumulativ_erreicht else 0
-        personen_letzte_welle = neu_erreicht_pro_runde[-1] if neu_erreicht_pro_runde else 0
-        anteil_letzte_welle_gesamt = personen_letzte_welle / gesamt_personen_erreicht if gesamt_personen_erreicht else 0
+        # Welle i (ab 0) erreicht starter_personen * multiplikator^i Personen (siehe engine.viral_final)
+        reichweite = viral_final(starter_personen, multiplikator, anzahl_wellen)
+        gesamt_personen_erreicht = float(reichweite["gesamt_personen_erreicht"])
+        anteil_letzte_welle_gesamt = float(reichweite["anteil_letzte_welle_gesamt"])
         
-        vergleich_pop = [
-            ("Deutsche Bank Park", 51_500), # Stadionkapazität
-            ("Stadt Frankfurt", 771_000), # Einwohnerzahl Frankfurt
-            ("Region Rhein-Main", 5_800_000), # Einwohnerzahl Rhein-Main
-            ("Deutschland", 84_000_000), # Einwohnerzahl Deutschland
-        ]
+        bevoelkerung = catalog.index("bevoelkerung")
+        vergleich_pop = bevoelkerung.items("viral")
 
     with col2:
         st.subheader("Ausbreitung pro Welle")
-        viral_df = pd.DataFrame({
-            "Runde": runden_liste,
-            "Neu erreicht": neu_erreicht_pro_runde,
-            "Gesamt erreicht": kumulativ_erreicht
-        })
-        
-        fig = px.bar(
-            viral_df,
-            x="Runde",
-            y="Neu erreicht",
-            title="Neu erreichte Personen pro Welle",
-            labels={"Neu erreicht": "Anzahl Personen"}
-        )
-        fig.update_traces(marker_color="#00c6ff")
-        fig.update_layout(hovermode="x unified")
-        st.plotly_chart(fig, use_container_width=True)
+        fig = viral_figure(starter_personen, multiplikator, anzahl_wellen, animiert=render_play_toggle("viral"))
+        render_chart(fig)
         
         st.write("---")
         st.subheader("Resultierende Reichweite")
         cols = st.columns(3, gap="large")
         cols[0].metric("Gesamt erreicht", human_number(gesamt_personen_erreicht))
-        cols[1].metric("Vergleich", best_comparison(gesamt_personen_erreicht, vergleich_pop))
+        cols[1].metric("Vergleich", bevoelkerung.best(gesamt_personen_erreicht))
         cols[2].metric("Anteil letzte Welle", f"{anteil_letzte_welle_gesamt:.0%}")
         
         cap_cols = st.columns(3, gap="large")
@@ -597,26 +1299,41 @@ with tab3:
         else:
             st.caption("Ein großer Teil der Gesamtlast (z.B. für Support oder Infrastruktur) fällt oft in die letzten Wellen – eine vorausschauende Planung ist entscheidend.")
 
-# ------------------------------------------------------
-# Tab 4: SaaS-Hypergrowth (SaaS Hypergrowth)
-# ------------------------------------------------------
-with tab4:
+    render_viral_goal_seek(starter_personen, multiplikator, anzahl_wellen, vergleich_pop)
+    render_branching_panel(starter_personen, multiplikator, anzahl_wellen, vergleich_pop)
+    render_network_panel(starter_personen, multiplikator, anzahl_wellen)
+    render_sweep_panel("viral", {
+        "starter_personen": starter_personen, "multiplikator": multiplikator, "anzahl_wellen": anzahl_wellen,
+    })
+
+with tab3:
     render_intro_card(
-        "Pitch-Deck im Boardroom: Das junge SaaS-Team zeigt 12 % monatliches Wachstum. "
-        "Ein Investor hebt die Augenbrauen – denn 12 % im Monat bedeutet eine Verdopplung in sechs Monaten. "
-        "Cashflow, Server, Hiring – alles muss in exponentiellen Kategorien gedacht werden."
+        "Ein Startup veröffentlicht seine nachhaltige Kreditkarte in Social Media. "
+        "Ein einziger Post entfacht eine Kette: Jede Kundin überzeugt weitere Freundinnen – "
+        "die Monitoring-Screens im Headquarter leuchten und das Support-Team kommt ins Schwitzen."
     )
     render_cover_image(
-        IMAGE_URLS["saas"],
-        "Wenn Product-Market-Fit trifft, rast das Wachstum wie eine Rakete."
+        "viral",
+        "Wenn eine Idee den Nerv trifft, vervielfacht sie sich in Wellen."
     )
     render_story_card(
         """
-        <p>Der 3D-holografische MRR-Chart schießt wie eine Rakete nach oben.</p>
-        <p>Das Team spürt: Jetzt entscheidet die Fähigkeit, exponentielles Wachstum zu managen – nicht nur zu wünschen.</p>
+        <p>Die Kampagne trifft einen Nerv: Jeder neue Kunde bringt durchschnittlich 1,7 weitere mit.</p>
+        <p>In wenigen Wellen schießt die Nutzung durch die Decke – Netzwerkeffekte in Reinform.</p>
         """
     )
-    
+
+    render_viral_scene()
+
+# ------------------------------------------------------
+# Tab 4: SaaS-Hypergrowth (SaaS Hypergrowth)
+# ------------------------------------------------------
+@st.fragment
+@instrumentation.traced("SaaS", profiling_enabled)
+def render_saas_scene():
+    """
+    Interaktive Szene des SaaS-Hypergrowth (Eingaben, Chart und KPIs).
+    """
     col1, col2 = st.columns([1, 2], gap="large")
     with col1:
         st.subheader("Monatliche Kennzahlen")
@@ -625,72 +1342,112 @@ with tab4:
         monate_planungszeitraum = st.slider("Planungszeitraum (Monate)", min_value=6, max_value=60, value=36, step=6)
         lineares_ziel_delta_mrr = st.slider("Lineares Monatsziel (Δ MRR)", min_value=0, max_value=200_000, value=10_000, step=1_000)
         
-        monate_liste = list(range(monate_planungszeitraum + 1))
-        mrr_exponentiell = [float(start_mrr)] # Exponentielles Wachstum
-        mrr_linear = [float(start_mrr)] # Lineares Wachstum
-        
-        for m in range(1, monate_planungszeitraum + 1):
-            mrr_exponentiell.append(mrr_exponentiell[-1] * (1 + monatliche_wachstumsrate / 100))
-            mrr_linear.append(start_mrr + lineares_ziel_delta_mrr * m) # Lineares Wachstum addiert einen festen Betrag
-            
-        gesamt_mrr_exponentiell = mrr_exponentiell[-1]
-        gesamt_mrr_linear = mrr_linear[-1]
-        
-        kumulatives_wachstum_gesamt = gesamt_mrr_exponentiell - start_mrr
-        
-        # Wachstum im letzten Monat des Planungszeitraums
-        zuwachs_letzter_monat = mrr_exponentiell[-1] - mrr_exponentiell[-2] if len(mrr_exponentiell) > 1 else 0
-        anteil_zuwachs_letzter_monat = zuwachs_letzter_monat / kumulatives_wachstum_gesamt if kumulatives_wachstum_gesamt > 0 else 0
-        
         st.subheader("Personalplanung")
         team_aktuelle_fte = st.slider("Aktuelle FTE (Full-Time Equivalents)", min_value=3, max_value=200, value=12)
         mrr_pro_fte_produktivitaet = st.slider("MRR pro FTE (€/Monat)", min_value=1_000, max_value=30_000, value=12_000, step=1_000)
+
+        kohorten = st.toggle("Kohorten-Modus: Churn und Expansion je Kundenkohorte", key="kohorten_saas",
+                             help="Das Wachstum gilt dann für die Neukundenakquise; der MRR ergibt sich aus allen Kohorten.")
+        if kohorten:
+            churn = st.slider("Monatlicher Churn (%)", min_value=0.0, max_value=10.0, value=2.0, step=0.1)
+            fruehchurn = st.slider("Zusätzlicher Churn neuer Kunden (%)", min_value=0.0, max_value=20.0, value=5.0,
+                                   step=0.5, help="Klingt in den ersten Monaten nach Vertragsbeginn ab (Onboarding).")
+            expansion = st.slider("Expansion je Kunde (% pro Monat)", min_value=0.0, max_value=5.0, value=1.0, step=0.1,
+                                  help="Upsells und Preiserhöhungen der verbleibenden Kunden.")
+            aufloesung = st.radio("Zeitauflösung", list(cohorts.AUFLOESUNGEN), horizontal=True)
         
-        erforderliche_fte_am_ende = gesamt_mrr_exponentiell / mrr_pro_fte_produktivitaet
+        # MRR- und FTE-Kennzahlen in geschlossener Form (siehe engine.saas_final)
+        kpis = saas_final(
+            start_mrr, monatliche_wachstumsrate, monate_planungszeitraum, lineares_ziel_delta_mrr,
+            team_aktuelle_fte, mrr_pro_fte_produktivitaet
+        )
+        mrr_am_ende = float(kpis["gesamt_mrr_exponentiell"])
+        gesamt_mrr_linear = float(kpis["gesamt_mrr_linear"])
+        anteil_zuwachs_letzter_monat = float(kpis["anteil_zuwachs_letzter_monat"])
+        erforderliche_fte_am_ende = float(kpis["erforderliche_fte_am_ende"])
         
         # Wie viele zusätzliche FTEs werden benötigt, um das exponentielle Wachstum zu bewältigen
-        zus_fte_benoetigt = max(erforderliche_fte_am_ende - team_aktuelle_fte, 0)
+        zus_fte_benoetigt = float(kpis["zus_fte_benoetigt"])
+
+        if kohorten:
+            # Im Kohorten-Modus stammen MRR, Wachstumsanteil und FTE-Bedarf aus cohorts.mrr_final
+            kohorten_kpis = saas_cohort_final(
+                start_mrr, monatliche_wachstumsrate, monate_planungszeitraum, churn, fruehchurn, expansion,
+                team_aktuelle_fte, mrr_pro_fte_produktivitaet, cohorts.AUFLOESUNGEN[aufloesung]
+            )
+            mrr_am_ende = float(kohorten_kpis["mrr_am_ende"])
+            anteil_zuwachs_letzter_monat = float(kohorten_kpis["anteil_zuwachs_letzter_monat"])
+            erforderliche_fte_am_ende = float(kohorten_kpis["erforderliche_fte_am_ende"])
+            zus_fte_benoetigt = float(kohorten_kpis["zus_fte_benoetigt"])
 
     with col2:
-        st.subheader("MRR-Prognose: exponentiell vs. linear")
-        saas_df = pd.DataFrame({
-            "Monat": monate_liste,
-            "Exponentielles Wachstum": mrr_exponentiell,
-            "Lineares Ziel": mrr_linear
-        })
-        
-        fig = px.line(
-            saas_df,
-            x="Monat",
-            y=["Exponentielles Wachstum", "Lineares Ziel"],
-            labels={"value": "MRR in €", "variable": "Szenario"},
-            title="Monatlich wiederkehrender Umsatz (MRR) Entwicklung"
-        )
-        fig.update_layout(
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-            hovermode="x unified"
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        if kohorten:
+            st.subheader("MRR-Prognose: Kohorten mit Churn und Expansion")
+            fig = saas_cohort_figure(start_mrr, monatliche_wachstumsrate, monate_planungszeitraum,
+                                     lineares_ziel_delta_mrr, churn, fruehchurn, expansion,
+                                     cohorts.AUFLOESUNGEN[aufloesung])
+        else:
+            st.subheader("MRR-Prognose: exponentiell vs. linear")
+            fig = saas_figure(start_mrr, monatliche_wachstumsrate, monate_planungszeitraum, lineares_ziel_delta_mrr,
+                              animiert=render_play_toggle("saas"))
+        render_chart(fig)
         
         st.write("---")
         st.subheader("Investor-Ready KPIs")
         cols = st.columns(4, gap="large")
-        cols[0].metric("MRR nach Plan", human_number(gesamt_mrr_exponentiell))
+        cols[0].metric("MRR mit Churn" if kohorten else "MRR nach Plan", human_number(mrr_am_ende))
         cols[1].metric("Lineares Ziel (MRR)", human_number(gesamt_mrr_linear))
         cols[2].metric("Zusätzliche FTE benötigt", human_number(zus_fte_benoetigt))
         cols[3].metric("Wachstum im letzten Monat", f"{anteil_zuwachs_letzter_monat:.0%}")
         
         cap_cols = st.columns(4, gap="large")
-        cap_cols[0].caption(f"Exakt: {format_number(gesamt_mrr_exponentiell, 0)} €")
+        cap_cols[0].caption(f"Exakt: {format_number(mrr_am_ende, 0)} €")
         cap_cols[1].caption(f"Exakt: {format_number(gesamt_mrr_linear, 0)} €")
         cap_cols[2].caption(f"Gesamtbedarf: {format_number(erforderliche_fte_am_ende, 1)} FTE")
         cap_cols[3].caption("Anteil am kumulierten Wachstum im Planzeitraum")
+        if kohorten:
+            st.caption(f"Net Revenue Retention (12 Monate, reife Kunden): "
+                       f"{format_number(float(kohorten_kpis['net_revenue_retention']) * 100, 1)}% · "
+                       f"Plan ohne Churn: {human_number(float(kohorten_kpis['mrr_plan_am_ende']))} – "
+                       f"Churn kostet {human_number(float(kohorten_kpis['luecke_zum_plan']))} MRR.")
         
-        if monatliche_wachstumsrate <= 0:
+        if kohorten and mrr_am_ende < start_mrr:
+            st.warning("Der Churn frisst das Wachstum: Trotz wachsender Neukundenakquise schrumpft der MRR. "
+                       "Erst Retention, dann Skalierung.")
+        elif monatliche_wachstumsrate <= 0:
             st.warning("Ein monatliches Wachstum von ≤ 0% bedeutet Stagnation oder Rückgang. Exponentielles Wachstum erfordert positive Raten.")
         else:
             st.caption("Ein erheblicher Teil des Gesamtwachstums fällt in die letzten Monate des Planungszeitraums – Hypergrowth erfordert proaktive Planung in allen Unternehmensbereichen.")
 
+    render_saas_goal_seek(
+        start_mrr, monatliche_wachstumsrate, monate_planungszeitraum,
+        (churn, fruehchurn, expansion, cohorts.AUFLOESUNGEN[aufloesung]) if kohorten else None
+    )
+    render_sweep_panel("saas", {
+        "start_mrr": start_mrr, "monatliche_wachstumsrate": monatliche_wachstumsrate,
+        "monate_planungszeitraum": monate_planungszeitraum, "lineares_ziel_delta_mrr": lineares_ziel_delta_mrr,
+        "team_aktuelle_fte": team_aktuelle_fte, "mrr_pro_fte_produktivitaet": mrr_pro_fte_produktivitaet,
+    })
+
+with tab4:
+    render_intro_card(
+        "Pitch-Deck im Boardroom: Das junge SaaS-Team zeigt 12 % monatliches Wachstum. "
+        "Ein Investor hebt die Augenbrauen – denn 12 % im Monat bedeutet eine Verdopplung in sechs Monaten. "
+        "Cashflow, Server, Hiring – alles muss in exponentiellen Kategorien gedacht werden."
+    )
+    render_cover_image(
+        "saas",
+        "Wenn Product-Market-Fit trifft, rast das Wachstum wie eine Rakete."
+    )
+    render_story_card(
+        """
+        <p>Der 3D-holografische MRR-Chart schießt wie eine Rakete nach oben.</p>
+        <p>Das Team spürt: Jetzt entscheidet die Fähigkeit, exponentielles Wachstum zu managen – nicht nur zu wünschen.</p>
+        """
+    )
+
+    render_saas_scene()
+
 # ------------------------------------------------------
 # Abschluss (Conclusion)
 # ------------------------------------------------------
@@ -704,3 +1461,8 @@ st.markdown(
     """,
     unsafe_allow_html=True
 )
+
+# Messung abschließen, bevor die Seitenleiste sie anzeigt
+instrumentation.finish_run()
+if profiling_enabled():
+    render_profile_panel()
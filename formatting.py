@@ -0,0 +1,268 @@
+"""
+Deutsche Zahlenformatierung (Komma als Dezimal-, Punkt als Tausendertrennzeichen)
+und Größenvergleiche ("5,2× Eiffelturm").
+
+Wird von der App und vom Batch-Runner (``batch``) gemeinsam genutzt, damit Texte im
+UI und exportierte Tabellen dieselbe Schreibweise verwenden. Kommt ohne Streamlit aus.
+
+Für ganze Spalten (Tabellen, Exporte, Hover-Labels) gibt es mit :func:`format_numbers` und
+:func:`human_numbers` Array-Varianten, deren Ergebnis Zeichen für Zeichen dem der
+Einzelwert-Funktionen entspricht.
+"""
+
+import functools
+
+import numpy as np
+
+import engine
+
+# ------------------------------------------------------
+# Einzelwerte (Scalar Formatting)
+# ------------------------------------------------------
+
+def format_number(value: float, decimals: int = 0) -> str:
+    """
+    Formatiert eine Zahl mit Tausender-Trennzeichen und Dezimalstellen,
+    unter Verwendung des deutschen Lokals (Komma für Dezimal, Punkt für Tausender).
+
+    Args:
+        value (float): Die zu formatierende Zahl.
+        decimals (int): Anzahl der Dezimalstellen. Standardwert ist 0.
+
+    Returns:
+        str: Die formatierte Zahl als String.
+    """
+    # Ersetzt Tausender-Trennzeichen (Komma) durch X, Dezimalpunkt durch Komma, X wieder durch Punkt
+    return f"{value:,.{decimals}f}".replace(",", "X").replace(".", ",").replace("X", ".")
+
+# Schwellen und Suffixe von human_number, absteigend
+HUMAN_THRESHOLDS = [
+    (1e12, " Bio."),
+    (1e9,  " Mrd."),
+    (1e6,  " Mio."),
+    (1e3,  " Tsd.")
+]
+
+def human_number(value: float) -> str:
+    """
+    Formatiert eine Zahl in einen menschenlesbaren String mit Suffixen (z.B. Mio., Mrd.).
+    Verwendet deutsches Zahlenformat.
+
+    Args:
+        value (float): Die zu formatierende Zahl.
+
+    Returns:
+        str: Die menschenlesbare Zahl als String.
+    """
+    for threshold, suffix in HUMAN_THRESHOLDS:
+        if abs(value) >= threshold:
+            formatted = value / threshold
+            return f"{formatted:,.1f}".replace(",", "X").replace(".", ",").replace("X", ".") + suffix
+    return f"{value:,.0f}".replace(",", "X").replace(".", ",").replace("X", ".")
+
+# ------------------------------------------------------
+# Arrays (Bulk Formatting)
+# ------------------------------------------------------
+
+# Ganzzahlen bis 2^53 sind in float64 exakt, Ziffern lassen sich dort per Division abspalten
+_EXAKT_BIS = 2.0 ** 53
+_ZEHNERPOTENZEN = 10.0 ** np.arange(1, 17)
+
+@functools.lru_cache(maxsize=None)
+def _layout(stellen: int, decimals: int, suffix: str) -> np.ndarray:
+    """
+    Zeichentabelle des Ziffernpfads für eine Zeichenmatrix mit ``stellen`` Ziffernspalten, gefolgt
+    von Komma, Punkt, Minus, Füllzeichen und dem Suffix. Zeile ``2 * (Vorkommastellen - 1) + negativ``
+    enthält die Spalten, aus denen sich der formatierte Text zusammensetzt.
+    """
+    komma, punkt, minus, leer = range(stellen, stellen + 4)
+    zeilen = []
+    for vorkomma in range(1, stellen - decimals + 1):
+        for negativ in (False, True):
+            zeile = [minus] if negativ else []
+            for k, spalte in enumerate(range(stellen - decimals - vorkomma, stellen - decimals)):
+                if k and (vorkomma - k) % 3 == 0:
+                    zeile.append(punkt)
+                zeile.append(spalte)
+            if decimals:
+                zeile += [komma, *range(stellen - decimals, stellen)]
+            zeilen.append(zeile + list(range(leer + 1, leer + 1 + len(suffix))))
+    breite = max(map(len, zeilen))
+    return np.array([zeile + [leer] * (breite - len(zeile)) for zeile in zeilen], dtype=np.intp)
+
+def _format_array(werte: np.ndarray, decimals: int, suffix: str = "") -> np.ndarray:
+    """Kern von :func:`format_numbers` für ein eindimensionales float64-Array; hängt ``suffix`` an jeden Text an."""
+    with np.errstate(over="ignore", invalid="ignore"):
+        skaliert = werte * 10.0 ** decimals
+        betrag = np.abs(np.rint(skaliert))
+        schnell = betrag < _EXAKT_BIS
+        if decimals:
+            # Liegt das Produkt zu nah an x,5, entscheidet erst der exakte Dezimalwert über die Rundung
+            schnell &= np.abs(skaliert - np.floor(skaliert) - 0.5) > np.spacing(np.abs(skaliert))
+    betrag = betrag[schnell]
+    # Wie beim f-String zählt das Vorzeichen des Werts, auch wenn er auf 0 gerundet wird (-0,00)
+    negativ = np.signbit(werte[schnell])
+
+    # Zeichenmatrix in UCS4: Ziffern (nur so viele Spalten wie der größte Wert braucht), dann ",.-", Füllzeichen, Suffix
+    ziffern = np.searchsorted(_ZEHNERPOTENZEN, betrag, side="right") + 1
+    stellen = max(int(ziffern.max(initial=1)), decimals + 1)
+    zeichen = np.empty((len(betrag), stellen + 4 + len(suffix)), dtype=np.uint32)
+    rest = betrag
+    for spalte in range(stellen - 1, -1, -1):
+        quotient = np.floor(rest / 10)  # exakt für Ganzzahlen unter 2^53
+        zeichen[:, spalte] = rest - 10 * quotient + ord("0")
+        rest = quotient
+    zeichen[:, stellen:] = [ord(z) for z in ",.-\0" + suffix]
+
+    vorkomma = np.maximum(ziffern - decimals, 1)
+    tabelle = _layout(stellen, decimals, suffix)[2 * (vorkomma - 1) + negativ]
+    text = np.ascontiguousarray(np.take_along_axis(zeichen, tabelle, axis=1))
+    texte = np.empty(len(werte), dtype=object)
+    # Als Unicode-Strings fester Breite gelesen, fallen die Füllzeichen (\0) am Ende weg
+    texte[schnell] = text.view(f"U{text.shape[1]}").ravel()
+    # Sehr große, nicht endliche und knapp an der Rundungsgrenze liegende Werte über den Einzelwert-Pfad
+    texte[~schnell] = [format_number(wert, decimals) + suffix for wert in werte[~schnell].tolist()]
+    return texte
+
+def format_numbers(values, decimals: int = 0) -> np.ndarray:
+    """
+    Array-Variante von :func:`format_number`: formatiert alle Werte eines Arrays bzw. einer
+    pandas-Serie auf einmal. Das Ergebnis ist für jeden Wert identisch zu ``format_number``.
+
+    Gerundet wird als Ganzzahl in float64; die Ziffern werden spaltenweise abgespalten und
+    per Zeichentabelle (Tausenderpunkte, Komma, Vorzeichen) in einem Schritt zu Texten
+    zusammengesetzt. Werte ab 2^53, ``nan``/``inf`` und Werte knapp an der Rundungsgrenze
+    gehen über ``format_number``.
+
+    Args:
+        values (array_like): Die zu formatierenden Zahlen.
+        decimals (int): Anzahl der Dezimalstellen. Standardwert ist 0.
+
+    Returns:
+        np.ndarray: Die formatierten Zahlen (dtype object), Form wie ``values``.
+    """
+    werte = np.asarray(values, dtype=float)
+    return _format_array(werte.ravel(), decimals).reshape(werte.shape)
+
+def human_numbers(values) -> np.ndarray:
+    """
+    Array-Variante von :func:`human_number` (identisches Ergebnis je Wert).
+
+    Args:
+        values (array_like): Die zu formatierenden Zahlen.
+
+    Returns:
+        np.ndarray: Die menschenlesbaren Zahlen (dtype object), Form wie ``values``.
+    """
+    werte = np.asarray(values, dtype=float)
+    flach = werte.ravel()
+    # Stufe: Anzahl der erreichten Schwellen (0 = ohne Suffix); nan bleibt ohne Suffix wie in human_number
+    schwellen = [schwelle for schwelle, _ in reversed(HUMAN_THRESHOLDS)]
+    stufe = np.where(np.isnan(flach), 0, np.searchsorted(schwellen, np.abs(flach), side="right"))
+    texte = np.empty(len(flach), dtype=object)
+    texte[stufe == 0] = _format_array(flach[stufe == 0], 0)
+    for nummer, (schwelle, suffix) in enumerate(reversed(HUMAN_THRESHOLDS), start=1):
+        auswahl = stufe == nummer
+        texte[auswahl] = _format_array(flach[auswahl] / schwelle, 1, suffix)
+    return texte.reshape(werte.shape)
+
+# Deutsche Zahlwörter ab der Billiarde (lange Skala), Zehnerpotenz -> Bezeichnung
+NAMED_MAGNITUDES = [
+    (63, "Dezilliarden"), (60, "Dezillionen"), (57, "Nonilliarden"), (54, "Nonillionen"),
+    (51, "Oktilliarden"), (48, "Oktillionen"), (45, "Septilliarden"), (42, "Septillionen"),
+    (39, "Sextilliarden"), (36, "Sextillionen"), (33, "Quintilliarden"), (30, "Quintillionen"),
+    (27, "Quadrilliarden"), (24, "Quadrillionen"), (21, "Trilliarden"), (18, "Trillionen"),
+    (15, "Billiarden"),
+]
+
+def scientific_number(log10_value: float) -> str:
+    """
+    Formatiert eine Zahl, von der nur der Zehnerlogarithmus bekannt ist, wissenschaftlich
+    (z.B. "1,84 × 10¹⁹"). Funktioniert auch für Zahlen weit jenseits von float64.
+
+    Args:
+        log10_value (float): Zehnerlogarithmus der Zahl.
+
+    Returns:
+        str: Die Zahl in wissenschaftlicher Schreibweise mit hochgestelltem Exponenten.
+    """
+    exponent = int(np.floor(log10_value))
+    mantisse = 10 ** (log10_value - exponent)
+    if round(mantisse, 2) >= 10: # Rundung auf 10,00 -> nächste Zehnerpotenz
+        mantisse, exponent = mantisse / 10, exponent + 1
+    hochgestellt = str(exponent).translate(str.maketrans("-0123456789", "⁻⁰¹²³⁴⁵⁶⁷⁸⁹"))
+    return f"{format_number(mantisse, 2)} × 10{hochgestellt}"
+
+def magnitude_number(log10_value: float) -> str:
+    """
+    Formatiert eine Zahl anhand ihres Zehnerlogarithmus menschenlesbar: bis zur Billion
+    wie human_number, danach mit deutschen Zahlwörtern (Billiarden bis Dezilliarden)
+    und darüber wissenschaftlich.
+
+    Args:
+        log10_value (float): Zehnerlogarithmus der Zahl.
+
+    Returns:
+        str: Die menschenlesbare Zahl als String.
+    """
+    if log10_value < NAMED_MAGNITUDES[-1][0]:
+        return human_number(10 ** log10_value)
+    if log10_value >= NAMED_MAGNITUDES[0][0] + 3:
+        return scientific_number(log10_value)
+    for exponent, name in NAMED_MAGNITUDES:
+        if log10_value >= exponent:
+            return f"{format_number(10 ** (log10_value - exponent), 1)} {name}"
+
+# ------------------------------------------------------
+# Vergleiche (Comparisons)
+# ------------------------------------------------------
+
+def best_comparison(value: float, comparison_list: list[tuple[str, float]]) -> str:
+    """
+    Vergleicht einen Wert mit einer Liste von Referenzwerten und gibt den am besten
+    passenden Vergleichsstring zurück (z.B. "5.2× Eiffelturm"). Für wiederholte Vergleiche
+    gegen dieselben Referenzen siehe den sortierten Index in ``catalog``.
+
+    Args:
+        value (float): Der zu vergleichende Wert.
+        comparison_list (list[tuple[str, float]]): Eine Liste von Tupeln, wobei jedes Tupel
+                                                    (Bezeichnung: str, Referenzwert: float) enthält.
+
+    Returns:
+        str: Ein Vergleichsstring.
+    """
+    if value <= 0:
+        label, _= comparison_list[0]
+        return f"0× {label}" # Bei Null oder negativen Werten, 0 mal die kleinste Einheit zurückgeben
+    
+    # Vergleichsliste nach Referenzwert sortieren, um die beste Übereinstimmung zu finden
+    comparison_list = sorted(comparison_list, key=lambda x: x[1])
+
+    # Von der größten zur kleinsten Referenz iterieren
+    for label, ref in reversed(comparison_list):
+        if value >= ref:
+            factor = value / ref
+            return f"{format_number(factor, 1)}× {label}"
+    
+    # Wenn der Wert kleiner als alle Referenzen ist, mit der kleinsten vergleichen
+    label, ref = comparison_list[0]
+    factor = value / ref
+    return f"{format_number(factor, 1)}× {label}"
+
+def best_comparison_log10(log10_value: float, comparison_list: list[tuple[str, float]]) -> str:
+    """
+    Variante von best_comparison für Werte, von denen nur der Zehnerlogarithmus bekannt ist.
+    Jenseits von float64 wird mit der größten Referenz verglichen und der Faktor
+    über magnitude_number formatiert.
+
+    Args:
+        log10_value (float): Zehnerlogarithmus des zu vergleichenden Werts.
+        comparison_list (list[tuple[str, float]]): Eine Liste von Tupeln (Bezeichnung, Referenzwert).
+
+    Returns:
+        str: Ein Vergleichsstring.
+    """
+    if log10_value <= engine.EXAKT_MAX_LOG10:
+        return best_comparison(10 ** log10_value, comparison_list)
+    label, ref = max(comparison_list, key=lambda x: x[1])
+    return f"{magnitude_number(log10_value - np.log10(ref))}× {label}"
@@ -0,0 +1,301 @@
+"""
+Zielwertsuche (Goal Seek) für die vier Geschichten.
+
+Beantwortet die Umkehrfragen der Tabs direkt, statt Slider auszuprobieren: Welcher Zinssatz
+bringt Lara auf 1 Mio. €? In welchem Monat überschreitet der MRR ein Ziel? Nach wie vielen
+Wellen ist Frankfurt erreicht? Ab welchem Feld wiegt der Reis mehr als die Cheops-Pyramide?
+
+- Wo sich ein Modell der Engine umkehren lässt, wird die Lösung in geschlossener Form über
+  den Logarithmus berechnet.
+- Sonst löst :func:`solve` die Gleichung elementweise mit Newton-Schritten innerhalb einer
+  Klammer, die bei Bedarf auf Bisektion zurückfallen.
+
+Alle Löser sind wie die Engine vektorisiert: Eine ganze Tabelle von Zielen (und beliebige
+Parameter-Arrays) wird in einem Aufruf gelöst. Unerreichbare Ziele ergeben ``NaN``.
+Fragen nach dem ersten Feld, der ersten Welle usw. liefern ganze Zahlen (als float); sie
+werden gegen die Engine geprüft, damit Rundungsfehler im Logarithmus nie um eins danebenliegen.
+"""
+
+import numpy as np
+
+import engine
+
+# Suchbereich des Zinssatzes in Prozent p.a.
+ZINSSATZ_BEREICH = (0.0, 100.0)
+
+# Suchbereich des Multiplikators pro Welle
+MULTIPLIKATOR_BEREICH = (0.0, 100.0)
+
+# Längste Laufzeit in Jahren, die bei Steuer oder Inflation durchsucht wird
+LAUFZEIT_MAX_JAHRE = 200
+
+# ------------------------------------------------------
+# Allgemeine Löser (Generic Solvers)
+# ------------------------------------------------------
+
+def solve(funktion, ziel, unten, oben, logarithmisch: bool = False, toleranz: float = 1e-10,
+          max_iterationen: int = 100) -> np.ndarray:
+    """
+    Löst ``funktion(x) == ziel`` elementweise für eine im Intervall ``[unten, oben]`` monoton
+    steigende Funktion: Newton-Schritte mit numerischer Ableitung; fällt ein Schritt aus der
+    Klammer, wird stattdessen halbiert. Die Klammer schrumpft in jeder Iteration.
+
+    Args:
+        funktion (callable): Vektorisierte Funktion von ``x`` (broadcastfähig).
+        ziel (array_like): Zielwerte.
+        unten (array_like): Untere Grenze der Klammer.
+        oben (array_like): Obere Grenze der Klammer.
+        logarithmisch (bool): Löst ``log(funktion(x)) == log(ziel)`` – für positive, exponentiell
+            wachsende Funktionen nahezu linear, sodass Newton in wenigen Schritten konvergiert.
+        toleranz (float): Relative Genauigkeit in ``x``.
+        max_iterationen (int): Höchstzahl an Iterationen.
+
+    Returns:
+        np.ndarray: Lösungen; ``NaN``, wo das Ziel nicht zwischen ``funktion(unten)`` und ``funktion(oben)`` liegt.
+    """
+    if logarithmisch:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return solve(lambda x: np.log(funktion(x)), np.log(ziel), unten, oben, False, toleranz, max_iterationen)
+    ziel = np.asarray(ziel, dtype=float)
+    a = np.asarray(unten, dtype=float)
+    b = np.asarray(oben, dtype=float)
+    fa = funktion(a) - ziel
+    fb = funktion(b) - ziel
+    form = np.broadcast_shapes(fa.shape, fb.shape)
+    a, b, fa, fb = (np.broadcast_to(w, form).astype(float) for w in (a, b, fa, fb))
+    erreichbar = (fa <= 0) & (fb >= 0)
+
+    x = np.where(fa == 0, a, (a + b) / 2)
+    for _ in range(max_iterationen):
+        fx = funktion(x) - ziel
+        # Klammer verengen: Die Lösung liegt rechts von x, wenn f(x) unter dem Ziel liegt
+        links = fx < 0
+        a = np.where(links, x, a)
+        b = np.where(links, b, x)
+        h = 1e-7 * np.maximum(np.abs(x), 1.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            schritt = fx * h / (funktion(x + h) - ziel - fx)
+        newton = x - schritt
+        # Ein winziger Schritt gilt auch dann, wenn er auf dem Rand der Klammer landet
+        konvergiert = (fx == 0) | (np.abs(schritt) <= toleranz * np.maximum(np.abs(x), 1.0))
+        x = np.where(((newton >= a) & (newton <= b)) | konvergiert, np.clip(newton, a, b), (a + b) / 2)
+        if (konvergiert | ~erreichbar).all():
+            break
+    return np.where(erreichbar, x, np.nan)
+
+def first_crossing(x, werte, ziel) -> np.ndarray:
+    """
+    Erster Wert von ``x``, an dem eine Zeitreihe das Ziel erreicht (auch wenn sie danach wieder fällt).
+
+    Args:
+        x (np.ndarray): Zeitachse der Länge ``n``.
+        werte (np.ndarray): Zeitreihe der Länge ``n``.
+        ziel (array_like): Zielwerte.
+
+    Returns:
+        np.ndarray: ``x`` der ersten Überschreitung je Ziel; ``NaN``, wenn die Reihe das Ziel nie erreicht.
+    """
+    # Das laufende Maximum ist monoton, die erste Überschreitung also eine binäre Suche
+    laufendes_maximum = np.maximum.accumulate(np.asarray(werte, dtype=float))
+    index = np.searchsorted(laufendes_maximum, np.asarray(ziel, dtype=float), side="left")
+    x = np.append(np.asarray(x, dtype=float), np.nan)
+    return x[index]
+
+def _smallest_integer(kontinuierlich, wert_bei, ziel, minimum: int = 0) -> np.ndarray:
+    """
+    Kleinste ganze Zahl ``n >= minimum`` mit ``wert_bei(n) >= ziel`` aus einer kontinuierlichen
+    Lösung; korrigiert Rundungsfehler des Logarithmus mit einer Auswertung der Engine. Erreicht
+    auch die korrigierte Zahl das Ziel nicht, ist die Lösung ``NaN``.
+    """
+    n = np.maximum(np.ceil(kontinuierlich - 1e-9), minimum)
+    endlich = np.isfinite(n)
+    n = np.where(endlich, n, minimum)
+    with np.errstate(over="ignore", invalid="ignore"):
+        n = np.where((n > minimum) & (wert_bei(n - 1) >= ziel), n - 1, n)
+        zu_klein = wert_bei(n) < ziel
+        n = np.where(zu_klein, n + 1, n)
+        # Nur wenn korrigiert wurde, ist eine weitere Auswertung der Engine nötig
+        erreicht = np.where(zu_klein, wert_bei(n) >= ziel, True) if np.any(zu_klein) else True
+    return np.where(endlich & erreicht, n, np.nan)
+
+# ------------------------------------------------------
+# Tab 1: Schachbrett-Legende
+# ------------------------------------------------------
+
+def chessboard_field(ziel, faktor=2.0, groesse: str = "gewicht_tonnen") -> np.ndarray:
+    """
+    Erstes Feld, bis zu dem die kumulierten Körner das Ziel erreichen.
+
+    Args:
+        ziel (array_like): Zielwert in der Einheit von ``groesse``.
+        faktor (array_like): Vervielfachung von Feld zu Feld, größer als 0.
+        groesse (str): "koerner_gesamt", "gewicht_tonnen" oder "flaeche_m2".
+
+    Returns:
+        np.ndarray: Feldnummer ab 1; ``NaN``, wenn die Summe bei ``faktor < 1`` unter dem Ziel bleibt.
+    """
+    einheit = {
+        "koerner_gesamt": 1.0,
+        "gewicht_tonnen": engine.GEWICHT_PRO_KORN_G / 1_000_000,
+        "flaeche_m2": engine.FLAECHE_PRO_KORN_CM2 / 10_000,
+    }[groesse]
+    koerner = np.asarray(ziel, dtype=float) / einheit
+    faktor = np.asarray(faktor, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # (f^n - 1) / (f - 1) >= K  <=>  n >= log(1 + K (f - 1)) / log(f), für f < 1 nur unterhalb von 1 / (1 - f)
+        felder = np.where(faktor == 1, koerner, np.log1p(koerner * (faktor - 1)) / np.log(faktor))
+    log10_koerner = np.log10(np.maximum(koerner, 1e-300))
+    return _smallest_integer(felder, lambda n: engine._log10_growth_sum(faktor, np.maximum(n, 1)), log10_koerner,
+                             minimum=1)
+
+# ------------------------------------------------------
+# Tab 2: Zinseszins vs. Zeit (Compound Interest vs. Time)
+# ------------------------------------------------------
+
+def compound_interest_rate(ziel, startkapital, sparrate, laufzeit, perioden_pro_jahr=1, vorschuessig=True,
+                           inflation=0.0, kosten=0.0, steuer=0.0) -> np.ndarray:
+    """
+    Jährlicher Zinssatz, mit dem Laras Endkapital das Ziel genau erreicht. Eine geschlossene
+    Form gibt es nicht (Rentenformel), daher per :func:`solve` im :data:`ZINSSATZ_BEREICH`.
+
+    Args:
+        ziel (array_like): Zielvermögen in €.
+        Sonst siehe :func:`engine.compound_interest_final`.
+
+    Returns:
+        np.ndarray: Zinssatz in Prozent; ``NaN`` außerhalb des Suchbereichs.
+    """
+    def endkapital(zinssatz):
+        return engine.compound_interest_final(startkapital, sparrate, laufzeit, zinssatz, perioden_pro_jahr,
+                                              vorschuessig, inflation, kosten, steuer)["endkapital_lara"]
+    return solve(endkapital, ziel, *ZINSSATZ_BEREICH, logarithmisch=True)
+
+def compound_interest_years(ziel, startkapital, sparrate, zinssatz, perioden_pro_jahr=1, vorschuessig=True,
+                            inflation=0.0, kosten=0.0, steuer=0.0) -> np.ndarray:
+    """
+    Erstes volles Jahr, in dem Laras Endkapital das Ziel erreicht.
+
+    Ohne Steuer und Inflation in geschlossener Form: Aus ``K = (S + c) q^N - c`` mit
+    ``c = Rate · Zeitpunkt / (q - 1)`` folgt ``N = log((K + c) / (S + c)) / log(q)``. Liegt der
+    Nettozins (Zinssatz minus Kosten) unter null, nähert sich das Kapital der Asymptote ``-c``;
+    Ziele jenseits davon sind unerreichbar (negatives oder undefiniertes ``N``). Steuer beim
+    Verkauf und Kaufkraftverlust machen den Verlauf nicht umkehrbar (er kann sogar wieder
+    fallen); dann wird die erste Überschreitung auf dem Jahresraster bis :data:`LAUFZEIT_MAX_JAHRE`
+    gesucht.
+
+    Args:
+        ziel (array_like): Zielvermögen in €.
+        Sonst siehe :func:`engine.compound_interest_final`.
+
+    Returns:
+        np.ndarray: Laufzeit in Jahren; ``NaN``, wenn das Ziel nicht erreicht wird.
+    """
+    ziel = np.asarray(ziel, dtype=float)
+
+    def endkapital(laufzeit):
+        return engine.compound_interest_final(startkapital, sparrate, laufzeit, zinssatz, perioden_pro_jahr,
+                                              vorschuessig, inflation, kosten, steuer)["endkapital_lara"]
+
+    if np.any(np.asarray(inflation) != 0) or np.any(np.asarray(steuer) != 0):
+        # Jahresraster als letzte Achse, alle Parameter davor
+        parameter = (startkapital, sparrate, zinssatz, perioden_pro_jahr, vorschuessig, inflation, kosten, steuer)
+        s, r, z, p, v, i, k, st = (np.expand_dims(w, -1) for w in parameter)
+        werte = engine.compound_interest_final(s, r, np.arange(LAUFZEIT_MAX_JAHRE + 1), z, p, v, i, k, st)["endkapital_lara"]
+        erreicht = werte >= np.expand_dims(ziel, -1)
+        return np.where(erreicht.any(axis=-1), np.argmax(erreicht, axis=-1), np.nan)
+
+    perioden_pro_jahr = np.asarray(perioden_pro_jahr, dtype=float)
+    startkapital = np.asarray(startkapital, dtype=float)
+    periodenrate = (np.asarray(zinssatz, dtype=float) - np.asarray(kosten, dtype=float)) / 100 / perioden_pro_jahr
+    rate = np.asarray(sparrate, dtype=float) * 12 / perioden_pro_jahr * np.where(vorschuessig, 1 + periodenrate, 1.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        c = rate / periodenrate
+        perioden = np.where(periodenrate == 0, (ziel - startkapital) / rate,
+                            np.log((ziel + c) / (startkapital + c)) / np.log1p(periodenrate))
+    # Bei negativem Nettozins fällt das Kapital zur Asymptote -c hin: Ziele darüber liefern N < 0
+    perioden = np.where(ziel <= startkapital, 0.0, np.where(perioden < 0, np.nan, perioden))
+    return _smallest_integer(perioden / perioden_pro_jahr, endkapital, ziel)
+
+# ------------------------------------------------------
+# Tab 3: Viraler Dominoeffekt (Viral Domino Effect)
+# ------------------------------------------------------
+
+def viral_waves(ziel, starter_personen, multiplikator) -> np.ndarray:
+    """
+    Anzahl der Wellen, bis die Gesamtreichweite das Ziel erreicht (siehe :func:`engine.viral_final`).
+
+    Args:
+        ziel (array_like): Zielreichweite in Personen.
+        starter_personen (array_like): Initiale Personen.
+        multiplikator (array_like): Multiplikator pro Welle.
+
+    Returns:
+        np.ndarray: Anzahl der Wellen; ``NaN``, wenn die Reichweite bei Multiplikator < 1 unter dem Ziel bleibt.
+    """
+    ziel = np.asarray(ziel, dtype=float)
+    starter_personen = np.asarray(starter_personen, dtype=float)
+    multiplikator = np.asarray(multiplikator, dtype=float)
+    verhaeltnis = ziel / starter_personen
+    with np.errstate(divide="ignore", invalid="ignore"):
+        wellen = np.where(multiplikator == 1, verhaeltnis,
+                          np.log1p(verhaeltnis * (multiplikator - 1)) / np.log(multiplikator))
+    return _smallest_integer(wellen, lambda n: engine.viral_final(starter_personen, multiplikator, n)[
+        "gesamt_personen_erreicht"], ziel)
+
+def viral_multiplier(ziel, starter_personen, anzahl_wellen) -> np.ndarray:
+    """
+    Multiplikator, mit dem die Gesamtreichweite nach ``anzahl_wellen`` Wellen das Ziel genau
+    erreicht; per :func:`solve` im :data:`MULTIPLIKATOR_BEREICH`.
+
+    Args:
+        ziel (array_like): Zielreichweite in Personen.
+        starter_personen (array_like): Initiale Personen.
+        anzahl_wellen (array_like): Anzahl der Wellen (mindestens 2).
+
+    Returns:
+        np.ndarray: Multiplikator pro Welle; ``NaN`` außerhalb des Suchbereichs.
+    """
+    def reichweite(multiplikator):
+        return engine.viral_final(starter_personen, multiplikator, anzahl_wellen)["gesamt_personen_erreicht"]
+    return solve(reichweite, ziel, *MULTIPLIKATOR_BEREICH, logarithmisch=True)
+
+# ------------------------------------------------------
+# Tab 4: SaaS-Hypergrowth (SaaS Hypergrowth)
+# ------------------------------------------------------
+
+def saas_month(ziel, start_mrr, monatliche_wachstumsrate) -> np.ndarray:
+    """
+    Erster Monat, in dem der MRR nach Plan das Ziel erreicht: ``n = log(Ziel / Start) / log(1 + r)``.
+
+    Args:
+        ziel (array_like): Ziel-MRR in €.
+        start_mrr (array_like): Startumsatz (MRR) in €.
+        monatliche_wachstumsrate (array_like): Monatliches Wachstum in Prozent.
+
+    Returns:
+        np.ndarray: Monat ab 0; ``NaN``, wenn der MRR ohne Wachstum unter dem Ziel bleibt.
+    """
+    ziel = np.asarray(ziel, dtype=float)
+    rate = np.asarray(monatliche_wachstumsrate, dtype=float) / 100
+    with np.errstate(divide="ignore", invalid="ignore"):
+        monate = np.log(ziel / np.asarray(start_mrr, dtype=float)) / np.log1p(rate)
+    monate = np.where(ziel <= np.asarray(start_mrr, dtype=float), 0.0, np.where(rate > 0, monate, np.nan))
+    return _smallest_integer(monate, lambda n: engine.saas_final(start_mrr, monatliche_wachstumsrate, n, 0)[
+        "gesamt_mrr_exponentiell"], ziel)
+
+def saas_rate(ziel, start_mrr, monate_planungszeitraum) -> np.ndarray:
+    """
+    Monatliches Wachstum, mit dem der MRR das Ziel genau am Ende des Planungszeitraums
+    erreicht: ``r = (Ziel / Start)^(1 / n) - 1``.
+
+    Args:
+        ziel (array_like): Ziel-MRR in €.
+        start_mrr (array_like): Startumsatz (MRR) in €.
+        monate_planungszeitraum (array_like): Planungszeitraum in Monaten.
+
+    Returns:
+        np.ndarray: Monatliches Wachstum in Prozent (negativ, wenn das Ziel unter dem Start liegt).
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.expm1(np.log(np.asarray(ziel, dtype=float) / np.asarray(start_mrr, dtype=float))
+                        / np.asarray(monate_planungszeitraum, dtype=float)) * 100
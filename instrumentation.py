@@ -0,0 +1,361 @@
+"""
+Optionale Laufzeitmessung der App (Opt-in Instrumentation).
+
+Misst je Skriptlauf, wie viel Zeit in den einzelnen Abschnitten eines Tabs steckt
+(Modell, Figur, ``st.plotly_chart`` …) und wie viele Bytes jedes Element an den Browser
+sendet. Die Ergebnisse werden prozessweit aggregiert und lassen sich als Prometheus-Text
+oder JSON exportieren.
+
+Eingeschaltet wird die Messung per Umgebungsvariable für alle Sitzungen oder – in der App –
+per Query-Parameter ``?profil=1`` für eine einzelne Sitzung:
+
+- ``EXPO_PROFILE``: ``1`` aktiviert die Messung für alle Sitzungen.
+- ``EXPO_PROFILE_LOG``: Pfad einer JSON-Lines-Datei, in die jeder gemessene Lauf geschrieben
+  wird (``-`` für stderr).
+- ``EXPO_PROFILE_METRICS_FILE``: Pfad, unter dem nach jedem Lauf die Prometheus-Metriken
+  abgelegt werden (z.B. für den Textfile-Collector des node_exporter).
+
+Ist die Messung aus, kostet jeder gemessene Abschnitt einen Attributzugriff (unter einer
+Mikrosekunde, bei rund 30 Abschnitten je Skriptlauf also vernachlässigbar); Streamlit wird erst
+importiert, wenn tatsächlich gemessen wird.
+"""
+
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+ENABLED = os.environ.get("EXPO_PROFILE", "0") == "1"
+PROFILE_LOG = os.environ.get("EXPO_PROFILE_LOG")
+METRICS_FILE = os.environ.get("EXPO_PROFILE_METRICS_FILE")
+
+class _Zustand(threading.local):
+    """Laufender Skriptlauf je Thread (Streamlit führt jede Sitzung in einem eigenen Skript-Thread aus)."""
+    # Klassenattribut als Vorgabe: ein fehlendes Attribut abzufragen wäre deutlich langsamer
+    lauf = None
+
+_zustand = _Zustand()
+_NULL = contextlib.nullcontext()
+
+# Serialisiert das Schreiben von JSON-Log und Metrikdatei über alle Skript-Threads des Prozesses
+_export_lock = threading.Lock()
+
+# ------------------------------------------------------
+# Aggregation (Recorder)
+# ------------------------------------------------------
+
+class Recorder:
+    """
+    Thread-sichere Sammlung der Messwerte aller Läufe des Prozesses.
+
+    Zeiten werden je Abschnittspfad (z.B. ``"Zinseszins/figur"``) geführt, Bytes je
+    Abschnittspfad und Elementtyp (z.B. ``"plotly_chart"``).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._zeiten = {}  # Pfad -> {"calls", "seconds_total", "seconds_max", "seconds_last"}
+        self._bytes = {}  # (Pfad, Element) -> {"messages", "bytes_total", "bytes_last"}
+        self.runs = 0
+
+    def add_run(self, zeiten: dict, aufrufe: dict, bytes_: dict, nachrichten: dict):
+        """
+        Übernimmt die Messwerte eines abgeschlossenen Laufs.
+
+        Args:
+            zeiten (dict): Pfad -> Sekunden (Summe im Lauf).
+            aufrufe (dict): Pfad -> Anzahl Aufrufe im Lauf.
+            bytes_ (dict): (Pfad, Element) -> gesendete Bytes im Lauf.
+            nachrichten (dict): (Pfad, Element) -> Anzahl Nachrichten im Lauf.
+        """
+        with self._lock:
+            self.runs += 1
+            for pfad, sekunden in zeiten.items():
+                werte = self._zeiten.setdefault(
+                    pfad, {"calls": 0, "seconds_total": 0.0, "seconds_max": 0.0, "seconds_last": 0.0})
+                werte["calls"] += aufrufe[pfad]
+                werte["seconds_total"] += sekunden
+                werte["seconds_max"] = max(werte["seconds_max"], sekunden)
+                werte["seconds_last"] = sekunden
+            for schluessel, anzahl in bytes_.items():
+                werte = self._bytes.setdefault(schluessel, {"messages": 0, "bytes_total": 0, "bytes_last": 0})
+                werte["messages"] += nachrichten[schluessel]
+                werte["bytes_total"] += anzahl
+                werte["bytes_last"] = anzahl
+
+    def snapshot(self) -> dict:
+        """
+        Liefert eine Kopie aller Messwerte.
+
+        Returns:
+            dict: "runs", "sections" (Pfad -> Zeitwerte) und "elements" (Liste mit Pfad,
+            Element und Bytewerten).
+        """
+        with self._lock:
+            return {
+                "runs": self.runs,
+                "sections": {pfad: dict(werte) for pfad, werte in self._zeiten.items()},
+                "elements": [{"section": pfad, "element": element, **werte}
+                             for (pfad, element), werte in self._bytes.items()],
+            }
+
+    def clear(self):
+        """Verwirft alle Messwerte."""
+        with self._lock:
+            self._zeiten.clear()
+            self._bytes.clear()
+            self.runs = 0
+
+# Gemeinsame Instanz für alle Sitzungen des Prozesses
+RECORDER = Recorder()
+
+# ------------------------------------------------------
+# Messung eines Laufs (Run Tracing)
+# ------------------------------------------------------
+
+class _Run:
+    """Messwerte eines einzelnen Skript- oder Fragmentlaufs."""
+
+    def __init__(self):
+        self.pfad = []
+        self.zeiten = {}
+        self.aufrufe = {}
+        self.bytes = {}
+        self.nachrichten = {}
+        self.start = time.perf_counter()
+
+    def count_bytes(self, element: str, anzahl: int):
+        schluessel = ("/".join(self.pfad) or "Seite", element)
+        self.bytes[schluessel] = self.bytes.get(schluessel, 0) + anzahl
+        self.nachrichten[schluessel] = self.nachrichten.get(schluessel, 0) + 1
+
+def current_run():
+    """Der im aktuellen Thread gemessene Lauf oder ``None``, wenn nicht gemessen wird."""
+    return _zustand.lauf
+
+@contextlib.contextmanager
+def _timed_section(lauf: _Run, name: str):
+    lauf.pfad.append(name)
+    pfad = "/".join(lauf.pfad)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        lauf.zeiten[pfad] = lauf.zeiten.get(pfad, 0.0) + time.perf_counter() - start
+        lauf.aufrufe[pfad] = lauf.aufrufe.get(pfad, 0) + 1
+        lauf.pfad.pop()
+
+def section(name: str):
+    """
+    Kontextmanager, der die Dauer eines Abschnitts misst. Abschnitte lassen sich verschachteln,
+    der Pfad ergibt sich aus den Namen (z.B. ``"Viral/figur"``). Ohne laufende Messung ein
+    wiederverwendeter Null-Kontext.
+
+    Args:
+        name (str): Name des Abschnitts.
+    """
+    lauf = _zustand.lauf
+    return _NULL if lauf is None else _timed_section(lauf, name)
+
+def timed(name: str):
+    """
+    Dekorator, der jeden Aufruf der Funktion als Abschnitt ``name`` misst.
+
+    Args:
+        name (str): Name des Abschnitts.
+
+    Returns:
+        callable: Dekorator; ohne laufende Messung wird die Funktion direkt aufgerufen.
+    """
+    def dekorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            lauf = _zustand.lauf
+            if lauf is None:
+                return func(*args, **kwargs)
+            with _timed_section(lauf, name):
+                return func(*args, **kwargs)
+        return wrapper
+    return dekorator
+
+def _element_type(msg) -> str:
+    """Elementtyp einer Streamlit-ForwardMsg (z.B. "markdown", "plotly_chart", "add_block")."""
+    art = msg.WhichOneof("type")
+    if art != "delta":
+        return art
+    delta = msg.delta.WhichOneof("type")
+    return msg.delta.new_element.WhichOneof("type") if delta == "new_element" else delta
+
+def _install_byte_counter():
+    """Zählt die an den Browser gesendeten Bytes je Element (einmal je Streamlit-Kontext)."""
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    if ctx is None or getattr(ctx, "_expo_profil", False):
+        return
+    senden = ctx._enqueue
+
+    def enqueue(msg):
+        lauf = _zustand.lauf
+        if lauf is not None:
+            lauf.count_bytes(_element_type(msg), msg.ByteSize())
+        senden(msg)
+
+    ctx._enqueue = enqueue
+    ctx._expo_profil = True
+
+def _fragment_rerun() -> bool:
+    """Ob der aktuelle Streamlit-Lauf nur Fragmente ausführt."""
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    return bool(ctx is not None and ctx.fragment_ids_this_run)
+
+def start_run(aktiv: bool = ENABLED):
+    """
+    Beginnt die Messung eines Skriptlaufs im aktuellen Thread (bzw. beendet eine
+    liegengebliebene Messung eines abgebrochenen Laufs).
+
+    Args:
+        aktiv (bool): Ob gemessen werden soll.
+    """
+    _zustand.lauf = None
+    if aktiv:
+        _install_byte_counter()
+        _zustand.lauf = _Run()
+
+def finish_run(name: str = "lauf", recorder: Recorder = None):
+    """
+    Schließt die Messung des aktuellen Laufs ab, überträgt sie in den Recorder und schreibt
+    sie gegebenenfalls ins JSON-Log bzw. die Metrikdatei.
+
+    Args:
+        name (str): Pfad, unter dem die Gesamtdauer des Laufs geführt wird (sofern nicht
+                    bereits als Abschnitt gemessen).
+        recorder (Recorder): Ziel der Messwerte, standardmäßig :data:`RECORDER`.
+    """
+    lauf = _zustand.lauf
+    _zustand.lauf = None
+    if lauf is None:
+        return
+    recorder = recorder if recorder is not None else RECORDER
+    lauf.zeiten.setdefault(name, time.perf_counter() - lauf.start)
+    lauf.aufrufe.setdefault(name, 1)
+    recorder.add_run(lauf.zeiten, lauf.aufrufe, lauf.bytes, lauf.nachrichten)
+
+    if PROFILE_LOG or METRICS_FILE:
+        with _export_lock:
+            _export(name, lauf, recorder)
+
+def _export(name: str, lauf, recorder: Recorder):
+    """Schreibt einen abgeschlossenen Lauf ins JSON-Log und die Metrikdatei (unter :data:`_export_lock`)."""
+    if PROFILE_LOG:
+        zeile = json.dumps({
+            "time": time.time(),
+            "run": name,
+            "sections": lauf.zeiten,
+            "bytes": [{"section": pfad, "element": element, "bytes": anzahl}
+                      for (pfad, element), anzahl in lauf.bytes.items()],
+        }, ensure_ascii=False)
+        if PROFILE_LOG == "-":
+            print(zeile, file=sys.stderr)
+        else:
+            with open(PROFILE_LOG, "a", encoding="utf-8") as log:
+                log.write(zeile + "\n")
+    if METRICS_FILE:
+        # Erst vollständig schreiben, dann umbenennen: Der Collector liest nie eine halbe Datei.
+        # Die temporäre Datei ist je Prozess eindeutig (mehrere Worker können dieselbe Datei teilen).
+        temporaer = f"{METRICS_FILE}.{os.getpid()}.tmp"
+        with open(temporaer, "w", encoding="utf-8") as datei:
+            datei.write(prometheus_text(recorder))
+        os.replace(temporaer, METRICS_FILE)
+
+def traced(name: str, aktiv=lambda: ENABLED):
+    """
+    Dekorator für die Fragmente der App: Im vollständigen Skriptlauf wird das Fragment als
+    Abschnitt ``name`` gemessen, bei einem Fragment-Rerun als eigener Lauf.
+
+    Args:
+        name (str): Name des Abschnitts bzw. Laufs, z.B. der Tab.
+        aktiv (callable): Entscheidet bei einem Fragment-Rerun, ob gemessen wird.
+
+    Returns:
+        callable: Dekorator.
+    """
+    def dekorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            lauf = _zustand.lauf
+            if lauf is not None and not _fragment_rerun():
+                with _timed_section(lauf, name):
+                    return func(*args, **kwargs)
+            if not aktiv():
+                _zustand.lauf = None
+                return func(*args, **kwargs)
+            start_run(True)
+            try:
+                with section(name):
+                    return func(*args, **kwargs)
+            finally:
+                finish_run(name)
+        return wrapper
+    return dekorator
+
+# ------------------------------------------------------
+# Export (Prometheus & JSON)
+# ------------------------------------------------------
+
+def _label(wert: str) -> str:
+    return wert.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def prometheus_text(recorder: Recorder = None) -> str:
+    """
+    Messwerte im Prometheus-Textformat.
+
+    Args:
+        recorder (Recorder): Quelle der Messwerte, standardmäßig :data:`RECORDER`.
+
+    Returns:
+        str: Metriken ``expo_profile_*`` mit den Labels ``section`` und ``element``.
+    """
+    daten = (recorder if recorder is not None else RECORDER).snapshot()
+    zeilen = [
+        "# HELP expo_profile_runs_total Gemessene Skript- und Fragmentläufe.",
+        "# TYPE expo_profile_runs_total counter",
+        f"expo_profile_runs_total {daten['runs']}",
+    ]
+    metriken = (
+        ("section_calls_total", "counter", "Aufrufe je Abschnitt.", "calls"),
+        ("section_seconds_total", "counter", "Summierte Dauer je Abschnitt in Sekunden.", "seconds_total"),
+        ("section_seconds_max", "gauge", "Längste Dauer je Abschnitt und Lauf in Sekunden.", "seconds_max"),
+        ("section_seconds_last", "gauge", "Dauer je Abschnitt im letzten Lauf in Sekunden.", "seconds_last"),
+    )
+    for name, typ, hilfe, feld in metriken:
+        zeilen += [f"# HELP expo_profile_{name} {hilfe}", f"# TYPE expo_profile_{name} {typ}"]
+        zeilen += [f'expo_profile_{name}{{section="{_label(pfad)}"}} {werte[feld]}'
+                   for pfad, werte in daten["sections"].items()]
+    metriken = (
+        ("element_messages_total", "counter", "Gesendete Nachrichten je Abschnitt und Element.", "messages"),
+        ("element_bytes_total", "counter", "Gesendete Bytes je Abschnitt und Element.", "bytes_total"),
+        ("element_bytes_last", "gauge", "Gesendete Bytes je Abschnitt und Element im letzten Lauf.", "bytes_last"),
+    )
+    for name, typ, hilfe, feld in metriken:
+        zeilen += [f"# HELP expo_profile_{name} {hilfe}", f"# TYPE expo_profile_{name} {typ}"]
+        zeilen += [f'expo_profile_{name}{{section="{_label(e["section"])}",element="{_label(e["element"])}"}} {e[feld]}'
+                   for e in daten["elements"]]
+    return "\n".join(zeilen) + "\n"
+
+def json_text(recorder: Recorder = None) -> str:
+    """
+    Messwerte als JSON-Dokument (siehe :meth:`Recorder.snapshot`).
+
+    Args:
+        recorder (Recorder): Quelle der Messwerte, standardmäßig :data:`RECORDER`.
+
+    Returns:
+        str: Das JSON-Dokument.
+    """
+    return json.dumps((recorder if recorder is not None else RECORDER).snapshot(), ensure_ascii=False, indent=2)
@@ -0,0 +1,304 @@
+"""
+Vorberechnete Nachschlagetabellen (Lookup Tables) für die Slider-Raster der App.
+
+Alle Eingaben der App sind beschränkte, diskrete Widgets. Der Build-Schritt::
+
+    python -m lookup [--ziel VERZEICHNIS]
+
+berechnet die exponentiellen Faktoren jeder Geschichte (Potenzen und geometrische
+Summen, siehe ``engine.*_factors``) für jeden erreichbaren Slider-Wert und jede Periode
+vor und legt sie als ``.npy``-Dateien ab, die zur Laufzeit per Memory-Mapping gelesen
+werden. Die linearen Eingaben (Startkapital, Sparrate, Startpersonen, Start-MRR, ...)
+werden erst beim Nachschlagen über ``engine.*_from_factors`` eingerechnet. So bleiben
+die Tabellen wenige MB groß, statt das kartesische Produkt aller Slider abzulegen
+(allein Tab 2 hätte über 10^8 Kombinationen). Eine Kennzahl kostet einen Indexzugriff,
+eine Zeitreihe einen Slice – unabhängig davon, wie aufwendig das Modell ist.
+
+Werte außerhalb des Rasters (z.B. tägliche Verzinsung oder Sweep-Raster) und fehlende
+oder veraltete Tabellen fallen auf die Engine zurück, siehe :func:`tabulated`. Fehlende
+oder veraltete Tabellen werden einmal pro Prozess als Warnung geloggt, jeder Rückfall
+außerhalb des Rasters auf Stufe DEBUG (Logger ``lookup``).
+
+Die Tabellen werden mit der App ausgeliefert (Verzeichnis ``lookup_tables`` im
+Repository, überschreibbar per ``EXPO_LOOKUP_DIR``). Nach Änderungen an :data:`RASTER`
+oder an den Faktorfunktionen der Engine den Build-Schritt ausführen und die Tabellen
+mit einchecken.
+"""
+
+import argparse
+import functools
+import json
+import logging
+import os
+
+import numpy as np
+
+import engine
+
+LOOKUP_DIR = os.environ.get(
+    "EXPO_LOOKUP_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "lookup_tables")
+)
+
+# ------------------------------------------------------
+# Raster je Geschichte (Grids)
+# Slider-Achsen: (Minimum, Maximum, Schrittweite); Zeitachsen: maximale Anzahl Perioden
+# ------------------------------------------------------
+
+RASTER = {
+    "viral": {"multiplikator": [0.5, 5.0, 0.1], "anzahl_wellen": 40},
+    "saas": {"monatliche_wachstumsrate": [0.0, 35.0, 0.5], "monate": 60},
+    # Nettozins = Zinssatz (Schritt 0,5) minus Kosten (Schritt 0,05). Tägliche Verzinsung
+    # bräuchte über 100 MB und wird weiterhin in geschlossener Form berechnet.
+    "zinseszins": {"nettozins": [-3.0, 18.0, 0.05], "laufzeit": 50, "perioden_pro_jahr": [1, 4, 12]},
+}
+
+_MANIFEST = "manifest.json"
+
+_tabellen = None
+
+_log = logging.getLogger(__name__)
+
+# ------------------------------------------------------
+# Raster-Hilfsfunktionen (Grid Helpers)
+# ------------------------------------------------------
+
+def _axis(minimum: float, maximum: float, schritt: float) -> np.ndarray:
+    """Stützstellen einer Slider-Achse, auf die Dezimaldarstellung des Sliders gerundet."""
+    return np.round(minimum + schritt * np.arange(round((maximum - minimum) / schritt) + 1), 10)
+
+def _index(wert, minimum: float, maximum: float, schritt: float):
+    """Index von ``wert`` auf der Achse oder ``None``, wenn der Wert nicht auf dem Raster liegt."""
+    if np.ndim(wert) != 0:
+        return None
+    index = round((float(wert) - minimum) / schritt)
+    if 0 <= index <= round((maximum - minimum) / schritt) and abs(minimum + index * schritt - wert) < 1e-9:
+        return index
+    return None
+
+def _count(wert, maximum: int):
+    """Ganzzahlige Periodenanzahl zwischen 0 und ``maximum`` oder ``None``."""
+    if np.ndim(wert) != 0 or not float(wert).is_integer() or not 0 <= wert <= maximum:
+        return None
+    return int(wert)
+
+# ------------------------------------------------------
+# Build-Schritt (Build Step)
+# ------------------------------------------------------
+
+def build(ziel: str = LOOKUP_DIR) -> dict:
+    """
+    Berechnet alle Tabellen und schreibt sie als ``.npy``-Dateien samt Manifest nach ``ziel``.
+
+    Args:
+        ziel (str): Zielverzeichnis.
+
+    Returns:
+        dict: Tabellenname -> Form.
+    """
+    tabellen = {}
+
+    viral = RASTER["viral"]
+    multiplikator = _axis(*viral["multiplikator"])[:, np.newaxis]
+    faktoren = engine.viral_factors(multiplikator, np.arange(1, viral["anzahl_wellen"] + 1))
+    tabellen["viral_summe"] = faktoren["summe"]
+    tabellen["viral_letzte_potenz"] = faktoren["letzte_potenz"]
+
+    saas = RASTER["saas"]
+    wachstumsrate = _axis(*saas["monatliche_wachstumsrate"])[:, np.newaxis]
+    tabellen["saas_wachstum"] = engine.saas_factors(wachstumsrate, np.arange(saas["monate"] + 1))["wachstum"]
+
+    zinseszins = RASTER["zinseszins"]
+    rate = _axis(*zinseszins["nettozins"])[:, np.newaxis] / 100
+    for perioden_pro_jahr in zinseszins["perioden_pro_jahr"]:
+        # Dieselbe Zeitachse wie engine.compound_interest_series, damit Slices identische Werte liefern
+        jahre = np.arange(zinseszins["laufzeit"] * perioden_pro_jahr + 1) / perioden_pro_jahr
+        for name, werte in engine.compound_interest_factors(rate, perioden_pro_jahr, jahre).items():
+            tabellen[f"zinseszins_m{perioden_pro_jahr}_{name}"] = werte
+
+    os.makedirs(ziel, exist_ok=True)
+    for name, werte in tabellen.items():
+        np.save(os.path.join(ziel, f"{name}.npy"), np.ascontiguousarray(werte, dtype=np.float64))
+    # Manifest zuletzt schreiben: Es kennzeichnet einen vollständigen Build für dieses Raster
+    with open(os.path.join(ziel, _MANIFEST), "w", encoding="utf-8") as datei:
+        json.dump({"raster": RASTER, "tabellen": sorted(tabellen)}, datei, indent=2)
+    return {name: werte.shape for name, werte in tabellen.items()}
+
+def load_tables(verzeichnis: str = LOOKUP_DIR) -> dict:
+    """
+    Mappt die Tabellen aus ``verzeichnis`` schreibgeschützt in den Speicher (einmal pro Prozess).
+
+    Args:
+        verzeichnis (str): Tabellenverzeichnis.
+
+    Returns:
+        dict: Tabellenname -> Memmap, oder ``None``, wenn die Tabellen fehlen oder zu einem
+              anderen Raster gehören.
+    """
+    global _tabellen
+    if _tabellen is None:
+        _tabellen = {}
+        try:
+            with open(os.path.join(verzeichnis, _MANIFEST), encoding="utf-8") as datei:
+                manifest = json.load(datei)
+            if manifest["raster"] == RASTER:
+                _tabellen = {name: np.load(os.path.join(verzeichnis, f"{name}.npy"), mmap_mode="r")
+                             for name in manifest["tabellen"]}
+            else:
+                _log.warning("Lookup-Tabellen in %s gehören zu einem anderen Raster; alle Werte kommen "
+                             "aus der Engine (neu bauen mit 'python -m lookup').", verzeichnis)
+        except (OSError, ValueError, KeyError) as fehler:
+            _log.warning("Lookup-Tabellen in %s nicht lesbar (%s); alle Werte kommen aus der Engine "
+                         "(neu bauen mit 'python -m lookup').", verzeichnis, fehler)
+    return _tabellen or None
+
+# ------------------------------------------------------
+# Nachschlagen (Lookups)
+# Gleiche Signaturen wie die Engine; ``None`` bedeutet "nicht tabelliert".
+# ------------------------------------------------------
+
+def compound_interest_final(startkapital, sparrate, laufzeit, zinssatz, perioden_pro_jahr=1, vorschuessig=True,
+                            inflation=0.0, kosten=0.0, steuer=0.0):
+    """Nachschlage-Variante von :func:`engine.compound_interest_final`."""
+    tabellen = load_tables()
+    raster = RASTER["zinseszins"]
+    index = _index(np.subtract(zinssatz, kosten), *raster["nettozins"])
+    jahre = _count(laufzeit, raster["laufzeit"])
+    if (tabellen is None or index is None or jahre is None or np.ndim(perioden_pro_jahr) != 0
+            or perioden_pro_jahr not in raster["perioden_pro_jahr"]):
+        return None
+    periode = jahre * perioden_pro_jahr
+    return engine.compound_interest_from_factors(
+        startkapital, sparrate, laufzeit, (np.asarray(zinssatz, dtype=float) - np.asarray(kosten, dtype=float)) / 100,
+        perioden_pro_jahr, vorschuessig, inflation, steuer,
+        aufzinsung=tabellen[f"zinseszins_m{perioden_pro_jahr}_aufzinsung"][index, periode],
+        wachstum=tabellen[f"zinseszins_m{perioden_pro_jahr}_wachstum"][index, periode],
+    )
+
+def compound_interest_series(startkapital, sparrate, laufzeit, zinssatz, perioden_pro_jahr=1, vorschuessig=True,
+                             inflation=0.0, kosten=0.0, steuer=0.0):
+    """Nachschlage-Variante von :func:`engine.compound_interest_series` (Slice der Faktortabellen)."""
+    tabellen = load_tables()
+    raster = RASTER["zinseszins"]
+    index = _index(np.subtract(zinssatz, kosten), *raster["nettozins"])
+    jahre = _count(laufzeit, raster["laufzeit"])
+    if (tabellen is None or index is None or jahre is None or np.ndim(perioden_pro_jahr) != 0
+            or perioden_pro_jahr not in raster["perioden_pro_jahr"]):
+        return None
+    ende = jahre * perioden_pro_jahr + 1
+    zeitachse = np.arange(ende) / perioden_pro_jahr
+    werte = engine.compound_interest_from_factors(
+        np.expand_dims(startkapital, -1), np.expand_dims(sparrate, -1), zeitachse,
+        (np.expand_dims(zinssatz, -1) - np.expand_dims(kosten, -1)) / 100,
+        perioden_pro_jahr, vorschuessig, np.expand_dims(inflation, -1), np.expand_dims(steuer, -1),
+        aufzinsung=tabellen[f"zinseszins_m{perioden_pro_jahr}_aufzinsung"][index, :ende],
+        wachstum=tabellen[f"zinseszins_m{perioden_pro_jahr}_wachstum"][index, :ende],
+    )
+    return {
+        "jahre": zeitachse,
+        "kapital_zinseszins": werte["endkapital_lara"],
+        "kapital_lineares_sparen": werte["endkapital_tim"],
+        "eingezahlt_total": werte["eigenleistung_kumuliert"],
+    }
+
+def viral_final(starter_personen, multiplikator, anzahl_wellen):
+    """Nachschlage-Variante von :func:`engine.viral_final`."""
+    tabellen = load_tables()
+    index = _index(multiplikator, *RASTER["viral"]["multiplikator"])
+    wellen = _count(anzahl_wellen, RASTER["viral"]["anzahl_wellen"])
+    if tabellen is None or index is None or not wellen:
+        return None
+    return engine.viral_from_factors(starter_personen, anzahl_wellen,
+                                     summe=tabellen["viral_summe"][index, wellen - 1],
+                                     letzte_potenz=tabellen["viral_letzte_potenz"][index, wellen - 1])
+
+def viral_series(starter_personen, multiplikator, anzahl_wellen):
+    """Nachschlage-Variante von :func:`engine.viral_series`."""
+    tabellen = load_tables()
+    index = _index(multiplikator, *RASTER["viral"]["multiplikator"])
+    wellen = _count(anzahl_wellen, RASTER["viral"]["anzahl_wellen"])
+    if tabellen is None or index is None or not wellen:
+        return None
+    # Die Potenz der Welle n steht in der Spalte von n + 1 Wellen ("letzte Welle")
+    neu = np.expand_dims(np.asarray(starter_personen, dtype=float), -1) * tabellen["viral_letzte_potenz"][index, :wellen]
+    return {
+        "runden": np.arange(1, wellen + 1),
+        "neu_erreicht_pro_runde": neu,
+        "kumulativ_erreicht": np.cumsum(neu, axis=-1),
+    }
+
+def saas_final(start_mrr, monatliche_wachstumsrate, monate_planungszeitraum, lineares_ziel_delta_mrr,
+               team_aktuelle_fte=0, mrr_pro_fte_produktivitaet=1):
+    """Nachschlage-Variante von :func:`engine.saas_final`."""
+    tabellen = load_tables()
+    index = _index(monatliche_wachstumsrate, *RASTER["saas"]["monatliche_wachstumsrate"])
+    monate = _count(monate_planungszeitraum, RASTER["saas"]["monate"])
+    if tabellen is None or index is None or monate is None:
+        return None
+    return engine.saas_from_factors(start_mrr, monatliche_wachstumsrate, monate_planungszeitraum,
+                                    lineares_ziel_delta_mrr, team_aktuelle_fte, mrr_pro_fte_produktivitaet,
+                                    wachstum=tabellen["saas_wachstum"][index, monate])
+
+def saas_series(start_mrr, monatliche_wachstumsrate, monate_planungszeitraum, lineares_ziel_delta_mrr):
+    """Nachschlage-Variante von :func:`engine.saas_series`."""
+    tabellen = load_tables()
+    index = _index(monatliche_wachstumsrate, *RASTER["saas"]["monatliche_wachstumsrate"])
+    monate = _count(monate_planungszeitraum, RASTER["saas"]["monate"])
+    if tabellen is None or index is None or monate is None:
+        return None
+    zeitachse = np.arange(monate + 1)
+    werte = engine.saas_from_factors(
+        np.expand_dims(start_mrr, -1), np.expand_dims(monatliche_wachstumsrate, -1), zeitachse,
+        np.expand_dims(lineares_ziel_delta_mrr, -1), 0, 1,
+        wachstum=tabellen["saas_wachstum"][index, :monate + 1],
+    )
+    return {
+        "monate": zeitachse,
+        "mrr_exponentiell": werte["gesamt_mrr_exponentiell"],
+        "mrr_linear": werte["gesamt_mrr_linear"],
+    }
+
+_LOOKUPS = {
+    engine.compound_interest_final: compound_interest_final,
+    engine.compound_interest_series: compound_interest_series,
+    engine.viral_final: viral_final,
+    engine.viral_series: viral_series,
+    engine.saas_final: saas_final,
+    engine.saas_series: saas_series,
+}
+
+def tabulated(modell):
+    """
+    Umhüllt eine Engine-Funktion: Liegen alle Raster-Parameter auf den Slider-Rastern, wird
+    das Ergebnis aus den Tabellen zusammengesetzt, sonst wie bisher mit ``modell`` berechnet
+    (und der Rückfall geloggt, siehe Modulbeschreibung).
+
+    Args:
+        modell (callable): Eine der tabellierten Engine-Funktionen.
+
+    Returns:
+        callable: Funktion mit derselben Signatur.
+    """
+    nachschlagen = _LOOKUPS[modell]
+
+    @functools.wraps(modell)
+    def wrapper(*args, **kwargs):
+        ergebnis = nachschlagen(*args, **kwargs)
+        if ergebnis is None:
+            _log.debug("%s nicht tabelliert, Rückfall auf die Engine.", modell.__name__)
+            return modell(*args, **kwargs)
+        return ergebnis
+
+    return wrapper
+
+def main():
+    parser = argparse.ArgumentParser(description="Erzeugt die Lookup-Tabellen der App.")
+    parser.add_argument("--ziel", default=LOOKUP_DIR, help="Zielverzeichnis (Standard: EXPO_LOOKUP_DIR)")
+    args = parser.parse_args()
+    formen = build(args.ziel)
+    groesse = sum(os.path.getsize(os.path.join(args.ziel, f"{name}.npy")) for name in formen)
+    for name, form in formen.items():
+        print(f"{name:<32} {form}")
+    print(f"{len(formen)} Tabellen, {groesse / 1e6:.1f} MB in {args.ziel}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+Monte-Carlo-Simulation für die Zinseszins-Geschichte (Tab 2).
+
+Statt eines festen Zinssatzes zieht jedes Jahr eine zufällige Rendite. So wird das
+Reihenfolgerisiko (Sequence-of-Returns Risk) sichtbar: Laras reinvestiertes Depot
+reagiert auf jede Renditefolge anders als Tims Auszahlungsstrategie.
+
+Die Pfade werden in Blöcken fester Größe erzeugt, jeder Block mit einem eigenen,
+aus dem Seed abgeleiteten Zufallsgenerator (``SeedSequence.spawn``). Dadurch liefern
+der serielle und der Prozesspool-Backend bei gleichem Seed identische Ergebnisse,
+und Ergebnisse lassen sich über den Seed cachen.
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Pfade pro Block; bestimmt die Zuordnung der Zufallsströme und damit die Reproduzierbarkeit
+CHUNK_PATHS = 25_000
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+# ------------------------------------------------------
+# Pfad-Erzeugung (Path Generation)
+# ------------------------------------------------------
+
+def draw_returns(rng: np.random.Generator, n_paths: int, jahre: int, zinssatz: float, volatilitaet: float) -> np.ndarray:
+    """
+    Zieht jährliche Renditen aus einer Lognormalverteilung mit Erwartungswert ``zinssatz``.
+    Renditen unter -100 % sind damit ausgeschlossen.
+
+    Args:
+        rng (np.random.Generator): Zufallsgenerator.
+        n_paths (int): Anzahl der Pfade.
+        jahre (int): Anzahl der Jahre.
+        zinssatz (float): Erwartete jährliche Rendite in Prozent.
+        volatilitaet (float): Standardabweichung der jährlichen Rendite in Prozent.
+
+    Returns:
+        np.ndarray: Renditen als Dezimalzahlen, Form ``(n_paths, jahre)``.
+    """
+    erwartung = 1 + zinssatz / 100
+    if volatilitaet <= 0:
+        return np.full((n_paths, jahre), erwartung - 1)
+    # Parameter der Lognormalverteilung so wählen, dass E[1 + r] und Std[r] passen
+    sigma2 = np.log1p((volatilitaet / 100 / erwartung) ** 2)
+    mu = np.log(erwartung) - sigma2 / 2
+    return np.exp(rng.normal(mu, np.sqrt(sigma2), size=(n_paths, jahre))) - 1
+
+def savings_paths(renditen: np.ndarray, startkapital: float, sparrate: float) -> dict:
+    """
+    Berechnet Laras und Tims Vermögenspfade für gegebene Renditefolgen, ohne Schleife über die Zeit.
+
+    Lara: ``K_t = (K_{t-1} + 12 * sparrate) * (1 + r_t)``, also mit ``P_t = prod(1 + r)``
+    in geschlossener Form ``K_t = P_t * (K_0 + S * sum_{k<=t} 1 / P_{k-1})``.
+    Tim: zahlt ein, lässt sich aber die Erträge auf das Startkapital auszahlen
+    (einfache Verzinsung mit der jeweiligen Jahresrendite).
+
+    Args:
+        renditen (np.ndarray): Renditen der Form ``(n_paths, jahre)``.
+        startkapital (float): Startkapital in €.
+        sparrate (float): Monatliche Sparrate in €.
+
+    Returns:
+        dict: "lara" und "tim" mit Form ``(n_paths, jahre + 1)`` inklusive Jahr 0.
+    """
+    jahressparrate = sparrate * 12
+    n_paths, jahre = renditen.shape
+    wachstum = np.cumprod(1 + renditen, axis=1)
+    vorher = np.concatenate([np.ones((n_paths, 1)), wachstum[:, :-1]], axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        lara = wachstum * (startkapital + jahressparrate * np.cumsum(1 / vorher, axis=1))
+    tim = startkapital + jahressparrate * np.arange(1, jahre + 1) + startkapital * np.cumsum(renditen, axis=1)
+
+    start = np.full((n_paths, 1), float(startkapital))
+    return {
+        "lara": np.concatenate([start, lara], axis=1),
+        "tim": np.concatenate([start, tim], axis=1),
+    }
+
+def _simulate_chunk(seed_sequence, n_paths, startkapital, sparrate, laufzeit, zinssatz, volatilitaet):
+    rng = np.random.default_rng(seed_sequence)
+    renditen = draw_returns(rng, n_paths, laufzeit, zinssatz, volatilitaet)
+    return savings_paths(renditen, startkapital, sparrate)
+
+def _get_executor() -> ProcessPoolExecutor:
+    """
+    Gemeinsamer Prozesspool, beim ersten Aufruf angelegt. Das Lock verhindert, dass gleichzeitige
+    Sitzungen je einen eigenen Pool starten. Die Worker entstehen per forkserver bzw. spawn statt
+    fork: Der Server-Prozess hält Threads (Streamlit, Anytime-Jobs), deren Locks ein Fork mitkopieren würde.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            methode = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _executor = ProcessPoolExecutor(max_workers=os.cpu_count(),
+                                            mp_context=multiprocessing.get_context(methode))
+        return _executor
+
+def _chunks(startkapital, sparrate, laufzeit, zinssatz, volatilitaet, n_paths, seed, backend):
+    """Erzeugt die Pfade blockweise in fester Reihenfolge; beim Schließen werden ausstehende Blöcke verworfen."""
+    bloecke = [min(CHUNK_PATHS, n_paths - start) for start in range(0, n_paths, CHUNK_PATHS)]
+    seeds = np.random.SeedSequence(seed).spawn(len(bloecke))
+    argumente = (startkapital, sparrate, laufzeit, zinssatz, volatilitaet)
+
+    if backend == "process" and len(bloecke) > 1:
+        futures = [_get_executor().submit(_simulate_chunk, s, n, *argumente) for s, n in zip(seeds, bloecke)]
+        try:
+            for future in futures:
+                yield len(bloecke), future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+    else:
+        for s, n in zip(seeds, bloecke):
+            yield len(bloecke), _simulate_chunk(s, n, *argumente)
+
+def _bands(pfade: np.ndarray, max_pfade: int = None) -> np.ndarray:
+    """Perzentilbänder je Jahr; optional aus einer gleichmäßigen Stichprobe von höchstens ``max_pfade`` Pfaden."""
+    if max_pfade is not None and len(pfade) > max_pfade:
+        pfade = pfade[::-(-len(pfade) // max_pfade)]
+    # Zeitachse nach vorn: Die Perzentile laufen dann über zusammenhängenden Speicher (deutlich schneller)
+    return np.percentile(np.ascontiguousarray(pfade.T), PERCENTILES, axis=1)
+
+def _summarize(ergebnisse: list, startkapital: float, sparrate: float, laufzeit: int, max_pfade: int = None) -> dict:
+    lara = np.concatenate([e["lara"] for e in ergebnisse])
+    tim = np.concatenate([e["tim"] for e in ergebnisse])
+    eigenleistung = startkapital + sparrate * 12 * laufzeit
+    return {
+        "jahre": np.arange(laufzeit + 1),
+        "pfade": len(lara),
+        "perzentile": PERCENTILES,
+        "lara_baender": _bands(lara, max_pfade),
+        "tim_baender": _bands(tim, max_pfade),
+        "lara_endwerte": lara[:, -1],
+        "tim_endwerte": tim[:, -1],
+        "p_lara_schlaegt_tim": float(np.mean(lara[:, -1] > tim[:, -1])),
+        "p_lara_schlaegt_eigenleistung": float(np.mean(lara[:, -1] > eigenleistung)),
+    }
+
+# ------------------------------------------------------
+# Öffentliche Simulation (Public Simulation API)
+# ------------------------------------------------------
+
+def simulate(startkapital: float, sparrate: float, laufzeit: int, zinssatz: float, volatilitaet: float,
+             n_paths: int = 10_000, seed: int = 42, backend: str = "serial") -> dict:
+    """
+    Simuliert ``n_paths`` zufällige Renditepfade und fasst sie zu Perzentilbändern zusammen.
+
+    Args:
+        startkapital (float): Startkapital in €.
+        sparrate (float): Monatliche Sparrate in €.
+        laufzeit (int): Laufzeit in Jahren.
+        zinssatz (float): Erwartete jährliche Rendite in Prozent.
+        volatilitaet (float): Standardabweichung der jährlichen Rendite in Prozent.
+        n_paths (int): Anzahl der simulierten Pfade.
+        seed (int): Seed für reproduzierbare Ergebnisse.
+        backend (str): "serial" oder "process" (Blöcke auf mehrere Prozessorkerne verteilen).
+
+    Returns:
+        dict: "jahre", Anzahl "pfade", Perzentilbänder für Lara und Tim (Form
+              ``(len(PERCENTILES), laufzeit + 1)``), Endwert-Stichproben und die
+              Wahrscheinlichkeiten, dass Lara Tim bzw. ihre eigene Einzahlung übertrifft.
+    """
+    ergebnisse = [teil for _, teil in _chunks(startkapital, sparrate, laufzeit, zinssatz, volatilitaet,
+                                              n_paths, seed, backend)]
+    return _summarize(ergebnisse, startkapital, sparrate, laufzeit)
+
+def simulate_progressive(startkapital: float, sparrate: float, laufzeit: int, zinssatz: float, volatilitaet: float,
+                         n_paths: int = 10_000, seed: int = 42, backend: str = "serial", intervall: float = 0.0):
+    """
+    Wie :func:`simulate`, liefert aber nach jedem Block von :data:`CHUNK_PATHS` Pfaden die
+    Perzentilbänder der bisher simulierten Pfade (für :mod:`anytime`). Zwischenstände schätzen die
+    Bänder aus einer Stichprobe von höchstens :data:`CHUNK_PATHS` Pfaden; da die Blöcke ihre eigenen
+    Zufallsströme haben, ist das letzte Ergebnis identisch mit :func:`simulate`.
+
+    Args:
+        intervall (float): Mindestabstand zwischen zwei Zwischenständen in Sekunden. Blöcke davor
+            melden nur ihren Fortschritt (Ergebnis ``None``), statt erneut Bänder zu berechnen.
+        Sonst siehe :func:`simulate`.
+
+    Yields:
+        tuple[float, dict]: Anteil der simulierten Pfade und Ergebnis wie bei :func:`simulate` bzw. ``None``.
+    """
+    ergebnisse = []
+    letzter_stand = time.perf_counter()
+    for anzahl_bloecke, teil in _chunks(startkapital, sparrate, laufzeit, zinssatz, volatilitaet, n_paths, seed, backend):
+        ergebnisse.append(teil)
+        anteil = len(ergebnisse) / anzahl_bloecke
+        if anteil == 1:
+            yield anteil, _summarize(ergebnisse, startkapital, sparrate, laufzeit)
+        elif time.perf_counter() - letzter_stand >= intervall:
+            yield anteil, _summarize(ergebnisse, startkapital, sparrate, laufzeit, CHUNK_PATHS)
+            letzter_stand = time.perf_counter()
+        else:
+            yield anteil, None
@@ -0,0 +1,246 @@
+"""
+Ausbreitung auf synthetischen sozialen Netzwerken (Graph-based Spread).
+
+Das Netzwerk ist ein gerichteter Kontaktgraph ("wen erreicht eine Person?") im
+CSR-Format: ``indptr`` (int64, Länge n + 1) und ``indices`` (int32, eine Kante je
+Eintrag). Für 10 Mio. Knoten mit 10 Kontakten sind das ca. 480 MB, die als
+``.npy``-Dateien auf der Platte liegen und per Memory-Mapping gelesen werden.
+Erzeugung und Ausbreitung arbeiten blockweise auf Arrays; der Heap-Speicher bleibt
+auch bei 10 Mio. Knoten deutlich unter 1 GB.
+
+Die Graphen werden im Cache-Verzeichnis ``EXPO_GRAPH_CACHE_DIR`` (Standard:
+``.graph_cache`` neben der App) abgelegt und bei späteren Läufen nur noch gemappt.
+Gleichzeitige Sitzungen eines Prozesses bauen denselben Graphen nur einmal; parallele
+Prozesse schreiben in eigene temporäre Dateien und ersetzen das Ergebnis atomar.
+"""
+
+import os
+import threading
+
+import numpy as np
+
+GRAPH_CACHE_DIR = os.environ.get(
+    "EXPO_GRAPH_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".graph_cache")
+)
+
+# Kanten je Erzeugungs- bzw. Ausbreitungsblock (begrenzt den Arbeitsspeicher)
+EDGE_CHUNK = 4_000_000
+
+# Obergrenze für den Ausgangsgrad eines Knotens im skalenfreien Graphen
+MAX_DEGREE = 10_000
+
+# Version der Graph-Erzeugung im Dateinamen: Ändert sich die Erzeugung, werden ältere Graphen
+# im Cache nicht mehr gemappt, sondern neu gebaut
+GRAPH_VERSION = 2
+
+# Ein Lock je Graph-Datei: Sitzungen, die denselben Graphen anfordern, warten auf den ersten Build
+_build_locks = {}
+_build_locks_lock = threading.Lock()
+
+# ------------------------------------------------------
+# Graph-Erzeugung (Graph Generation)
+# ------------------------------------------------------
+
+def _pareto_weights(rng: np.random.Generator, n: int, mittel: float, exponent: float) -> np.ndarray:
+    """Pareto-verteilte Gewichte mit Dichte ~ x^-exponent und Erwartungswert ``mittel``."""
+    x_min = mittel * (exponent - 2) / (exponent - 1)
+    return x_min * (1 - rng.random(n)) ** (-1 / (exponent - 1))
+
+def _degrees(rng: np.random.Generator, modell: str, n: int, mittlerer_grad: int, exponent: float) -> np.ndarray:
+    if modell == "small_world":
+        return np.full(n, mittlerer_grad, dtype=np.int32)
+    grade = np.round(_pareto_weights(rng, n, mittlerer_grad, exponent)).astype(np.int32)
+    return np.clip(grade, 1, min(MAX_DEGREE, n - 1))
+
+def _small_world_targets(rng, knoten, n, mittlerer_grad, rewiring):
+    """Ringgitter mit ``mittlerer_grad`` Nachbarn (je Hälfte links/rechts), Kanten mit Wahrscheinlichkeit ``rewiring`` neu verdrahtet."""
+    halb = mittlerer_grad // 2
+    versatz = np.concatenate([np.arange(1, halb + 1), -np.arange(1, mittlerer_grad - halb + 1)])
+    ziele = (knoten[:, np.newaxis] + versatz) % n
+    neu = rng.random(ziele.shape) < rewiring
+    ziele[neu] = rng.integers(0, n, size=int(neu.sum()))
+    # Neu verdrahtete Kanten, die auf ihren eigenen Knoten zeigen, neu ziehen (keine Selbstkontakte)
+    schleifen = neu & (ziele == knoten[:, np.newaxis])
+    while n > 1 and schleifen.any():
+        ziele[schleifen] = rng.integers(0, n, size=int(schleifen.sum()))
+        schleifen &= ziele == knoten[:, np.newaxis]
+    return ziele.ravel()
+
+def _graph_paths(modell: str, n: int, mittlerer_grad: int, parameter: float, seed: int) -> tuple:
+    name = f"{modell}_v{GRAPH_VERSION}_n{n}_k{mittlerer_grad}_p{parameter:g}_s{seed}"
+    return (os.path.join(GRAPH_CACHE_DIR, f"{name}_indptr.npy"),
+            os.path.join(GRAPH_CACHE_DIR, f"{name}_indices.npy"))
+
+def _load(pfad_indptr: str, pfad_indices: str):
+    """Mappt einen fertigen Graphen oder liefert ``None``, solange er nicht vollständig im Cache liegt."""
+    # indices wird zuletzt umbenannt: Existieren beide Dateien, sind beide vollständig
+    if os.path.exists(pfad_indptr) and os.path.exists(pfad_indices):
+        return np.load(pfad_indptr, mmap_mode="r"), np.load(pfad_indices, mmap_mode="r")
+    return None
+
+def build_graph(modell: str, n: int, mittlerer_grad: int = 10, parameter: float = None, seed: int = 7) -> tuple:
+    """
+    Erzeugt einen synthetischen Kontaktgraphen blockweise als .npy-Dateien im Graph-Cache.
+
+    Args:
+        modell (str): "small_world" (Watts–Strogatz-Ringgitter mit Umverdrahtung) oder
+                      "scale_free" (Chung–Lu mit Pareto-verteilten Graden und Zielgewichten).
+        n (int): Anzahl der Knoten (Personen).
+        mittlerer_grad (int): Mittlere Anzahl Kontakte je Person.
+        parameter (float): Umverdrahtungswahrscheinlichkeit (small_world, Standard 0.1) bzw.
+                           Exponent der Gradverteilung (scale_free, Standard 2.5).
+        seed (int): Seed für reproduzierbare Graphen.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: ``indptr`` und ``indices`` als schreibgeschützte Memmaps.
+    """
+    for _, graph in build_graph_progressive(modell, n, mittlerer_grad, parameter, seed):
+        pass
+    return graph
+
+def build_graph_progressive(modell: str, n: int, mittlerer_grad: int = 10, parameter: float = None, seed: int = 7):
+    """
+    Wie :func:`build_graph`, meldet aber nach jedem Block den Anteil der geschriebenen Kanten
+    (für :mod:`anytime`). Wird der Generator vorzeitig geschlossen, bleiben keine temporären
+    Dateien zurück; ein später angeforderter Graph wird dann von vorn erzeugt.
+
+    Args:
+        Siehe :func:`build_graph`.
+
+    Yields:
+        tuple[float, tuple]: Anteil der geschriebenen Kanten und ``None`` bzw. zuletzt ``(1.0, (indptr, indices))``.
+    """
+    if parameter is None:
+        parameter = 0.1 if modell == "small_world" else 2.5
+    pfade = _graph_paths(modell, n, mittlerer_grad, parameter, seed)
+    graph = _load(*pfade)
+    if graph is None:
+        with _build_locks_lock:
+            lock = _build_locks.setdefault(pfade[0], threading.Lock())
+        with lock:
+            # Eine andere Sitzung kann den Graphen gebaut haben, während auf das Lock gewartet wurde
+            graph = _load(*pfade)
+            if graph is None:
+                for anteil in _write_graph(*pfade, modell, n, mittlerer_grad, parameter, seed):
+                    yield anteil, None
+                graph = _load(*pfade)
+    yield 1.0, graph
+
+def _write_graph(pfad_indptr: str, pfad_indices: str, modell: str, n: int, mittlerer_grad: int, parameter: float,
+                 seed: int):
+    """
+    Erzeugt den Graphen (siehe :func:`build_graph`) und legt ihn atomar unter den beiden Pfaden ab.
+    Liefert nach jedem Block den Anteil der geschriebenen Kanten.
+    """
+    os.makedirs(GRAPH_CACHE_DIR, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    grade = _degrees(rng, modell, n, mittlerer_grad, parameter)
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(grade, out=indptr[1:])
+    del grade
+
+    if modell == "scale_free":
+        # Beliebte Personen werden überproportional oft erreicht (skalenfreier Eingangsgrad)
+        kumuliert = np.cumsum(_pareto_weights(rng, n, 1.0, parameter))
+
+    # Kanten blockweise direkt in die .npy-Datei schreiben (kein kompletter Kantenarray im Speicher);
+    # temporäre Dateien je Prozess, damit abgebrochene oder parallele Läufe nie eine halbe Datei
+    # im Cache hinterlassen oder die eines anderen Prozesses überschreiben
+    temporaer_indptr = f"{pfad_indptr}.{os.getpid()}.tmp"
+    temporaer_indices = f"{pfad_indices}.{os.getpid()}.tmp"
+    fertig = False
+    try:
+        with open(temporaer_indices, "wb") as datei:
+            np.lib.format.write_array_header_2_0(
+                datei, {"descr": np.dtype(np.int32).str, "fortran_order": False, "shape": (int(indptr[-1]),)}
+            )
+            start = 0
+            while start < n:
+                # Blockgrenze so wählen, dass etwa EDGE_CHUNK Kanten entstehen
+                ende = int(min(max(np.searchsorted(indptr, indptr[start] + EDGE_CHUNK), start + 1), n))
+                if modell == "small_world":
+                    ziele = _small_world_targets(rng, np.arange(start, ende), n, mittlerer_grad, parameter)
+                else:
+                    zufall = rng.random(int(indptr[ende] - indptr[start])) * kumuliert[-1]
+                    # Sortierte Suchschlüssel machen searchsorted cache-freundlich, danach zurück permutieren
+                    reihenfolge = np.argsort(zufall)
+                    ziele = np.empty(len(zufall), dtype=np.int64)
+                    # Rundung kann zufall auf kumuliert[-1] legen, searchsorted liefert dann n
+                    ziele[reihenfolge] = np.minimum(np.searchsorted(kumuliert, zufall[reihenfolge], side="right"),
+                                                    n - 1)
+                ziele.astype(np.int32).tofile(datei)
+                start = ende
+                yield float(indptr[ende] / indptr[-1])
+
+        with open(temporaer_indptr, "wb") as datei:
+            np.save(datei, indptr)
+        os.replace(temporaer_indptr, pfad_indptr)
+        os.replace(temporaer_indices, pfad_indices)
+        fertig = True
+    finally:
+        # Abgebrochener Bau (z.B. geschlossener Generator): halbe temporäre Dateien entfernen
+        if not fertig:
+            for pfad in (temporaer_indptr, temporaer_indices):
+                if os.path.exists(pfad):
+                    os.remove(pfad)
+
+# ------------------------------------------------------
+# Ausbreitung (Spread)
+# ------------------------------------------------------
+
+def _gather_neighbors(indptr: np.ndarray, indices: np.ndarray, knoten: np.ndarray) -> np.ndarray:
+    """Alle ausgehenden Kontakte der ``knoten`` als ein Array (vektorisierter CSR-Zugriff)."""
+    anfang = indptr[knoten]
+    laengen = indptr[knoten + 1] - anfang
+    positionen = np.repeat(anfang - np.cumsum(laengen) + laengen, laengen) + np.arange(int(laengen.sum()))
+    return indices[positionen]
+
+def spread(indptr: np.ndarray, indices: np.ndarray, starter_personen: int, multiplikator: float,
+           anzahl_wellen: int, seed: int = 42) -> dict:
+    """
+    Wellenweise Ausbreitung (Frontier-BFS) auf dem Graphen: Jede neu erreichte Person
+    überzeugt jeden ihrer Kontakte mit Wahrscheinlichkeit ``multiplikator / mittlerer_grad``,
+    bereits Erreichte zählen nicht erneut.
+
+    Args:
+        indptr (np.ndarray): CSR-Zeilenzeiger.
+        indices (np.ndarray): CSR-Kantenziele.
+        starter_personen (int): Anzahl zufällig gewählter Startpersonen (Welle 1).
+        multiplikator (float): Mittlere Anzahl überzeugter Kontakte je Person und Welle.
+        anzahl_wellen (int): Anzahl der Wellen.
+        seed (int): Seed für die Auswahl der Startpersonen und die Übertragungen.
+
+    Returns:
+        dict: "runden", "neu_erreicht_pro_runde" und "kumulativ_erreicht".
+    """
+    n = len(indptr) - 1
+    rng = np.random.default_rng(seed)
+    uebertragung = min(multiplikator * n / len(indices), 1.0)
+    erreicht = np.zeros(n, dtype=bool)
+    front = rng.choice(n, size=min(starter_personen, n), replace=False).astype(np.int64)
+    erreicht[front] = True
+    neu_pro_welle = [len(front)]
+
+    for _ in range(1, anzahl_wellen):
+        if len(front) == 0:
+            neu_pro_welle.append(0)
+            continue
+        # Frontier blockweise abarbeiten, damit die Zahl gleichzeitig gehaltener Kanten begrenzt bleibt
+        grade = indptr[front + 1] - indptr[front]
+        grenzen = np.searchsorted(np.cumsum(grade), np.arange(EDGE_CHUNK, int(grade.sum()), EDGE_CHUNK))
+        naechste = []
+        for block in np.split(front, grenzen):
+            ziele = _gather_neighbors(indptr, indices, block)
+            ziele = ziele[rng.random(len(ziele)) < uebertragung]
+            ziele = np.unique(ziele[~erreicht[ziele]])
+            erreicht[ziele] = True
+            naechste.append(ziele.astype(np.int64))
+        front = np.concatenate(naechste)
+        neu_pro_welle.append(len(front))
+
+    neu = np.asarray(neu_pro_welle, dtype=float)
+    return {
+        "runden": np.arange(1, anzahl_wellen + 1),
+        "neu_erreicht_pro_runde": neu,
+        "kumulativ_erreicht": np.cumsum(neu),
+    }
@@ -0,0 +1,192 @@
+"""
+Parameter-Sweeps (2-D Raster) über die geschlossenen Formeln der Engine.
+
+Zwei Eingaben einer Geschichte werden gleichzeitig über ihren gesamten
+Wertebereich variiert, alle übrigen bleiben auf den aktuellen Slider-Werten.
+Das Raster wird zeilenweise in Blöcken ausgewertet (begrenzter Speicher) und
+für den Browser serverseitig per Blockmittelung verkleinert.
+"""
+
+import numpy as np
+
+import engine
+
+# ------------------------------------------------------
+# Sweep-Räume je Geschichte (Sweep Spaces)
+# Parameter: (Label, Minimum, Maximum, Ganzzahlig)
+# Kennzahlen: (Label, logarithmische Farbskala)
+# Standard: voreingestellte Achsen (x, y)
+# ------------------------------------------------------
+
+SWEEP_SPACES = {
+    "schachbrett": {
+        "standard": ("faktor", "feld_nummer"),
+        "model": engine.chessboard_log10,
+        "parameter": {
+            "feld_nummer": ("Feld", 1, engine.SCHACHBRETT_FELDER, True),
+            "faktor": ("Vervielfachung pro Feld", 1.0, 10.0, False),
+        },
+        # Die Engine rechnet hier bereits im Logarithmus, daher keine zusätzliche log-Farbskala
+        "kennzahlen": {
+            "log10_koerner_gesamt": ("Kumulierte Reiskörner (log₁₀)", False),
+            "log10_koerner_auf_feld": ("Reiskörner auf dem Feld (log₁₀)", False),
+            "log10_gewicht_tonnen": ("Gewicht in t (log₁₀)", False),
+        },
+    },
+    "zinseszins": {
+        "standard": ("zinssatz", "laufzeit"),
+        "model": engine.compound_interest_final,
+        "parameter": {
+            "startkapital": ("Startkapital (€)", 0, 500_000, False),
+            "sparrate": ("Monatliche Sparrate (€)", 0, 5_000, False),
+            "laufzeit": ("Laufzeit (Jahre)", 5, 50, True),
+            "zinssatz": ("Jährlicher Zinssatz (%)", 0.0, 18.0, False),
+            "inflation": ("Inflation (% p.a.)", 0.0, 10.0, False),
+            "kosten": ("Kosten (% p.a.)", 0.0, 3.0, False),
+        },
+        "kennzahlen": {
+            "endkapital_lara": ("Gesamtvermögen Lara (€)", True),
+            "endkapital_tim": ("Vermögen Tim (€)", True),
+            "eigenleistung_kumuliert": ("Eigenleistung (€)", True),
+        },
+    },
+    "viral": {
+        "standard": ("multiplikator", "anzahl_wellen"),
+        "model": engine.viral_final,
+        "parameter": {
+            "starter_personen": ("Initiale Personen", 1, 1_000, True),
+            "multiplikator": ("Multiplikator pro Welle", 0.5, 5.0, False),
+            "anzahl_wellen": ("Anzahl Wellen", 1, 40, True),
+        },
+        "kennzahlen": {
+            "gesamt_personen_erreicht": ("Gesamt erreicht (Personen)", True),
+            "anteil_letzte_welle_gesamt": ("Anteil letzte Welle", False),
+        },
+    },
+    "saas": {
+        "standard": ("monatliche_wachstumsrate", "monate_planungszeitraum"),
+        "model": engine.saas_final,
+        "parameter": {
+            "start_mrr": ("Startumsatz (MRR in €)", 1_000, 1_000_000, False),
+            "monatliche_wachstumsrate": ("Monatliches Wachstum (%)", 0.0, 35.0, False),
+            "monate_planungszeitraum": ("Planungszeitraum (Monate)", 6, 60, True),
+            "lineares_ziel_delta_mrr": ("Lineares Monatsziel (Δ MRR)", 0, 200_000, False),
+            "team_aktuelle_fte": ("Aktuelle FTE", 3, 200, True),
+            "mrr_pro_fte_produktivitaet": ("MRR pro FTE (€/Monat)", 1_000, 30_000, False),
+        },
+        "kennzahlen": {
+            "gesamt_mrr_exponentiell": ("MRR nach Plan (€)", True),
+            "gesamt_mrr_linear": ("Lineares Ziel (MRR in €)", True),
+            "zus_fte_benoetigt": ("Zusätzliche FTE", True),
+            "anteil_zuwachs_letzter_monat": ("Wachstum im letzten Monat", False),
+        },
+    },
+}
+
+# Maximale Rasterauflösung pro Achse, die an den Browser geht
+MAX_DISPLAY_CELLS = 200
+
+# ------------------------------------------------------
+# Raster-Auswertung (Grid Evaluation)
+# ------------------------------------------------------
+
+def axis_values(space: str, parameter: str, resolution: int, bereich: tuple = None) -> np.ndarray:
+    """
+    Erzeugt die Stützstellen einer Sweep-Achse über den gesamten Slider-Bereich.
+    Ganzzahlige Parameter (Laufzeiten, Wellen, ...) werden auf eindeutige Ganzzahlen gerundet.
+
+    Args:
+        space (str): Schlüssel in :data:`SWEEP_SPACES`.
+        parameter (str): Name des Parameters.
+        resolution (int): Gewünschte Anzahl an Stützstellen.
+        bereich (tuple): Optional abweichendes (Minimum, Maximum), z.B. bei einstellbarer Brettgröße.
+
+    Returns:
+        np.ndarray: Aufsteigende Stützstellen.
+    """
+    _, minimum, maximum, ganzzahlig = SWEEP_SPACES[space]["parameter"][parameter]
+    if bereich is not None:
+        minimum, maximum = bereich
+    werte = np.linspace(minimum, maximum, resolution)
+    if ganzzahlig:
+        werte = np.unique(np.round(werte))
+    return werte
+
+def evaluate_grid(space: str, x_param: str, y_param: str, metric: str, fixed: dict,
+                  resolution: int = 1000, chunk_rows: int = 128, bereiche: dict = None) -> tuple:
+    """
+    Wertet eine Kennzahl auf dem vollständigen Raster zweier Parameter aus.
+
+    Args:
+        space (str): Schlüssel in :data:`SWEEP_SPACES`.
+        x_param (str): Parameter auf der x-Achse.
+        y_param (str): Parameter auf der y-Achse.
+        metric (str): Auszuwertende Kennzahl (Schlüssel im Ergebnis des Modells).
+        fixed (dict): Aktuelle Werte aller übrigen Parameter.
+        resolution (int): Stützstellen je Achse (ganzzahlige Achsen ggf. weniger).
+        chunk_rows (int): Rasterzeilen pro Block; begrenzt den temporären Speicher.
+        bereiche (dict): Optional abweichende Bereiche je Parameter, siehe :func:`axis_values`.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: x-Werte, y-Werte und Raster der Form ``(len(y), len(x))``.
+    """
+    for _, ergebnis in evaluate_grid_progressive(space, x_param, y_param, metric, fixed, resolution, chunk_rows,
+                                                 bereiche):
+        pass
+    return ergebnis
+
+def evaluate_grid_progressive(space: str, x_param: str, y_param: str, metric: str, fixed: dict,
+                              resolution: int = 1000, chunk_rows: int = 128, bereiche: dict = None):
+    """
+    Wie :func:`evaluate_grid`, liefert aber nach jedem Block die bereits berechneten Rasterzeilen
+    (für :mod:`anytime`).
+
+    Args:
+        Siehe :func:`evaluate_grid`.
+
+    Yields:
+        tuple[float, tuple]: Anteil der berechneten Zeilen sowie x-Werte, die bisherigen y-Werte und
+        deren Rasterzeilen (Sichten auf das Gesamtraster, ohne Kopie).
+    """
+    if x_param == y_param:
+        raise ValueError("Für einen Sweep werden zwei unterschiedliche Parameter benötigt.")
+    modell = SWEEP_SPACES[space]["model"]
+    bereiche = bereiche or {}
+    x = axis_values(space, x_param, resolution, bereiche.get(x_param))
+    y = axis_values(space, y_param, resolution, bereiche.get(y_param))
+    raster = np.empty((len(y), len(x)))
+    for start in range(0, len(y), chunk_rows):
+        zeilen = y[start:start + chunk_rows, np.newaxis]
+        argumente = {**fixed, x_param: x[np.newaxis, :], y_param: zeilen}
+        ende = start + len(zeilen)
+        raster[start:ende] = np.broadcast_to(modell(**argumente)[metric], (len(zeilen), len(x)))
+        yield ende / len(y), (x, y[:ende], raster[:ende])
+
+def downsample_grid(x: np.ndarray, y: np.ndarray, z: np.ndarray, max_cells: int = MAX_DISPLAY_CELLS) -> tuple:
+    """
+    Verkleinert ein Raster per Blockmittelung auf höchstens ``max_cells`` Zellen je Achse.
+
+    Args:
+        x (np.ndarray): x-Stützstellen.
+        y (np.ndarray): y-Stützstellen.
+        z (np.ndarray): Raster der Form ``(len(y), len(x))``.
+        max_cells (int): Maximale Zellen je Achse.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: Verkleinerte Achsen und Raster.
+    """
+    fy = -(-len(y) // max_cells)  # Aufrunden
+    fx = -(-len(x) // max_cells)
+    if fx == 1 and fy == 1:
+        return x, y, z
+    return _block_mean(x, fx), _block_mean(y, fy), _block_mean(_block_mean(z, fx, axis=1), fy, axis=0)
+
+def _block_mean(werte: np.ndarray, faktor: int, axis: int = 0) -> np.ndarray:
+    if faktor == 1:
+        return werte
+    werte = np.moveaxis(werte, axis, -1)
+    rest = (-werte.shape[-1]) % faktor
+    if rest:
+        werte = np.concatenate([werte, np.full(werte.shape[:-1] + (rest,), np.nan)], axis=-1)
+    bloecke = werte.reshape(werte.shape[:-1] + (-1, faktor))
+    return np.moveaxis(np.nanmean(bloecke, axis=-1), -1, axis)